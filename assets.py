@@ -0,0 +1,52 @@
+import gzip, logging, os, sys
+from pathlib import Path
+
+# --------------------------------------------------------------------------- #
+# Precompressed dashboard assets
+# --------------------------------------------------------------------------- #
+# Text assets worth shipping with a gzipped sibling; fonts and images are
+# compressed already
+COMPRESS_SUFFIXES = ('.js', '.css', '.svg', '.ico', '.webmanifest')
+STATIC_DIR = Path(__file__).parent / 'static'
+
+def precompress_assets(folder=STATIC_DIR):
+    """
+    Write a gzipped ``.gz`` sibling next to every text asset in *folder*.
+
+    Run at install and update time (``setup.sh`` and
+    :pyfunc:`update.perform_update`), not by the API, which serves a
+    sibling only while its mtime matches the source's. Each ``.gz`` is
+    stamped with its source's mtime; files whose sibling already carries
+    that mtime are skipped, so only assets changed by an update are
+    recompressed. Siblings that would not be smaller are not written.
+
+    Returns:
+        int: Number of files compressed.
+    """
+    written = 0
+    for src in Path(folder).glob("*"):
+        if src.suffix not in COMPRESS_SUFFIXES or not src.is_file():
+            continue
+        gz = src.with_name(src.name + ".gz")
+        try:
+            st = src.stat()
+            if gz.exists() and gz.stat().st_mtime_ns == st.st_mtime_ns:
+                continue
+            data = src.read_bytes()
+            packed = gzip.compress(data, compresslevel=9, mtime=0)
+            if len(packed) >= len(data):
+                gz.unlink(missing_ok=True)
+                continue
+            tmp = gz.with_name(gz.name + ".tmp")
+            tmp.write_bytes(packed)
+            os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+            os.replace(tmp, gz)
+            written += 1
+        except OSError as e:
+            logging.warning(f"Could not precompress {src.name}: {e}")
+    return written
+
+if __name__ == "__main__":
+    # python3 assets.py [folder]
+    folder = Path(sys.argv[1]) if len(sys.argv) > 1 else STATIC_DIR
+    print(f"Precompressed {precompress_assets(folder)} assets in {folder}")
@@ -1,6 +1,6 @@
 import logging, logging.handlers, shutil, pytest, inspect
 from pathlib import Path
-import viewport, monitoring
+import viewport, monitoring, core
 from validate_config import AppConfig
 
 # --------------------------------------------------------------------------- # 
@@ -81,11 +81,18 @@ def provide_dummy_config(tmp_path_factory):
         DEBUG_LOGGING=False,
         ERROR_LOGGING=False,
         ERROR_PRTSCR=False,
+        LOG_ASYNC=False,
+        LOG_JSON=False,
+        LOG_COMPRESS=False,
         LOG_DAYS=7,
         LOG_INTERVAL=60,
         # API & creds
         API=False,
         CONTROL_TOKEN="",
+        API_WORKERS=1,
+        API_THREADS=8,
+        API_KEEPALIVE=5,
+        API_TIMEOUT=30,
         username="user",
         password="pass",
         url="http://example.com",
@@ -95,13 +102,20 @@ def provide_dummy_config(tmp_path_factory):
         mon_file=str(data_dir / "monitoring.log"),
         log_file=str(data_dir / "viewport.log"),
         sst_file=data_dir / "sst.txt",
-        status_file=data_dir / "status.txt",
+        status_file=data_dir / "status.jsonl",
         restart_file=data_dir / ".restart",
         pause_file= data_dir / ".pause",
+        vp_pid_file=data_dir / "viewport.pid",
+        mon_pid_file=data_dir / "monitoring.pid",
+        sample_file=data_dir / "samples.bin",
+        metrics_file=data_dir / "metrics.json",
+        history_file=data_dir / "history.db",
+        control_file=data_dir / "viewport.sock",
+        state_file=data_dir / "state.bin",
     )
     # Save the real config browser since it changes based on other variables
     mp = pytest.MonkeyPatch()
-    for mod in (viewport, monitoring):
+    for mod in (viewport, monitoring, core):
         def _cfg(*_a, **_kw):
             # make sure any per-test monkey-patches bleed through
             cfg.sst_file     = getattr(viewport,   "sst_file",     cfg.sst_file)
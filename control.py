@@ -0,0 +1,154 @@
+import hmac, json, os, socket, struct, threading, logging
+from pathlib import Path
+
+# --------------------------------------------------------------------------- #
+# Protocol
+# --------------------------------------------------------------------------- #
+# One JSON object per line in each direction, one command per connection:
+#   -> {"command": "pause", "token": "...", "args": {...}}
+#   <- {"status": "ok", "data": {...}} | {"status": "error", "message": "..."}
+MAX_REQUEST = 64 * 1024     # bytes accepted for one request line
+TIMEOUT     = 2             # seconds a client or connection may take
+SCREENSHOT_TIMEOUT = 5      # seconds the daemon waits for its health loop to take one
+# Commands whose handler may take longer than TIMEOUT to reply
+TIMEOUTS = {"screenshot": SCREENSHOT_TIMEOUT + TIMEOUT}
+
+class ControlServer(threading.Thread):
+    """
+    Daemon thread serving the control socket of a running *viewport.py*.
+
+    The socket is created with mode ``0600``, each connection is checked
+    against the caller's user id where the platform reports it
+    (``SO_PEERCRED``), and when *token* is set every request must carry
+    it. Handlers run on this thread, so anything that has to happen on
+    the health-check thread should only be scheduled here.
+
+    Args:
+        path: Filesystem path of the Unix domain socket.
+        handlers: ``{command: callable(**args) -> JSON-ready data}``.
+        token: Shared secret requests must present; empty disables it.
+    """
+    def __init__(self, path, handlers, token=""):
+        super().__init__(name="control-server", daemon=True)
+        self.path = Path(path)
+        self.handlers = handlers
+        self.token = token or ""
+        self._sock = None
+        self._stopped = threading.Event()
+
+    def open(self):
+        """
+        Bind the socket, replacing one left behind by a previous run,
+        and start serving.
+        """
+        self.path.unlink(missing_ok=True)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Nobody else may even connect; the umask only narrows the window
+        old_umask = os.umask(0o177)
+        try:
+            sock.bind(str(self.path))
+        finally:
+            os.umask(old_umask)
+        os.chmod(self.path, 0o600)
+        sock.listen(8)
+        sock.settimeout(1)  # lets run() notice stop()
+        self._sock = sock
+        self.start()
+        return self
+
+    def _peer_allowed(self, conn):
+        peercred = getattr(socket, "SO_PEERCRED", None)
+        if peercred is None:
+            return True  # socket permissions are the only check
+        _, uid, _ = struct.unpack("3i", conn.getsockopt(socket.SOL_SOCKET, peercred, struct.calcsize("3i")))
+        return uid in (os.geteuid(), 0)
+
+    def dispatch(self, request):
+        """
+        Run one decoded request and return the reply object.
+        """
+        if not isinstance(request, dict):
+            return {"status": "error", "message": "Malformed request"}
+        if self.token and not hmac.compare_digest(str(request.get("token", "")), self.token):
+            return {"status": "error", "message": "Unauthorized"}
+        handler = self.handlers.get(request.get("command"))
+        if handler is None:
+            return {"status": "error", "message": f'Unknown command "{request.get("command")}"'}
+        args = request.get("args") or {}
+        try:
+            return {"status": "ok", "data": handler(**args)}
+        except Exception as e:
+            logging.warning(f"Control command {request.get('command')} failed: {e}")
+            return {"status": "error", "message": str(e) or type(e).__name__}
+
+    def _serve(self, conn):
+        with conn:
+            conn.settimeout(TIMEOUT)
+            if not self._peer_allowed(conn):
+                reply = {"status": "error", "message": "Unauthorized"}
+            else:
+                line = conn.makefile("rb").readline(MAX_REQUEST)
+                try:
+                    reply = self.dispatch(json.loads(line))
+                except ValueError:
+                    reply = {"status": "error", "message": "Malformed request"}
+            conn.sendall(json.dumps(reply).encode() + b"\n")
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                continue
+            try:
+                self._serve(conn)
+            except OSError as e:
+                logging.debug(f"Control connection dropped: {e}")
+
+    def stop(self):
+        """
+        Stop serving and remove the socket file.
+        """
+        self._stopped.set()
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)  # wakes accept() on Linux
+            except OSError:
+                pass
+            self._sock.close()
+        self.path.unlink(missing_ok=True)
+
+def request(path, command, token="", timeout=None, **args):
+    """
+    Send *command* to the daemon listening on *path*.
+
+    *timeout* defaults to ``TIMEOUT``, or the command's entry in
+    ``TIMEOUTS`` for commands the daemon takes longer to answer.
+
+    Returns:
+        dict | None: The reply, ``{"status": "ok", "data": ...}`` or
+        ``{"status": "error", "message": ...}``; ``None`` when no daemon
+        is listening, so callers can fall back to the old mechanism. A
+        daemon that accepts the request but does not answer in time
+        gives an error reply, not ``None``.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout or TIMEOUTS.get(command, TIMEOUT))
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    try:
+        sock.sendall(json.dumps({"command": command, "token": token or "", "args": args}).encode() + b"\n")
+        line = sock.makefile("rb").readline(MAX_REQUEST)
+    except TimeoutError:
+        return {"status": "error", "message": f"Timed out waiting for a reply to {command}"}
+    except OSError:
+        return None
+    finally:
+        sock.close()
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
@@ -0,0 +1,503 @@
+import os, sys, json, time, signal, logging, threading
+import psutil
+from pathlib import Path
+from validate_config import config_cache
+from logging_config import event_code, tail_lines
+from history import HistoryRecorder
+from state import StateBlock
+# --------------------------------------------------------------------------- # 
+# Variable Declaration and file paths
+# --------------------------------------------------------------------------- # 
+# Shared by viewport.py, monitoring.py and update.py. Importing it must stay
+# cheap: no selenium, no logging setup and no signal handlers.
+_mod = sys.modules[__name__]
+history = HistoryRecorder() # Queues until viewport.main() opens history_file
+state = StateBlock()        # Kept in memory until viewport.main() opens state_file
+# Status journal (status_file): one JSON object per line, newest last
+STATUS_MAX_BYTES = 256 * 1024   # compacted once it grows past this
+STATUS_KEEP      = 500          # newest entries kept by a compaction
+_STATUS_ERROR    = ("error", "crash", "timed out", "failed", "unresponsive",
+                    "not found", "stuck", "unsupported", "couldn't")
+_STATUS_WARNING  = ("restarting", "starting", "stopped", "offline", "paused",
+                    "retrying", "killed", "no devices", "max attempts",
+                    "scheduled restart", "slow", "fell back", "loading issue")
+_journal = {"path": None, "size": None, "last": None}
+_journal_lock = threading.Lock()
+cfg = config_cache.get()
+for name, val in vars(cfg).items():
+    setattr(_mod, name, val)
+# --------------------------------------------------------------------------- # 
+# Logging and status
+# --------------------------------------------------------------------------- # 
+def log_error(message, exception=None):
+    """
+    Log an error, with a stack trace when ``ERROR_LOGGING`` is enabled.
+
+    The daemon's :pyfunc:`viewport.log_error` also takes a screenshot;
+    this one never touches the browser.
+
+    Args:
+        message: Human-readable error message.
+        exception: Optional exception to include in the log.
+    """
+    if ERROR_LOGGING and exception:
+        logging.exception(message)  # Logs the message with the stacktrace
+    else:
+        logging.error(message)  # Logs the message without any exception
+def status_entry(msg, **details):
+    """
+    Build a status journal entry for *msg*.
+
+    The event code comes from :pyfunc:`logging_config.event_code`
+    (``"Retrying: 2 of 5"`` -> ``"retrying"``), so entries of the same
+    kind share a code; severity comes from keywords.
+
+    Args:
+        msg: Human-readable status message.
+        **details: Extra JSON-ready fields stored under ``details``.
+
+    Returns:
+        dict: ``{"ts", "code", "severity", "message", "details"}``.
+    """
+    lower = msg.lower()
+    if any(word in lower for word in _STATUS_ERROR):
+        severity = "error"
+    elif any(word in lower for word in _STATUS_WARNING):
+        severity = "warning"
+    else:
+        severity = "info"
+    code = event_code(msg, "status")
+    return {"ts": time.time(), "code": code, "severity": severity,
+            "message": msg, "details": details}
+
+def _status_key(entry):
+    return (entry.get("code"), entry.get("message"), entry.get("details"))
+
+def read_status(path, tail=1):
+    """
+    Return the newest *tail* entries of the status journal at *path*.
+
+    Only the end of the file is read. Lines that are not complete JSON
+    objects (a write in progress, or an old plain-text status) are
+    skipped.
+
+    Returns:
+        list[dict]: Entries, oldest first; empty if the journal is empty.
+
+    Raises:
+        FileNotFoundError: If *path* does not exist.
+    """
+    if tail <= 0:
+        return []
+    with open(path, "rb") as f:
+        # One spare line in case the newest is still being written
+        lines, _ = tail_lines(f, tail + 1)
+    entries = []
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(entry, dict):
+            entries.append(entry)
+    return entries[-tail:]
+
+def _compact_status(path):
+    # Keep the newest entries; readers see the old or the new file, never half
+    entries = read_status(path, STATUS_KEEP)
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    data = "".join(json.dumps(entry) + "\n" for entry in entries).encode()
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return len(data)
+
+def api_status(msg, **details):
+    """
+    Record a status update for external tools.
+
+    The update is appended to the status journal (*status_file*) unless
+    it repeats the newest entry, so a steady "Feed Healthy" costs no
+    writes. Each entry is one ``write`` to a file opened for appending,
+    and the journal is compacted to the newest ``STATUS_KEEP`` entries
+    once it passes ``STATUS_MAX_BYTES``.
+
+    Args:
+        msg: Human-readable status message.
+        **details: Extra JSON-ready fields stored with the entry.
+    """
+    history.event("status", msg)
+    entry = status_entry(msg, **details)
+    if state.values["status"] != msg:
+        state.update(status=msg, severity=entry["severity"], status_changed=entry["ts"])
+    key = _status_key(entry)
+    path = status_file
+    with _journal_lock:
+        try:
+            size = os.stat(path).st_size
+        except FileNotFoundError:
+            size = None
+        # Someone else wrote, truncated or removed the journal since our last write
+        if (_journal["path"], _journal["size"]) != (path, size):
+            latest = read_status(path) if size else []
+            _journal["last"] = _status_key(latest[-1]) if latest else None
+        if _journal["last"] != key:
+            line = (json.dumps(entry) + "\n").encode()
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            size = (size or 0) + len(line)
+            if size > STATUS_MAX_BYTES:
+                size = _compact_status(path)
+        _journal.update(path=path, size=size, last=key)
+# --------------------------------------------------------------------------- # 
+# Processes
+# --------------------------------------------------------------------------- # 
+def get_process_type(cmdline):
+    """
+    Classify a browser process from its command-line.
+
+    Chrome/Chromium children carry a ``--type=`` switch (the main
+    browser process has none); Firefox children are started with
+    ``-contentproc`` and end with their process type.
+
+    Args:
+        cmdline: The process's argument list.
+
+    Returns:
+        string: One of ``"browser"``, ``"renderer"``, ``"gpu"``,
+        ``"network"``, ``"utility"``, ``"extension"`` or ``"other"``.
+    """
+    args = [str(arg) for arg in cmdline or []]
+    ptype = next((arg.split("=", 1)[1] for arg in args if arg.startswith("--type=")), None)
+    if ptype is None:
+        if "-contentproc" in args:
+            firefox_types = {"tab": "renderer", "gpu": "gpu", "socket": "network",
+                             "rdd": "utility", "utility": "utility"}
+            return firefox_types.get(args[-1], "other")
+        return "browser"
+    if ptype == "renderer":
+        return "extension" if "--extension-process" in args else "renderer"
+    if ptype == "gpu-process":
+        return "gpu"
+    if ptype == "utility":
+        sub_type = next((arg.split("=", 1)[1] for arg in args
+                         if arg.startswith("--utility-sub-type=")), "")
+        return "network" if sub_type.startswith("network.") else "utility"
+    # zygote, crashpad-handler, broker, ...
+    return "other"
+def process_snapshot():
+    """
+    Take a single snapshot of the process table.
+
+    The snapshot can be shared by several :pyfunc:`process_handler` and
+    :pyfunc:`usage_handler` calls so the table is only walked once.
+
+    Returns:
+        list[psutil.Process]: Processes with ``pid``, ``ppid``, ``name``,
+        ``uids``, ``cmdline`` and ``exe`` pre-fetched into ``proc.info``.
+    """
+    return list(psutil.process_iter(['pid', 'ppid', 'name', 'uids', 'cmdline', 'exe']))
+def usage_match(proc, match_str):
+    """
+    Check whether *match_str* appears in a process's name or command-line.
+
+    Args:
+        proc: Process from :pyfunc:`process_snapshot`.
+        match_str: Substring to look for.
+
+    Returns:
+        bool: ``True`` on a match; ``False`` otherwise or if the process
+        cannot be inspected.
+    """
+    try:
+        # normalize cmdline → string
+        raw = proc.info.get('cmdline') or []
+        cmd = " ".join(raw) if isinstance(raw, (list, tuple)) else str(raw)
+        return match_str in (proc.info.get('name') or "") or match_str in cmd
+    except Exception:
+        return False
+def cpu_sampler(procs, interval=0.1):
+    """
+    Sample CPU and memory for many processes in one measuring window.
+
+    ``cpu_percent`` is primed on every process first, then a single
+    *interval* elapses before all of them are read, instead of blocking
+    once per process.
+
+    Args:
+        procs: Processes to sample.
+        interval: Seconds between priming and reading.
+
+    Returns:
+        dict[int, tuple[float, int]]: ``{pid: (cpu_percent, rss_bytes)}``
+        for every process that could be inspected.
+    """
+    primed = []
+    for p in procs:
+        try:
+            p.cpu_percent(None)
+            primed.append(p)
+        except Exception:
+            # skip processes we can’t inspect
+            continue
+    if not primed:
+        return {}
+    time.sleep(interval)
+    samples = {}
+    for p in primed:
+        try:
+            samples[p.info['pid']] = (p.cpu_percent(None), p.memory_info().rss)
+        except Exception:
+            continue
+    return samples
+def usage_handler(match_str, procs=None, samples=None):
+    """
+    Aggregate CPU and memory use for matching processes.
+
+    Args:
+        match_str: Substring to look for in a process's name or
+            command-line.
+        procs: Optional snapshot from :pyfunc:`process_snapshot`; a new
+            one is taken when omitted.
+        samples: Optional result of :pyfunc:`cpu_sampler` covering the
+            matching processes; sampled on demand when omitted.
+
+    Returns:
+        tuple[float, int]: ``(total_cpu_percent, total_rss_bytes)`` where
+        *total_cpu_percent* is summed across logical cores and
+        *total_rss_bytes* is the combined resident-set size.
+    """
+    procs = process_snapshot() if procs is None else procs
+    matches = [p for p in procs if usage_match(p, match_str)]
+    if samples is None:
+        samples = cpu_sampler(matches)
+    total_cpu = 0.0
+    total_mem = 0
+    for p in matches:
+        try:
+            cpu, mem = samples[p.info['pid']]
+        except Exception:
+            continue
+        total_cpu += cpu
+        total_mem += mem
+    return total_cpu, total_mem
+def browser_tree(procs=None, driver=None):
+    """
+    Collect the browser processes spawned by the WebDriver service.
+
+    The tree is rooted at the driver service (``chromedriver`` or
+    ``geckodriver``) instead of matching the browser name, so unrelated
+    browser windows are left out. When *driver* is given its service PID
+    is used directly; otherwise the service is located in the snapshot.
+
+    Args:
+        procs: Optional snapshot from :pyfunc:`process_snapshot`.
+        driver: Optional active WebDriver instance.
+
+    Returns:
+        list[psutil.Process]: Every descendant of the driver service.
+    """
+    procs = process_snapshot() if procs is None else procs
+    service = getattr(getattr(driver, "service", None), "process", None)
+    if service is not None:
+        roots = {service.pid}
+    else:
+        service_name = "geckodriver" if BROWSER == "firefox" else "chromedriver"
+        me = os.geteuid()
+        roots = set()
+        for p in procs:
+            uids = p.info.get('uids')
+            if usage_match(p, service_name) and (uids is None or uids.real == me):
+                roots.add(p.info['pid'])
+    children = {}
+    for p in procs:
+        children.setdefault(p.info.get('ppid'), []).append(p)
+    tree = []
+    pending = list(roots)
+    while pending:
+        for child in children.get(pending.pop(), []):
+            tree.append(child)
+            pending.append(child.info['pid'])
+    return tree
+def browser_usage_handler(procs=None, samples=None, driver=None):
+    """
+    Break browser CPU and memory use down by process type.
+
+    Args:
+        procs: Optional snapshot from :pyfunc:`process_snapshot`.
+        samples: Optional :pyfunc:`cpu_sampler` result covering the
+            browser tree; sampled on demand when omitted.
+        driver: Optional active WebDriver used to locate the tree.
+
+    Returns:
+        dict[str, dict]: ``{type: {"count": n, "cpu": pct, "mem": rss}}``
+        keyed by :pyfunc:`get_process_type`, with CPU summed across
+        logical cores.
+    """
+    tree = browser_tree(procs, driver)
+    if samples is None:
+        samples = cpu_sampler(tree)
+    breakdown = {}
+    for p in tree:
+        entry = breakdown.setdefault(
+            get_process_type(p.info.get('cmdline')),
+            {"count": 0, "cpu": 0.0, "mem": 0},
+        )
+        cpu, mem = samples.get(p.info['pid'], (0.0, 0))
+        entry["count"] += 1
+        entry["cpu"] += cpu
+        entry["mem"] += mem
+    return breakdown
+def pid_handler(name, action="read"):
+    """
+    Read, write, or clear the PID file registered for a script.
+
+    Each file stores the PID together with the process ``create_time``
+    so a recycled PID that now belongs to an unrelated program is never
+    mistaken for a running instance.
+
+    Args:
+        name: ``"viewport.py"`` or ``"monitoring.py"``.
+        action: ``"read"`` to return the validated PID, ``"write"`` to
+            register the current process, or ``"clear"`` to remove the
+            file if it belongs to the current process.
+
+    Returns:
+        int | None: The registered PID when it is alive, owned by us and
+        still running *name*; ``None`` otherwise.
+    """
+    lower_name = name.lower()
+    path = {"viewport.py": vp_pid_file, "monitoring.py": mon_pid_file}.get(lower_name)
+    if path is None:
+        return None
+    try:
+        if action == "write":
+            me = psutil.Process()
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_text(f"{me.pid}\n{me.create_time()!r}\n")
+            os.replace(tmp, path)
+            return me.pid
+        pid_raw, created_raw = path.read_text().split()[:2]
+        pid, created = int(pid_raw), float(created_raw)
+        if action == "clear":
+            if pid == os.getpid(): path.unlink(missing_ok=True)
+            return None
+        proc = psutil.Process(pid)
+        # A different create_time means the PID was recycled
+        if abs(proc.create_time() - created) > 0.01:
+            return None
+        script_token = lower_name[:-3]
+        cmd_args = [os.path.basename(str(arg)).lower() for arg in proc.cmdline()]
+        if lower_name not in cmd_args and script_token not in cmd_args:
+            return None
+        if proc.uids().real != os.geteuid():
+            return None
+        return pid
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Unreadable or stale entry; callers fall back to a full scan
+        return None
+def live_state(values):
+    """
+    Return a state block's values only if the daemon that wrote them runs.
+
+    The block outlives its writer after a SIGKILL, a crash or a reboot
+    and then still says ``running`` with the last status. Its ``pid``
+    must be the one :pyfunc:`pid_handler` vouches for (alive, same
+    ``create_time``, running ``viewport.py``) and the phase must not be
+    ``stopped``; otherwise callers fall back to ``sst.txt`` and the
+    status journal.
+
+    Args:
+        values: The dict from :pymeth:`state.StateReader.read`, or ``None``.
+
+    Returns:
+        dict | None: *values*, or ``None`` if they cannot be trusted.
+    """
+    if not values or not values["pid"] or values["phase"] == "stopped":
+        return None
+    return values if pid_handler("viewport.py") == values["pid"] else None
+def process_handler(name, action="check", procs=None):
+    """
+    Check for—or terminate—running processes that match *name*.
+
+    For ``viewport.py`` and ``monitoring.py`` the match is exact on a
+    standalone script argument; for browsers it searches the executable
+    path and full command-line. Script checks consult the PID file
+    registry first and only scan the process table when it is missing
+    or stale.
+
+    Args:
+        name: Script filename (e.g., ``"viewport.py"``) or browser name.
+        action: ``"check"`` to test for running instances,
+            ``"kill"`` to force-terminate them.
+        procs: Optional snapshot from :pyfunc:`process_snapshot` to
+            scan instead of walking the process table again.
+
+    Returns:
+        bool: ``True`` if any matching processes are (or were) running;
+        otherwise ``False``.
+    """
+    try:
+        me = os.geteuid()
+        current_pid = os.getpid()
+        matches = []
+        lower_name = name.lower()
+        script_token = lower_name[:-3] if lower_name.endswith(".py") else lower_name
+        # Determine if we're matching a script or a browser
+        is_script = lower_name in ("viewport.py", "monitoring.py")
+        if is_script and action == "check":
+            # Fast path: a validated PID file answers with a single lookup
+            pid = pid_handler(lower_name, action="read")
+            if pid is not None and pid != current_pid:
+                return True
+        if procs is None:
+            procs = psutil.process_iter(['pid', 'name', 'uids', 'cmdline', 'exe'])
+        for proc in procs:
+            try:
+                info = proc.info
+                proc_name = (info.get('name') or '').lower()
+                raw_cmd = info.get('cmdline') or []
+                exe_path = (info.get('exe') or '').lower()
+                if is_script:
+                    # Strict: match only if script name is a standalone argument
+                    cmd_args = [os.path.basename(str(arg)).lower() for arg in raw_cmd]
+                    if lower_name not in cmd_args and script_token not in cmd_args:
+                        continue
+                else:
+                    # Browser: match if name appears anywhere in cmdline or exe path
+                    cmd = " ".join(raw_cmd).lower()
+                    if lower_name not in proc_name and lower_name not in cmd and lower_name not in exe_path:
+                        continue
+                # Only kill/check processes you own
+                uids = info.get('uids')
+                if uids is not None and uids.real != me:
+                    continue
+                pid = info.get('pid')
+                if pid == current_pid:
+                    continue
+                matches.append(pid)
+                if action == "check":
+                    return True
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        if action == "kill" and matches:
+            for pid in matches:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    logging.warning(f"Process {pid} already gone")
+            pids = ', '.join(str(x) for x in matches)
+            time.sleep(0.5)
+            logging.info(f"Killed process '{name}' with PIDs: {pids}")
+            api_status(f"Killed process '{name}'")
+            return False
+        return bool(matches)
+    except Exception as e:
+        log_error(f"Error while checking process '{name}'", e)
+        api_status(f"Error Checking Process '{name}'")
+        return False
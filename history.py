@@ -0,0 +1,239 @@
+import sqlite3, threading, time, logging
+from collections import deque
+from pathlib import Path
+
+# --------------------------------------------------------------------------- #
+# Store layout
+# --------------------------------------------------------------------------- #
+FLUSH_INTERVAL = 60         # seconds between batched writes
+MAX_POINTS     = 5000       # most points a range query returns per series
+# name: (bucket seconds, retention seconds); raw rows keep each sample's time
+RESOLUTIONS = {
+    "raw":    (0,    24 * 3600),
+    "minute": (60,   30 * 24 * 3600),
+    "hour":   (3600, 2 * 365 * 24 * 3600),
+}
+RAW_STEP = 5                # sampler interval, used to size raw queries
+# Sampler fields kept as history (see sampler.FIELDS)
+SAMPLE_SERIES = (
+    "cpu_percent", "mem_percent", "mem_used",
+    "net_recv_rate", "net_sent_rate",
+    "viewport_rss", "browser_cpu", "browser_rss",
+)
+# Series recorded directly by the daemon
+RECORDED_SERIES = ("health_check_seconds",)
+SERIES = SAMPLE_SERIES + RECORDED_SERIES
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS points (
+    res    INTEGER NOT NULL,
+    metric TEXT    NOT NULL,
+    ts     REAL    NOT NULL,
+    avg    REAL    NOT NULL,
+    max    REAL    NOT NULL,
+    n      INTEGER NOT NULL,
+    PRIMARY KEY (res, metric, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS events (
+    ts      REAL NOT NULL,
+    kind    TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+"""
+
+def connect(path, readonly=False):
+    """
+    Open the history database at *path*, creating the schema if writable.
+    """
+    if readonly:
+        db = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=5)
+    else:
+        # Written by the recorder thread, flushed by others on restart
+        db = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        # Readers (the monitoring API) never block the daemon's writes
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(SCHEMA)
+    return db
+
+def rollup(db, now=None):
+    """
+    Aggregate finished buckets into the next coarser resolution.
+
+    Raw points roll into minutes and minutes into hours, starting again
+    from the newest bucket already written so gaps while the daemon was
+    down are caught up. Averages are weighted by the number of raw
+    points behind each row. Expired rows are then deleted.
+    """
+    now = time.time() if now is None else now
+    steps = [step for step, _ in RESOLUTIONS.values()]
+    for source, step in zip(steps, steps[1:]):
+        last = db.execute(
+            "SELECT MAX(ts) FROM points WHERE res = ?", (step,)
+        ).fetchone()[0] or 0
+        db.execute(
+            """
+            INSERT OR REPLACE INTO points (res, metric, ts, avg, max, n)
+            SELECT ?, metric, CAST(ts / ? AS INTEGER) * ?,
+                   SUM(avg * n) / SUM(n), MAX(max), SUM(n)
+            FROM points
+            WHERE res = ? AND ts >= ? AND ts < ?
+            GROUP BY metric, CAST(ts / ? AS INTEGER)
+            """,
+            (step, step, step, source, last, now // step * step, step),
+        )
+    for step, retention in RESOLUTIONS.values():
+        db.execute("DELETE FROM points WHERE res = ? AND ts < ?", (step, now - retention))
+    db.execute("DELETE FROM events WHERE ts < ?", (now - RESOLUTIONS["hour"][1],))
+
+class HistoryRecorder(threading.Thread):
+    """
+    Daemon thread that batches history into an SQLite database.
+
+    Every *interval* seconds it copies new samples from the sampler's
+    ring, plus any values passed to :pymeth:`record` and events passed
+    to :pymeth:`event`, into the database in one transaction, then rolls
+    finished buckets up (see :pyfunc:`rollup`). Until :pymeth:`open` is
+    called nothing is written and recent values wait in bounded queues.
+
+    Args:
+        interval: Seconds between writes.
+    """
+    def __init__(self, interval=FLUSH_INTERVAL):
+        super().__init__(name="history-writer", daemon=True)
+        self.interval = interval
+        self.path = None
+        self.ring = None
+        self._db = None
+        self._points = deque(maxlen=10_000)  # (ts, metric, value)
+        self._events = deque(maxlen=1_000)   # (ts, kind, message)
+        self._last_event = {}
+        self._last_seq = 0
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    def open(self, path, ring=None):
+        """
+        Start writing to *path*, reading samples from *ring* if given.
+        """
+        self.path = Path(path)
+        self.ring = ring
+        if not self.is_alive():
+            self.start()
+        return self
+
+    def record(self, metric, value, ts=None):
+        """
+        Queue one *value* of the series *metric*.
+        """
+        self._points.append((time.time() if ts is None else ts, metric, float(value)))
+
+    def event(self, kind, message, ts=None):
+        """
+        Queue an event, ignoring repeats of the previous *kind* event.
+        """
+        if self._last_event.get(kind) == message:
+            return
+        self._last_event[kind] = message
+        self._events.append((time.time() if ts is None else ts, kind, message))
+
+    def _samples(self):
+        if self.ring is None:
+            return []
+        new = [s for s in self.ring.history() if s["seq"] > self._last_seq]
+        if new:
+            self._last_seq = new[-1]["seq"]
+        return [
+            (s["timestamp"], metric, s[metric])
+            for s in new for metric in SAMPLE_SERIES
+        ]
+
+    def flush(self, now=None):
+        """
+        Write everything queued so far and roll up finished buckets.
+
+        Errors are logged rather than raised; whatever was dequeued for
+        the failed write is dropped.
+        """
+        if self.path is None:
+            return
+        with self._lock:
+            points = self._samples()
+            while self._points:
+                points.append(self._points.popleft())
+            events = []
+            while self._events:
+                events.append(self._events.popleft())
+            try:
+                if self._db is None:
+                    self._db = connect(self.path)
+                with self._db:
+                    # Samples the ring still held before a restart are already stored
+                    self._db.executemany(
+                        "INSERT OR IGNORE INTO points VALUES (0, ?, ?, ?, ?, 1)",
+                        [(metric, ts, value, value) for ts, metric, value in points],
+                    )
+                    self._db.executemany("INSERT INTO events VALUES (?, ?, ?)", events)
+                    rollup(self._db, now)
+            except (sqlite3.Error, OSError) as e:
+                logging.warning(f"Could not write history to {self.path}: {e}")
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            self.flush()
+
+    def stop(self):
+        self._stopped.set()
+
+def pick_resolution(start, end, now=None):
+    """
+    Return the finest resolution that still holds *start* and keeps a
+    series for ``start..end`` under ``MAX_POINTS`` points.
+    """
+    now = time.time() if now is None else now
+    for name, (step, retention) in RESOLUTIONS.items():
+        if start >= now - retention and (end - start) / (step or RAW_STEP) <= MAX_POINTS:
+            return name
+    return "hour"
+
+def query(path, start, end, metrics=SERIES, now=None):
+    """
+    Read series and events for ``start..end`` (epoch seconds).
+
+    Returns:
+        dict | None: ``{"resolution", "step", "series", "events"}`` where
+        each series is a list of ``[ts, avg, max]`` and each event is
+        ``[ts, kind, message]``; ``None`` if the database does not exist.
+    """
+    if not Path(path).exists():
+        return None
+    resolution = pick_resolution(start, end, now)
+    step = RESOLUTIONS[resolution][0]
+    db = connect(path, readonly=True)
+    try:
+        series = {metric: [] for metric in metrics}
+        rows = db.execute(
+            f"""
+            SELECT metric, ts, avg, max FROM points
+            WHERE res = ? AND ts >= ? AND ts <= ?
+              AND metric IN ({",".join("?" * len(metrics))})
+            ORDER BY metric, ts
+            """,
+            (step, start, end, *metrics),
+        )
+        for metric, ts, avg, peak in rows:
+            series[metric].append([ts, avg, peak])
+        events = [
+            list(row) for row in db.execute(
+                "SELECT ts, kind, message FROM events WHERE ts >= ? AND ts <= ? ORDER BY ts",
+                (start, end),
+            )
+        ]
+    finally:
+        db.close()
+    return {
+        "resolution": resolution,
+        "step": step or RAW_STEP,
+        "series": series,
+        "events": events,
+    }
@@ -1,60 +1,958 @@
-import logging, re
-from logging.handlers import TimedRotatingFileHandler
+import atexit, copy, ctypes, gzip, json, logging, os, queue, re, select, shutil, struct, threading, time
+from collections import deque
+from types import SimpleNamespace
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 from datetime import time as dtime
 from pathlib import Path
 
+LOG_QUEUE_SIZE   = 10000    # records buffered for the writer thread in async mode
+LOG_FLUSH_TIMEOUT = 5       # seconds flush_logging() waits for the backlog
+STALE_PART_AGE   = 3600     # seconds before an abandoned compression is removed
+KEEP_PLAIN       = 1        # newest backups left uncompressed, so cursors into them survive
+FOLLOW_POLL      = 1.0      # seconds follow_log() waits between checks without inotify
+
+# ANSI colour/escape sequences, e.g. Werkzeug's coloured status codes
+_ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+# Werkzeug's 'IP - - [timestamp] ' preamble, IPv4 *or* IPv6
+_ACCESS_PREAMBLE = re.compile(r'^[0-9a-fA-F:.]+ - - \[[^\]]+\]\s*', flags=re.ASCII)
+_ACCESS_LOGGERS = ("werkzeug", "flask")
+# Event codes: the message up to its first quote, digit, colon or brace
+_EVENT_END = re.compile(r"[:'\"0-9{]")
+_EVENT_SEPARATORS = re.compile(r"[^a-z]+")
+# Text log line: "[YYYY-MM-DD HH:MM:SS] [LEVEL] message"
+_TEXT_LINE = re.compile(r"\[(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\] \[([A-Z]+)\] (.*)", re.S)
+
+def event_code(message, default="log"):
+    """
+    Derive a ``snake_case`` event code from a free-text message.
+
+    Everything from the first quote, digit, colon or brace on is
+    dropped, so messages of the same kind share a code:
+    ``"Retrying: 2 of 5"`` -> ``"retrying"``.
+    """
+    head = _EVENT_END.split(message.lower(), 1)[0]
+    return _EVENT_SEPARATORS.sub("_", head).strip("_") or default
+
 class ColoredFormatter(logging.Formatter):
+    """
+    Console formatter that colours the message by level.
+
+    The colour codes are part of one format string per level, built
+    once, so the record is left untouched for the other handlers.
+    """
     RED    = '\033[0;31m'
     GREEN  = '\033[0;32m'
     YELLOW = '\033[1;33m'
     CYAN   = '\033[36m'
     NC     = '\033[0m'
 
+    def __init__(self, fmt=None, datefmt=None):
+        super().__init__(fmt, datefmt)
+        fmt = fmt or "%(message)s"
+        style = type(self._style)
+        self._levels = {
+            level: style(fmt.replace("%(message)s", f"{color}%(message)s{self.NC}"))
+            for level, color in (
+                (logging.ERROR, self.RED),
+                (logging.WARNING, self.YELLOW),
+                (logging.INFO, self.GREEN),
+                (logging.DEBUG, self.CYAN),
+            )
+        }
+        self._other = style(fmt.replace("%(message)s", f"{self.NC}%(message)s{self.NC}"))
+
+    def formatMessage(self, record):
+        return self._levels.get(record.levelno, self._other).format(record)
+
+class PlainFormatter(logging.Formatter):
+    """
+    File formatter that writes messages without ANSI escape codes.
+
+    With *clean_access* it also strips the ``IP - - [timestamp]``
+    preamble Werkzeug puts on access lines, leaving the HTTP line. Like
+    :class:`ColoredFormatter` it never modifies the record; messages
+    with nothing to strip are formatted as they are.
+    """
+    def __init__(self, fmt=None, datefmt=None, clean_access=False):
+        super().__init__(fmt, datefmt)
+        self.clean_access = clean_access
+
+    def formatMessage(self, record):
+        message = record.message
+        cleaned = _ANSI_ESCAPE.sub('', message) if '\x1b' in message else message
+        if self.clean_access and record.name.startswith(_ACCESS_LOGGERS):
+            cleaned = _ACCESS_PREAMBLE.sub('', cleaned, count=1).strip()
+        text = super().formatMessage(record)
+        if cleaned == message:
+            return text
+        if text.endswith(message):
+            # The usual layout: the message comes last, so swap just that
+            return text[:len(text) - len(message)] + cleaned
+        # Format a copy of the attributes instead of rewriting the record
+        return super().formatMessage(SimpleNamespace(**{**record.__dict__, "message": cleaned}))
+
+class JsonFormatter(PlainFormatter):
+    """
+    File formatter writing each record as one JSON object per line.
+
+    Keys come in a fixed order with ``ts`` and ``level`` first, so the
+    log can be indexed by time and level without decoding every line:
+    ``ts``, ``level``, ``event``, ``logger`` and ``message``, then
+    ``duration`` and ``attempt`` when the record carries them, then
+    ``exc`` for a traceback. ``event`` is the record's own (``extra=
+    {"event": ...}``) or is derived with :pyfunc:`event_code`.
+    Messages are cleaned as by :class:`PlainFormatter`.
+    """
+    FIELDS = ("duration", "attempt")
+
+    def __init__(self, datefmt='%Y-%m-%d %H:%M:%S', clean_access=False):
+        super().__init__('%(message)s', datefmt, clean_access)
+
     def format(self, record):
-        # Apply color based on level
-        if record.levelno == logging.ERROR:
-            color = self.RED
-        elif record.levelno == logging.WARNING:
-            color = self.YELLOW
-        elif record.levelno == logging.INFO:
-            color = self.GREEN
-        elif record.levelno == logging.DEBUG:
-            color = self.CYAN
+        record.message = record.getMessage()
+        message = self.formatMessage(record)
+        entry = {
+            "ts": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "event": getattr(record, "event", None) or event_code(message),
+            "logger": record.name,
+            "message": message,
+        }
+        for field in self.FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+# --------------------------------------------------------------------------- #
+# Reading logs back
+# --------------------------------------------------------------------------- #
+def parse_log_line(line):
+    """
+    Split one line of either log format into its fields.
+
+    JSON lines (see :class:`JsonFormatter`) are decoded as they are;
+    text lines ``[ts] [LEVEL] message`` give ``ts``, ``level``,
+    ``message`` and a derived ``event``.
+
+    Returns:
+        dict | None: The fields, or ``None`` for a line that continues
+        the record above it (e.g. a traceback) or is not a log record.
+    """
+    line = line.rstrip("\n")
+    if line.startswith("{"):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            return None
+        return entry if isinstance(entry, dict) and "level" in entry else None
+    match = _TEXT_LINE.match(line)
+    if match is None:
+        return None
+    ts, level, message = match.groups()
+    return {"ts": ts, "level": level, "event": event_code(message), "message": message}
+
+def render_log_entry(entry):
+    """
+    Format fields from :pyfunc:`parse_log_line` as a text log line.
+    """
+    return f"[{entry.get('ts')}] [{entry.get('level')}] {entry.get('message', '')}"
+
+def render_log_lines(lines):
+    """
+    Split log lines into display text and structured fields.
+
+    JSON lines are rendered with :pyfunc:`render_log_entry` so every
+    client can show them as it shows text lines, and their fields are
+    kept alongside.
+
+    Returns:
+        tuple[list[str], list[dict | None]]: The text of each line, and
+        its decoded fields (``None`` for text lines), index-aligned.
+    """
+    texts, entries = [], []
+    for line in lines:
+        entry = parse_log_line(line) if line.startswith("{") else None
+        texts.append(render_log_entry(entry) if entry else line)
+        entries.append(entry)
+    return texts, entries
+
+def rotated_logs(log_path):
+    """
+    List the rotated backups of *log_path*, newest first.
+
+    ``TimedRotatingFileHandler`` suffixes backups with ``%Y-%m-%d``, so
+    sorting by name orders them by date without stat-ing every file.
+    Backups may be gzipped (``.gz``, see :class:`CompressingFileHandler`);
+    one caught mid-compression exists both ways and is listed once, as
+    the plain file, which still has the inode read_log cursors refer to.
+    """
+    log_path = Path(log_path)
+    backups = {}
+    for p in log_path.parent.glob(f"{log_path.name}.*"):
+        if not p.is_file():
+            continue
+        if p.suffix == ".gz":
+            backups.setdefault(p.name[:-3], p)
         else:
-            color = self.NC
-        record.msg = f"{color}{record.msg}{self.NC}"
-        return super().format(record)
-
-def clean_flask_message(record):
-    """
-    Strip the 'IP - - [timestamp] ' preamble that Werkzeug adds, leaving
-    the actual HTTP line intact.
-    """
-    if record.name.startswith(("werkzeug", "flask")):
-        # record.msg looks like:
-        # 127.0.0.1 - - [11/Jun/2025 16:37:01] "GET /api/status HTTP/1.1" 200 -
-        record.msg = re.sub(
-            r'^[0-9a-fA-F:.]+ - - \[[^\]]+\]\s*',  # IPv4 *or* IPv6, once
-            '',
-            record.getMessage(),
-            count=1,
-            flags=re.ASCII,
-        ).strip()
-        record.args = ()          # safety; Werkzeug doesn’t use %-style args
-    return True
-
-# Filter to remove ANSI color codes
-def remove_ansi_codes(record):
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    if record.msg: record.msg = ansi_escape.sub('', str(record.msg))
-    return True
+            backups[p.name] = p
+    return [backups[name] for name in sorted(backups, reverse=True)]
+
+def open_log(path):
+    """
+    Open a log file or gzipped backup for reading bytes.
+    """
+    return gzip.open(path, "rb") if Path(path).suffix == ".gz" else open(path, "rb")
+
+def tail_compressed(path, limit):
+    """
+    Return up to *limit* of the last lines of a gzipped backup.
+
+    gzip streams cannot be read backwards, so the file is decompressed
+    front to back while only the newest *limit* lines are kept; memory
+    stays bounded by *limit*, not by the file.
+
+    Returns:
+        list[str]: The lines, oldest first.
+    """
+    if limit <= 0:
+        return []
+    with gzip.open(path, "rb") as f:
+        lines = deque(f, maxlen=limit)
+    return [line.decode("utf-8", errors="replace").rstrip("\r\n") for line in lines]
+
+def tail_lines(f, limit, start=0, chunk_size=8192):
+    """
+    Return up to *limit* of the last lines in an open file.
+
+    The file is read backwards from the end in *chunk_size* blocks, so
+    the cost depends on the lines returned rather than the file size.
+
+    Args:
+        f: File opened in binary mode.
+        limit: Maximum number of lines to return.
+        start: Byte offset (at a line boundary) to never read before.
+        chunk_size: Bytes read per backwards step.
+
+    Returns:
+        tuple[list[str], int]: The lines, oldest first, and the offset
+        where they end (the file size when read).
+    """
+    end = pos = f.seek(0, os.SEEK_END)
+    if pos <= start or limit <= 0:
+        return [], max(pos, start)
+    buf = b""
+    # One extra newline guarantees the oldest line we keep is whole
+    while pos > start and buf.count(b"\n") <= limit:
+        step = min(chunk_size, pos - start)
+        pos -= step
+        f.seek(pos)
+        buf = f.read(step) + buf
+    lines = buf.decode("utf-8", errors="replace").splitlines()
+    return lines[-limit:], end
+
+def head_lines(f, limit, start=0, partial=True, chunk_size=65536):
+    """
+    Return up to *limit* lines of an open file from *start* onwards.
+
+    The forward counterpart of :pyfunc:`tail_lines`: the file is read in
+    *chunk_size* blocks and reading stops once *limit* lines are found.
+
+    Args:
+        f: File opened in binary mode (a ``gzip`` file works too).
+        limit: Maximum number of lines to return.
+        start: Byte offset (at a line boundary) to read from.
+        partial: Whether a last line without a newline is returned;
+            pass ``False`` for a file that is still being written.
+        chunk_size: Bytes read per step.
+
+    Returns:
+        tuple[list[str], int]: The lines, oldest first, and the offset
+        just past the last one returned.
+    """
+    f.seek(start)
+    pos, lines, pending = start, [], b""
+    while len(lines) < limit:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            if partial and pending:
+                lines.append(pending.decode("utf-8", errors="replace").rstrip("\r"))
+                pos += len(pending)
+            break
+        *complete, pending = (pending + chunk).split(b"\n")
+        taken = complete[:limit - len(lines)]
+        lines.extend(line.decode("utf-8", errors="replace").rstrip("\r") for line in taken)
+        pos += sum(len(line) + 1 for line in taken)
+    return lines, pos
+
+def parse_log_cursor(raw):
+    """
+    Parse an ``"<inode>:<offset>"`` cursor from :pyfunc:`read_log`.
+
+    Returns:
+        tuple[int, int] | None: ``(inode, offset)``, or ``None`` if
+        *raw* is empty or malformed.
+    """
+    try:
+        ino, offset = (int(part) for part in str(raw).split(":"))
+    except (TypeError, ValueError):
+        return None
+    return (ino, offset) if offset >= 0 else None
+
+def read_log(log_path, limit, since=None, compressed=True):
+    """
+    Return the newest log lines, optionally only those after a cursor.
+
+    Without *since* this tails the live log and walks back into rotated
+    backups only when it holds fewer than *limit* lines. With *since*
+    it reads forwards from that point and returns at most the *limit*
+    oldest lines written after it; the cursor returned then points just
+    past the last of them, so when more were written the next call
+    continues where this one stopped instead of skipping any. A line
+    still being written to the live log is held back until it is
+    complete. Rotation renames the live file but keeps its inode, so a
+    cursor taken before midnight is found again in the dated backup and
+    reading continues from there into the new file.
+
+    Reaching into a gzipped backup is the slow case: it has to be
+    decompressed from the start to find its last lines (about a second
+    per hundred megabytes of log), so callers that only want the latest
+    entry pass ``compressed=False`` to skip them.
+
+    Args:
+        log_path: The live log, e.g. ``logs/viewport.log``.
+        limit: Maximum number of lines to return.
+        since: Cursor returned by an earlier call.
+        compressed: Whether a tail may read gzipped backups.
+
+    Returns:
+        tuple[list[str], str | None, bool]: Lines oldest first, the
+        cursor for the next call (``None`` if there is no log yet), and
+        whether *since* could not be honoured (unknown file or the file
+        shrank) so a fresh tail was returned instead.
+    """
+    log_path = Path(log_path)
+    parsed = parse_log_cursor(since) if since else None
+    if parsed:
+        ino, offset = parsed
+        # Files from the one the cursor is in up to the live log, oldest first
+        chain = []
+        for path in [log_path] + rotated_logs(log_path):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            chain.append(path)
+            if st.st_ino == ino:
+                # A gzipped backup's offset is into its decompressed data
+                if path.suffix == ".gz" or offset <= st.st_size:
+                    return _read_log_from(log_path, reversed(chain), offset, limit)
+                break
+    lines, cursor = _tail_log(log_path, limit, compressed)
+    return lines, cursor, bool(since)
+
+def _read_log_from(log_path, chain, offset, limit):
+    # read_log with a cursor: forwards through *chain* from *offset*
+    lines, cursor = [], None
+    for path in chain:
+        try:
+            with open_log(path) as f:
+                ino = os.fstat(f.fileno()).st_ino
+                got, end = head_lines(f, limit - len(lines), offset, partial=path != log_path)
+        except FileNotFoundError:
+            continue
+        except Exception:
+            logging.getLogger(__name__).warning("Could not read %s", path, exc_info=True)
+            continue
+        lines.extend(got)
+        cursor = f"{ino}:{end}"
+        offset = 0
+        if len(lines) >= limit:
+            break
+    return lines, cursor, False
+
+def _tail_log(log_path, limit, compressed):
+    # read_log without a cursor: the newest lines, walking back into backups
+    cursor = None
+    remaining = limit
+    chunks = []
+    for path in [log_path] + rotated_logs(log_path):
+        if path.suffix == ".gz" and not compressed:
+            continue
+        try:
+            if path.suffix == ".gz":
+                lines = tail_compressed(path, remaining)
+            else:
+                with open(path, "rb") as f:
+                    lines, end = tail_lines(f, remaining)
+                    if path == log_path:
+                        cursor = f"{os.fstat(f.fileno()).st_ino}:{end}"
+        except FileNotFoundError:
+            lines = []
+        except Exception:
+            logging.getLogger(__name__).warning("Could not read %s", path, exc_info=True)
+            lines = []
+        chunks.append(lines)
+        remaining -= len(lines)
+        if remaining <= 0:
+            break
+    return [line for chunk in reversed(chunks) for line in chunk], cursor
+
+class DirectoryWatcher:
+    """
+    Wait for changes to one file name in a directory, via Linux inotify.
+
+    The directory is watched rather than the file so that midnight
+    rotation (a rename, then a new file) is seen as well as appends.
+    Uses libc through ``ctypes``; where inotify is missing the
+    constructor raises ``OSError`` and callers fall back to polling.
+
+    Args:
+        path: The file to watch for, e.g. ``logs/viewport.log``.
+    """
+    # IN_MODIFY | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    MASK = 0x002 | 0x040 | 0x080 | 0x100 | 0x200
+    EVENT = struct.Struct("iIII")   # wd, mask, cookie, name length
+
+    def __init__(self, path):
+        path = Path(path)
+        self.name = os.fsencode(path.name)
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            init, add_watch = libc.inotify_init1, libc.inotify_add_watch
+        except (OSError, AttributeError) as e:
+            raise OSError("inotify is not available") from e
+        self.fd = init(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if add_watch(self.fd, os.fsencode(path.parent), self.MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"Cannot watch {path.parent}")
+
+    def wait(self, timeout):
+        """
+        Block until the file may have changed or *timeout* seconds pass.
+
+        Returns:
+            bool: True if an event for the file arrived.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        hit = False
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return hit
+            pos = 0
+            while pos < len(data):
+                _, _, _, length = self.EVENT.unpack_from(data, pos)
+                pos += self.EVENT.size
+                hit = hit or data[pos:pos + length].rstrip(b"\0") == self.name
+                pos += length
+
+    def close(self):
+        os.close(self.fd)
+
+def follow_log(log_path, cursor=None, poll=FOLLOW_POLL, stop=None):
+    """
+    Yield lines as they are appended to *log_path*, like ``tail -F``.
+
+    The file is read forwards from *cursor* (from :pyfunc:`read_log`;
+    the current end if omitted) in fixed-size chunks, so memory use does
+    not depend on the file size or how much is written at once. When the
+    file is rotated the rest of the old file is read before moving on to
+    the new one. New data is waited for with :class:`DirectoryWatcher`,
+    or by checking every *poll* seconds where inotify is unavailable.
+
+    Args:
+        log_path: The live log, e.g. ``logs/viewport.log``.
+        cursor: ``"<inode>:<offset>"`` to start from.
+        poll: Seconds between checks without inotify (and the longest
+            wait with it).
+        stop: Optional ``threading.Event`` that ends the generator.
+
+    Yields:
+        str: Each complete line, without its newline.
+    """
+    log_path = Path(log_path)
+    try:
+        watcher = DirectoryWatcher(log_path)
+    except OSError:
+        watcher = None
+    start = parse_log_cursor(cursor) if cursor else None
+    f, pending = None, b""
+    try:
+        while stop is None or not stop.is_set():
+            if f is None:
+                try:
+                    f = open(log_path, "rb")
+                except FileNotFoundError:
+                    start = (0, 0)  # not created yet: read it from the top
+                else:
+                    ino = os.fstat(f.fileno()).st_ino
+                    if start is None:
+                        f.seek(0, os.SEEK_END)
+                    elif start[0] == ino:
+                        f.seek(min(start[1], f.seek(0, os.SEEK_END)))
+                    start = (ino, 0)    # anything opened later is read from the top
+            chunk = f.read(65536) if f is not None else b""
+            if chunk:
+                *lines, pending = (pending + chunk).split(b"\n")
+                for line in lines:
+                    yield line.decode("utf-8", errors="replace").rstrip("\r")
+                continue
+            if f is not None:
+                try:
+                    st = os.stat(log_path)
+                except FileNotFoundError:
+                    st = None
+                if st is not None and st.st_ino != os.fstat(f.fileno()).st_ino:
+                    # Rotated: the old file is complete, switch to the new one
+                    if pending:
+                        yield pending.decode("utf-8", errors="replace")
+                    f.close()
+                    f, pending = None, b""
+                    continue
+                if st is not None and st.st_size < f.tell():
+                    f.seek(0)   # truncated in place
+                    pending = b""
+                    continue
+            if watcher is not None:
+                watcher.wait(poll)
+            else:
+                time.sleep(poll)
+    finally:
+        if f is not None:
+            f.close()
+        if watcher is not None:
+            watcher.close()
+
+# --------------------------------------------------------------------------- #
+# Searching logs
+# --------------------------------------------------------------------------- #
+# "[YYYY-MM-DD HH:MM:SS] [LEVEL] " or '{"ts": "YYYY-MM-DD HH:MM:SS", "level": "LEVEL"';
+# lines without either continue the record above
+_LOG_HEADER = re.compile(
+    rb'(?:\[|\{"ts": ")(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)(?:\] \[|", "level": ")([A-Z]+)(?:\] |")'
+)
+
+class LogIndex:
+    """
+    Per-minute, per-level byte offsets for a log and its rotated backups.
+
+    Each file is indexed as a list of blocks, one per minute it holds:
+    ``[minute, start, end, {level: records}]``. Files are keyed by inode,
+    so rotation (a rename) keeps their index, and each :pymeth:`search`
+    only scans what was appended since the last one. A search reads
+    just the blocks inside its time range that hold a wanted level.
+
+    Gzipped backups are indexed once, by streaming through them, with
+    offsets into the uncompressed text; reading a block seeks forward in
+    the stream rather than decompressing the whole file into memory.
+
+    Args:
+        log_path: The live log, e.g. ``logs/viewport.log``.
+    """
+    def __init__(self, log_path):
+        self.log_path = Path(log_path)
+        self._files = {}    # inode -> {"size": indexed bytes, "blocks": [...]}
+        self._lock = threading.Lock()
+
+    def _scan(self, path, entry, size):
+        # size=None reads to the end: compressed backups are never appended to
+        blocks = entry["blocks"]
+        with open_log(path) as f:
+            f.seek(entry["size"])
+            offset = entry["size"]
+            for line in f:
+                if size is not None and (not line.endswith(b"\n") or offset + len(line) > size):
+                    break   # still being written
+                match = _LOG_HEADER.match(line)
+                if match:
+                    minute = match[1][:16].decode()
+                    if not blocks or blocks[-1][0] != minute:
+                        blocks.append([minute, offset, offset, {}])
+                    counts = blocks[-1][3]
+                    level = match[2].decode()
+                    counts[level] = counts.get(level, 0) + 1
+                elif not blocks:
+                    blocks.append(["", offset, offset, {}])
+                offset += len(line)
+                blocks[-1][2] = offset
+        entry["size"] = offset
+
+    def refresh(self):
+        """
+        Bring the index up to date with the files on disk.
+
+        Returns:
+            list[tuple[Path, int]]: ``(path, inode)`` of each log file,
+            oldest first.
+        """
+        files, seen = [], set()
+        for path in reversed([self.log_path] + rotated_logs(self.log_path)):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entry = self._files.get(st.st_ino)
+            if entry is None or st.st_size < entry["size"]:
+                # New file, or truncated and rewritten: index from the top
+                entry = self._files[st.st_ino] = {"size": 0, "blocks": []}
+            if st.st_size > entry["size"]:
+                compressed = path.suffix == ".gz"
+                try:
+                    self._scan(path, entry, None if compressed else st.st_size)
+                except (OSError, EOFError):
+                    logging.getLogger(__name__).warning("Could not index %s", path, exc_info=True)
+                if compressed:
+                    # Offsets are into the uncompressed text; mark it done
+                    entry["size"] = st.st_size
+            files.append((path, st.st_ino))
+            seen.add(st.st_ino)
+        for ino in set(self._files) - seen:
+            del self._files[ino]
+        return files
+
+    def search(self, start=None, end=None, levels=None, text=None, limit=100, cursor=None):
+        """
+        Find records by time range, level and substring, oldest first.
+
+        Args:
+            start: Earliest timestamp, ``"YYYY-MM-DD HH:MM:SS"``.
+            end: Latest timestamp, same format.
+            levels: Level names to keep, e.g. ``{"ERROR", "WARNING"}``.
+            text: Case-insensitive substring the record must contain.
+            limit: Maximum number of records to return.
+            cursor: ``"<inode>:<offset>"`` from a previous page.
+
+        Returns:
+            tuple[list[str], str | None]: Matching records (continuation
+            lines such as tracebacks stay attached) and the cursor for
+            the next page, or ``None`` when there are no more.
+
+        Raises:
+            ValueError: If *cursor* no longer points into a log file.
+        """
+        needle = text.lower() if text else None
+        start_min = start[:16] if start else None
+        end_min = end[:16] if end else None
+        with self._lock:
+            files = self.refresh()
+            resume = parse_log_cursor(cursor) if cursor else None
+            if cursor:
+                inodes = [ino for _, ino in files]
+                if resume is None or resume[0] not in inodes:
+                    raise ValueError("cursor does not point into a log file")
+                files = files[inodes.index(resume[0]):]
+            # (path, inode, [(start, end), ...]) for blocks worth reading
+            plan = []
+            for path, ino in files:
+                ranges = []
+                floor = resume[1] if resume and ino == resume[0] else 0
+                for minute, b_start, b_end, counts in self._files[ino]["blocks"]:
+                    if b_end <= floor:
+                        continue
+                    if minute and ((start_min and minute < start_min) or (end_min and minute > end_min)):
+                        continue
+                    if levels and not any(counts.get(level) for level in levels):
+                        continue
+                    b_start = max(b_start, floor)
+                    if ranges and ranges[-1][1] == b_start:
+                        ranges[-1][1] = b_end
+                    else:
+                        ranges.append([b_start, b_end])
+                if ranges:
+                    plan.append((path, ino, ranges))
+
+        results = []
+        for path, ino, ranges in plan:
+            for offset, record in self._records(path, ranges):
+                if not self._keep(record, start, end, levels, needle):
+                    continue
+                if len(results) == limit:
+                    return results, f"{ino}:{offset}"
+                results.append(record.decode("utf-8", errors="replace").rstrip("\n"))
+        return results, None
+
+    @staticmethod
+    def _records(path, ranges):
+        # Yield (offset, bytes) for each record in the given byte ranges
+        try:
+            f = open_log(path)
+        except OSError:
+            return
+        with f:
+            for r_start, r_end in ranges:
+                try:
+                    f.seek(r_start)
+                    data = f.read(r_end - r_start)
+                except (OSError, EOFError):
+                    return
+                offset, record = r_start, None
+                for line in data.splitlines(keepends=True):
+                    if record is not None and _LOG_HEADER.match(line):
+                        yield record
+                        record = None
+                    if record is None:
+                        record = (offset, line)
+                    else:
+                        record = (record[0], record[1] + line)
+                    offset += len(line)
+                if record is not None:
+                    yield record
+
+    @staticmethod
+    def _keep(record, start, end, levels, needle):
+        match = _LOG_HEADER.match(record)
+        if match:
+            stamp = match[1].decode()
+            if (start and stamp < start) or (end and stamp > end):
+                return False
+            if levels and match[2].decode() not in levels:
+                return False
+        elif levels or start or end:
+            return False
+        if needle:
+            text = record.decode("utf-8", errors="replace")
+            if text.startswith("{"):
+                # Search what was logged, not the JSON keys and escapes
+                entry = parse_log_line(text) or {}
+                text = f"{entry.get('message', '')}\n{entry.get('exc', '')}"
+            if needle not in text.lower():
+                return False
+        return True
+
+# --------------------------------------------------------------------------- #
+# Compressed rotation
+# --------------------------------------------------------------------------- #
+_compress_lock = threading.Lock()
+
+def compress_log(path):
+    """
+    Gzip a rotated backup: write ``<path>.gz``, then delete *path*.
+
+    The archive is built under a hidden ``.<name>.<pid>.part`` name and
+    renamed into place, so readers never see a partial ``.gz`` and two
+    processes compressing the same backup do not collide.
+
+    Returns:
+        bool: True if the backup was compressed.
+    """
+    path = Path(path)
+    part = path.with_name(f".{path.name}.{os.getpid()}.part")
+    with _compress_lock:
+        try:
+            with open(path, "rb") as src, gzip.open(part, "wb") as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+            os.replace(part, path.with_name(f"{path.name}.gz"))
+            path.unlink(missing_ok=True)
+            return True
+        except FileNotFoundError:
+            # Compressed (or culled) by someone else in the meantime
+            part.unlink(missing_ok=True)
+        except OSError:
+            part.unlink(missing_ok=True)
+            logging.getLogger(__name__).warning("Could not compress %s", path, exc_info=True)
+        return False
+
+def compress_backups(log_path, keep=KEEP_PLAIN):
+    """
+    Gzip the plain backups of *log_path* and clear abandoned ``.part`` files.
+
+    The newest *keep* backups stay plain: compressing replaces the file,
+    and with it the inode that :pyfunc:`read_log` cursors taken before
+    the last rotation point into. Picks up backups rotated before
+    compression was turned on and any a previous run was stopped before
+    compressing.
+    """
+    log_path = Path(log_path)
+    now = time.time()
+    for part in log_path.parent.glob(f".{log_path.name}.*.part"):
+        try:
+            if now - part.stat().st_mtime > STALE_PART_AGE:
+                part.unlink()
+        except OSError:
+            pass
+    for backup in rotated_logs(log_path)[keep:]:
+        if backup.suffix != ".gz":
+            compress_log(backup)
+
+class CompressingFileHandler(TimedRotatingFileHandler):
+    """
+    ``TimedRotatingFileHandler`` that gzips older backups after rotation.
+
+    The namer gives backups a ``.gz`` name; the rotator renames the live
+    file to the plain dated name, as before, and leaves the compression
+    to a background thread so the record that triggered the rollover is
+    not held up. The backup just rotated stays plain until the next
+    rollover (see :pyfunc:`compress_backups`), so a ``since`` cursor
+    taken before midnight still finds its file; the one before it is
+    compressed instead.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.namer = lambda name: f"{name}.gz"
+        self.rotator = self._rotate
+
+    def _rotate(self, source, dest):
+        plain = dest[:-len(".gz")]
+        if os.path.exists(source):
+            os.rename(source, plain)
+        threading.Thread(
+            target=compress_backups, args=(self.baseFilename,), name="log-compress", daemon=True
+        ).start()
+
+    def getFilesToDelete(self):
+        """
+        Return the backups beyond ``backupCount``, counting each date once.
+
+        A backup being compressed exists as plain and ``.gz`` files for a
+        moment; the base class would count it twice and cull a day early.
+        """
+        base = Path(self.baseFilename)
+        dated = [
+            p for p in rotated_logs(base)
+            if self.extMatch.match(p.name[len(base.name) + 1:])
+        ]
+        stale = []
+        for p in dated[self.backupCount:]:
+            plain = p.with_name(p.name.removesuffix(".gz"))
+            stale += [str(f) for f in (plain, plain.with_name(f"{plain.name}.gz")) if f.exists()]
+        return stale
+
+# --------------------------------------------------------------------------- #
+# Asynchronous logging
+# --------------------------------------------------------------------------- #
+class DroppingQueueHandler(QueueHandler):
+    """
+    Queue handler that never blocks the thread that logs.
+
+    Records go to a bounded queue drained by an :class:`AsyncLogListener`.
+    When the queue is full the new record is dropped and counted by
+    level in :pyattr:`dropped`; the next record that fits is preceded by
+    a warning saying how many were lost.
+
+    Records are queued as copies with their arguments merged into the
+    message and any traceback rendered into ``exc_text``, kept apart
+    from the message so :class:`JsonFormatter` still writes it as
+    ``exc``. (The stock ``prepare`` folds it into the message instead.)
+    """
+    _exc_formatter = logging.Formatter()
+
+    def __init__(self, q):
+        super().__init__(q)
+        self.dropped = {}       # level name -> records dropped so far
+        self._unreported = 0
+        self.listener = None
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # The traceback's frames are not needed once it is text
+            record.exc_text = record.exc_text or self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        # Handler.handle() holds self.lock, so this runs one record at a time
+        try:
+            if self._unreported:
+                self.queue.put_nowait(logging.LogRecord(
+                    __name__, logging.WARNING, __file__, 0,
+                    f"Log queue full; dropped {self._unreported} records", None, None,
+                ))
+                self._unreported = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._unreported += 1
+            self.dropped[record.levelname] = self.dropped.get(record.levelname, 0) + 1
+
+class AsyncLogListener(QueueListener):
+    """
+    Writer thread for a :class:`DroppingQueueHandler`.
+
+    Unlike the stock listener, :pymeth:`stop` gives up after *timeout*
+    seconds instead of hanging on a stuck disk.
+    """
+    def stop(self, timeout=LOG_FLUSH_TIMEOUT):
+        """
+        Write out the backlog and stop the thread.
+
+        Returns:
+            bool: ``True`` if everything queued was written in time.
+        """
+        thread = self._thread
+        if thread is None:
+            return True
+        self._thread = None
+        try:
+            self.queue.put(self._sentinel, timeout=timeout)
+        except queue.Full:
+            return False
+        thread.join(timeout)
+        return not thread.is_alive()
+
+def flush_logging(timeout=LOG_FLUSH_TIMEOUT):
+    """
+    Drain asynchronous logging and switch the root logger back to
+    writing synchronously.
+
+    Call it before the process exits or replaces itself, so queued
+    records are not lost. Does nothing when async logging is off.
+
+    Returns:
+        bool: ``False`` if the backlog could not be written in time.
+    """
+    logger = logging.getLogger()
+    ok = True
+    for handler in list(logger.handlers):
+        if isinstance(handler, DroppingQueueHandler) and handler.listener is not None:
+            ok = handler.listener.stop(timeout) and ok
+            logger.removeHandler(handler)
+            for target in handler.listener.handlers:
+                logger.addHandler(target)
+            handler.listener = None
+    return ok
+
+def dropped_records():
+    """
+    Return ``{level name: count}`` of records async logging has dropped.
+    """
+    dropped = {}
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, DroppingQueueHandler):
+            for level, count in handler.dropped.items():
+                dropped[level] = dropped.get(level, 0) + count
+    return dropped
+
+def _handlers(logger):
+    # The logger's handlers, plus those writing behind a queue
+    for handler in logger.handlers:
+        yield handler
+        if isinstance(handler, DroppingQueueHandler) and handler.listener is not None:
+            yield from handler.listener.handlers
 
 def configure_logging(
     log_file_path: str,
     log_file: bool,
     log_console: bool,
     log_days: int = 7,
-    Debug_logging: bool = False
+    Debug_logging: bool = False,
+    log_async: bool = False,
+    log_json: bool = False,
+    log_compress: bool = False
 ) -> logging.Logger:
     """
     Configure the root logger with:
@@ -67,21 +965,36 @@ def configure_logging(
         log_console:     if True, enable colored console output
         log_days:        how many days' worth of dated backups to keep
         Debug_logging:   if True, set level to DEBUG; otherwise INFO
+        log_async:       if True, the handlers write on a background thread
+                         fed by a bounded queue (see flush_logging)
+        log_json:        if True, the file gets one JSON object per record
+                         (see JsonFormatter); the console stays text
+        log_compress:    if True, rotated backups but the newest are gzipped
+                         in the background (see CompressingFileHandler)
     """
     logger = logging.getLogger()
     level = logging.DEBUG if Debug_logging else logging.INFO
     logger.setLevel(level)
     logger.propagate = False
     # If a handler for this file already exists, reuse it and exit.
-    for h in logger.handlers:
+    for h in _handlers(logger):
         if isinstance(h, TimedRotatingFileHandler) and \
             Path(h.baseFilename) == Path(log_file_path):
             return logger
     # File formatter: [YYYY‐MM‐DD HH:MM:SS] [LEVEL] message
-    file_fmt = logging.Formatter(f'[%(asctime)s] [%(levelname)s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+    clean_access = Path(log_file_path).name == "monitoring.log"
+    if log_json:
+        file_fmt = JsonFormatter(clean_access=clean_access)
+    else:
+        file_fmt = PlainFormatter(
+            '[%(asctime)s] [%(levelname)s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S',
+            clean_access=clean_access,
+        )
+    handlers = []
 
     if log_file:
-        file_handler = TimedRotatingFileHandler(
+        handler_class = CompressingFileHandler if log_compress else TimedRotatingFileHandler
+        file_handler = handler_class(
             filename    = log_file_path,
             when        = "midnight",
             interval    = 1,
@@ -90,7 +1003,6 @@ def configure_logging(
             utc         = False,
             atTime      = dtime(0, 0),
         )
-        file_handler.addFilter(remove_ansi_codes)
         # If the handler writes to viewport.log, keep monitoring noise out
         if Path(log_file_path).name == "viewport.log":
             viewport_filter = (
@@ -103,10 +1015,13 @@ def configure_logging(
         if Path(log_file_path).name == "monitoring.log":
             file_handler.addFilter(lambda rec: rec.name.startswith(
                                         ("monitoring", "werkzeug", "flask")))
-            file_handler.addFilter(clean_flask_message)
         file_handler.setLevel(logger.level)
         file_handler.setFormatter(file_fmt)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+        if log_compress:
+            threading.Thread(
+                target=compress_backups, args=(log_file_path,), name="log-compress", daemon=True
+            ).start()
 
     if log_console:
         console_handler = logging.StreamHandler()
@@ -114,6 +1029,19 @@ def configure_logging(
         console_handler.setFormatter(
             ColoredFormatter('[%(asctime)s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
         )
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
 
+    if log_async and handlers:
+        queue_handler = DroppingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+        queue_handler.setLevel(logger.level)
+        queue_handler.listener = AsyncLogListener(
+            queue_handler.queue, *handlers, respect_handler_level=True
+        )
+        queue_handler.listener.start()
+        logger.addHandler(queue_handler)
+        atexit.unregister(flush_logging)   # register once however often we run
+        atexit.register(flush_logging)
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
     return logger
\ No newline at end of file
@@ -0,0 +1,247 @@
+import json, os, threading, time, logging
+from contextlib import contextmanager
+from pathlib import Path
+
+# --------------------------------------------------------------------------- #
+# Metric definitions
+# --------------------------------------------------------------------------- #
+WRITE_INTERVAL = 5          # minimum seconds between writes of the metrics file
+METRICS_VERSION = 1
+PREFIX = "viewport_"
+COUNTERS = {
+    "retries":            "Health-check retries after a failed check.",
+    "browser_restarts":   "Browser relaunches.",
+    "script_restarts":    "Script restarts, scheduled or after repeated failures.",
+    "logins":             "Successful logins.",
+    "login_failures":     "Login attempts that did not reach the dashboard.",
+    "modals_closed":      "Modals found over the live view and closed.",
+    "loading_refreshes":  "Page refreshes for a live view stuck loading.",
+}
+HISTOGRAMS = {
+    "health_check_seconds": (
+        "Duration of a passing health check.",
+        (1, 5, 10, 30, 31, 32, 35, 40, 60, 120),
+    ),
+    "webdriver_rtt_seconds": (
+        "Round-trip latency of a WebDriver command.",
+        (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+    ),
+    "recovery_seconds": (
+        "Time from a failed health check until the feed is healthy again.",
+        (5, 10, 30, 60, 120, 300, 600, 1800, 3600),
+    ),
+}
+# Process groups recorded by the sampler (see sampler.GROUPS)
+PROCESS_GROUPS = ("viewport", "monitoring", "browser")
+
+class MetricsStore:
+    """
+    Counters and histograms shared between the daemon and the API.
+
+    The daemon updates the store in memory and it is written to *path*
+    as JSON, atomically and at most every *interval* seconds; a change
+    made inside that window is written when it ends. The API only reads
+    the file, so it never measures anything itself. Counts already in
+    the file are loaded on :pymeth:`open`, so they carry on across
+    script restarts.
+
+    Args:
+        path: File to persist to; ``None`` keeps the store in memory.
+        interval: Minimum seconds between writes.
+    """
+    def __init__(self, path=None, interval=WRITE_INTERVAL):
+        self.path = None
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._timer = None
+        self._written = 0.0
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.histograms = {
+            name: {"buckets": [0] * len(bounds), "sum": 0.0, "count": 0}
+            for name, (_, bounds) in HISTOGRAMS.items()
+        }
+        if path is not None:
+            self.open(path)
+
+    def open(self, path):
+        """
+        Persist to *path* from now on, continuing from the counts in it.
+        """
+        data = read_metrics(path) or {}
+        with self._lock:
+            self.path = Path(path)
+            for name, value in data.get("counters", {}).items():
+                if name in self.counters:
+                    self.counters[name] += value
+            for name, hist in data.get("histograms", {}).items():
+                mine = self.histograms.get(name)
+                if mine is None or len(hist.get("buckets", ())) != len(mine["buckets"]):
+                    continue  # bucket layout changed; start over
+                mine["buckets"] = [a + b for a, b in zip(mine["buckets"], hist["buckets"])]
+                mine["sum"] += hist["sum"]
+                mine["count"] += hist["count"]
+        return self
+
+    def inc(self, name, value=1):
+        """
+        Add *value* to the counter *name*.
+        """
+        with self._lock:
+            self.counters[name] += value
+        self.flush()
+
+    def observe(self, name, seconds):
+        """
+        Record one *seconds* observation in the histogram *name*.
+        """
+        bounds = HISTOGRAMS[name][1]
+        with self._lock:
+            hist = self.histograms[name]
+            for i, bound in enumerate(bounds):
+                if seconds <= bound:
+                    hist["buckets"][i] += 1
+                    break
+            hist["sum"] += seconds
+            hist["count"] += 1
+        self.flush()
+
+    @contextmanager
+    def timer(self, name):
+        """
+        Observe how long the ``with`` block takes, unless it raises.
+        """
+        start = time.monotonic()
+        yield
+        self.observe(name, time.monotonic() - start)
+
+    def snapshot(self):
+        """
+        Return the current counts as a JSON-ready dict.
+        """
+        with self._lock:
+            return {
+                "version": METRICS_VERSION,
+                "updated": time.time(),
+                "counters": dict(self.counters),
+                "histograms": {
+                    name: {**hist, "buckets": list(hist["buckets"])}
+                    for name, hist in self.histograms.items()
+                },
+            }
+
+    def flush(self, force=False):
+        """
+        Write the store to its file, throttled to one write per interval.
+
+        Args:
+            force: Write now regardless of the interval, e.g. right
+                before the process is replaced.
+        """
+        if self.path is None:
+            return
+        with self._lock:
+            wait = self._written + self.interval - time.monotonic()
+            if not force and wait > 0:
+                # Coalesce into one write when the interval ends
+                if self._timer is None:
+                    self._timer = threading.Timer(wait, self._deferred)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+            self._written = time.monotonic()
+        try:
+            write_metrics(self.path, self.snapshot())
+        except OSError as e:
+            logging.debug(f"Could not write {self.path}: {e}")
+
+    def _deferred(self):
+        with self._lock:
+            self._timer = None
+        self.flush(force=True)
+
+def write_metrics(path, data):
+    """
+    Atomically replace *path* with *data* as JSON.
+    """
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data))
+    os.replace(tmp, path)
+
+def read_metrics(path):
+    """
+    Return the metrics written to *path*, or ``None`` if unreadable.
+    """
+    try:
+        data = json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != METRICS_VERSION:
+        return None
+    return data
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def render(data=None, sample=None, cache=None):
+    """
+    Render metrics in the Prometheus text exposition format.
+
+    Args:
+        data: Output of :pyfunc:`read_metrics`; missing metrics are
+            reported as zero.
+        sample: Optional resource sample (see ``sampler.FIELDS``) that
+            supplies the per-process CPU and memory gauges.
+        cache: Optional API micro-cache counts, ``{endpoint: {"hit": n,
+            "miss": n, "coalesced": n}}``.
+
+    Returns:
+        str: The exposition text, ending in a newline.
+    """
+    data = data or {}
+    counters = data.get("counters", {})
+    histograms = data.get("histograms", {})
+    lines = []
+    for name, text in COUNTERS.items():
+        metric = f"{PREFIX}{name}_total"
+        lines += [
+            f"# HELP {metric} {text}",
+            f"# TYPE {metric} counter",
+            f"{metric} {_number(counters.get(name, 0))}",
+        ]
+    for name, (text, bounds) in HISTOGRAMS.items():
+        metric = f"{PREFIX}{name}"
+        hist = histograms.get(name) or {}
+        buckets = hist.get("buckets") or [0] * len(bounds)
+        lines += [f"# HELP {metric} {text}", f"# TYPE {metric} histogram"]
+        cumulative = 0
+        for bound, count in zip(bounds, buckets):
+            cumulative += count
+            lines.append(f'{metric}_bucket{{le="{_number(bound)}"}} {cumulative}')
+        lines += [
+            f'{metric}_bucket{{le="+Inf"}} {hist.get("count", 0)}',
+            f"{metric}_sum {_number(hist.get('sum', 0.0))}",
+            f"{metric}_count {hist.get('count', 0)}",
+        ]
+    if sample:
+        for field, metric, text in (
+            ("cpu", f"{PREFIX}process_cpu_percent", "CPU use by process group, percent of all cores."),
+            ("rss", f"{PREFIX}process_resident_memory_bytes", "Resident memory by process group."),
+        ):
+            lines += [f"# HELP {metric} {text}", f"# TYPE {metric} gauge"]
+            lines += [
+                f'{metric}{{process="{group}"}} {_number(sample.get(f"{group}_{field}", 0))}'
+                for group in PROCESS_GROUPS
+            ]
+    if cache:
+        metric = f"{PREFIX}api_cache_requests_total"
+        lines += [
+            f"# HELP {metric} Cached API requests by endpoint and result.",
+            f"# TYPE {metric} counter",
+        ]
+        lines += [
+            f'{metric}{{endpoint="{endpoint}",result="{result}"}} {count}'
+            for endpoint, counts in sorted(cache.items())
+            for result, count in counts.items()
+        ]
+    return "\n".join(lines) + "\n"
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-import sys, os, time, configparser, psutil, subprocess, logging, socket
+import sys, os, time, math, gzip, json, hashlib, mimetypes, threading, configparser, psutil, subprocess, logging, socket
 from functools import wraps
 from pathlib import Path
 from collections import deque
@@ -8,34 +8,58 @@ from urllib.parse import urlparse
 from flask import (
     Flask, render_template, request,
     session, redirect, url_for, flash,
-    jsonify
+    jsonify, Response, send_file, abort
 )
+from werkzeug.security import safe_join
 from flask_cors import CORS
 from collections import deque
 import update 
-from logging_config import configure_logging
-from validate_config import validate_config
+from logging_config import configure_logging, read_log, render_log_lines, LogIndex
+from validate_config import validate_config, config_cache, ConfigCache
 from dotenv import load_dotenv, find_dotenv
-from viewport import process_handler
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:  # Optional: fall back to Flask's built-in server
+    BaseApplication = None
+from core import process_handler, pid_handler, browser_usage_handler, read_status, live_state, STATUS_KEEP
+from control import request as control_request
+from sampler import ResourceRing, ResourceSampler, latest_sample
+from state import StateReader
+from metrics import read_metrics, render as render_metrics
+from assets import COMPRESS_SUFFIXES
+import history
 
 _mon = sys.modules[__name__]
 dotenv_file = find_dotenv()
 load_dotenv(dotenv_file, override=True)
 LOG_HARD_CAP = 1000
-unwanted = None
-last_net_io = None
-last_check_time = time.time()
+# /api/stream timing, in seconds
+STREAM_POLL      = 1     # how often a stream checks for changes
+STREAM_HEARTBEAT = 15    # comment line sent when nothing else was
+STREAM_MAX_AGE   = 300   # streams end after this; EventSource reconnects
+STREAM_RETRY_MS  = 1000  # reconnect delay suggested to the browser
+# Dashboard assets and response compression
+STATIC_MAX_AGE     = 31536000  # versioned asset URLs never change: one year
+COMPRESS_MIN_SIZE  = 1024      # smaller JSON bodies are not worth gzipping
+UNVERSIONED_ASSETS = ('UI_Sans.woff2',)  # main-min.css loads it by its plain URL
+# Virtual interfaces left out of the network stats
+UNWANTED_INTERFACES = ('lo', 'docker', 'veth', 'br-', 'virbr', 'tun', 'IO')
+# System CPU and network sampler; started by main()
+sampler = ResourceSampler()
+# Keeps the latest-release cache current; started alongside the sampler
+release_refresher = update.ReleaseRefresher()
 script_dir = Path(__file__).resolve().parent
 _base = Path(__file__).parent
 config_file = _base / 'config.ini'
 env_file    = _base / '.env'
 logs_dir    = _base / 'logs'
 api_dir     = _base / 'api'
+static_dir  = _base / 'static'
 
 # --------------------------------------------------------------------------- # 
 # Load and validate everything via our shared validator
 # --------------------------------------------------------------------------- # 
-cfg = validate_config(strict=False, print=False)
+cfg = config_cache.get()
 # pull everything out into locals/globals
 for name, val in vars(cfg).items():
     setattr(_mon, name, val)
@@ -48,12 +72,98 @@ configure_logging(
     log_file=LOG_FILE_FLAG,
     log_console=LOG_CONSOLE,
     log_days=LOG_DAYS,
-    Debug_logging=DEBUG_LOGGING
+    Debug_logging=DEBUG_LOGGING,
+    log_json=LOG_JSON,
+    log_compress=LOG_COMPRESS
 )
 
 # --------------------------------------------------------------------------- # 
 # Application for the monitoring API
 # --------------------------------------------------------------------------- # 
+def system_facts():
+    """
+    Read the host facts that never change while we run.
+
+    Returns:
+        dict: ``os_name``, ``hardware_model`` (Raspberry Pi model, DMI
+        product name or hostname, in that order), ``cores`` and
+        ``threads``.
+    """
+    with open('/etc/os-release', 'r') as f:
+        os_release = f.read()
+    pretty_name = next(
+        line.split('=', 1)[1].strip('"')
+        for line in os_release.split('\n')
+        if line.startswith('PRETTY_NAME=')
+    )
+    hardware_model = "Unknown"
+    # Try Raspberry Pi
+    try:
+        with open('/proc/device-tree/model', 'r') as f:
+            hardware_model = f.read().strip('\x00')
+    except (FileNotFoundError, PermissionError):
+        pass  # Not a Pi or no permission
+    # Fallback to x86 DMI
+    if hardware_model == "Unknown":
+        try:
+            with open('/sys/devices/virtual/dmi/id/product_name', 'r') as f:
+                hardware_model = f.read().strip()
+        except (FileNotFoundError, PermissionError):
+            pass  # Not available or no permission
+    # Final fallback to hostname
+    if hardware_model == "Unknown":
+        try:
+            hardware_model = socket.gethostname()
+        except:
+            hardware_model = "Unknown (Fallback Failed)"
+    return {
+        "os_name": pretty_name,
+        "hardware_model": hardware_model,
+        "cores": psutil.cpu_count(logical=False),
+        "threads": psutil.cpu_count(logical=True),
+    }
+
+def human_size(num):
+    """
+    Format a byte count the way ``df -h`` does (``"512M"``, ``"9.6G"``, ``"12G"``).
+    """
+    for unit in "KMGTPE":
+        num /= 1024
+        if num < 1024:
+            break
+    if num < 10:
+        return f"{math.ceil(num * 10) / 10:.1f}{unit}"
+    return f"{math.ceil(num)}{unit}"
+
+def disk_available(path="/"):
+    """
+    Return the space available to unprivileged users on *path*'s filesystem.
+    """
+    st = os.statvfs(path)
+    return human_size(st.f_bavail * st.f_frsize)
+
+# (mtime_ns, size, version) per asset path, so each file is hashed once
+_asset_versions = {}
+
+def asset_version(path):
+    """
+    Return a short content hash of *path* for cache-busting asset URLs.
+
+    The hash is recomputed only when the file's mtime or size changes.
+    Returns ``None`` when the file cannot be read.
+    """
+    try:
+        st = os.stat(path)
+        cached = _asset_versions.get(path)
+        if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        with open(path, "rb") as f:
+            version = hashlib.sha1(f.read()).hexdigest()[:10]
+    except OSError:
+        return None
+    _asset_versions[path] = (st.st_mtime_ns, st.st_size, version)
+    return version
+
 def create_app():
     """
     Build and configure the Flask Monitoring API application.
@@ -70,7 +180,8 @@ def create_app():
         flask.Flask: A fully configured Flask application instance,
         ready to be served or unit-tested.
     """
-    app = Flask(__name__) 
+    # /static is served below: precompressed and cached by content hash
+    app = Flask(__name__, static_folder=None)
     # This is only needed to inject the different configs we test with
     if "pytest" in sys.modules:
         cfg = validate_config()
@@ -82,6 +193,80 @@ def create_app():
     # ----------------------------------------------------------------------- #
     CORS(app)
     # ----------------------------------------------------------------------- #
+    # Static assets: versioned URLs, immutable caching, precompressed files
+    # ----------------------------------------------------------------------- #
+    @app.url_defaults
+    def _version_static(endpoint, values):
+        # url_for('static', ...) appends ?v=<content hash>; an update
+        # changes the hash, so browsers may cache each URL forever
+        filename = values.get("filename")
+        if endpoint != "static" or not filename or "v" in values:
+            return
+        if filename in UNVERSIONED_ASSETS:
+            return
+        path = safe_join(str(static_dir), filename)
+        version = path and asset_version(path)
+        if version:
+            values["v"] = version
+
+    @app.route("/static/<path:filename>", endpoint="static")
+    def static_file(filename):
+        path = safe_join(str(static_dir), filename)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        # Serve the .gz sibling written at install/update time (see
+        # assets.precompress_assets) when the client takes gzip and it
+        # was built from the current file
+        gz = path + ".gz"
+        packed = False
+        if "gzip" in request.accept_encodings:
+            try:
+                packed = os.stat(gz).st_mtime_ns == os.stat(path).st_mtime_ns
+            except OSError:
+                packed = False
+        # A URL carrying the current content hash can be cached forever;
+        # unversioned or outdated ones are revalidated with the ETag
+        version = request.args.get("v")
+        versioned = bool(version) and version == asset_version(path)
+        response = send_file(
+            gz if packed else path,
+            mimetype=mimetype,
+            max_age=STATIC_MAX_AGE if versioned else None,
+        )
+        if versioned:
+            response.cache_control.immutable = True
+        if packed:
+            response.headers["Content-Encoding"] = "gzip"
+        if filename.endswith(COMPRESS_SUFFIXES):
+            response.vary.add("Accept-Encoding")
+        return response
+
+    @app.after_request
+    def _compress_json(response):
+        # Large JSON (mostly /api/logs) is gzipped on the fly
+        if (
+            response.mimetype != "application/json"
+            or response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or "Content-Encoding" in response.headers
+        ):
+            return response
+        response.vary.add("Accept-Encoding")
+        if "gzip" not in request.accept_encodings:
+            return response
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+        response.set_data(gzip.compress(data, compresslevel=6, mtime=0))
+        response.headers["Content-Encoding"] = "gzip"
+        # A strong ETag names one byte sequence; the gzipped body is another
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+    # ----------------------------------------------------------------------- #
     # Helper: read and strip text files
     # ----------------------------------------------------------------------- #
     def _read_api_file(path):
@@ -94,6 +279,235 @@ def create_app():
             return None
     app._read_api_file = _read_api_file
     # ----------------------------------------------------------------------- #
+    # Helper: newest entries of the status journal
+    # ----------------------------------------------------------------------- #
+    def _read_status(tail=1):
+        try:
+            return read_status(status_file, tail)
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            app.logger.error(f"Error reading {status_file}: {e}")
+            return []
+    def _live_state():
+        # The daemon's state block, unless whoever wrote it is gone
+        return live_state(app._state.read())
+    def _status_message():
+        live = _live_state()
+        if live and live["status"]:
+            return live["status"]
+        entries = _read_status()
+        return entries[-1]["message"] if entries else None
+    # The daemon's live state block; mapped on first read, then kept
+    app._state = StateReader(state_file)
+    # Filled in by the first /api/system_info request
+    app._system_facts = None
+    # Parsed config.ini/.env, re-validated only when either file changes
+    app._config_cache = ConfigCache(
+        lambda: validate_config(strict=False, print=False),
+        files=(config_file, env_file),
+    )
+    # Byte offsets into viewport.log and its backups for /api/logs/search
+    app._log_index = None
+    # Last /api/snapshot body and the validators it was built from
+    app._snapshot = None
+    # Micro-cache for expensive GET routes: key -> (expires, body, status, headers)
+    app._cache = {}
+    app._cache_flights = {}     # key -> Event set when its computation ends
+    app._cache_stats = {}       # endpoint -> {"hit": n, "miss": n, "coalesced": n}
+    app._cache_lock = threading.Lock()
+    # Each open /api/stream holds a server thread; leave the rest for requests
+    app._stream_slots = threading.BoundedSemaphore(max(1, API_THREADS // 2))
+    # ----------------------------------------------------------------------- #
+    # Helpers: payloads shared by the REST routes and /api/stream
+    # ----------------------------------------------------------------------- #
+    def _file_state(path):
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _script_start():
+        live = _live_state()
+        if live is not None and live["started"]:
+            return datetime.fromtimestamp(live["started"])
+        raw = _read_api_file(sst_file)
+        if raw is None:
+            return None
+        try:
+            return datetime.strptime(raw, "%Y-%m-%d %H:%M:%S.%f")
+        except ValueError:
+            # Treat malformed timestamp as "not running"
+            return None
+
+    def _script_uptime():
+        start = _script_start()
+        if start is None:
+            return {"running": False, "uptime": None}
+        return {"running": True, "uptime": (datetime.now() - start).total_seconds()}
+
+    def _latest_sample():
+        # Sample inline when nothing has been sampled yet (the thread may
+        # still be starting) or when no background thread is feeding us
+        latest = sampler.latest
+        if latest is None or (
+            not sampler.is_alive() and time.time() - latest["timestamp"] >= sampler.interval
+        ):
+            latest = sampler.sample()
+        return latest
+
+    def _system_info():
+        if app._system_facts is None:
+            app._system_facts = system_facts()
+        facts = app._system_facts
+        latest = _latest_sample()
+        # Uptime
+        uptime = time.time() - psutil.boot_time()
+        # Get RAM
+        vm = psutil.virtual_memory()
+        network_stats = {
+            interface: {"interface": interface, **stats}
+            for interface, stats in sampler.net_interfaces.items()
+            if not any(unwanted in interface for unwanted in UNWANTED_INTERFACES)
+        }
+        return {
+            "os_name": facts["os_name"],
+            "system_uptime": uptime,
+            "hardware_model": facts["hardware_model"],
+            "disk_available": disk_available(),
+            "memory": {
+                "percent": vm.percent,
+                "used": vm.used,
+                "total": vm.total,
+            },
+            "cpu": {
+                "percent": latest["cpu_percent"],
+                "cores": facts["cores"],
+                "threads": facts["threads"]
+            },
+            "network": {
+                "interfaces": network_stats,
+                "primary_interface": list(network_stats.values())[0] if network_stats else None
+            }
+        }
+
+    def _config():
+        cfg = app._config_cache.get()
+        restart_times = None
+        next_restart = None
+        times = getattr(cfg, "RESTART_TIMES", None)
+
+        if times:  # Checks if not None and not empty
+            now = datetime.now()
+            # compute next run for each time
+            next_runs = []
+            for t in times:
+                run_dt = datetime.combine(now.date(), t)
+                if run_dt <= now: run_dt += timedelta(days=1)
+                next_runs.append(run_dt)
+            next_run = min(next_runs)
+            restart_times = [t.strftime('%H:%M') for t in times]
+            next_restart = next_run.isoformat()
+
+        return {
+            "general": {
+                "health_interval_sec": getattr(cfg, "SLEEP_TIME", None),
+                "wait_time_sec": getattr(cfg, "WAIT_TIME", None),
+                "max_retries": getattr(cfg, "MAX_RETRIES", None),
+                "restart_times": restart_times,
+                "next_restart": next_restart,
+            },
+            "browser": {
+                "profile_path": getattr(cfg, "BROWSER_PROFILE_PATH", None),
+                "binary_path": getattr(cfg, "BROWSER_BINARY", None),
+                "headless": getattr(cfg, "HEADLESS", None),
+            },
+            "logging": {
+                "log_file_flag": getattr(cfg, "LOG_FILE_FLAG", None),
+                "log_console_flag": getattr(cfg, "LOG_CONSOLE", None),
+                "debug_logging": getattr(cfg, "DEBUG_LOGGING", None),
+                "error_logging": getattr(cfg, "ERROR_LOGGING", None),
+                "ERROR_PRTSCR": getattr(cfg, "ERROR_PRTSCR", None),
+                "log_async": getattr(cfg, "LOG_ASYNC", None),
+                "log_json": getattr(cfg, "LOG_JSON", None),
+                "log_compress": getattr(cfg, "LOG_COMPRESS", None),
+                "log_days": getattr(cfg, "LOG_DAYS", None),
+                "log_interval_min": getattr(cfg, "LOG_INTERVAL", None),
+            },
+        }
+    # ----------------------------------------------------------------------- #
+    # Share one computation between identical GET requests
+    # ----------------------------------------------------------------------- #
+    def cached(ttl, params=()):
+        """
+        Cache a GET route's successful responses for *ttl* seconds.
+
+        Requests are keyed by endpoint and the values of the query
+        arguments named in *params*, the only ones the route reads, so
+        arbitrary query strings cannot add entries. Expired entries are
+        dropped whenever one is stored. While one
+        request computes a missing entry, identical requests wait for it
+        instead of repeating the work; if it fails they compute their
+        own. Only 200 responses are cached.
+        """
+        def lookup(key):
+            entry = app._cache.get(key)
+            if entry and entry[0] > time.monotonic():
+                return app.response_class(entry[1], status=entry[2], headers=entry[3])
+            return None
+
+        def decorator(f):
+            @wraps(f)
+            def decorated(*args, **kwargs):
+                key = (request.endpoint, tuple(request.args.get(name) for name in params))
+                with app._cache_lock:
+                    stats = app._cache_stats.setdefault(
+                        request.endpoint, {"hit": 0, "miss": 0, "coalesced": 0}
+                    )
+                    response = lookup(key)
+                    flight = app._cache_flights.get(key)
+                    leader = response is None and flight is None
+                    if leader:
+                        flight = app._cache_flights[key] = threading.Event()
+                    elif response is not None:
+                        stats["hit"] += 1
+                        return response
+                if not leader:
+                    # Another request is computing it: wait for its result
+                    flight.wait(API_TIMEOUT)
+                    with app._cache_lock:
+                        response = lookup(key)
+                        stats["coalesced" if response is not None else "miss"] += 1
+                    if response is not None:
+                        return response
+                else:
+                    with app._cache_lock:
+                        stats["miss"] += 1
+                try:
+                    response = app.make_response(f(*args, **kwargs))
+                    if response.status_code == 200 and not response.is_streamed:
+                        entry = (
+                            time.monotonic() + ttl,
+                            response.get_data(),
+                            response.status_code,
+                            list(response.headers.items()),
+                        )
+                        with app._cache_lock:
+                            now = time.monotonic()
+                            for old in [k for k, e in app._cache.items() if e[0] <= now]:
+                                del app._cache[old]
+                            app._cache[key] = entry
+                    return response
+                finally:
+                    if leader:
+                        with app._cache_lock:
+                            del app._cache_flights[key]
+                        flight.set()
+            return decorated
+        return decorator
+    app.cached = cached     # so tests can cache routes of their own
+    # ----------------------------------------------------------------------- #
     # Protect routes if SECRET is set
     # ----------------------------------------------------------------------- #
     def login_required(f):
@@ -192,18 +606,37 @@ def create_app():
     @login_required
     def api_control(action):
         """
-        Dispatch start/restart/quit commands to *viewport.py*.
+        Dispatch start/restart/quit/pause/resume commands to *viewport.py*.
+
+        A running daemon is told over its control socket, which takes
+        milliseconds; ``start``, and ``restart`` or ``quit`` when the
+        socket cannot be reached, launch *viewport.py* with the matching
+        flag instead. ``pause`` and ``resume`` need the socket.
 
         Args:
-            action: One of ``"start"``, ``"restart"``, or ``"quit"``.
+            action: One of ``"start"``, ``"restart"``, ``"quit"``,
+                ``"pause"`` or ``"resume"``.
 
         Returns:
             flask.Response: JSON containing status and message.
         """
-        if action not in ("start", "restart", "quit"):
+        if action not in ("start", "restart", "quit", "pause", "resume"):
             return jsonify(status="error",
                             message=f'Unknown action "{action}"'), 400
 
+        command = {"restart": "soft-restart", "quit": "quit",
+                   "pause": "pause", "resume": "resume"}.get(action)
+        if command:
+            reply = control_request(control_file, command, CONTROL_TOKEN)
+            if reply is not None:
+                if reply["status"] != "ok":
+                    app.logger.error(f"Control command {command} failed: {reply['message']}")
+                    return jsonify(status="error", message="Failed to dispatch control command"), 500
+                return jsonify(status="ok", message=f"{action.title()} command issued",
+                               data=reply["data"]), 202
+            if action in ("pause", "resume"):
+                return jsonify(status="error", message="Fake Viewport is not running"), 409
+
         flag = {"start":"--background", "restart":"--restart", "quit":"--quit"}[action]
         try:
             viewport_dir = str(script_dir / "viewport.py")
@@ -282,8 +715,16 @@ def create_app():
             "script_uptime":   url_for("api_script_uptime",   _external=True),
             "system_info":     url_for("api_system_info",     _external=True),
             "logs":            url_for("api_logs",            _external=True),
+            "logs/search":     url_for("api_logs_search",     _external=True),
             "status":          url_for("api_status",          _external=True),
+            "state":           url_for("api_state",           _external=True),
             "config":          url_for("api_config",          _external=True),
+            "browser_usage":   url_for("api_browser_usage",   _external=True),
+            "resources":       url_for("api_resources",       _external=True),
+            "snapshot":        url_for("api_snapshot",        _external=True),
+            "stream":          url_for("api_stream",          _external=True),
+            "history":         url_for("api_history",         _external=True),
+            "metrics":         url_for("metrics",             _external=True),
         })
 
     # ----------------------------------------------------------------------- #
@@ -292,13 +733,21 @@ def create_app():
         """
         Return the current and latest available Fake Viewport versions.
 
+        The latest version comes from the release cache kept by
+        :class:`update.ReleaseRefresher`, so GitHub is never contacted
+        while the request waits.
+
         Returns:
-            flask.Response: ``{"current": "...", "latest": "..."}`` or error.
+            flask.Response: ``{"current": "...", "latest": "...",
+            "checked": "...", "age": seconds}`` or error.
         """
         try:
+            release = update.release_info()
             return jsonify(status="ok", data={
                 "current": update.current_version(),
-                "latest":  update.latest_version(),
+                "latest":  release["latest"],
+                "checked": release["checked"],
+                "age":     release["age"],
             })
         except Exception as e:
             app.logger.exception("version check failed")
@@ -308,20 +757,25 @@ def create_app():
     @app.route("/api/update/changelog")
     def api_update_changelog():
         """
-        Fetch the latest release notes and GitHub release URL.
+        Return the latest release notes and GitHub release URL.
+
+        Served from the release cache like :pyfunc:`api_update_info`.
 
         Returns:
-            flask.Response: JSON with ``changelog`` and ``release_url`` keys.
+            flask.Response: JSON with ``changelog``, ``release_url``,
+            ``checked`` and ``age`` keys.
         """
         try:
-            changelog = update.latest_changelog()
+            release = update.release_info()
             # You can point directly at the “latest” redirect, or use a tag-specific URL:
             release_url = f"https://github.com/{update.REPO}/releases/latest"
             return jsonify(
                 status="ok",
                 data={
-                    "changelog": changelog,
+                    "changelog": release["changelog"],
                     "release_url": release_url,
+                    "checked": release["checked"],
+                    "age": release["age"],
                 }
             )
         except Exception as e:
@@ -344,117 +798,24 @@ def create_app():
                 "data":   { "running": false, "uptime": null  }
             }
         """
-        raw = _read_api_file(sst_file)
-        if raw is None:
-            return jsonify(status="ok",
-                        data={"running": False, "uptime": None})
-        try:
-            start = datetime.strptime(raw, "%Y-%m-%d %H:%M:%S.%f")
-        except ValueError:
-            # Treat malformed timestamp as "not running"
-            return jsonify(status="ok",
-                        data={"running": False, "uptime": None})
-        uptime = (datetime.now() - start).total_seconds()
-        return jsonify(status="ok",
-                    data={"running": True, "uptime": uptime})
+        return jsonify(status="ok", data=_script_uptime())
 
     # ----------------------------------------------------------------------- #
     @app.route("/api/system_info")
+    @cached(ttl=2)
     def api_system_info():
         """
         Return system metrics - OS, CPU, RAM, disk, and network stats.
 
+        Static facts are read once per app; CPU and network rates come
+        from the background :class:`ResourceSampler`, so every client
+        sees the same per-interval figures and nothing blocks.
+
         Returns:
             flask.Response: JSON payload on success or error message.
         """
-        global last_net_io, last_check_time, unwanted
         try:
-            # Get OS info
-            with open('/etc/os-release', 'r') as f:
-                os_release = f.read()
-            pretty_name = next(
-                line.split('=', 1)[1].strip('"') 
-                for line in os_release.split('\n') 
-                if line.startswith('PRETTY_NAME=')
-            )
-            hardware_model = "Unknown"
-            # Try Raspberry Pi
-            try:
-                with open('/proc/device-tree/model', 'r') as f:
-                    hardware_model = f.read().strip('\x00')
-            except (FileNotFoundError, PermissionError):
-                pass  # Not a Pi or no permission
-            # Fallback to x86 DMI
-            if hardware_model == "Unknown":
-                try:
-                    with open('/sys/devices/virtual/dmi/id/product_name', 'r') as f:
-                        hardware_model = f.read().strip()
-                except (FileNotFoundError, PermissionError):
-                    pass  # Not available or no permission
-            # Final fallback to hostname
-            if hardware_model == "Unknown":
-                try:
-                    hardware_model = socket.gethostname()
-                except:
-                    hardware_model = "Unknown (Fallback Failed)"
-            # Get available disk space (root partition)
-            disk_info = subprocess.check_output(
-                ['df', '-h', '--output=avail', '/']
-            ).decode().split('\n')[1].strip()
-            # Uptime
-            uptime = time.time() - psutil.boot_time()
-            # Get RAM
-            vm = psutil.virtual_memory()
-            # CPU Usage (percentage)
-            cpu_percent = psutil.cpu_percent(interval=1)  
-            # Network Usage (bytes sent/received)
-            current_net_io = psutil.net_io_counters(pernic=True, nowrap=True)
-            current_time = time.time()
-            time_elapsed = current_time - last_check_time
-            
-            # Filter out virtual/unwanted interfaces
-            unwanted_interfaces = ['lo', 'docker', 'veth', 'br-', 'virbr', 'tun', 'IO']
-            network_stats = {}
-            for interface, stats in current_net_io.items():
-                if any(unwanted in interface for unwanted in unwanted_interfaces): 
-                    continue
-                if last_net_io:
-                    # Calculate bytes/second
-                    recv_rate = (stats.bytes_recv - last_net_io[interface].bytes_recv) / time_elapsed
-                    sent_rate = (stats.bytes_sent - last_net_io[interface].bytes_sent) / time_elapsed
-                    network_stats[interface] = {
-                        'interface': interface,
-                        'upload': sent_rate,
-                        'download': recv_rate,
-                        'total_upload': stats.bytes_sent,
-                        'total_download': stats.bytes_recv
-                    }
-                else: pass
-            last_net_io = current_net_io
-            last_check_time = current_time
-            return jsonify(
-                status="ok",
-                data={
-                    "os_name": pretty_name,
-                    "system_uptime": uptime,
-                    "hardware_model": hardware_model,
-                    "disk_available": disk_info,
-                    "memory": {
-                        "percent": vm.percent,
-                        "used": vm.used,
-                        "total": vm.total,
-                    },
-                    "cpu": {
-                        "percent": cpu_percent,
-                        "cores": psutil.cpu_count(logical=False),
-                        "threads": psutil.cpu_count(logical=True)
-                    },
-                    "network": {
-                        "interfaces": network_stats,
-                        "primary_interface": list(network_stats.values())[0] if network_stats else None
-                    }
-                }
-            )
+            return jsonify(status="ok", data=_system_info())
         except Exception as e:
             app.logger.exception("An error occurred while fetching system information")
             return jsonify(
@@ -462,75 +823,436 @@ def create_app():
                 message="An internal error occurred while fetching system information."
             ), 500
 
+    # ----------------------------------------------------------------------- #
+    @app.route("/api/browser_usage")
+    @cached(ttl=5)
+    def api_browser_usage():
+        """
+        Break the browser's CPU and memory use down by process type.
+
+        Returns:
+            flask.Response: JSON with one entry per process type
+            (``browser``, ``renderer``, ``gpu``, ``network``,
+            ``utility``, ``extension``, ``other``).
+        """
+        try:
+            breakdown = browser_usage_handler()
+            # normalize across all logical cores (so 0–100%)
+            ncpus = psutil.cpu_count(logical=True) or 1
+            for entry in breakdown.values():
+                entry["cpu"] = entry["cpu"] / ncpus
+            return jsonify(status="ok", data={
+                "browser": getattr(_mon, "BROWSER", None),
+                "processes": breakdown,
+            })
+        except Exception as e:
+            app.logger.exception("An error occurred while sampling browser processes")
+            return jsonify(
+                status="error",
+                message="An internal error occurred while sampling browser processes."
+            ), 500
+
+    # ----------------------------------------------------------------------- #
+    @app.route("/api/history")
+    def api_history() -> "flask.Response":
+        """
+        Return recorded resource and health history for a time range.
+        ?span=SECONDS       Range ending now. Default 3600.
+        ?start=&end=        Explicit range in epoch seconds (overrides span).
+        ?metrics=a,b        Series to include. Default all.
+
+        The resolution (raw samples, per-minute or per-hour rollups) is
+        the finest one that still covers *start* and keeps each series
+        under ``history.MAX_POINTS`` points.
+
+        Returns:
+            flask.Response: JSON ``{"start", "end", "resolution", "step",
+            "series", "events"}``; series points are ``[ts, avg, max]``.
+        """
+        now = time.time()
+        try:
+            end = float(request.args.get("end", now))
+            start = float(request.args.get("start", end - float(request.args.get("span", 3600))))
+        except ValueError:
+            return jsonify(status="error", message="start, end and span must be numbers"), 400
+        if start >= end:
+            return jsonify(status="error", message="start must be before end"), 400
+        names = request.args.get("metrics")
+        names = tuple(n.strip() for n in names.split(",") if n.strip()) if names else history.SERIES
+        unknown = [n for n in names if n not in history.SERIES]
+        if unknown:
+            return jsonify(status="error", message=f"Unknown metrics: {', '.join(unknown)}"), 400
+        try:
+            data = history.query(history_file, start, end, names, now=now)
+        except Exception as e:
+            app.logger.error(f"Error reading {history_file}: {e}")
+            return jsonify(status="error", message="An internal error has occurred."), 500
+        if data is None:
+            # Nothing recorded yet
+            resolution = history.pick_resolution(start, end, now)
+            data = {
+                "resolution": resolution,
+                "step": history.RESOLUTIONS[resolution][0] or history.RAW_STEP,
+                "series": {name: [] for name in names},
+                "events": [],
+            }
+        return jsonify(status="ok", data={"start": start, "end": end, **data})
+
+    # ----------------------------------------------------------------------- #
+    @app.route("/metrics")
+    def metrics() -> "flask.Response":
+        """
+        Expose the daemon's counters and histograms to Prometheus.
+
+        Counts come from the metrics file *viewport.py* keeps up to date
+        and the per-process gauges from its resource sampler, so a scrape
+        reads two files and measures nothing. Metrics the daemon has not
+        recorded yet are reported as zero; the process gauges are left
+        out while the daemon is not sampling.
+
+        Returns:
+            flask.Response: Prometheus text exposition format.
+        """
+        body = render_metrics(
+            read_metrics(metrics_file), latest_sample(sample_file), app._cache_stats
+        )
+        return Response(body, content_type="text/plain; version=0.0.4; charset=utf-8")
+
+    # ----------------------------------------------------------------------- #
+    @app.route("/api/resources")
+    def api_resources():
+        """
+        Return the daemon's latest resource sample and recent history.
+        ?history=N   Number of past samples to include (0-720). Default 0.
+
+        Samples come from the ring buffer written by *viewport.py*'s
+        background sampler, so nothing is measured here.
+
+        Returns:
+            flask.Response: JSON ``{"interval", "latest", "history"}``;
+            ``latest`` is ``None`` until the daemon has written a sample.
+        """
+        try:
+            count = int(request.args.get("history", 0))
+        except ValueError:
+            count = 0
+        count = max(0, min(count, 720))
+        ring = ResourceRing.open(sample_file)
+        if ring is None:
+            return jsonify(status="ok", data={"interval": None, "latest": None, "history": []})
+        try:
+            history = ring.history(max(count, 1))
+            interval = ring.interval
+        finally:
+            ring.close()
+        return jsonify(status="ok", data={
+            "interval": interval,
+            "latest": history[-1] if history else None,
+            "history": history[-count:] if count else [],
+        })
+
     # ----------------------------------------------------------------------- #
     @app.route("/api/log")
     @app.route("/api/logs")
     def api_logs() -> "flask.Response":
         """
         Tail the most recent log lines, spanning rotated files if needed.
-        ?limit=N   Number of lines to return (1-1000). Default 100.
+        ?limit=N        Number of lines to return (1-1000). Default 100.
+        ?since=CURSOR   Only return lines written after a previous
+                        response's ``cursor``, the oldest first. When
+                        more than *limit* were written, ``cursor``
+                        points after the last one returned and the
+                        next request picks up the rest.
 
         Response schema
         ---------------
             {
                 "status": "ok",
-                "data": { "logs": [ "<line>", ... ] }
+                "data": {
+                    "logs": [ "<line>", ... ],
+                    "entries": [ {"ts", "level", "event", ...} | null, ... ],
+                    "cursor": "<inode>:<offset>",
+                    "reset": false
+                }
             }
+
+        ``reset`` is true when *since* no longer points into a known log
+        (deleted backup, truncated file); ``logs`` is then a fresh tail
+        that should replace what the client has. ``entries`` holds the
+        fields of each line written with ``LOG_JSON`` (``null`` for text
+        lines); such lines appear in ``logs`` as ``[ts] [LEVEL] message``.
         """
         try:
             limit = int(request.args.get("limit", 100))
         except ValueError:
             limit = 100
         limit = max(1, min(limit, LOG_HARD_CAP))
+        since = request.args.get("since") or None
 
-        log_path  = Path(log_file).resolve()        # e.g. viewport.log
-        log_dir   = log_path.parent
-        base_name = log_path.name                   #   "viewport.log"
+        lines, cursor, reset = read_log(Path(log_file).resolve(), limit, since)
+        lines, entries = render_log_lines(lines)
+        return jsonify(status="ok", data={
+            "logs": lines, "entries": entries, "cursor": cursor, "reset": reset,
+        })
 
-        # TimedRotatingFileHandler names rotated files like
-        #   viewport.log.2025-06-05
-        rotated = sorted(
-            (p for p in log_dir.glob(f"{base_name}.*") if p.is_file()),
-            key=lambda p: p.stat().st_mtime,        # newest first
-            reverse=True
-        )
+    # ----------------------------------------------------------------------- #
+    @app.route("/api/logs/search")
+    def api_logs_search() -> "flask.Response":
+        """
+        Search the log and its rotated backups, oldest match first.
+        ?start=ISO      Earliest timestamp, e.g. 2025-06-11T16:30.
+        ?end=ISO        Latest timestamp.
+        ?level=A,B      Only these levels (ERROR, WARNING, INFO, DEBUG).
+        ?q=TEXT         Case-insensitive substring.
+        ?limit=N        Records per page (1-1000). Default 100.
+        ?cursor=C       Continue from a previous page's ``cursor``.
 
-        # Always examine current log first, then yesterday, then older …
-        candidates = [log_path] + rotated
+        Searches go through a :class:`LogIndex` of per-minute, per-level
+        byte offsets that is extended as the files grow, so only blocks
+        in range that hold a wanted level are read.
 
-        remaining = limit
-        tail = deque(maxlen=limit)                  # keeps newest lines in order
+        Returns:
+            flask.Response: JSON ``{"logs": [...], "entries": [...],
+            "cursor": "..." | null}`` (see ``/api/logs``); ``cursor`` is
+            null on the last page.
+        """
+        args = request.args
+        try:
+            start, end = (
+                datetime.fromisoformat(args[key]).strftime("%Y-%m-%d %H:%M:%S") if args.get(key) else None
+                for key in ("start", "end")
+            )
+        except ValueError:
+            return jsonify(status="error", message="start and end must be ISO-8601 timestamps"), 400
+        levels = {l.strip().upper() for l in args.get("level", "").split(",") if l.strip()} or None
+        if levels and not levels <= {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}:
+            return jsonify(status="error", message="Unknown log level"), 400
+        try:
+            limit = int(args.get("limit", 100))
+        except ValueError:
+            limit = 100
+        limit = max(1, min(limit, LOG_HARD_CAP))
 
-        for path in candidates:
-            try:
-                # Read only what we still need from *this* file
-                chunk = deque(maxlen=remaining)
-                with path.open("r", encoding="utf-8") as f:
-                    for line in f:
-                        chunk.append(line.rstrip("\n"))
-                # Prepend so chronology is preserved when we move to older logs
-                tail.extendleft(reversed(chunk))
-                remaining = limit - len(tail)
-                if remaining == 0:                  # got everything we asked for
-                    break
-            except Exception:
-                app.logger.warning("Could not read %s", path, exc_info=True)
-
-        return jsonify(status="ok", data={"logs": list(tail)})
+        path = Path(log_file).resolve()
+        if app._log_index is None or app._log_index.log_path != path:
+            app._log_index = LogIndex(path)
+        try:
+            lines, cursor = app._log_index.search(
+                start, end, levels, args.get("q") or None, limit, args.get("cursor") or None
+            )
+        except ValueError as e:
+            return jsonify(status="error", message=str(e)), 400
+        lines, entries = render_log_lines(lines)
+        return jsonify(status="ok", data={"logs": lines, "entries": entries, "cursor": cursor})
 
     # ----------------------------------------------------------------------- #
     @app.route("/api/status")
     def api_status():
         """
-        Return the one-line status message written by *viewport.py*.
+        Return the newest status recorded by *viewport.py*.
+
+        Query Params:
+            tail (int, optional): Also return up to this many of the most
+                recent entries, oldest first, capped at ``STATUS_KEEP``.
+
+        Returns:
+            flask.Response: JSON ``{"status": "...", "latest": {...}}``,
+            plus ``"events": [...]`` when *tail* is given. Each entry has
+            ``ts``, ``code``, ``severity``, ``message`` and ``details``.
+        """
+        tail = max(0, min(request.args.get("tail", 0, type=int), STATUS_KEEP))
+        entries = _read_status(max(tail, 1))
+        latest = entries[-1] if entries else None
+        data = {"status": latest["message"] if latest else None, "latest": latest}
+        if tail:
+            data["events"] = entries
+        return jsonify(status="ok", data=data)
+
+    # ----------------------------------------------------------------------- #
+    @app.route("/api/state")
+    def api_state():
+        """
+        Return the daemon's live state block.
+
+        Read straight from the shared mapping, so polling it is cheap.
 
         Returns:
-            flask.Response: JSON ``{"status": "..."}`` or error.
+            flask.Response: JSON with ``pid``, ``phase``, ``paused``,
+            ``status``, ``severity``, ``attempt``, ``max_attempts``,
+            ``checks``, the Unix times ``started``, ``last_check``,
+            ``status_changed`` and ``updated``, and the block's ``seq``;
+            ``data`` is ``null`` until the script has created the block.
         """
-        line = _read_api_file(status_file)
-        if line is None:
-            return jsonify(status="ok", data={"status": None})
-        return jsonify(status="ok", data={"status": line})    
+        return jsonify(status="ok", data=app._state.read())
+
+    # ----------------------------------------------------------------------- #
+    @app.route("/api/snapshot")
+    def api_snapshot():
+        """
+        Return status, script start, system info and config in one document.
+
+        The body is rebuilt only when ``status_file``, ``sst_file`` or
+        ``config.ini`` change or the resource sampler takes a new sample.
+        Its ``ETag`` is a hash of the body, so every API worker gives the
+        same one for the same content and a sample that changes nothing
+        keeps it; ``Last-Modified`` moves only when the ETag does. Clients
+        repeating a poll with ``If-None-Match`` or ``If-Modified-Since``
+        get ``304 Not Modified`` with no body until something changes.
+
+        Nothing in the body counts up on its own: the script reports its
+        start time and the host its boot time (both Unix seconds), and
+        clients derive uptimes from them.
+
+        Returns:
+            flask.Response: JSON ``{"status", "script", "system_info",
+            "config"}``, an empty 304, or an error.
+        """
+        try:
+            # Keeps sampler.seq moving when no background thread runs
+            sample = _latest_sample()
+            files = tuple(_file_state(path) for path in (status_file, sst_file, config_file))
+            cached = app._snapshot
+            # Cached until config.ini changes; next_restart rolls over by itself
+            config = _config()
+            validators = (files, sampler.seq, config["general"]["next_restart"])
+            if cached is None or cached["validators"] != validators:
+                start = _script_start()
+                info = _system_info()
+                del info["system_uptime"]
+                info["boot_time"] = psutil.boot_time()
+                data = {
+                    "status": {"status": _status_message()},
+                    "script": {
+                        "running": start is not None,
+                        "started": start.timestamp() if start else None,
+                    },
+                    "system_info": info,
+                    "config": config,
+                }
+                # Derived from the content, not this worker's own counters
+                etag = hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+                if cached is not None and cached["etag"] == etag:
+                    last_modified = cached["last_modified"]
+                else:
+                    last_modified = max(
+                        [state[0] / 1e9 for state in files if state] + [sample["timestamp"]]
+                    )
+                cached = app._snapshot = {
+                    "validators": validators,
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "data": data,
+                }
+            response = jsonify(status="ok", data=cached["data"])
+            response.set_etag(cached["etag"])
+            response.last_modified = cached["last_modified"]
+            # Let browsers cache it, but revalidate on every poll
+            response.cache_control.no_cache = True
+            return response.make_conditional(request)
+        except Exception as e:
+            app.logger.exception("An error occurred while building the snapshot")
+            return jsonify(
+                status="error",
+                message="An internal error occurred while building the snapshot."
+            ), 500
+
+    # ----------------------------------------------------------------------- #
+    @app.route("/api/stream")
+    @login_required
+    def api_stream():
+        """
+        Push status, log and metric updates as Server-Sent Events.
+        ?since=CURSOR   Log cursor to continue from (see ``/api/logs``).
+
+        One connection replaces the dashboard's polling loops. Events:
+
+        * ``status`` - ``{"status": "..."}`` whenever the status file
+          changes.
+        * ``logs`` - ``{"logs", "entries", "cursor", "since", "reset"}``
+          (see ``/api/logs``) with the lines written after ``since``; the
+          event id is the new cursor, so a reconnecting browser resumes
+          from ``Last-Event-ID``.
+        * ``metrics`` - ``{"system_info", "script_uptime"}``, the same
+          data as those routes, once per resource sample.
+
+        A comment line goes out after ``STREAM_HEARTBEAT`` quiet seconds
+        so dead clients are noticed, and the stream ends after
+        ``STREAM_MAX_AGE`` seconds to hand its thread back. Only half the
+        worker's threads may stream at once; beyond that the route
+        answers 503 and the dashboard keeps polling.
+
+        Returns:
+            flask.Response: ``text/event-stream`` response, or JSON error.
+        """
+        if not app._stream_slots.acquire(blocking=False):
+            return jsonify(status="error", message="Too many open streams"), 503
+        since = request.headers.get("Last-Event-ID") or request.args.get("since") or None
+        log_path = Path(log_file).resolve()
+
+        def event(name, data, event_id=None):
+            head = f"id: {event_id}\n" if event_id else ""
+            return f"{head}event: {name}\ndata: {json.dumps(data)}\n\n"
+
+        def events():
+            cursor = since
+            last_status = last_log = last_sample = None
+            started = last_sent = time.monotonic()
+            yield f"retry: {STREAM_RETRY_MS}\n\n"
+            while True:
+                chunks = []
+                line = _status_message()
+                if line != last_status:
+                    last_status = line
+                    chunks.append(event("status", {"status": line}))
+                try:
+                    st = log_path.stat()
+                    log_state = (st.st_ino, st.st_size)
+                except OSError:
+                    log_state = None
+                if log_state != last_log:
+                    last_log = log_state
+                    if cursor is None:
+                        # Nothing to continue from: start at the current end
+                        _, cursor, _ = read_log(log_path, 1)
+                    else:
+                        lines, new_cursor, reset = read_log(log_path, LOG_HARD_CAP, cursor)
+                        if lines or reset:
+                            lines, entries = render_log_lines(lines)
+                            chunks.append(event("logs", {
+                                "logs": lines, "entries": entries, "cursor": new_cursor,
+                                "since": cursor, "reset": reset,
+                            }, new_cursor))
+                        cursor = new_cursor
+                        if len(lines) >= LOG_HARD_CAP:
+                            last_log = None     # more to read: don't wait for a change
+                try:
+                    sample = _latest_sample()
+                    if sample is not None and sample["timestamp"] != last_sample:
+                        last_sample = sample["timestamp"]
+                        chunks.append(event("metrics", {
+                            "system_info": _system_info(),
+                            "script_uptime": _script_uptime(),
+                        }))
+                except Exception:
+                    app.logger.exception("An error occurred while streaming metrics")
+                now = time.monotonic()
+                if chunks:
+                    last_sent = now
+                    yield "".join(chunks)
+                elif now - last_sent >= STREAM_HEARTBEAT:
+                    last_sent = now
+                    yield ": keep-alive\n\n"
+                if now - started >= STREAM_MAX_AGE:
+                    return
+                time.sleep(STREAM_POLL)
+
+        response = Response(events(), mimetype="text/event-stream", headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",   # don't let a reverse proxy buffer events
+        })
+        # Runs even if the client leaves before the first event
+        response.call_on_close(app._stream_slots.release)
+        return response
 
     # ----------------------------------------------------------------------- #
     @app.route("/api/config")
@@ -543,52 +1265,7 @@ def create_app():
             settings, plus restart scheduling details.
         """
         try:
-            # Re-parse config on each call
-            cfg = validate_config(strict=False, print=False)
-            # pull everything out into locals/globals
-            for name, val in vars(cfg).items():
-                setattr(_mon, name, val)
-                
-            restart_times = None
-            next_restart = None
-            
-            if RESTART_TIMES:  # Checks if not None and not empty
-                now = datetime.now()
-                # compute next run for each time
-                next_runs = []
-                for t in RESTART_TIMES:
-                    run_dt = datetime.combine(now.date(), t)
-                    if run_dt <= now: run_dt += timedelta(days=1)
-                    next_runs.append(run_dt)
-                next_run = min(next_runs)
-                restart_times = [t.strftime('%H:%M') for t in RESTART_TIMES]
-                next_restart = next_run.isoformat()
-                
-            return jsonify(
-                status="ok",
-                data={
-                    "general": {
-                        "health_interval_sec": getattr(_mon, "SLEEP_TIME", None),
-                        "wait_time_sec": getattr(_mon, "WAIT_TIME", None),
-                        "max_retries": getattr(_mon, "MAX_RETRIES", None),
-                        "restart_times": restart_times,
-                        "next_restart": next_restart,
-                    },
-                    "browser": {
-                        "profile_path": getattr(_mon, "BROWSER_PROFILE_PATH", None),
-                        "binary_path": getattr(_mon, "BROWSER_BINARY", None),
-                        "headless": getattr(_mon, "HEADLESS", None),
-                    },
-                    "logging": {
-                        "log_file_flag": getattr(_mon, "LOG_FILE_FLAG", None),
-                        "log_console_flag": getattr(_mon, "LOG_CONSOLE", None),
-                        "debug_logging": getattr(_mon, "DEBUG_LOGGING", None),
-                        "error_logging": getattr(_mon, "ERROR_LOGGING", None),
-                        "ERROR_PRTSCR": getattr(_mon, "ERROR_PRTSCR", None),
-                        "log_days": getattr(_mon, "LOG_DAYS", None),
-                        "log_interval_min": getattr(_mon, "LOG_INTERVAL", None),
-                    },
-                })
+            return jsonify(status="ok", data=_config())
         except Exception as e:
             logging.error("An error occurred while processing the configuration.", exc_info=True)
             return jsonify(
@@ -601,6 +1278,68 @@ def create_app():
 # --------------------------------------------------------------------------- # 
 # Run server when invoked directly
 # --------------------------------------------------------------------------- # 
+# --------------------------------------------------------------------------- #
+# Serving
+# --------------------------------------------------------------------------- #
+if BaseApplication is not None:
+    class APIServer(BaseApplication):
+        """
+        Embedded gunicorn application serving :pyfunc:`create_app`.
+
+        Workers use the ``gthread`` class so a slow request only ties up
+        one thread instead of every dashboard behind it. The resource
+        sampler and release refresher are started inside each worker
+        because threads do not survive gunicorn's fork.
+
+        Args:
+            options: gunicorn settings, e.g. ``{"bind": "0.0.0.0:5000"}``.
+        """
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            if not sampler.is_alive():
+                sampler.start()
+            if not release_refresher.is_alive():
+                release_refresher.start()
+            return create_app()
+
+def serve(host, port):
+    """
+    Serve the monitoring API until the process is stopped.
+
+    Uses gunicorn with ``WORKERS`` processes of ``THREADS`` threads each
+    and the configured keep-alive and request timeouts. When gunicorn is
+    not installed it falls back to Flask's threaded development server.
+
+    Args:
+        host: Interface to bind; Flask's default when empty.
+        port: Port to bind; Flask's default when empty.
+    """
+    if BaseApplication is None:
+        logging.warning("gunicorn is not installed, using Flask's development server")
+        sampler.start()
+        release_refresher.start()
+        create_app().run(host=host or None, port=port or None)
+        return
+    APIServer({
+        "bind": f"{host or '127.0.0.1'}:{port or 5000}",
+        "workers": API_WORKERS,
+        "worker_class": "gthread",
+        "threads": API_THREADS,
+        "keepalive": API_KEEPALIVE,
+        "timeout": API_TIMEOUT,
+        "graceful_timeout": API_TIMEOUT,
+        "accesslog": None,
+        "errorlog": "-",
+        "loglevel": "warning",
+    }).run()
+
 def main():
     """
     Entry point for launching the monitoring API.
@@ -608,7 +1347,8 @@ def main():
     * Re-validates configuration when running under pytest.
     * Ensures no duplicate ``monitoring.py`` process is active
         (gracefully terminates one if found).
-    * Logs the bind address and starts the Flask development server.
+    * Logs the bind address and serves the app with :pyfunc:`serve`
+        (gunicorn, or Flask's development server as a fallback).
     """
     if "pytest" in sys.modules:
         cfg = validate_config()
@@ -619,9 +1359,10 @@ def main():
     if should_kill_process:
         time.sleep(3)
         process_handler("monitoring.py", action="kill")
+    pid_handler("monitoring.py", action="write")
     
     logging.info(f"Starting server with http://{host}:{port}")
-    create_app().run(host=host or None, port=port or None)
+    serve(host, port)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -22,9 +22,16 @@ git archive \
     viewport.py \
     monitoring.py \
     update.py \
+    assets.py \
     logging_config.py \
     validate_config.py \
     css_selectors.py \
+    sampler.py \
+    metrics.py \
+    history.py \
+    core.py \
+    control.py \
+    state.py \
     setup.sh \
     minimize.sh \
     uninstall.sh \
@@ -51,6 +58,12 @@ git archive \
     logging_config.py \
     validate_config.py \
     css_selectors.py \
+    sampler.py \
+    metrics.py \
+    history.py \
+    core.py \
+    control.py \
+    state.py \
     setup.sh \
     minimize.sh \
     uninstall.sh \
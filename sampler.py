@@ -0,0 +1,257 @@
+import mmap, os, struct, threading, time, logging
+import psutil
+from pathlib import Path
+
+# --------------------------------------------------------------------------- #
+# Ring buffer layout
+# --------------------------------------------------------------------------- #
+SAMPLE_INTERVAL = 5         # seconds between samples
+RING_CAPACITY   = 720       # one hour of history at the default interval
+RING_MAGIC      = b"FVRB"
+RING_VERSION    = 1
+GROUPS          = ("viewport", "monitoring", "browser")
+FIELDS = (
+    "timestamp",
+    "cpu_percent", "mem_percent", "mem_used",
+    "net_recv_rate", "net_sent_rate",
+    "disk_read_rate", "disk_write_rate",
+    "viewport_cpu", "viewport_rss",
+    "monitoring_cpu", "monitoring_rss",
+    "browser_cpu", "browser_rss",
+)
+# magic, version, record size, capacity, interval, sequence number
+HEADER = struct.Struct("<4sHHIIQ")
+RECORD = struct.Struct("<dffQddddfQfQfQ")
+
+class ResourceRing:
+    """
+    Fixed-size ring of resource samples backed by an mmap'd file.
+
+    A single writer (the daemon's sampler) appends records; any number
+    of readers in other processes map the same file and read the latest
+    sample or recent history without sampling themselves. The header's
+    sequence number counts every record ever written, so readers can
+    tell which slot is newest and detect a slot being overwritten while
+    they read it.
+    """
+    def __init__(self, path, capacity=RING_CAPACITY, interval=SAMPLE_INTERVAL, writable=False):
+        self.path = Path(path)
+        self.writable = writable
+        size = HEADER.size + capacity * RECORD.size
+        if writable:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                header = os.pread(fd, HEADER.size, 0)
+                if len(header) < HEADER.size or HEADER.unpack(header)[:4] != (
+                    RING_MAGIC, RING_VERSION, RECORD.size, capacity
+                ):
+                    # New or incompatible file: start from an empty ring
+                    os.ftruncate(fd, 0)
+                    os.ftruncate(fd, size)
+                    os.pwrite(fd, HEADER.pack(RING_MAGIC, RING_VERSION, RECORD.size,
+                                              capacity, int(interval), 0), 0)
+                self._mm = mmap.mmap(fd, size, access=mmap.ACCESS_WRITE)
+            finally:
+                os.close(fd)
+        else:
+            with open(self.path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, rec_size, capacity, interval, _ = HEADER.unpack_from(self._mm, 0)
+            if (magic, version, rec_size) != (RING_MAGIC, RING_VERSION, RECORD.size):
+                self._mm.close()
+                raise ValueError(f"{self.path} is not a compatible sample ring")
+        _, _, _, self.capacity, self.interval, _ = HEADER.unpack_from(self._mm, 0)
+
+    @classmethod
+    def open(cls, path):
+        """
+        Map an existing ring for reading.
+
+        Returns:
+            ResourceRing | None: The ring, or ``None`` if the file is
+            missing or not a compatible ring.
+        """
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error):
+            return None
+
+    @property
+    def seq(self):
+        return HEADER.unpack_from(self._mm, 0)[5]
+
+    def _offset(self, n):
+        return HEADER.size + (n % self.capacity) * RECORD.size
+
+    def append(self, sample):
+        """
+        Write *sample* (a mapping keyed by ``FIELDS``) into the next slot.
+        """
+        seq = self.seq
+        RECORD.pack_into(self._mm, self._offset(seq), *(sample.get(f) or 0 for f in FIELDS))
+        # Publish only after the record is complete
+        struct.pack_into("<Q", self._mm, HEADER.size - 8, seq + 1)
+
+    def history(self, count=None):
+        """
+        Return up to *count* of the newest samples, oldest first.
+
+        The slot after the newest record may be mid-write, so at most
+        ``capacity - 1`` samples are returned.
+
+        Returns:
+            list[dict]: Samples keyed by ``FIELDS`` plus ``"seq"``.
+        """
+        limit = self.capacity - 1 if count is None else max(0, min(count, self.capacity - 1))
+        for _ in range(3):
+            seq = self.seq
+            n = min(seq, limit)
+            records = [
+                dict(zip(FIELDS, RECORD.unpack_from(self._mm, self._offset(i))), seq=i + 1)
+                for i in range(seq - n, seq)
+            ]
+            # Slots are only reused once the writer laps the oldest one we read
+            if self.seq - seq < self.capacity - n:
+                break
+        return records
+
+    def latest(self):
+        """
+        Return the newest sample, or ``None`` if the ring is empty.
+        """
+        records = self.history(1)
+        return records[0] if records else None
+
+    def close(self):
+        self._mm.close()
+
+class ResourceSampler(threading.Thread):
+    """
+    Daemon thread that samples system and per-process resources.
+
+    Every *interval* seconds it records system CPU and RAM, network and
+    disk throughput, and CPU/RSS for each process group, then appends
+    the sample to *ring* (if any) and keeps it as :pyattr:`latest`.
+    CPU figures come from psutil's non-blocking deltas between ticks, so
+    a sample never blocks for a measuring window.
+
+    Args:
+        ring: Optional writable :class:`ResourceRing`.
+        interval: Seconds between samples.
+        groups: Mapping of group name (see ``GROUPS``) to a predicate
+            taking a ``psutil.Process`` whose ``info`` holds ``pid``,
+            ``name`` and ``cmdline``.
+    """
+    def __init__(self, ring=None, interval=SAMPLE_INTERVAL, groups=None):
+        super().__init__(name="resource-sampler", daemon=True)
+        self.ring = ring
+        self.interval = interval
+        self.groups = groups or {}
+        self.latest = None
+        self.seq = 0        # samples taken so far
+        self.net_interfaces = {}
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._last = None   # (time, net counters, disk counters)
+
+    def _rate(self, now_value, last_value, elapsed):
+        if last_value is None or elapsed <= 0:
+            return 0.0
+        return max(0.0, (now_value - last_value) / elapsed)
+
+    def sample(self):
+        """
+        Take one sample and publish it.
+
+        Returns:
+            dict: The sample keyed by ``FIELDS``.
+        """
+        with self._lock:
+            return self._sample()
+
+    def _sample(self):
+        now = time.time()
+        ncpus = psutil.cpu_count(logical=True) or 1
+        vm = psutil.virtual_memory()
+        pernic = psutil.net_io_counters(pernic=True, nowrap=True) or {}
+        disk = psutil.disk_io_counters(nowrap=True)
+        last_time, last_pernic, last_disk = self._last or (None, {}, None)
+        elapsed = now - last_time if last_time else 0
+        interfaces = {}
+        for name, stats in pernic.items():
+            prev = last_pernic.get(name)
+            interfaces[name] = {
+                "download": self._rate(stats.bytes_recv, prev and prev.bytes_recv, elapsed),
+                "upload": self._rate(stats.bytes_sent, prev and prev.bytes_sent, elapsed),
+                "total_download": stats.bytes_recv,
+                "total_upload": stats.bytes_sent,
+            }
+        sample = {
+            "timestamp": now,
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "mem_percent": vm.percent,
+            "mem_used": vm.used,
+            "net_recv_rate": sum(i["download"] for i in interfaces.values()),
+            "net_sent_rate": sum(i["upload"] for i in interfaces.values()),
+            "disk_read_rate": self._rate(disk.read_bytes, last_disk and last_disk.read_bytes, elapsed) if disk else 0.0,
+            "disk_write_rate": self._rate(disk.write_bytes, last_disk and last_disk.write_bytes, elapsed) if disk else 0.0,
+        }
+        for group in GROUPS:
+            sample[f"{group}_cpu"] = 0.0
+            sample[f"{group}_rss"] = 0
+        if self.groups:
+            # process_iter hands back cached Process objects, so
+            # cpu_percent() measures the time since the previous tick
+            for p in psutil.process_iter(['pid', 'name', 'cmdline']):
+                try:
+                    for group, match in self.groups.items():
+                        if match(p):
+                            sample[f"{group}_cpu"] += p.cpu_percent(None) / ncpus
+                            sample[f"{group}_rss"] += p.memory_info().rss
+                            break
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+        self._last = (now, pernic, disk)
+        self.net_interfaces = interfaces
+        self.latest = sample
+        self.seq += 1
+        if self.ring is not None:
+            self.ring.append(sample)
+        return sample
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                self.sample()
+            except Exception:
+                logging.debug("Resource sample failed", exc_info=True)
+            self._stopped.wait(self.interval)
+
+    def stop(self):
+        self._stopped.set()
+
+def latest_sample(path, max_age=None):
+    """
+    Return the newest sample from the ring at *path* if it is fresh.
+
+    Args:
+        path: Ring file written by the daemon's sampler.
+        max_age: Oldest acceptable sample in seconds; defaults to three
+            sampling intervals.
+
+    Returns:
+        dict | None: The sample, or ``None`` when the ring is missing,
+        empty or stale (e.g. the daemon is no longer running).
+    """
+    ring = ResourceRing.open(path)
+    if ring is None:
+        return None
+    try:
+        sample = ring.latest()
+        if max_age is None:
+            max_age = 3 * ring.interval
+    finally:
+        ring.close()
+    if sample is None or time.time() - sample["timestamp"] > max_age:
+        return None
+    return sample
@@ -100,6 +100,16 @@ else
     exit 1
 fi
 # ----------------------------------------------------------------------------- 
+# Precompress the dashboard assets served by the monitoring API
+# ----------------------------------------------------------------------------- 
+if [ -f "assets.py" ] && [ -d "static" ]; then
+    if "$VENV_PYTHON" assets.py static > /dev/null; then
+        echo -e "${GREEN}✓ Dashboard assets precompressed${NC}"
+    else
+        echo -e "${RED}✗ Failed to precompress dashboard assets${NC}"
+    fi
+fi
+# ----------------------------------------------------------------------------- 
 # Verify Google Chrome, Chromium, or Firefox
 # ----------------------------------------------------------------------------- 
 any_browser_installed=false
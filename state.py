@@ -0,0 +1,199 @@
+import mmap, os, struct, threading, time
+from pathlib import Path
+
+# --------------------------------------------------------------------------- #
+# State block layout
+# --------------------------------------------------------------------------- #
+STATE_MAGIC   = b"FVST"
+STATE_VERSION = 1
+PHASES     = ("stopped", "starting", "running", "paused", "retrying", "restarting")
+SEVERITIES = ("info", "warning", "error")
+STATUS_BYTES = 160          # UTF-8 status message, truncated to fit
+# magic, version, sequence number (odd while a write is in progress)
+HEADER = struct.Struct("<4sHxxQ")
+# pid, phase, severity, paused, attempt, max attempts, started,
+# last check, status changed, updated, checks passed, status
+BODY = struct.Struct(f"<IBBBxHHddddQ{STATUS_BYTES}s")
+SIZE = HEADER.size + BODY.size
+FIELDS = (
+    "pid", "phase", "severity", "paused", "attempt", "max_attempts",
+    "started", "last_check", "status_changed", "updated", "checks", "status",
+)
+
+def _encode(values):
+    status = values["status"].encode()[:STATUS_BYTES].decode(errors="ignore").encode()
+    return (
+        values["pid"], PHASES.index(values["phase"]), SEVERITIES.index(values["severity"]),
+        bool(values["paused"]), values["attempt"], values["max_attempts"],
+        values["started"] or 0.0, values["last_check"] or 0.0,
+        values["status_changed"] or 0.0, values["updated"], values["checks"], status,
+    )
+
+def _decode(raw):
+    values = dict(zip(FIELDS, raw))
+    values["phase"] = PHASES[values["phase"]] if values["phase"] < len(PHASES) else "stopped"
+    values["severity"] = SEVERITIES[values["severity"]] if values["severity"] < len(SEVERITIES) else "info"
+    values["paused"] = bool(values["paused"])
+    values["status"] = values["status"].rstrip(b"\0").decode(errors="replace") or None
+    for name in ("started", "last_check", "status_changed"):
+        values[name] = values[name] or None  # 0.0 means "never"
+    return values
+
+class StateBlock:
+    """
+    Live daemon state in a small fixed-layout file mapped into memory.
+
+    The daemon is the only writer; the API and ``viewport.py -s`` map
+    the same file and read it without parsing anything. Writes follow a
+    sequence lock: the header's sequence number is made odd, the body
+    is rewritten in place and the number is made even again, so a reader
+    that sees an odd or changed number retries. Values are kept in
+    memory until :pymeth:`open` is called, like :class:`MetricsStore`,
+    so updates made before that are not lost.
+
+    The file is reused in place across restarts rather than replaced,
+    so readers that mapped it once keep seeing the live block.
+
+    Args:
+        path: File to map; ``None`` keeps the block in memory.
+    """
+    def __init__(self, path=None):
+        self.path = None
+        self._mm = None
+        self._seq = 0
+        self._lock = threading.Lock()
+        self.values = {
+            "pid": 0, "phase": "stopped", "severity": "info", "paused": False,
+            "attempt": 0, "max_attempts": 0, "started": None, "last_check": None,
+            "status_changed": None, "updated": 0.0, "checks": 0, "status": "",
+        }
+        if path is not None:
+            self.open(path)
+
+    def open(self, path):
+        """
+        Map *path* for writing and publish the current values to it.
+        """
+        path = Path(path)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            header = os.pread(fd, HEADER.size, 0)
+            seq = 0
+            if len(header) == HEADER.size:
+                magic, version, seq = HEADER.unpack(header)
+                if (magic, version) != (STATE_MAGIC, STATE_VERSION):
+                    seq = 0
+            if os.fstat(fd).st_size != SIZE:
+                os.ftruncate(fd, SIZE)
+            mm = mmap.mmap(fd, SIZE, access=mmap.ACCESS_WRITE)
+        finally:
+            os.close(fd)
+        with self._lock:
+            if self._mm is not None:
+                self._mm.close()
+            self.path, self._mm = path, mm
+            # Carry on from the old sequence so it never appears to go back
+            self._seq = seq + (seq & 1)
+            self._publish()
+        return self
+
+    def _publish(self):
+        if self._mm is None:
+            return
+        self.values["updated"] = time.time()
+        HEADER.pack_into(self._mm, 0, STATE_MAGIC, STATE_VERSION, self._seq + 1)
+        BODY.pack_into(self._mm, HEADER.size, *_encode(self.values))
+        self._seq += 2
+        HEADER.pack_into(self._mm, 0, STATE_MAGIC, STATE_VERSION, self._seq)
+
+    def update(self, **values):
+        """
+        Set the given fields (see ``FIELDS``) and publish them in one write.
+        """
+        with self._lock:
+            unknown = values.keys() - self.values.keys()
+            if unknown:
+                raise KeyError(f"Unknown state fields: {', '.join(sorted(unknown))}")
+            self.values.update(values)
+            self._publish()
+
+    def check_passed(self):
+        """
+        Record a passing health check.
+        """
+        with self._lock:
+            self.values.update(
+                phase="running", attempt=0, last_check=time.time(),
+                checks=self.values["checks"] + 1,
+            )
+            self._publish()
+
+    def close(self):
+        with self._lock:
+            if self._mm is not None:
+                self._mm.close()
+            self._mm = None
+
+class StateReader:
+    """
+    Read-only view of a :class:`StateBlock` file.
+
+    The file is mapped on the first :pymeth:`read` that finds it and
+    kept mapped, so later reads cost no system calls.
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        self._mm = None
+
+    def _map(self):
+        try:
+            with open(self.path, "rb") as f:
+                if os.fstat(f.fileno()).st_size < SIZE:
+                    return None
+                return mmap.mmap(f.fileno(), SIZE, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+    def read(self, attempts=100):
+        """
+        Return the current state, or ``None`` if there is no usable block.
+
+        Returns:
+            dict | None: Values keyed by ``FIELDS`` plus ``"seq"``;
+            ``phase``, ``severity`` and ``status`` are strings and times
+            are Unix seconds (``None`` if they never happened).
+        """
+        if self._mm is None:
+            self._mm = self._map()
+            if self._mm is None:
+                return None
+        for _ in range(attempts):
+            magic, version, seq = HEADER.unpack_from(self._mm, 0)
+            if (magic, version) != (STATE_MAGIC, STATE_VERSION):
+                self.close()  # recreated or incompatible; map again next time
+                return None
+            if seq & 1:
+                time.sleep(0)  # writer is mid-update
+                continue
+            raw = BODY.unpack_from(self._mm, HEADER.size)
+            if HEADER.unpack_from(self._mm, 0)[2] == seq:
+                return dict(_decode(raw), seq=seq)
+        return None
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+        self._mm = None
+
+def read_state(path):
+    """
+    Map the block at *path* once and return its current state.
+
+    Returns:
+        dict | None: See :pymeth:`StateReader.read`.
+    """
+    reader = StateReader(path)
+    try:
+        return reader.read()
+    finally:
+        reader.close()
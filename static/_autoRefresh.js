@@ -7,6 +7,7 @@ import { CACHE_TTL } from "./_update.js";
 // one timer for everything
 // ---------------------------------------------------------------------------
 let timer = null;
+let current = null;
 
 const RATE = {
   status: 5_000,
@@ -37,6 +38,12 @@ export function scheduleRefresh(key, { immediate = true } = {}) {
   clearInterval(timer);
   const rate = RATE[key];
   if (!rate) return;
+  current = key;
   if (immediate) tick(key);
   timer = setInterval(() => tick(key), rate);
 }
+
+// Redraw the current view now, e.g. when /api/stream pushed new data
+export function refreshNow() {
+  if (current) tick(current);
+}
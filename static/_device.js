@@ -2,10 +2,14 @@ let lastScriptUptime = null;
 export let activeTab = "status";
 import { loadUpdateData } from "./_update.js";
 import { colorLogEntry } from "./_logs.js";
+import { streamed } from "./_stream.js";
 // -----------------------------------------------------------------------------
 // Helper functions
 // -----------------------------------------------------------------------------
 export async function fetchJSON(path) {
+  // Served from /api/stream while it is connected
+  const pushed = streamed(path);
+  if (pushed) return pushed;
   try {
     const r = await fetch(path);
     if (!r.ok) return null;
@@ -15,6 +19,65 @@ export async function fetchJSON(path) {
   }
 }
 
+// -----------------------------------------------------------------------------
+// Snapshot: status, script, system info and config in one conditional GET
+// -----------------------------------------------------------------------------
+let snapshotRequest = null;
+let serverSkew = 0; // server clock minus ours, in ms
+
+async function fetchSnapshot() {
+  // Callers ticking together share one request
+  if (snapshotRequest) return snapshotRequest;
+  snapshotRequest = (async () => {
+    try {
+      // The response is no-cache, so the browser revalidates with its
+      // ETag and an unchanged snapshot comes back as an empty 304
+      const r = await fetch("/api/snapshot");
+      if (!r.ok) return null;
+      const date = Date.parse(r.headers.get("Date"));
+      if (!isNaN(date)) serverSkew = date - Date.now();
+      return (await r.json())?.data ?? null;
+    } catch {
+      return null;
+    } finally {
+      snapshotRequest = null;
+    }
+  })();
+  return snapshotRequest;
+}
+
+// Responses shaped like the individual routes, from /api/stream when it
+// is live (it carries no config) and from one /api/snapshot otherwise
+export async function loadSnapshot({ withConfig = false } = {}) {
+  const pushed = {
+    st: streamed("/api/status"),
+    sud: streamed("/api/script_uptime"),
+    sysInfo: streamed("/api/system_info"),
+  };
+  if (!withConfig && pushed.st && pushed.sud && pushed.sysInfo) return pushed;
+
+  const snap = await fetchSnapshot();
+  if (!snap) return {};
+  // Uptimes are derived from start times, so they keep counting on a 304
+  const now = (Date.now() + serverSkew) / 1000;
+  const { script, system_info: info } = snap;
+  return {
+    st: { status: "ok", data: snap.status },
+    sud: {
+      status: "ok",
+      data: {
+        running: script.running,
+        uptime: script.running ? now - script.started : null,
+      },
+    },
+    sysInfo: {
+      status: "ok",
+      data: { ...info, system_uptime: now - info.boot_time },
+    },
+    config: { status: "ok", data: snap.config },
+  };
+}
+
 // Config cache with refresh capability
 export let configCache = {
   data: null,
@@ -24,7 +87,7 @@ export let configCache = {
   async get(forceRefresh = false) {
     const now = Date.now();
     if (forceRefresh || !this.data || now - this.lastUpdated > this.ttl) {
-      this.data = await fetchJSON("/api/config");
+      this.data = (await loadSnapshot({ withConfig: true })).config ?? null;
       this.lastUpdated = now;
       this.updateConfigElements();
     }
@@ -337,18 +400,14 @@ function formatSpeed(bytesPerSec) {
 // -----------------------------------------------------------------------------
 export async function loadStatus() {
   const entry = document.getElementById("logEntry");
-  const fetchPromises = [
-    fetchJSON("/api/script_uptime"),
-    fetchJSON("/api/status"),
-    fetchJSON("/api/system_info"),
-  ];
+  const fetchPromises = [loadSnapshot()];
 
   // Only fetch logs if element is visible (not display: none)
   if (entry.offsetParent !== null) {
     fetchPromises.push(fetchJSON("/api/logs?limit=1"));
   }
 
-  const [sud, st, sysInfo, ...rest] = await Promise.all(fetchPromises);
+  const [{ sud, st, sysInfo }, ...rest] = await Promise.all(fetchPromises);
   const le = rest[0]; // Will be undefined if logs weren't fetched
 
   // Script uptime
@@ -445,7 +504,7 @@ export async function loadStatus() {
 
   // Log entry
   if (le?.data?.logs && le.data.logs.length > 0) {
-    colorLogEntry(le.data.logs[0], entry);
+    colorLogEntry(le.data.logs[0], entry, le.data.entries?.[0]);
   }
 }
 // -----------------------------------------------------------------------------
@@ -482,7 +541,7 @@ export async function loadDeviceData() {
   }
 
   // System Info
-  const sysInfo = await fetchJSON("/api/system_info");
+  const { sysInfo } = await loadSnapshot();
   if (sysInfo?.data) {
     const osEl = document.getElementById("osInfo");
     const hwEl = document.getElementById("hardwareInfo");
@@ -1,18 +1,28 @@
 import { fetchJSON } from "./_device.js";
+import { streaming } from "./_stream.js";
 
 // Store the last used limit value
 let logRefreshInterval;
 let lastLogControlsInteraction = 0;
 let lastLogLimit = 50;
+let logCursor = null; // Position after the newest line shown; see /api/logs?since
+let logsBehind = false; // A streamed batch was skipped; catch up by polling
 const MAX_AUTO_SCROLL_LOGS = 100;
 const INTERACTION_PAUSE_MS = 2_500; 
+// Event codes of LOG_JSON records shown as successes (see /api/logs entries)
+const SUCCESS_EVENTS = new Set([
+  "feed_healthy", "resumed", "page_reloaded", "fullscreen_activated",
+  "screenshot_saved", "shutdown", "api_started", "updated", "config_valid",
+  "started",
+]);
 
 // Helper function for logs
 export function startLogsAutoRefresh(interval=5_000) {
   if (logRefreshInterval) return; // already running
 
   logRefreshInterval = setInterval(() => {
-    if (shouldRefreshLogs()) fetchAndDisplayLogs(lastLogLimit);
+    // While /api/stream delivers new lines, only poll to catch up
+    if (shouldRefreshLogs() && (logsBehind || !streaming())) fetchNewLogs();
   }, interval);
 }
 export function stopLogsAutoRefresh() {
@@ -41,13 +51,17 @@ function shouldRefreshLogs() {
   return visible && atBottom && !interactedRecently;
 }
 
-export function colorLogEntry(logText, element) {
-  const entry = element || document.createElement("div");
-  let displayText = logText.trim();
-  entry.classList.remove("Green", "Blue", "Yellow", "Red");
-
+// Color class for a structured (LOG_JSON) line from its level and event code
+function fieldsLogColor(fields) {
+  if (fields.level === "ERROR" || fields.level === "CRITICAL") return "Red";
+  if (SUCCESS_EVENTS.has(fields.event)) return "Green";
+  if (fields.level === "WARNING") return "Yellow";
+  return "Blue";
+}
+// Color class for a text line, from its wording
+function textLogColor(logText) {
   // Convert log text to lowercase once for all comparisons
-  const lowerLogText = displayText.toLowerCase();
+  const lowerLogText = logText.toLowerCase();
   if (
     // Success
     lowerLogText.includes("healthy") ||
@@ -61,7 +75,7 @@ export function colorLogEntry(logText, element) {
     lowerLogText.includes("no errors found") ||
     lowerLogText.includes("started")
   ) {
-    entry.classList.add("Green");
+    return "Green";
   } else if (
     // Actions that raise an eyebrow
     lowerLogText.includes("[warning]") ||
@@ -76,16 +90,22 @@ export function colorLogEntry(logText, element) {
     lowerLogText.includes("^^") ||
     lowerLogText.includes("get ")
   ) {
-    entry.classList.add("Yellow");
+    return "Yellow";
   } else if (
     // Normal actions
     lowerLogText.includes("[info]")
   ) {
-    entry.classList.add("Blue");
-  } else {
-    // Errors and exceptions
-    entry.classList.add("Red");
+    return "Blue";
   }
+  // Errors and exceptions
+  return "Red";
+}
+export function colorLogEntry(logText, element, fields) {
+  const entry = element || document.createElement("div");
+  let displayText = logText.trim();
+  entry.classList.remove("Green", "Blue", "Yellow", "Red");
+  // Structured lines carry their own level and event; no need to guess
+  entry.classList.add(fields ? fieldsLogColor(fields) : textLogColor(displayText));
   // If an existing element was passed, trim timestamp and log level
   if (element) {
     // Match timestamp followed by log level (e.g., "2023-01-01 12:00:00 [INFO] ")
@@ -120,19 +140,69 @@ export async function fetchAndDisplayLogs(limit, scroll=true) {
   if (res?.data?.logs) {
     // Clear the log output container
     logOutput.innerHTML = "";
-
-    // Convert the log array to individual div elements
-    res.data.logs.forEach((logText) => {
-      const logEntry = colorLogEntry(logText);
-      logEntry.classList.add("log-entry");
-      logOutput.appendChild(logEntry);
-    });
+    appendLogEntries(res.data.logs, res.data.entries);
+    logCursor = res.data.cursor ?? null;
+    logsBehind = false;
   }
   // Auto-scroll to bottom if logs are below threshold
   if (scroll && (logOutput.children.length <= MAX_AUTO_SCROLL_LOGS)) {
     logOutput.scrollTop = logOutput.scrollHeight;
   }
 }
+// Fetch only the lines written since the last poll and append them
+export async function fetchNewLogs() {
+  if (!logCursor) return fetchAndDisplayLogs(lastLogLimit);
+
+  const since = logCursor;
+  const res = await fetchJSON(
+    `/api/logs?limit=${lastLogLimit}&since=${encodeURIComponent(since)}`
+  );
+  if (!res?.data) return;
+  // The stream appended these lines while we waited
+  if (since !== logCursor) return;
+  logsBehind = false;
+  // Cursor no longer valid (log deleted or truncated): start over
+  if (res.data.reset) return fetchAndDisplayLogs(lastLogLimit);
+  showNewLogs(res.data);
+}
+// Apply a "logs" event from /api/stream
+export function receiveLogs(data) {
+  // Only append a batch that continues exactly where the output ends;
+  // anything else (reset, gap, paused view) is left to fetchNewLogs()
+  if (logsBehind || data.reset || data.since !== logCursor || !shouldRefreshLogs()) {
+    logsBehind = true;
+    return;
+  }
+  showNewLogs(data);
+}
+export function currentLogCursor() {
+  return logCursor;
+}
+function showNewLogs(data) {
+  logCursor = data.cursor ?? null;
+  if (!data.logs.length) return;
+
+  const logOutput = document.getElementById("logOutput");
+  appendLogEntries(data.logs, data.entries);
+  // Keep only the newest lastLogLimit entries
+  while (logOutput.children.length > lastLogLimit) {
+    logOutput.firstElementChild.remove();
+  }
+  if (logOutput.children.length <= MAX_AUTO_SCROLL_LOGS) {
+    logOutput.scrollTop = logOutput.scrollHeight;
+  }
+}
+// Convert log lines to individual div elements at the bottom of the output
+function appendLogEntries(lines, entries) {
+  const logOutput = document.getElementById("logOutput");
+  const fragment = document.createDocumentFragment();
+  lines.forEach((logText, i) => {
+    const logEntry = colorLogEntry(logText, null, entries?.[i]);
+    logEntry.classList.add("log-entry");
+    fragment.appendChild(logEntry);
+  });
+  logOutput.appendChild(fragment);
+}
 
 // Initialize logs functionality
 export function initLogs() {
@@ -219,5 +289,5 @@ export function initLogs() {
     });
   }
   // Initial load with stored value
-  fetchAndDisplayLogs(lastLogLimit);
+  return fetchAndDisplayLogs(lastLogLimit);
 }
\ No newline at end of file
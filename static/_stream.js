@@ -0,0 +1,84 @@
+// -----------------------------------------------------------------------------
+// Server-sent events: /api/stream pushes what the polling loops would fetch
+// -----------------------------------------------------------------------------
+const STALE_MS = 15_000; // no event for this long: fall back to polling
+const RETRY_MS = 60_000; // wait before retrying a refused stream
+let source = null;
+let lastEvent = 0;
+let updatePending = false;
+const pushed = new Map();
+
+// True while the stream is connected and delivering events
+export function streaming() {
+  return (
+    !!source &&
+    source.readyState === EventSource.OPEN &&
+    Date.now() - lastEvent < STALE_MS
+  );
+}
+
+// Latest pushed data for an API path, shaped like a fetchJSON() response
+export function streamed(path) {
+  const hit = pushed.get(path);
+  if (!hit || !streaming()) return null;
+  if (path === "/api/script_uptime" && hit.data?.running) {
+    // Uptime keeps counting between metrics events
+    const uptime = hit.data.uptime + (Date.now() - hit.at) / 1000;
+    return { status: "ok", data: { ...hit.data, uptime } };
+  }
+  return { status: "ok", data: hit.data };
+}
+
+function store(path, data) {
+  pushed.set(path, { at: Date.now(), data });
+}
+
+export function startStream({ cursor, onUpdate, onLogs }) {
+  if (source || typeof EventSource === "undefined") return;
+  const since = cursor();
+  source = new EventSource(
+    since ? `/api/stream?since=${encodeURIComponent(since)}` : "/api/stream"
+  );
+  // status and metrics often arrive together: redraw once
+  const update = () => {
+    if (updatePending) return;
+    updatePending = true;
+    setTimeout(() => {
+      updatePending = false;
+      onUpdate();
+    }, 0);
+  };
+  const on = (name, handler) =>
+    source.addEventListener(name, (e) => {
+      lastEvent = Date.now();
+      handler(JSON.parse(e.data));
+    });
+
+  on("status", (data) => {
+    store("/api/status", data);
+    update();
+  });
+  on("metrics", (data) => {
+    store("/api/system_info", data.system_info);
+    store("/api/script_uptime", data.script_uptime);
+    update();
+  });
+  on("logs", (data) => {
+    if (data.logs.length) {
+      store("/api/logs?limit=1", {
+        logs: data.logs.slice(-1),
+        entries: data.entries?.slice(-1),
+      });
+    }
+    onLogs(data);
+  });
+  source.addEventListener("error", () => {
+    // The browser reconnects on its own unless the stream was refused
+    // (503, logged out); polling carries on until we try again
+    if (source.readyState !== EventSource.CLOSED) return;
+    source.close();
+    source = null;
+    pushed.clear();
+    setTimeout(() => startStream({ cursor, onUpdate, onLogs }), RETRY_MS);
+  });
+}
@@ -1,9 +1,10 @@
-import { initLogs, startLogsAutoRefresh } from "./_logs.js";
-import { scheduleRefresh } from "./_autoRefresh.js";
+import { initLogs, startLogsAutoRefresh, receiveLogs, currentLogCursor } from "./_logs.js";
+import { scheduleRefresh, refreshNow } from "./_autoRefresh.js";
 import { loadStatus, loadDeviceData, configCache } from "./_device.js";
 import { checkForUpdate, CACHE_TTL, initUpdateButton } from "./_update.js";
 import { control } from "./_control.js";
 import { initSections, isDesktopView } from "./_sections.js";
+import { startStream } from "./_stream.js";
 
 document.addEventListener("DOMContentLoaded", async () => {
   // Light Theme toggle
@@ -123,13 +124,19 @@ document.addEventListener("DOMContentLoaded", async () => {
     loadDeviceData(),
     configCache.get(true),
   ]);
-  initLogs();
+  await initLogs();
   // Check for update last
   checkForUpdate();
   initUpdateButton();
   startLogsAutoRefresh();
   setInterval(checkForUpdate, CACHE_TTL);
   scheduleRefresh(isDesktopView() ? "desktop" : "status", { immediate: false });
+  // Push updates over one connection; the timers above remain the fallback
+  startStream({
+    cursor: currentLogCursor,
+    onUpdate: refreshNow,
+    onLogs: receiveLogs,
+  });
   // Control buttons
   const controls = document.getElementById("controls");
   const parentTooltip = controls.parentElement;
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Load-test a running monitoring API the way wall dashboards use it.
+
+Each simulated dashboard polls ``/api/status``, ``/api/system_info`` and
+``/api/logs`` over one keep-alive connection, then waits *interval*
+seconds. Prints per-endpoint latency percentiles and overall throughput.
+
+Usage:
+    python tests/bench_api.py http://127.0.0.1:5000 --clients 20 --duration 30
+"""
+import argparse, http.client, statistics, threading, time
+from collections import defaultdict
+from urllib.parse import urlparse
+
+ENDPOINTS = ("/api/status", "/api/system_info", "/api/logs?limit=100")
+
+def dashboard(base, interval, deadline, results, errors, lock):
+    connect = lambda: http.client.HTTPConnection(base.hostname, base.port or 80, timeout=30)
+    conn = connect()
+    while time.monotonic() < deadline:
+        for path in ENDPOINTS:
+            start = time.perf_counter()
+            ok = False
+            # Like a browser, retry once if the server closed an idle keep-alive connection
+            for _ in range(2):
+                try:
+                    conn.request("GET", path)
+                    resp = conn.getresponse()
+                    resp.read()
+                    ok = resp.status == 200
+                    break
+                except (http.client.HTTPException, OSError):
+                    conn.close()
+                    conn = connect()
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                if ok:
+                    results[path].append(elapsed)
+                else:
+                    errors[path] += 1
+        time.sleep(interval)
+    conn.close()
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("url", help="Base URL of the monitoring API")
+    parser.add_argument("--clients", type=int, default=20, help="Concurrent dashboards")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--interval", type=float, default=5, help="Seconds between polls")
+    args = parser.parse_args()
+
+    base = urlparse(args.url)
+    results, errors, lock = defaultdict(list), defaultdict(int), threading.Lock()
+    deadline = time.monotonic() + args.duration
+    threads = [
+        threading.Thread(target=dashboard, args=(base, args.interval, deadline, results, errors, lock))
+        for _ in range(args.clients)
+    ]
+    started = time.monotonic()
+    for t in threads: t.start()
+    for t in threads: t.join()
+    wall = time.monotonic() - started
+
+    total = sum(len(v) for v in results.values())
+    print(f"{args.clients} clients, {args.duration:.0f}s, poll every {args.interval:g}s")
+    print(f"{'endpoint':<22}{'reqs':>6}{'err':>5}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}")
+    for path in ENDPOINTS:
+        lat = results[path]
+        if not lat:
+            print(f"{path:<22}{0:>6}{errors[path]:>5}")
+            continue
+        print(
+            f"{path:<22}{len(lat):>6}{errors[path]:>5}"
+            f"{statistics.median(lat):>9.1f}{percentile(lat, 95):>9.1f}{max(lat):>9.1f}"
+        )
+    print(f"throughput: {total / wall:.1f} req/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Measure logging throughput for each handler configuration.
+
+Logs the same mix of records the daemon and the API produce (plain
+status lines, lines with arguments, coloured Werkzeug access lines)
+through ``configure_logging`` and prints records per second and the
+cost per record. Console output goes to /dev/null.
+
+Usage:
+    python tests/bench_logging.py --records 50000
+"""
+import argparse, logging, os, sys, tempfile, time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from logging_config import configure_logging, flush_logging
+
+CONFIGS = (
+    # name, log file name, file, console, async, json
+    ("viewport file",          "viewport.log",   True,  False, False, False),
+    ("viewport file+console",  "viewport.log",   True,  True,  False, False),
+    ("viewport async",         "viewport.log",   True,  True,  True,  False),
+    ("viewport json",          "viewport.log",   True,  False, False, True),
+    ("monitoring file",        "monitoring.log", True,  False, False, False),
+    ("console only",           "viewport.log",   False, True,  False, False),
+)
+ACCESS = "\x1b[32m127.0.0.1 - - [01/Jan/2025 00:00:00] \"GET /api/status HTTP/1.1\" 200 -\x1b[0m"
+
+def emit(count):
+    root, mon, werkzeug = logging.getLogger(), logging.getLogger("monitoring"), logging.getLogger("werkzeug")
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            root.info("Video feeds healthy.", extra={"event": "feed_healthy", "duration": 0.25})
+        elif kind == 1:
+            root.warning("Retrying... (Attempt %d of %d)", i % 5, 5)
+        elif kind == 2:
+            mon.info("Serving /api/status")
+        else:
+            werkzeug.info(ACCESS)
+
+def run(name, filename, log_file, log_console, log_async, log_json, count, workdir):
+    """
+    Log *count* records through one configuration.
+
+    Returns:
+        tuple[float, float]: Seconds until the last call returned, and
+        until everything was written.
+    """
+    root = logging.getLogger()
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    devnull = open(os.devnull, "w")
+    stderr, sys.stderr = sys.stderr, devnull  # StreamHandler() binds sys.stderr
+    try:
+        configure_logging(
+            str(workdir / filename), log_file, log_console, log_async=log_async, log_json=log_json
+        )
+        start = time.perf_counter()
+        emit(count)
+        queued = time.perf_counter() - start
+        flush_logging()
+        total = time.perf_counter() - start
+    finally:
+        sys.stderr = stderr
+        for h in list(root.handlers):
+            root.removeHandler(h)
+            h.close()
+        devnull.close()
+    return queued, total
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=50000, help="Records per configuration")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per configuration; the best is shown")
+    args = parser.parse_args()
+
+    print(f"{args.records} records per configuration, best of {args.repeat}")
+    print(f"{'configuration':<24}{'rec/s':>10}{'us/rec':>9}{'caller us/rec':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, filename, log_file, log_console, log_async, log_json in CONFIGS:
+            queued, total = min(
+                run(name, filename, log_file, log_console, log_async, log_json, args.records, Path(tmp))
+                for _ in range(args.repeat)
+            )
+            # For async, the caller only pays for enqueueing
+            print(
+                f"{name:<24}{args.records / total:>10.0f}{total / args.records * 1e6:>9.1f}"
+                f"{queued / args.records * 1e6:>15.1f}"
+            )
+
+if __name__ == "__main__":
+    main()
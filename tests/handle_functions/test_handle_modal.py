@@ -22,8 +22,10 @@ def test_handle_modal_success(mock_driver):
         mock_action_chain = MagicMock()
         MockActions.return_value = mock_action_chain
 
+        closed = viewport.metrics.counters["modals_closed"]
         assert viewport.handle_modal(mock_driver) is True
         mock_action_chain.click.assert_called()
+        assert viewport.metrics.counters["modals_closed"] == closed + 1
 
 def test_handle_modal_no_modal(mock_driver):
     mock_driver.execute_script.return_value = False
@@ -34,6 +34,12 @@ def make_driver(window_size, screen_size,
     driver.execute_script.side_effect = exec_script
     return driver
 
+@pytest.fixture(autouse=True)
+def control_wait_sleeps(monkeypatch):
+    # The loop's idle waits end early on control requests; route them through
+    # time.sleep, which the tests below patch to step or break the loop
+    monkeypatch.setattr(viewport, "control_wait", lambda seconds: viewport.time.sleep(seconds))
+
 @pytest.fixture(autouse=True)
 def base_setup(monkeypatch):
     # handle_page and check_driver always succeed up to our branch
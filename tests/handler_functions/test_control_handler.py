@@ -0,0 +1,130 @@
+import json, signal, threading, time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import pytest
+import viewport
+from control import request
+from core import status_entry
+
+# --------------------------------------------------------------------------- #
+# Fixtures
+# --------------------------------------------------------------------------- #
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    # A control socket served from tmp_path, torn down after the test
+    monkeypatch.setattr(viewport, "control_file", tmp_path / "viewport.sock")
+    monkeypatch.setattr(viewport, "pause_file", tmp_path / ".pause")
+    monkeypatch.setattr(viewport, "status_file", tmp_path / "status.jsonl")
+    monkeypatch.setattr(viewport, "sst_file", tmp_path / "sst.txt")
+    monkeypatch.setattr(viewport, "logs_dir", tmp_path)
+    monkeypatch.setattr(viewport, "CONTROL_TOKEN", "tok")
+    monkeypatch.setattr(viewport, "control_server", None)
+    monkeypatch.setattr(viewport, "driver", None)
+    monkeypatch.setattr(viewport, "api_status", lambda msg: None)
+    viewport.restart_requested.clear()
+    viewport.control_wake.clear()
+    srv = viewport.control_handler()
+    yield srv
+    srv.stop()
+    srv.join(5)
+    viewport.restart_requested.clear()
+    viewport.control_wake.clear()
+
+# --------------------------------------------------------------------------- #
+# Test control_handler function
+# --------------------------------------------------------------------------- #
+def test_control_handler_status_and_pause(daemon):
+    viewport.status_file.write_text(json.dumps(status_entry("Feed Healthy")) + "\n")
+    viewport.sst_file.write_text("2025-06-05 09:00:00.000001")
+    status = request(viewport.control_file, "status", "tok")["data"]
+    assert status["status"]["message"] == "Feed Healthy"
+    assert status["status"]["severity"] == "info"
+    assert status["paused"] is False
+    assert status["started"] == "2025-06-05 09:00:00.000001"
+
+    assert request(viewport.control_file, "pause", "tok")["data"] == {"paused": True}
+    assert viewport.pause_file.exists()
+    assert request(viewport.control_file, "resume", "tok")["data"] == {"paused": False}
+    assert not viewport.pause_file.exists()
+
+def test_control_handler_requires_token(daemon):
+    assert request(viewport.control_file, "pause", "nope") == {"status": "error", "message": "Unauthorized"}
+    assert not viewport.pause_file.exists()
+
+def test_control_handler_soft_restart_is_left_to_handle_view(daemon, monkeypatch):
+    monkeypatch.setattr(viewport, "restart_handler", lambda driver: pytest.fail("restarted on the socket thread"))
+    assert request(viewport.control_file, "soft-restart", "tok")["status"] == "ok"
+    assert viewport.restart_requested.is_set()
+
+def test_control_handler_quit_signals_self(daemon, monkeypatch):
+    timers = []
+    monkeypatch.setattr(viewport.threading, "Timer",
+                        lambda delay, fn, args: SimpleNamespace(start=lambda: timers.append((fn, args))))
+    assert request(viewport.control_file, "quit", "tok")["data"] == {"stopping": True}
+    assert timers == [(viewport.os.kill, (viewport.os.getpid(), signal.SIGTERM))]
+
+def test_control_handler_screenshot(daemon, monkeypatch):
+    assert request(viewport.control_file, "screenshot", "tok") == {"status": "error", "message": "No browser session"}
+    driver = MagicMock()
+    monkeypatch.setattr(viewport, "driver", driver)
+    served = []
+    def health_loop():
+        # Stands in for handle_view: woken by the request, drives the browser itself
+        viewport.control_wait(5)
+        served.append(threading.current_thread())
+        viewport.serve_screenshots(driver)
+    loop = threading.Thread(target=health_loop)
+    loop.start()
+    path = request(viewport.control_file, "screenshot", "tok", timeout=10)["data"]["path"]
+    loop.join(5)
+    assert served == [loop]
+    driver.save_screenshot.assert_called_once_with(path)
+    assert path.startswith(str(viewport.logs_dir / "screenshot_"))
+
+def test_control_handler_screenshot_times_out(daemon, monkeypatch):
+    driver = MagicMock()
+    monkeypatch.setattr(viewport, "driver", driver)
+    monkeypatch.setattr(viewport, "SCREENSHOT_TIMEOUT", 0.05)
+    reply = request(viewport.control_file, "screenshot", "tok")
+    assert reply["status"] == "error" and "Timed out" in reply["message"]
+    # A request given up on is skipped, not taken late
+    viewport.serve_screenshots(driver)
+    driver.save_screenshot.assert_not_called()
+
+def test_handle_view_wakes_for_restart(daemon, monkeypatch):
+    class Restarted(BaseException): pass
+    def restart(driver):
+        raise Restarted
+    monkeypatch.setattr(viewport, "handle_page", lambda d: True)
+    monkeypatch.setattr(viewport, "restart_handler", restart)
+    monkeypatch.setattr(viewport, "state", MagicMock())
+    viewport.pause_file.touch()   # idles in the paused branch between checks
+    threading.Timer(0.1, request, (viewport.control_file, "soft-restart", "tok")).start()
+    start = time.monotonic()
+    with pytest.raises(Restarted):
+        viewport.handle_view(MagicMock(), "http://example.com")
+    assert time.monotonic() - start < 2
+
+def test_control_handler_metrics(daemon):
+    data = request(viewport.control_file, "metrics", "tok")["data"]
+    assert set(data["counters"]) == set(viewport.metrics.counters)
+
+# --------------------------------------------------------------------------- #
+# CLI flags use the socket when the daemon is reachable
+# --------------------------------------------------------------------------- #
+def _args(**flags):
+    base = dict(status=False, logs=None, background=False, pause=False, quit=False,
+                diagnose=False, api=False, restart=False)
+    return SimpleNamespace(**{**base, **flags})
+
+@pytest.mark.parametrize("flag, command", [("quit", "quit"), ("restart", "soft-restart"), ("pause", "pause")])
+def test_args_handler_uses_control_socket(monkeypatch, flag, command):
+    sent = []
+    monkeypatch.setattr(viewport, "control_request",
+                        lambda path, cmd, token: sent.append(cmd) or {"status": "ok", "data": {}})
+    monkeypatch.setattr(viewport, "process_handler", lambda *a, **k: pytest.fail("scanned processes"))
+    monkeypatch.setattr(viewport.subprocess, "Popen", lambda *a, **k: pytest.fail("spawned a child"))
+    monkeypatch.setattr(viewport, "clear_sst", lambda: pytest.fail("cleared the SST"))
+    with pytest.raises(SystemExit):
+        viewport.args_handler(_args(**{flag: True}))
+    assert sent == [command]
@@ -18,8 +18,9 @@ def isolate_sst(tmp_path, monkeypatch):
 # --------------------------------------------------------------------------- # 
 @patch("viewport.logging")
 @patch("viewport.api_status")
+@patch("viewport.flush_logging")
 @patch("viewport.os._exit")
-def test_signal_handler_calls_exit(mock__exit, mock_api_status, mock_logging):
+def test_signal_handler_calls_exit(mock__exit, mock_flush, mock_api_status, mock_logging):
     mock_driver = MagicMock()
 
     # Call the signal handler manually
@@ -27,9 +28,11 @@ def test_signal_handler_calls_exit(mock__exit, mock_api_status, mock_logging):
 
     # Assertions
     mock_driver.quit.assert_called_once()
-    mock_logging.info.assert_any_call(f"Gracefully shutting down chrome.")
-    mock_logging.info.assert_any_call("Gracefully shutting down script instance.")
+    mock_logging.info.assert_any_call(f"Gracefully shutting down chrome.", extra={"event": "shutdown"})
+    mock_logging.info.assert_any_call("Gracefully shutting down script instance.", extra={"event": "shutdown"})
     mock_api_status.assert_called_once_with("Stopped")
+    # Queued log records are written before os._exit skips atexit
+    mock_flush.assert_called_once_with()
     mock__exit.assert_called_once_with(0)
 
 @patch("viewport.logging")
@@ -42,8 +45,8 @@ def test_signal_handler_quit_exception(mock__exit, mock_api_status, mock_logging
     viewport.signal_handler(signum=2, frame=None, driver=mock_driver)
 
     mock_driver.quit.assert_called_once()
-    mock_logging.info.assert_any_call(f"Gracefully shutting down {viewport.BROWSER}.")
-    mock_logging.info.assert_any_call("Gracefully shutting down script instance.")
+    mock_logging.info.assert_any_call(f"Gracefully shutting down {viewport.BROWSER}.", extra={"event": "shutdown"})
+    mock_logging.info.assert_any_call("Gracefully shutting down script instance.", extra={"event": "shutdown"})
     mock_api_status.assert_called_once_with("Stopped")
     mock__exit.assert_called_once_with(0)
 
@@ -216,7 +219,7 @@ def test_browser_restart_handler(
 
     # "Page successfully reloaded." only when handle_page was True and no exception
     if should_feed_ok:
-        mock_log_info.assert_any_call("Page successfully reloaded.")
+        mock_log_info.assert_any_call("Page successfully reloaded.", extra={"event": "page_reloaded"})
     else:
         assert not any("Page successfully reloaded." in args[0][0]
             for args in mock_log_info.call_args_list)
@@ -227,3 +230,24 @@ def test_browser_restart_handler(
 
     # log_error only on exception paths
     assert mock_log_error.called == should_log_err
+# --------------------------------------------------------------------------- #
+# Test for Sampler Handler
+# --------------------------------------------------------------------------- #
+@patch("viewport.ResourceSampler")
+def test_sampler_handler_starts_once(mock_sampler_cls, tmp_path, monkeypatch):
+    monkeypatch.setattr(viewport, "sample_file", tmp_path / "samples.bin")
+    monkeypatch.setattr(viewport, "sampler", None)
+    first = viewport.sampler_handler()
+    mock_sampler_cls.return_value.start.assert_called_once()
+    assert set(mock_sampler_cls.call_args.kwargs["groups"]) == {"viewport", "monitoring", "browser"}
+    # A live sampler is reused rather than doubled up
+    mock_sampler_cls.return_value.is_alive.return_value = True
+    assert viewport.sampler_handler() is first
+    assert mock_sampler_cls.call_count == 1
+
+@patch("viewport.log_error")
+@patch("viewport.ResourceRing", side_effect=OSError("read-only"))
+def test_sampler_handler_ring_error(mock_ring, mock_log_error, monkeypatch):
+    monkeypatch.setattr(viewport, "sampler", None)
+    assert viewport.sampler_handler() is None
+    mock_log_error.assert_called_once()
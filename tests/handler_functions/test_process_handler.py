@@ -1,7 +1,7 @@
 import psutil
 import signal
 import pytest
-import viewport
+import core
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch, call
 
@@ -166,13 +166,13 @@ def _make_proc(pid, cmdline, uids=None, name=None, cpu: float = 0.0, mem: int =
         ),
     ]
 )
-@patch("viewport.logging.info")
-@patch("viewport.psutil.process_iter")
-@patch("viewport.os.geteuid")
-@patch("viewport.os.getpid")
-@patch("viewport.os.kill")
-@patch("viewport.api_status")
-@patch("viewport.time.sleep")
+@patch("core.logging.info")
+@patch("core.psutil.process_iter")
+@patch("core.os.geteuid")
+@patch("core.os.getpid")
+@patch("core.os.kill")
+@patch("core.api_status")
+@patch("core.time.sleep")
 def test_process_handler(
     mock_sleep, mock_api, mock_kill, mock_getpid, mock_geteuid, mock_iter, mock_log_info,
     proc_list, current_pid, name, action,
@@ -184,7 +184,7 @@ def test_process_handler(
     mock_getpid.return_value = current_pid
 
     # act
-    result = viewport.process_handler(name, action=action)
+    result = core.process_handler(name, action=action)
 
     # assert return value
     assert result is expected_result
@@ -212,8 +212,8 @@ def test_process_handler(
 # --------------------------------------------------------------------------- #
 # Cover the psutil.NoSuchProcess / AccessDenied path in the loop
 # --------------------------------------------------------------------------- #
-@patch("viewport.psutil.process_iter")
-@patch("viewport.time.sleep")
+@patch("core.psutil.process_iter")
+@patch("core.time.sleep")
 def test_process_handler_ignores_uninspectable_procs(mock_sleep, mock_iter):
     class BadProc:
         @property
@@ -222,7 +222,7 @@ def test_process_handler_ignores_uninspectable_procs(mock_sleep, mock_iter):
             raise psutil.NoSuchProcess(pid=123)
     mock_iter.return_value = iter([BadProc()])
     # should swallow and return False (no matches)
-    assert viewport.process_handler("anything", action="check") is False
+    assert core.process_handler("anything", action="check") is False
 
     # also cover AccessDenied
     class DeniedProc:
@@ -230,19 +230,19 @@ def test_process_handler_ignores_uninspectable_procs(mock_sleep, mock_iter):
         def info(self):
             raise psutil.AccessDenied(pid=456)
     mock_iter.return_value = iter([DeniedProc()])
-    assert viewport.process_handler("anything", action="check") is False
+    assert core.process_handler("anything", action="check") is False
 
 # --------------------------------------------------------------------------- #
 # Cover the ProcessLookupError inside the kill loop
 # --------------------------------------------------------------------------- #
-@patch("viewport.os.kill")
-@patch("viewport.os.getpid", return_value=0)
-@patch("viewport.os.geteuid", return_value=1000)
-@patch("viewport.psutil.process_iter")
-@patch("viewport.api_status")
-@patch("viewport.logging.info")
-@patch("viewport.logging.warning")
-@patch("viewport.time.sleep")
+@patch("core.os.kill")
+@patch("core.os.getpid", return_value=0)
+@patch("core.os.geteuid", return_value=1000)
+@patch("core.psutil.process_iter")
+@patch("core.api_status")
+@patch("core.logging.info")
+@patch("core.logging.warning")
+@patch("core.time.sleep")
 def test_process_handler_kill_handles_processlookuperror(
     mock_sleep, mock_warn, mock_info, mock_api, mock_iter,
     mock_geteuid, mock_getpid, mock_kill
@@ -261,7 +261,7 @@ def test_process_handler_kill_handles_processlookuperror(
     mock_kill.side_effect = ProcessLookupError
 
     # kill action
-    result = viewport.process_handler("foo", action="kill")
+    result = core.process_handler("foo", action="kill")
     assert result is False
 
     # ensure kill was attempted
@@ -276,12 +276,12 @@ def test_process_handler_kill_handles_processlookuperror(
 # --------------------------------------------------------------------------- #
 # Cover the catch-all Exception path
 # --------------------------------------------------------------------------- #
-@patch("viewport.api_status")
-@patch("viewport.log_error")
-@patch("viewport.os.geteuid", side_effect=RuntimeError("oh no"))
+@patch("core.api_status")
+@patch("core.log_error")
+@patch("core.os.geteuid", side_effect=RuntimeError("oh no"))
 def test_process_handler_catches_unexpected(mock_geteuid, mock_log_error, mock_api):
     # When get_euid blows up, we should hit the catch-all
-    result = viewport.process_handler("myproc", action="check")
+    result = core.process_handler("myproc", action="check")
     assert result is False
 
     # log_error should be called with the right message and the exception
@@ -292,4 +292,97 @@ def test_process_handler_catches_unexpected(mock_geteuid, mock_log_error, mock_a
     assert str(exc) == "oh no"
 
     # api_status should be notified too
-    mock_api.assert_called_once_with("Error Checking Process 'myproc'")
\ No newline at end of file
+    mock_api.assert_called_once_with("Error Checking Process 'myproc'")
+# --------------------------------------------------------------------------- #
+# PID file registry
+# --------------------------------------------------------------------------- #
+@pytest.fixture
+def pid_files(tmp_path, monkeypatch):
+    vp = tmp_path / "viewport.pid"
+    mon = tmp_path / "monitoring.pid"
+    monkeypatch.setattr(core, "vp_pid_file", vp)
+    monkeypatch.setattr(core, "mon_pid_file", mon)
+    return vp, mon
+
+def _fake_ps_process(pid=4242, created=1000.5, cmdline=("python3", "/opt/viewport.py"), uid=1000):
+    proc = MagicMock()
+    proc.pid = pid
+    proc.create_time.return_value = created
+    proc.cmdline.return_value = list(cmdline)
+    proc.uids.return_value = SimpleNamespace(real=uid)
+    return proc
+
+@patch("core.psutil.Process")
+def test_pid_handler_write_and_read_roundtrip(mock_process, pid_files):
+    vp, _ = pid_files
+    mock_process.return_value = _fake_ps_process()
+    with patch("core.os.geteuid", return_value=1000):
+        assert core.pid_handler("viewport.py", action="write") == 4242
+        assert vp.read_text().split() == ["4242", "1000.5"]
+        assert core.pid_handler("viewport.py", action="read") == 4242
+
+@pytest.mark.parametrize("proc_kwargs", [
+    {"created": 2000.0},                              # PID recycled
+    {"cmdline": ("python3", "/opt/monitoring.py")},   # different script
+    {"uid": 0},                                       # someone else's process
+])
+@patch("core.os.geteuid", return_value=1000)
+@patch("core.psutil.Process")
+def test_pid_handler_rejects_stale_entries(mock_process, mock_geteuid, proc_kwargs, pid_files):
+    vp, _ = pid_files
+    vp.write_text("4242\n1000.5\n")
+    mock_process.return_value = _fake_ps_process(**proc_kwargs)
+    assert core.pid_handler("viewport.py", action="read") is None
+
+@patch("core.psutil.Process", side_effect=psutil.NoSuchProcess(pid=4242))
+def test_pid_handler_dead_process(mock_process, pid_files):
+    vp, _ = pid_files
+    vp.write_text("4242\n1000.5\n")
+    assert core.pid_handler("viewport.py", action="read") is None
+
+def test_pid_handler_missing_or_garbage(pid_files):
+    vp, mon = pid_files
+    assert core.pid_handler("monitoring.py", action="read") is None
+    mon.write_text("not a pid")
+    assert core.pid_handler("monitoring.py", action="read") is None
+    # Browsers have no registry entry
+    assert core.pid_handler("chrome", action="read") is None
+
+def test_pid_handler_clear_only_own_entry(pid_files):
+    vp, _ = pid_files
+    vp.write_text("4242\n1000.5\n")
+    with patch("core.os.getpid", return_value=1):
+        core.pid_handler("viewport.py", action="clear")
+    assert vp.exists()
+    with patch("core.os.getpid", return_value=4242):
+        core.pid_handler("viewport.py", action="clear")
+    assert not vp.exists()
+
+@pytest.mark.parametrize("values, registered, trusted", [
+    (None, 4242, False),
+    ({"pid": 4242, "phase": "running"}, 4242, True),
+    ({"pid": 4242, "phase": "stopped"}, 4242, False),   # stopped cleanly
+    ({"pid": 4242, "phase": "running"}, None, False),   # killed, crashed or rebooted
+    ({"pid": 4242, "phase": "running"}, 5151, False),   # another instance since
+    ({"pid": 0, "phase": "running"}, None, False),
+])
+def test_live_state_requires_a_running_writer(values, registered, trusted):
+    with patch("core.pid_handler", return_value=registered):
+        assert core.live_state(values) is (values if trusted else None)
+
+@patch("core.psutil.process_iter")
+@patch("core.pid_handler", return_value=4242)
+@patch("core.os.getpid", return_value=1)
+def test_process_handler_check_uses_pid_file(mock_getpid, mock_pid, mock_iter):
+    assert core.process_handler("viewport.py", action="check") is True
+    mock_pid.assert_called_once_with("viewport.py", action="read")
+    mock_iter.assert_not_called()
+
+@patch("core.psutil.process_iter")
+@patch("core.pid_handler", return_value=None)
+@patch("core.os.geteuid", return_value=1000)
+@patch("core.os.getpid", return_value=1)
+def test_process_handler_check_falls_back_to_scan(mock_getpid, mock_geteuid, mock_pid, mock_iter):
+    mock_iter.return_value = iter([_make_proc(7, ["python", "monitoring.py"])])
+    assert core.process_handler("monitoring.py", action="check") is True
+    mock_iter.assert_called_once()
@@ -198,4 +198,23 @@ def test_restart_handler_detach(monkeypatch,
     assert kwargs["stdout"] == subprocess.DEVNULL
     assert kwargs["stderr"] == subprocess.DEVNULL
     assert kwargs["close_fds"]         is True
-    assert kwargs["start_new_session"] is True
\ No newline at end of file
+    assert kwargs["start_new_session"] is True
+# --------------------------------------------------------------------------- #
+# The restart is counted and written before the process is replaced
+# --------------------------------------------------------------------------- #
+@patch("viewport.sys.exit")
+@patch("viewport.subprocess.Popen")
+@patch("viewport.time.sleep", return_value=None)
+@patch("viewport.api_status")
+def test_restart_handler_flushes_metrics(mock_api_status, mock_sleep, mock_popen, mock_exit,
+                                         monkeypatch, tmp_path):
+    import metrics
+    store = metrics.MetricsStore(tmp_path / "metrics.json", interval=3600)
+    store.inc("retries")  # starts the write interval
+    monkeypatch.setattr(viewport, "metrics", store)
+    viewport.sys.argv = ["viewport.py"]
+
+    viewport.restart_handler(None)
+
+    data = metrics.read_metrics(tmp_path / "metrics.json")
+    assert data["counters"]["script_restarts"] == 1
@@ -1,5 +1,9 @@
+import gzip, json, os, subprocess, sys
 import pytest
-import viewport
+import viewport, logging_config
+import core
+from core import status_entry
+from state import StateBlock
 from datetime import datetime
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch, call
@@ -7,19 +11,23 @@ from unittest.mock import MagicMock, patch, call
 # --------------------------------------------------------------------------- #
 # Helper function and fixture
 # --------------------------------------------------------------------------- #
+def journal(*messages):
+    return "".join(json.dumps(status_entry(m)) + "\n" for m in messages)
+
 @pytest.fixture(autouse=True)
 def isolate_all_files(tmp_path, monkeypatch):
     fake_sst    = tmp_path / "sst.txt"
-    fake_status = tmp_path / "status.txt"
+    fake_status = tmp_path / "status.jsonl"
     fake_log    = tmp_path / "viewport.log"
 
     fake_sst.write_text("2025-01-01 00:00:00.000000")
-    fake_status.write_text("OK\n")
+    fake_status.write_text(journal("OK"))
     fake_log.write_text("[INFO] test\n")
 
     monkeypatch.setattr(viewport, "sst_file",    fake_sst)
     monkeypatch.setattr(viewport, "status_file", fake_status)
     monkeypatch.setattr(viewport, "log_file",    fake_log)
+    monkeypatch.setattr(viewport, "state_file",  tmp_path / "state.bin")
     
     yield fake_sst, fake_status, fake_log
 @pytest.fixture
@@ -125,7 +133,7 @@ def test_status_handler(
     if not status_exists:
         fake_status.unlink()
     else:
-        fake_status.write_text("Feed Healthy\n")
+        fake_status.write_text(journal("Feed Healthy"))
 
     #log_content?
     if log_content is None:
@@ -134,7 +142,7 @@ def test_status_handler(
         fake_log.write_text(log_content)
 
     # stub process_handler: running iff name in process_names
-    mock_process_handler.side_effect = lambda name, action="check": name in process_names
+    mock_process_handler.side_effect = lambda name, action="check", procs=None: name in process_names
 
     # run
     viewport.status_handler()
@@ -191,7 +199,7 @@ def test_status_handler_param(
     fake_sst, fake_status, fake_log = isolate_all_files
     
     viewport.SLEEP_TIME  = sleep_time
-    fake_status.write_text(status_text)
+    fake_status.write_text(journal("Starting...", status_text.strip()))
 
     # stub next-interval
     mock_interval.return_value = next_interval
@@ -251,6 +259,59 @@ def test_status_handler_malformed_timestamp_covered(
     # and we never hit the outer FileNotFound
     assert "Uptime file not found" not in out
     
+@patch("viewport.time.time", return_value=0)
+@patch("viewport.get_next_interval", return_value=5)
+@patch("viewport.psutil.virtual_memory", return_value=MagicMock(total=1024**3))
+@patch("viewport.process_handler", return_value=True)
+@patch("viewport.usage_handler", return_value=(0.0, 0.0))
+@patch("viewport.get_cpu_color",  return_value=viewport.GREEN)
+@patch("viewport.get_mem_color",  return_value=viewport.GREEN)
+def test_status_handler_reads_state_block(
+    mock_mem_color,
+    mock_cpu_color,
+    mock_usage,
+    mock_proc,
+    mock_mem,
+    mock_interval,
+    mock_time,
+    default_status_env,
+    isolate_all_files,
+    monkeypatch,
+    capsys
+):
+    fake_sst, fake_status, fake_log = isolate_all_files
+    # Files say otherwise; the live block wins
+    fake_sst.write_text("not-a-timestamp\n")
+    monkeypatch.setattr(core, "pid_handler", lambda name, action="read": os.getpid())
+    block = StateBlock(viewport.state_file)
+    block.update(pid=os.getpid(), phase="running",
+                 started=datetime.now().timestamp() - 3700, status="Tab Crashed", severity="error")
+    viewport.status_handler()
+    block.close()
+    out = capsys.readouterr().out
+    assert f"{viewport.GREEN}1h 1m" in out
+    assert f"{viewport.RED}Tab Crashed{viewport.NC}" in out
+
+@patch("viewport.cpu_sampler", return_value={})
+@patch("viewport.psutil.virtual_memory", return_value=SimpleNamespace(total=1024**3))
+@patch("viewport.psutil.process_iter", return_value=[])
+def test_status_handler_ignores_block_of_dead_daemon(
+    mock_iter, mock_vm, mock_sampler, default_status_env, isolate_all_files, monkeypatch, capsys
+):
+    # SIGKILLed daemon: its block still says healthy, the journal is the truth
+    proc = subprocess.Popen([sys.executable, "-c", ""])
+    proc.wait()
+    pid_file = isolate_all_files[0].parent / "viewport.pid"
+    pid_file.write_text(f"{proc.pid}\n1000.5\n")
+    monkeypatch.setattr(core, "vp_pid_file", pid_file)
+    block = StateBlock(viewport.state_file)
+    block.update(pid=proc.pid, phase="running", status="Feed Healthy")
+    viewport.status_handler()
+    block.close()
+    out = capsys.readouterr().out
+    assert "Feed Healthy" not in out
+    assert f"{viewport.GREEN}OK{viewport.NC}" in out
+
 @patch("viewport.log_error")
 @patch("viewport.process_handler", side_effect=FileNotFoundError)
 def test_status_handler_outer_file_not_found(mock_proc, mock_log_error, capsys):
@@ -369,4 +430,72 @@ def test_status_handler_log_coloring(
     out = capsys.readouterr().out
 
     # assert: last log entry is wrapped in the expected color
-    assert f"{expected_color}{log_line}{viewport.NC}" in out
\ No newline at end of file
+    assert f"{expected_color}{log_line}{viewport.NC}" in out
+# --------------------------------------------------------------------------- #
+# status_handler walks the process table and samples CPU only once
+# --------------------------------------------------------------------------- #
+@patch("viewport.cpu_sampler", return_value={})
+@patch("viewport.psutil.virtual_memory", return_value=SimpleNamespace(total=1024**3))
+@patch("viewport.psutil.process_iter", return_value=[])
+def test_status_handler_single_snapshot(mock_iter, mock_vm, mock_sampler, default_status_env, capsys):
+    viewport.status_handler()
+    mock_iter.assert_called_once()
+    mock_sampler.assert_called_once()
+    assert "Usage:" in capsys.readouterr().out
+# --------------------------------------------------------------------------- #
+# status_handler prefers the daemon's background sample when it is fresh
+# --------------------------------------------------------------------------- #
+@pytest.mark.parametrize("running, fresh, expect_ring", [
+    (True,  True,  True),
+    (True,  False, False),
+    (False, True,  False),
+])
+@patch("viewport.usage_handler", return_value=(0.0, 0))
+@patch("viewport.cpu_sampler", return_value={})
+@patch("viewport.psutil.virtual_memory", return_value=SimpleNamespace(total=1024**3))
+@patch("viewport.psutil.process_iter", return_value=[])
+def test_status_handler_uses_ring_sample(
+    mock_iter, mock_vm, mock_sampler, mock_usage,
+    running, fresh, expect_ring, default_status_env, monkeypatch, capsys
+):
+    sample = {"viewport_cpu": 1.5, "viewport_rss": 1024**3,
+              "monitoring_cpu": 0.0, "monitoring_rss": 0,
+              "browser_cpu": 0.0, "browser_rss": 0}
+    mock_latest = MagicMock(return_value=sample if fresh else None)
+    monkeypatch.setattr(viewport, "latest_sample", mock_latest)
+    monkeypatch.setattr(viewport, "process_handler", lambda *a, **k: running)
+    viewport.status_handler()
+    out = capsys.readouterr().out
+    assert mock_latest.called is running
+    if expect_ring:
+        mock_usage.assert_not_called()
+        assert "01.5%" in out and "1.0GB" in out
+    else:
+        assert mock_usage.call_count == 3
+# --------------------------------------------------------------------------- #
+# status_handler never decompresses a gzipped backup for the last log entry
+# --------------------------------------------------------------------------- #
+@pytest.mark.parametrize("backup, expected", [
+    ("viewport.log.2025-01-01",    "[INFO] yesterday"),
+    ("viewport.log.2025-01-01.gz", "No log entries yet."),
+])
+@patch("viewport.cpu_sampler", return_value={})
+@patch("viewport.psutil.virtual_memory", return_value=SimpleNamespace(total=1024**3))
+@patch("viewport.psutil.process_iter", return_value=[])
+def test_status_handler_skips_compressed_backups(
+    mock_iter, mock_vm, mock_sampler, backup, expected,
+    isolate_all_files, default_status_env, monkeypatch, capsys
+):
+    _, _, fake_log = isolate_all_files
+    fake_log.write_text("")     # just rotated
+    path = fake_log.parent / backup
+    if path.suffix == ".gz":
+        with gzip.open(path, "wt") as f:
+            f.write("[INFO] yesterday\n")
+    else:
+        path.write_text("[INFO] yesterday\n")
+    mock_tail = MagicMock(return_value=[])
+    monkeypatch.setattr(logging_config, "tail_compressed", mock_tail)
+    viewport.status_handler()
+    assert expected in capsys.readouterr().out
+    mock_tail.assert_not_called()
@@ -68,3 +68,78 @@ def test_usage_handler_ignores_exceptions(mock_process_iter):
     cpu, mem = viewport.usage_handler("target")
     assert cpu == pytest.approx(10.0)
     assert mem == 100000
+
+# --------------------------------------------------------------------------- #
+# Batched sampling
+# --------------------------------------------------------------------------- #
+@patch("viewport.time.sleep")
+def test_cpu_sampler_sleeps_once_for_all_processes(mock_sleep):
+    procs = [_make_proc(pid, ["chrome", f"--type={t}"], cpu=1.5, mem=10)
+             for pid, t in enumerate(("renderer", "gpu-process", "utility"), start=1)]
+    samples = viewport.cpu_sampler(procs, interval=0.1)
+    mock_sleep.assert_called_once_with(0.1)
+    assert samples == {1: (1.5, 10), 2: (1.5, 10), 3: (1.5, 10)}
+    # every process was primed before the single read
+    for p in procs:
+        assert p.cpu_percent.call_count == 2
+
+@patch("viewport.time.sleep")
+def test_cpu_sampler_no_processes_does_not_sleep(mock_sleep):
+    assert viewport.cpu_sampler([]) == {}
+    mock_sleep.assert_not_called()
+
+@patch("viewport.time.sleep")
+@patch("viewport.psutil.process_iter")
+def test_usage_handler_reuses_snapshot_and_samples(mock_iter, mock_sleep):
+    procs = [_make_proc(1, ["python", "viewport.py"]), _make_proc(2, ["chrome"])]
+    samples = {1: (4.0, 400), 2: (6.0, 600)}
+    assert viewport.usage_handler("viewport.py", procs, samples) == (4.0, 400)
+    assert viewport.usage_handler("chrome", procs, samples) == (6.0, 600)
+    mock_iter.assert_not_called()
+    mock_sleep.assert_not_called()
+
+# --------------------------------------------------------------------------- #
+# Browser process tree and per-type breakdown
+# --------------------------------------------------------------------------- #
+def _tree_procs():
+    # chromedriver(10) → chrome(11) → renderer(12), gpu(13), network(14)
+    # plus an unrelated chrome window (20) that must be ignored
+    specs = [
+        (10, 1,  ["chromedriver", "--port=1234"]),
+        (11, 10, ["chrome", "--remote-debugging-port=9222"]),
+        (12, 11, ["chrome", "--type=renderer"]),
+        (13, 11, ["chrome", "--type=gpu-process"]),
+        (14, 11, ["chrome", "--type=utility", "--utility-sub-type=network.mojom.NetworkService"]),
+        (15, 12, ["chrome", "--type=renderer"]),
+        (20, 1,  ["chrome"]),
+    ]
+    procs = []
+    for pid, ppid, cmd in specs:
+        proc = _make_proc(pid, cmd)
+        proc.info["ppid"] = ppid
+        procs.append(proc)
+    return procs
+
+@patch("viewport.os.geteuid", return_value=1000)
+def test_browser_tree_follows_driver_service(mock_geteuid, monkeypatch):
+    monkeypatch.setattr(viewport, "BROWSER", "chrome")
+    pids = sorted(p.info["pid"] for p in viewport.browser_tree(_tree_procs()))
+    assert pids == [11, 12, 13, 14, 15]
+
+def test_browser_tree_uses_driver_service_pid(monkeypatch):
+    monkeypatch.setattr(viewport, "BROWSER", "chrome")
+    driver = SimpleNamespace(service=SimpleNamespace(process=SimpleNamespace(pid=12)))
+    pids = [p.info["pid"] for p in viewport.browser_tree(_tree_procs(), driver=driver)]
+    assert pids == [15]
+
+@patch("viewport.os.geteuid", return_value=1000)
+def test_browser_usage_handler_breakdown(mock_geteuid, monkeypatch):
+    monkeypatch.setattr(viewport, "BROWSER", "chrome")
+    samples = {11: (1.0, 100), 12: (2.0, 200), 13: (30.0, 300), 14: (0.5, 50), 15: (4.0, 400)}
+    breakdown = viewport.browser_usage_handler(_tree_procs(), samples)
+    assert breakdown == {
+        "browser":  {"count": 1, "cpu": 1.0,  "mem": 100},
+        "renderer": {"count": 2, "cpu": 6.0,  "mem": 600},
+        "gpu":      {"count": 1, "cpu": 30.0, "mem": 300},
+        "network":  {"count": 1, "cpu": 0.5,  "mem": 50},
+    }
@@ -3,6 +3,20 @@ import types
 import monitoring
 from unittest.mock import patch, MagicMock
 
+@pytest.fixture(autouse=True)
+def stub_sampler(monkeypatch):
+    # the server starts the resource sampler; never spawn a real thread here
+    fake = MagicMock()
+    fake.is_alive.return_value = False
+    monkeypatch.setattr(monitoring, "sampler", fake)
+    # likewise the release refresher, which would contact GitHub
+    refresher = MagicMock()
+    refresher.is_alive.return_value = False
+    monkeypatch.setattr(monitoring, "release_refresher", refresher)
+    # main() tests exercise the Flask fallback unless they opt into gunicorn
+    monkeypatch.setattr(monitoring, "BaseApplication", None)
+    return fake
+
 class DummyApp:
     def __init__(self):
         self.run_called = False
@@ -27,6 +41,8 @@ def test_main_with_valid_config(monkeypatch):
 
     assert dummy.run_called is True
     assert dummy.run_args == ("1.2.3.4", 2500)
+    monitoring.sampler.start.assert_called_once()
+    monitoring.release_refresher.start.assert_called_once()
 
 def test_main_with_missing_host_port(monkeypatch):
     # Stub process_handler again
@@ -124,4 +140,53 @@ def test_main_process_handler_true(monkeypatch):
     # Assert that create_app().run(...) was invoked using the host and port from patch_validate_config
     assert dummy_app.run_called is True, "create_app().run() was not invoked"
     assert dummy_app.run_args == (monitoring.host, monitoring.port)
-    _ = fake_process_handler("monitoring.py", action="noop")
\ No newline at end of file
+    _ = fake_process_handler("monitoring.py", action="noop")
+
+# --------------------------------------------------------------------------- #
+# serve() with gunicorn
+# --------------------------------------------------------------------------- #
+@pytest.mark.parametrize("host, port, bind", [
+    ("0.0.0.0", 8080, "0.0.0.0:8080"),
+    ("", 0, "127.0.0.1:5000"),
+])
+def test_serve_uses_gunicorn(monkeypatch, host, port, bind):
+    recorded = {}
+    class FakeServer:
+        def __init__(self, options):
+            recorded["options"] = options
+        def run(self):
+            recorded["ran"] = True
+    monkeypatch.setattr(monitoring, "BaseApplication", object)
+    monkeypatch.setattr(monitoring, "APIServer", FakeServer, raising=False)
+    monkeypatch.setattr(monitoring, "API_WORKERS", 2)
+    monkeypatch.setattr(monitoring, "API_THREADS", 16)
+    monkeypatch.setattr(monitoring, "API_KEEPALIVE", 7)
+    monkeypatch.setattr(monitoring, "API_TIMEOUT", 45)
+    create = MagicMock()
+    monkeypatch.setattr(monitoring, "create_app", create)
+
+    monitoring.serve(host, port)
+
+    opts = recorded["options"]
+    assert recorded["ran"] is True
+    assert opts["bind"] == bind
+    assert opts["worker_class"] == "gthread"
+    assert (opts["workers"], opts["threads"], opts["keepalive"], opts["timeout"]) == (2, 16, 7, 45)
+    # the app and sampler are built inside the workers, not the master
+    create.assert_not_called()
+    monitoring.sampler.start.assert_not_called()
+    monitoring.release_refresher.start.assert_not_called()
+
+def test_api_server_loads_app_in_worker(monkeypatch):
+    gunicorn_base = pytest.importorskip("gunicorn.app.base")
+    if not hasattr(monitoring, "APIServer"):
+        pytest.skip("monitoring imported without gunicorn")
+    app = object()
+    monkeypatch.setattr(monitoring, "create_app", lambda: app)
+    server = monitoring.APIServer({"bind": "127.0.0.1:5999", "worker_class": "gthread", "threads": 4})
+    assert isinstance(server, gunicorn_base.BaseApplication)
+    assert server.cfg.bind == ["127.0.0.1:5999"]
+    assert server.cfg.threads == 4
+    assert server.load() is app
+    monitoring.sampler.start.assert_called_once()
+    monitoring.release_refresher.start.assert_called_once()
@@ -51,7 +51,8 @@ def patch_validate_config(monkeypatch, tmp_path):
             mon_file=tmp_path / "api" / "mon.txt",
             log_file=tmp_path / "logs" / "viewport.log",
             sst_file=tmp_path / "api" / "sst.txt",
-            status_file=tmp_path / "api" / "status.txt",
+            status_file=tmp_path / "api" / "status.jsonl",
+            state_file=tmp_path / "api" / "state.bin",
         )
 
     monkeypatch.setattr(monitoring, "validate_config", fake_validate_config)
@@ -159,6 +160,38 @@ def test_control_requires_login_for_all_actions(tmp_path, monkeypatch, action):
     assert resp.status_code == 302
     assert f"/login?next=/api/control/{action}" in resp.headers["Location"]
 
+@pytest.fixture
+def daemon_socket(tmp_path, monkeypatch):
+    # A stand-in daemon listening on the control socket
+    import control
+    commands = []
+    srv = control.ControlServer(tmp_path / "viewport.sock", {
+        name: (lambda name=name: commands.append(name) or {"ok": name})
+        for name in ("soft-restart", "quit", "pause", "resume")
+    }).open()
+    monkeypatch.setattr(monitoring, "control_file", srv.path)
+    srv.commands = commands
+    yield srv
+    srv.stop()
+    srv.join(5)
+
+@pytest.mark.parametrize("action, command", [
+    ("restart", "soft-restart"), ("quit", "quit"), ("pause", "pause"), ("resume", "resume"),
+])
+def test_api_control_uses_daemon_socket(client, daemon_socket, monkeypatch, action, command):
+    monkeypatch.setattr(subprocess, "Popen", lambda *a, **k: pytest.fail("spawned viewport.py"))
+    resp = client.post(f"/api/control/{action}")
+    assert resp.status_code == 202
+    assert resp.get_json()["data"] == {"ok": command}
+    assert daemon_socket.commands == [command]
+
+@pytest.mark.parametrize("action", ["pause", "resume"])
+def test_api_control_pause_needs_running_daemon(client, tmp_path, monkeypatch, action):
+    monkeypatch.setattr(monitoring, "control_file", tmp_path / "missing.sock")
+    resp = client.post(f"/api/control/{action}")
+    assert resp.status_code == 409
+    assert resp.get_json()["message"] == "Fake Viewport is not running"
+
 @pytest.mark.parametrize("exc_msg", ["boom", "kaboom"])
 def test_api_control_dispatch_failure(client, monkeypatch, exc_msg):
     client_app = client
@@ -1,9 +1,11 @@
 import pytest
 from datetime import datetime as real_datetime, time as timecls, timedelta
 from pathlib import Path
-import psutil, builtins, subprocess, io, os, time
-import monitoring
+import psutil, builtins, subprocess, io, os, sys, time, json
+import monitoring, sampler, core, assets
+from state import StateBlock
 from types import SimpleNamespace
+from flask import request, jsonify
 # --------------------------------------------------------------------------- #
 # Fake out datetime.now() for determinism
 # --------------------------------------------------------------------------- #
@@ -25,6 +27,10 @@ class DummyDateTime:
         from datetime import datetime as real_datetime
         return real_datetime.strptime(s, fmt)
 
+    @staticmethod
+    def fromisoformat(s):
+        return real_datetime.fromisoformat(s)
+
 @pytest.fixture(autouse=True)
 def patch_datetime(monkeypatch):
     monkeypatch.setattr(monitoring, 'datetime', DummyDateTime)
@@ -73,7 +79,8 @@ def client(tmp_path, monkeypatch, restart_times):
         mon_file=tmp_path / 'api' / 'mon.txt',
         log_file=tmp_path / 'logs' / 'viewport.log',
         sst_file=tmp_path / 'api' / 'sst.txt',
-        status_file=tmp_path / 'api' / 'status.txt',
+        status_file=tmp_path / 'api' / 'status.jsonl',
+        state_file=tmp_path / 'api' / 'state.bin',
     )
     monkeypatch.setattr(monitoring, 'validate_config', lambda **kw: cfg)
 
@@ -113,13 +120,21 @@ def test_api_index_links(client):
         'script_uptime',
         'system_info',
         'logs',
+        'logs/search',
         'status',
+        'state',
         'config',
+        'browser_usage',
+        'resources',
+        'snapshot',
+        'stream',
+        'history',
+        'metrics',
     }
     assert set(data.keys()) == expected
     for key, url in data.items():
-        if key == 'dashboard':
-            assert url.endswith('/dashboard')
+        if key in ('dashboard', 'metrics'):
+            assert url.endswith(f'/{key}')
         else:
             assert url.endswith(f'/api/{key}')
 
@@ -191,39 +206,97 @@ def test_script_uptime_ok(client, tmp_path, monkeypatch):
     assert obj["data"]["running"] is True
     # numeric comparison with small relative tolerance
     assert pytest.approx(obj["data"]["uptime"], rel=1e-3) == 10
+
+def test_script_uptime_prefers_state_block(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(monitoring, "datetime", real_datetime)
+    monkeypatch.setattr(core, "pid_handler", lambda name, action="read": os.getpid())
+    # A malformed sst.txt is ignored once the daemon publishes its state
+    (tmp_path / "api" / "sst.txt").write_text("garbage")
+    block = StateBlock(tmp_path / "api" / "state.bin")
+    block.update(pid=os.getpid(), started=real_datetime.now().timestamp() - 10, phase="running")
+    data = client.get("/api/script_uptime").get_json()["data"]
+    assert data["running"] is True
+    assert data["uptime"] == pytest.approx(10, abs=1)
+    # Stopped cleanly: the block says so without reading sst.txt
+    block.update(started=None, phase="stopped")
+    assert client.get("/api/script_uptime").get_json()["data"] == {"running": False, "uptime": None}
+    block.close()
+
+def test_script_uptime_ignores_block_of_dead_daemon(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(monitoring, "datetime", real_datetime)
+    # SIGKILLed: the block still says running, but sst.txt was never cleared either
+    (tmp_path / "api" / "sst.txt").write_text("")
+    proc = subprocess.Popen([sys.executable, "-c", ""])
+    proc.wait()
+    monkeypatch.setattr(core, "vp_pid_file", tmp_path / "api" / "viewport.pid")
+    (tmp_path / "api" / "viewport.pid").write_text(f"{proc.pid}\n1000.5\n")
+    block = StateBlock(tmp_path / "api" / "state.bin")
+    block.update(pid=proc.pid, started=real_datetime.now().timestamp() - 10, phase="running",
+                 status="Feed Healthy")
+    assert client.get("/api/script_uptime").get_json()["data"] == {"running": False, "uptime": None}
+    block.close()
+
+# --------------------------------------------------------------------------- #
+# /api/state
+# --------------------------------------------------------------------------- #
+def test_state_missing(client):
+    resp = client.get("/api/state")
+    assert resp.status_code == 200
+    assert resp.get_json() == {"status": "ok", "data": None}
+
+def test_state_ok(client, tmp_path):
+    block = StateBlock(tmp_path / "api" / "state.bin")
+    block.update(pid=123, phase="paused", paused=True, status="Paused", severity="warning")
+    data = client.get("/api/state").get_json()["data"]
+    assert data["pid"] == 123
+    assert (data["phase"], data["paused"]) == ("paused", True)
+    assert (data["status"], data["severity"]) == ("Paused", "warning")
+    block.close()
 # --------------------------------------------------------------------------- #
 # /api/system_info
 # --------------------------------------------------------------------------- #
-def test_api_system_info_ok(client, monkeypatch):
-    # Mock the network statistics
-    class LastNetIO:
-        bytes_sent = 500  # initial value
-        bytes_recv = 1000  # initial value
-        
-    class CurrentNetIO:
-        bytes_sent = 1000  # current value (500 more than last)
-        bytes_recv = 2000  # current value (1000 more than last)
-        
-    def mock_net_io_counters(pernic, nowrap):
-        return {'eth0': CurrentNetIO()}
-    
-    # Mock last_net_io and last_check_time
-    monkeypatch.setattr(monitoring, 'last_net_io', {'eth0': LastNetIO()})
-    monkeypatch.setattr(monitoring, 'last_check_time', 1009)  # 1 second before current time (1010)
-    
-    # Existing mocks
+class FakeSampler:
+    # Stands in for the background ResourceSampler
+    interval = 5
+    def __init__(self, latest=None, interfaces=None, alive=True):
+        self.latest = latest
+        self.net_interfaces = interfaces or {}
+        self.alive = alive
+        self.calls = 0
+        self.seq = 0
+    def is_alive(self):
+        return self.alive
+    def sample(self):
+        self.calls += 1
+        self.seq += 1
+        self.latest = {"timestamp": time.time(), "cpu_percent": 42.0}
+        return self.latest
+
+def _iface(up, down):
+    return {"upload": up, "download": down, "total_upload": up * 10, "total_download": down * 10}
+
+@pytest.fixture
+def system_env(monkeypatch):
+    # Deterministic host facts for /api/system_info
+    opened = []
     def fake_open(path, mode='r', *args, **kwargs):
+        opened.append(path)
         if path == "/etc/os-release": return io.StringIO('PRETTY_NAME="TestOS"\n')
         elif path == "/proc/device-tree/model": return io.StringIO("FakeModel")
-
     monkeypatch.setattr(builtins, "open", fake_open)
-    monkeypatch.setattr(subprocess, "check_output", lambda args: b"Filesystem\n100G\n")
+    monkeypatch.setattr(monitoring.os, "statvfs", lambda p: SimpleNamespace(f_bavail=25 * 1024**2, f_frsize=4096))
     monkeypatch.setattr(psutil, "virtual_memory", lambda: SimpleNamespace(used=12345, total=67890, percent=50))
     monkeypatch.setattr(psutil, "boot_time", lambda: 1000)
-    monkeypatch.setattr(psutil, "cpu_percent", lambda interval: 10)
     monkeypatch.setattr(psutil, "cpu_count", lambda logical: 4 if logical else 2)
-    monkeypatch.setattr(psutil, "net_io_counters", mock_net_io_counters)
     monkeypatch.setattr(monitoring.time, "time", lambda: 1010)
+    return opened
+
+def test_api_system_info_ok(client, monkeypatch, system_env):
+    fake = FakeSampler(
+        latest={"timestamp": 1008, "cpu_percent": 10.0},
+        interfaces={"eth0": _iface(500.0, 1000.0)},
+    )
+    monkeypatch.setattr(monitoring, "sampler", fake)
 
     resp = client.get("/api/system_info")
     assert resp.status_code == 200
@@ -234,25 +307,46 @@ def test_api_system_info_ok(client, monkeypatch):
     assert data["disk_available"] == "100G"
     assert data["memory"]["used"] == 12345
     assert data["memory"]["total"] == 67890
+    assert data["cpu"] == {"percent": 10.0, "cores": 2, "threads": 4}
     assert pytest.approx(data["system_uptime"], rel=1e-3) == 10
-    
-    # Network assertions
-    assert "network" in data
-    assert "interfaces" in data["network"]
-    assert "eth0" in data["network"]["interfaces"]
-    
-    # Calculate expected rates:
-    # Time elapsed = 1010 - 1009 = 1 second
-    # Upload: (1000 - 500) / 1 = 500 bytes/sec
-    # Download: (2000 - 1000) / 1 = 1000 bytes/sec
-    assert data["network"]["interfaces"]["eth0"]["upload"] == pytest.approx(500.0)
-    assert data["network"]["interfaces"]["eth0"]["download"] == pytest.approx(1000.0)
-    assert data["network"]["interfaces"]["eth0"]["total_upload"] == 1000
-    assert data["network"]["interfaces"]["eth0"]["total_download"] == 2000
+    eth0 = data["network"]["interfaces"]["eth0"]
+    assert eth0["interface"] == "eth0"
+    assert eth0["upload"] == pytest.approx(500.0)
+    assert eth0["download"] == pytest.approx(1000.0)
+    assert data["network"]["primary_interface"] == eth0
+    # A running sampler is never asked to sample on the request path
+    assert fake.calls == 0
+
+def test_api_system_info_reads_static_facts_once(client, monkeypatch, system_env):
+    monkeypatch.setattr(monitoring, "sampler", FakeSampler(latest={"timestamp": 1008, "cpu_percent": 1.0}))
+    for _ in range(3):
+        assert client.get("/api/system_info").status_code == 200
+    assert system_env.count("/etc/os-release") == 1
+
+@pytest.mark.parametrize("latest, expected_calls", [
+    (None, 1),                                          # nothing sampled yet
+    ({"timestamp": 1000, "cpu_percent": 1.0}, 1),       # stale
+    ({"timestamp": 1008, "cpu_percent": 1.0}, 0),       # within one interval
+])
+def test_api_system_info_samples_inline_without_thread(client, monkeypatch, system_env, latest, expected_calls):
+    fake = FakeSampler(latest=latest, alive=False)
+    monkeypatch.setattr(monitoring, "sampler", fake)
+    resp = client.get("/api/system_info")
+    assert resp.status_code == 200
+    assert fake.calls == expected_calls
+
+def test_api_system_info_samples_inline_before_first_sample(client, monkeypatch, system_env):
+    # A running sampler that has not produced a sample yet
+    fake = FakeSampler(latest=None)
+    monkeypatch.setattr(monitoring, "sampler", fake)
+    resp = client.get("/api/system_info")
+    assert resp.status_code == 200
+    assert resp.get_json()["data"]["cpu"]["percent"] == 42.0
+    assert fake.calls == 1
+
 @pytest.mark.parametrize(
-    "fake_open, mock_gethostname, last_check, now, expected_model",
+    "fake_open, mock_gethostname, expected_model",
     [
-        # /etc/os-release → OK
         # /proc/device-tree/model → FileNotFoundError
         # /sys/.../product_name → PermissionError
         # → fallback to hostname → "test-computer"
@@ -267,13 +361,10 @@ def test_api_system_info_ok(client, monkeypatch):
                 else (_ for _ in ()).throw(FileNotFoundError())
             ),
             lambda: "test-computer",
-            149,
-            150,
             "test-computer",
         ),
-        # /etc/os-release → OK
         # everything else → FileNotFoundError
-        # mock_gethostname raises Exception → final fallback → "Unknown (Fallback Failed)"
+        # mock_gethostname raises Exception → final fallback
         (
             lambda path, mode='r', *args, **kwargs: (
                 io.StringIO('PRETTY_NAME="TestOS"\n')
@@ -281,14 +372,10 @@ def test_api_system_info_ok(client, monkeypatch):
                 else (_ for _ in ()).throw(FileNotFoundError())
             ),
             lambda: (_ for _ in ()).throw(Exception("Hostname failed")),
-            259,
-            260,
             "Unknown (Fallback Failed)",
         ),
-        # /etc/os-release → OK
         # /proc/device-tree/model → FileNotFoundError
         # /sys/.../product_name → returns "DMI_TEST_MODEL"
-        # → hardware_model = "DMI_TEST_MODEL"
         (
             lambda path, mode='r', *args, **kwargs: (
                 io.StringIO('PRETTY_NAME="TestOS"\n')
@@ -300,14 +387,10 @@ def test_api_system_info_ok(client, monkeypatch):
                 else (_ for _ in ()).throw(FileNotFoundError())
             ),
             lambda: "unused-hostname",
-            149,
-            150,
             "DMI_TEST_MODEL",
         ),
-        # /etc/os-release → OK
         # everything else → FileNotFoundError
         # mock_gethostname returns "fallback-host"
-        # → hardware_model = "fallback-host"
         (
             lambda path, mode='r', *args, **kwargs: (
                 io.StringIO('PRETTY_NAME="TestOS"\n')
@@ -315,150 +398,67 @@ def test_api_system_info_ok(client, monkeypatch):
                 else (_ for _ in ()).throw(FileNotFoundError())
             ),
             lambda: "fallback-host",
-            149,
-            150,
             "fallback-host",
         ),
     ],
 )
 def test_api_system_info_hardware_model_variants(
-    client, monkeypatch,
-    fake_open, mock_gethostname, last_check, now, expected_model
+    client, monkeypatch, system_env,
+    fake_open, mock_gethostname, expected_model
 ):
-    # Stub out “last_net_io” and “last_check_time” so the network‐rate portion runs
-    class DummyNetIO:
-        bytes_sent = 1000
-        bytes_recv = 2000
-
-    def mock_net_io_counters(pernic, nowrap):
-        return {'eth0': DummyNetIO()}
-
-    monkeypatch.setattr(monitoring, 'last_net_io', {'eth0': DummyNetIO()})
-    monkeypatch.setattr(monitoring, 'last_check_time', last_check)
-    monkeypatch.setattr(psutil, "net_io_counters", mock_net_io_counters)
-    monkeypatch.setattr(psutil, "cpu_percent", lambda interval: 10)
-    monkeypatch.setattr(psutil, "cpu_count", lambda logical: 4 if logical else 2)
-
-    # Stub out socket.gethostname (either returns a name or raises)
+    monkeypatch.setattr(monitoring, "sampler", FakeSampler(latest={"timestamp": 1008, "cpu_percent": 1.0}))
     monkeypatch.setattr(monitoring.socket, "gethostname", mock_gethostname)
-
-    # Stub builtins.open to our fake_open
     monkeypatch.setattr(builtins, "open", fake_open)
 
-    # Stub subprocess.check_output, psutil.virtual_memory, psutil.boot_time, and time.time
-    monkeypatch.setattr(subprocess, "check_output", lambda args: b"Filesystem\n50G\n")
-    monkeypatch.setattr(psutil, "virtual_memory", lambda: SimpleNamespace(used=1111, total=2222, percent=50))
-    monkeypatch.setattr(psutil, "boot_time", lambda: 100)
-    monkeypatch.setattr(monitoring.time, "time", lambda: now)
-
-    # Fire the request
     resp = client.get("/api/system_info")
     assert resp.status_code == 200, f"Expected 200, got {resp.status_code}: {resp.data}"
     payload = resp.get_json()
     assert payload["status"] == "ok"
-    data = payload["data"]
-
-    # Only assert on hardware_model (we don’t need to re‐verify every field here)
-    assert data["hardware_model"] == expected_model
-def test_api_system_info_network_stats(client, monkeypatch):
-    # Mock initial network stats
-    class NetIO:
-        def __init__(self, sent, recv):
-            self.bytes_sent = sent
-            self.bytes_recv = recv
-    
-    # Create mock interfaces - both wanted and unwanted
-    initial_stats = {
-        'eth0': NetIO(1000, 2000),      # Real interface (should be kept)
-        'lo': NetIO(500, 500),          # Loopback (should be filtered)
-        'docker0': NetIO(300, 300),      # Docker (should be filtered)
-        'IO': NetIO(100, 100),          # Virtual (should be filtered)
-        'wlan0': NetIO(1500, 2500)      # Another real interface (should be kept)
-    }
-    
-    current_stats = {
-        'eth0': NetIO(2000, 3000),      # +1000 bytes
-        'lo': NetIO(600, 600),           # +100 bytes (should be filtered)
-        'docker0': NetIO(400, 400),      # +100 bytes (should be filtered)
-        'IO': NetIO(200, 200),           # +100 bytes (should be filtered)
-        'wlan0': NetIO(2500, 3500)       # +1000 bytes
+    assert payload["data"]["hardware_model"] == expected_model
+
+def test_api_system_info_network_stats(client, monkeypatch, system_env):
+    # Both wanted and unwanted interfaces
+    interfaces = {
+        'eth0': _iface(1000.0, 1000.0),     # Real interface (should be kept)
+        'lo': _iface(100.0, 100.0),         # Loopback (should be filtered)
+        'docker0': _iface(100.0, 100.0),    # Docker (should be filtered)
+        'IO': _iface(100.0, 100.0),         # Virtual (should be filtered)
+        'wlan0': _iface(1000.0, 1000.0),    # Another real interface (should be kept)
     }
-    
-    def mock_net_io_counters(pernic, nowrap):
-        return current_stats
-    
-    # Set initial state
-    monkeypatch.setattr(monitoring, 'last_net_io', initial_stats)
-    monkeypatch.setattr(monitoring, 'last_check_time', 1009)
-    monkeypatch.setattr(psutil, "net_io_counters", mock_net_io_counters)
-    
-    # Other required mocks
-    monkeypatch.setattr(builtins, "open", lambda path, mode: io.StringIO('PRETTY_NAME="TestOS"\n'))
-    monkeypatch.setattr(subprocess, "check_output", lambda args: b"Filesystem\n100G\n")
-    monkeypatch.setattr(psutil, "virtual_memory", lambda: SimpleNamespace(used=0, total=0, percent=0))
-    monkeypatch.setattr(psutil, "boot_time", lambda: 1000)
-    monkeypatch.setattr(psutil, "cpu_percent", lambda interval: 0)
-    monkeypatch.setattr(psutil, "cpu_count", lambda logical: 0)
-    monkeypatch.setattr(monitoring.time, "time", lambda: 1010)
+    monkeypatch.setattr(monitoring, "sampler", FakeSampler(
+        latest={"timestamp": 1008, "cpu_percent": 0.0}, interfaces=interfaces
+    ))
 
     resp = client.get("/api/system_info")
     assert resp.status_code == 200
-    data = resp.get_json()["data"]
-    
-    network = data["network"]
-    interfaces = network["interfaces"]
-    
-    # Verify only the real interfaces are present
+    interfaces = resp.get_json()["data"]["network"]["interfaces"]
     assert set(interfaces.keys()) == {'eth0', 'wlan0'}
-    
-    # Verify the stats for kept interfaces
-    assert interfaces["eth0"]["upload"] == pytest.approx(1000)  # (2000-1000)/1
-    assert interfaces["eth0"]["download"] == pytest.approx(1000)  # (3000-2000)/1
-    assert interfaces["wlan0"]["upload"] == pytest.approx(1000)  # (2500-1500)/1
-    assert interfaces["wlan0"]["download"] == pytest.approx(1000)  # (3500-2500)/1
-    
-    # Verify the unwanted interfaces are not present
-    for unwanted in ['lo', 'docker0', 'IO']:
-        assert unwanted not in interfaces
-def test_api_system_info_first_call_no_last_net_io(client, monkeypatch):
-    # Mock network stats with no last_net_io (first call)
-    class CurrentNetIO:
-        bytes_sent = 1000
-        bytes_recv = 2000
-        
-    def mock_net_io_counters(pernic, nowrap):
-        return {'eth0': CurrentNetIO()}
-    
-    # Set last_net_io to None to test the else: pass branch
-    monkeypatch.setattr(monitoring, 'last_net_io', None)
-    monkeypatch.setattr(monitoring, 'last_check_time', 1009)
-    monkeypatch.setattr(psutil, "net_io_counters", mock_net_io_counters)
-    monkeypatch.setattr(psutil, "cpu_percent", lambda interval: 10)
-    monkeypatch.setattr(psutil, "cpu_count", lambda logical: 4 if logical else 2)
-
-    # Other required mocks
-    def fake_open(path, mode='r', *args, **kwargs):
-        if path == "/etc/os-release": return io.StringIO('PRETTY_NAME="TestOS"\n')
-        elif path == "/proc/device-tree/model": return io.StringIO("FakeModel")
-
-    monkeypatch.setattr(builtins, "open", fake_open)
-    monkeypatch.setattr(subprocess, "check_output", lambda args: b"Filesystem\n100G\n")
-    monkeypatch.setattr(psutil, "virtual_memory", lambda: SimpleNamespace(used=12345, total=67890, percent=50))
-    monkeypatch.setattr(psutil, "boot_time", lambda: 1000)
-    monkeypatch.setattr(monitoring.time, "time", lambda: 1010)
+    assert interfaces["eth0"]["upload"] == pytest.approx(1000)
+    assert interfaces["wlan0"]["download"] == pytest.approx(1000)
 
+def test_api_system_info_first_sample_no_interfaces(client, monkeypatch, system_env):
+    monkeypatch.setattr(monitoring, "sampler", FakeSampler(alive=False))
     resp = client.get("/api/system_info")
     assert resp.status_code == 200
     data = resp.get_json()["data"]
-
-    # Verify network section exists but has no interfaces (since we passed the else: pass)
-    assert "network" in data
-    assert "interfaces" in data["network"]
-    assert data["network"]["interfaces"] == {}  # No interfaces added when last_net_io is None
+    assert data["cpu"]["percent"] == 42.0
+    assert data["network"]["interfaces"] == {}
     assert data["network"]["primary_interface"] is None
+
+@pytest.mark.parametrize("num, expected", [
+    (512 * 1024**2, "512M"),
+    (int(9.51 * 1024**3), "9.6G"),
+    (12 * 1024**3 + 1, "13G"),
+    (2048, "2.0K"),
+    (3 * 1024**4, "3.0T"),
+])
+def test_human_size_matches_df(num, expected):
+    assert monitoring.human_size(num) == expected
+
 def test_api_system_info_error(client, monkeypatch):
     # Force an exception during system info collection by making os-release
     # unreadable. Should return 500
+    monkeypatch.setattr(monitoring, "sampler", FakeSampler(latest={"timestamp": 0, "cpu_percent": 0.0}))
     def mock_open(*args, **kwargs):
         # Force open() to raise when reading /etc/os-release
         if args[0] == '/etc/os-release': raise IOError("forced file read error")
@@ -610,9 +610,47 @@ def test_logs_merge_two_files(client, tmp_path, monkeypatch):
     # Remaining 50 come from new file (0 ... 49)
     assert logs[70] == "new 0"
     assert logs[-1] == "new 49"
+def test_logs_since_cursor_returns_appended_lines(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(monitoring, "script_dir", tmp_path)
+    logs_dir = tmp_path / "logs"
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    log_path = logs_dir / "viewport.log"
+    log_path.write_text("first\n")
+
+    data = client.get("/api/logs").get_json()["data"]
+    assert data["logs"] == ["first"] and data["reset"] is False
+    with log_path.open("a") as f:
+        f.write("second\nthird\n")
+
+    data = client.get("/api/logs", query_string={"since": data["cursor"]}).get_json()["data"]
+    assert data["logs"] == ["second", "third"]
+    assert data["reset"] is False
+    # a cursor from an unknown file asks the client to start over
+    data = client.get("/api/logs?since=1:0").get_json()["data"]
+    assert data["reset"] is True
+    assert data["logs"] == ["first", "second", "third"]
+
+def test_logs_json_lines_rendered_with_entries(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(monitoring, "script_dir", tmp_path)
+    logs_dir = tmp_path / "logs"
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    entry = {"ts": "2025-06-05 10:00:01", "level": "INFO", "event": "feed_healthy",
+             "logger": "root", "message": "Video feeds healthy.", "duration": 1.2}
+    (logs_dir / "viewport.log").write_text(f"[2025-06-05 10:00:00] [INFO] text\n{json.dumps(entry)}\n")
+
+    data = client.get("/api/logs").get_json()["data"]
+    assert data["logs"] == [
+        "[2025-06-05 10:00:00] [INFO] text",
+        "[2025-06-05 10:00:01] [INFO] Video feeds healthy.",
+    ]
+    assert data["entries"] == [None, entry]
+
 # --------------------------------------------------------------------------- #
 # /api/status
 # --------------------------------------------------------------------------- #
+def _write_status(path, *messages):
+    path.write_text("".join(json.dumps(core.status_entry(m)) + "\n" for m in messages))
+
 def test_status_missing(client):
     resp = client.get("/api/status")
     assert resp.status_code == 200
@@ -629,12 +667,24 @@ def test_status_ok(client, tmp_path, monkeypatch):
     api_dir: Path = monitoring.script_dir / 'api'
     api_dir.mkdir(parents=True, exist_ok=True)
 
-    (api_dir / 'status.txt').write_text('All Good')
+    _write_status(api_dir / 'status.jsonl', 'Starting...', 'All Good')
     resp = client.get('/api/status')
     assert resp.status_code == 200
     obj = resp.get_json()
     assert obj['status'] == 'ok'
     assert obj['data']['status'] == 'All Good'
+    assert obj['data']['latest']['code'] == 'all_good'
+    assert 'events' not in obj['data']
+
+def test_status_tail(client, tmp_path):
+    _write_status(tmp_path / 'api' / 'status.jsonl',
+                  'Starting...', 'Feed Healthy', 'Tab Crashed', 'Feed Healthy')
+    data = client.get('/api/status?tail=3').get_json()['data']
+    assert [e['message'] for e in data['events']] == ['Feed Healthy', 'Tab Crashed', 'Feed Healthy']
+    assert [e['severity'] for e in data['events']] == ['info', 'error', 'info']
+    assert data['latest'] == data['events'][-1]
+    # tail beyond the journal returns what there is
+    assert len(client.get('/api/status?tail=100').get_json()['data']['events']) == 4
     
 # --------------------------------------------------------------------------- #
 # /api/config
@@ -684,6 +734,20 @@ def test_api_config_with_restart(client, monkeypatch):
     assert general["restart_times"] == ["09:00"]
     assert general["next_restart"] == "2025-06-01T09:00:00"
     
+def test_api_config_is_cached_and_leaves_globals(client, monkeypatch):
+    calls = []
+    fake_cfg = SimpleNamespace(SLEEP_TIME=5, WAIT_TIME=10, MAX_RETRIES=3, RESTART_TIMES=[])
+    def counting_config(**kw):
+        calls.append(kw)
+        return fake_cfg
+    monkeypatch.setattr(monitoring, "validate_config", counting_config)
+    before = monitoring.SLEEP_TIME
+
+    for _ in range(3):
+        assert client.get("/api/config").get_json()["data"]["general"]["health_interval_sec"] == 5
+    assert len(calls) == 1
+    assert monitoring.SLEEP_TIME == before
+
 def test_api_config_compute_error(client, monkeypatch):
     # Force an exception during the "compute restart_times / next_restart" block
     # by having datetime.now() raise. Expect a 500 response
@@ -708,4 +772,534 @@ def test_api_config_compute_error(client, monkeypatch):
     assert resp.status_code == 500
     payload = resp.get_json()
     assert payload["status"] == "error"
-    assert "An internal error has occurred while processing the configuration." in payload["message"]
\ No newline at end of file
+    assert "An internal error has occurred while processing the configuration." in payload["message"]
+
+# --------------------------------------------------------------------------- #
+# /api/browser_usage
+# --------------------------------------------------------------------------- #
+def test_api_browser_usage(client, monkeypatch):
+    monkeypatch.setattr(monitoring, "browser_usage_handler", lambda: {
+        "renderer": {"count": 3, "cpu": 40.0, "mem": 3000},
+        "gpu":      {"count": 1, "cpu": 20.0, "mem": 1000},
+    })
+    monkeypatch.setattr(psutil, "cpu_count", lambda logical: 4)
+    resp = client.get("/api/browser_usage")
+    assert resp.status_code == 200
+    procs = resp.get_json()["data"]["processes"]
+    assert procs["renderer"] == {"count": 3, "cpu": 10.0, "mem": 3000}
+    assert procs["gpu"]["cpu"] == pytest.approx(5.0)
+
+def test_api_browser_usage_error(client, monkeypatch):
+    def boom():
+        raise RuntimeError("ps failed")
+    monkeypatch.setattr(monitoring, "browser_usage_handler", boom)
+    resp = client.get("/api/browser_usage")
+    assert resp.status_code == 500
+    assert resp.get_json()["status"] == "error"
+
+# --------------------------------------------------------------------------- #
+# /api/resources
+# --------------------------------------------------------------------------- #
+def test_api_resources_missing_ring(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(monitoring, "sample_file", tmp_path / "samples.bin")
+    resp = client.get("/api/resources")
+    assert resp.status_code == 200
+    assert resp.get_json()["data"] == {"interval": None, "latest": None, "history": []}
+
+@pytest.mark.parametrize("query, expected_history", [
+    ("", 0),
+    ("?history=2", 2),
+    ("?history=abc", 0),
+    ("?history=5000", 3),
+])
+def test_api_resources_reads_ring(client, tmp_path, monkeypatch, query, expected_history):
+    path = tmp_path / "samples.bin"
+    ring = sampler.ResourceRing(path, capacity=8, writable=True)
+    for i in range(3):
+        ring.append({"timestamp": 100.0 + i, "cpu_percent": 10.0 * i})
+    ring.close()
+    monkeypatch.setattr(monitoring, "sample_file", path)
+    data = client.get(f"/api/resources{query}").get_json()["data"]
+    assert data["latest"]["timestamp"] == 102.0
+    assert data["latest"]["cpu_percent"] == pytest.approx(20.0)
+    assert len(data["history"]) == expected_history
+
+# --------------------------------------------------------------------------- #
+# /api/stream
+# --------------------------------------------------------------------------- #
+def _events(body):
+    # Parse a text/event-stream body into (event, id, data) tuples
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if "event" in fields:
+            events.append((fields["event"], fields.get("id"), json.loads(fields["data"])))
+    return events
+
+@pytest.fixture
+def host_env(client, tmp_path, monkeypatch):
+    # Fixed host facts and a running sampler for the aggregated routes
+    monkeypatch.setattr(monitoring, "system_facts", lambda: {
+        "os_name": "TestOS", "hardware_model": "FakeModel", "cores": 2, "threads": 4,
+    })
+    monkeypatch.setattr(monitoring.os, "statvfs", lambda p: SimpleNamespace(f_bavail=25 * 1024**2, f_frsize=4096))
+    monkeypatch.setattr(psutil, "virtual_memory", lambda: SimpleNamespace(used=12345, total=67890, percent=50))
+    monkeypatch.setattr(monitoring, "sampler", FakeSampler(
+        latest={"timestamp": 1008, "cpu_percent": 12.5},
+        interfaces={"eth0": _iface(1.0, 2.0)},
+    ))
+    _write_status(tmp_path / "api" / "status.jsonl", "Feed Healthy")
+    return client
+
+@pytest.fixture
+def stream_env(host_env, monkeypatch):
+    # One pass through the stream loop
+    monkeypatch.setattr(monitoring, "STREAM_MAX_AGE", 0)
+    return host_env
+
+def test_api_stream_pushes_status_and_metrics(stream_env):
+    resp = stream_env.get("/api/stream")
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/event-stream"
+    assert resp.headers["Cache-Control"] == "no-cache"
+    body = resp.get_data(as_text=True)
+    assert body.startswith(f"retry: {monitoring.STREAM_RETRY_MS}\n\n")
+
+    events = {name: data for name, _, data in _events(body)}
+    assert events["status"] == {"status": "Feed Healthy"}
+    metrics = events["metrics"]
+    assert metrics["system_info"]["cpu"]["percent"] == 12.5
+    assert metrics["system_info"]["network"]["primary_interface"]["interface"] == "eth0"
+    assert metrics["script_uptime"] == {"running": False, "uptime": None}
+    # Without a cursor the stream starts at the end of the log
+    assert "logs" not in events
+
+@pytest.mark.parametrize("use_header", [False, True])
+def test_api_stream_continues_from_log_cursor(stream_env, tmp_path, use_header):
+    log_path = tmp_path / "logs" / "viewport.log"
+    log_path.write_text("first\n")
+    cursor = stream_env.get("/api/logs").get_json()["data"]["cursor"]
+    with log_path.open("a") as f:
+        f.write("second\nthird\n")
+
+    if use_header:
+        # A reconnecting EventSource sends the last event id instead
+        resp = stream_env.get("/api/stream?since=1:0", headers={"Last-Event-ID": cursor})
+    else:
+        resp = stream_env.get("/api/stream", query_string={"since": cursor})
+    logs = [(event_id, data) for name, event_id, data in _events(resp.get_data(as_text=True)) if name == "logs"]
+    assert len(logs) == 1
+    event_id, data = logs[0]
+    assert data["logs"] == ["second", "third"]
+    assert data["since"] == cursor
+    assert data["reset"] is False
+    assert event_id == data["cursor"] != cursor
+
+def test_api_stream_refuses_when_slots_are_taken(stream_env, monkeypatch):
+    monkeypatch.setattr(monitoring, "API_THREADS", 2)
+    app = monitoring.create_app()
+    client = app.test_client()
+    assert app._stream_slots.acquire(blocking=False)
+    resp = client.get("/api/stream")
+    assert resp.status_code == 503
+    assert resp.get_json()["status"] == "error"
+
+def test_api_stream_releases_slot_when_closed(stream_env, monkeypatch):
+    monkeypatch.setattr(monitoring, "API_THREADS", 2)
+    app = monitoring.create_app()
+    client = app.test_client()
+    for _ in range(3):
+        resp = client.get("/api/stream")
+        assert resp.status_code == 200
+        resp.close()
+    assert app._stream_slots.acquire(blocking=False)
+
+# --------------------------------------------------------------------------- #
+# /api/snapshot
+# --------------------------------------------------------------------------- #
+@pytest.fixture
+def snapshot_env(host_env, tmp_path, monkeypatch):
+    config_path = tmp_path / "config.ini"
+    config_path.write_text("[General]\n")
+    monkeypatch.setattr(monitoring, "config_file", config_path)
+    # A fresh app so its config cache watches the temporary config.ini
+    client = monitoring.create_app().test_client()
+    calls = []
+    cfg = monitoring.validate_config()
+    def counting_config(**kw):
+        calls.append(kw)
+        return cfg
+    monkeypatch.setattr(monitoring, "validate_config", counting_config)
+    return SimpleNamespace(client=client, config=config_path, config_calls=calls, cfg=cfg)
+
+def test_api_snapshot_combines_routes(snapshot_env, tmp_path):
+    (tmp_path / "api" / "sst.txt").write_text("2023-01-01 11:00:00.000000")
+    resp = snapshot_env.client.get("/api/snapshot")
+    assert resp.status_code == 200
+    assert resp.headers["ETag"]
+    assert resp.headers["Last-Modified"]
+    assert "no-cache" in resp.headers["Cache-Control"]
+
+    data = resp.get_json()["data"]
+    assert data["status"] == {"status": "Feed Healthy"}
+    assert data["script"] == {
+        "running": True,
+        "started": real_datetime(2023, 1, 1, 11, 0, 0).timestamp(),
+    }
+    info = data["system_info"]
+    assert info["boot_time"] == 1000
+    assert "system_uptime" not in info
+    assert info["cpu"]["percent"] == 12.5
+    assert data["config"]["general"]["health_interval_sec"] == 300
+
+def test_api_snapshot_before_first_sample(snapshot_env):
+    monitoring.sampler.latest = None
+    resp = snapshot_env.client.get("/api/snapshot")
+    assert resp.status_code == 200
+    assert resp.get_json()["data"]["system_info"]["cpu"]["percent"] == 42.0
+    assert monitoring.sampler.calls == 1
+
+@pytest.mark.parametrize("header", ["If-None-Match", "If-Modified-Since"])
+def test_api_snapshot_unchanged_poll_returns_304(snapshot_env, header):
+    first = snapshot_env.client.get("/api/snapshot")
+    validator = first.headers["ETag" if header == "If-None-Match" else "Last-Modified"]
+    resp = snapshot_env.client.get("/api/snapshot", headers={header: validator})
+    assert resp.status_code == 304
+    assert resp.data == b""
+    # config.ini was parsed once for both requests
+    assert len(snapshot_env.config_calls) == 1
+
+@pytest.mark.parametrize("change", ["status", "sample", "config"])
+def test_api_snapshot_changes_etag(snapshot_env, tmp_path, monkeypatch, change):
+    etag = snapshot_env.client.get("/api/snapshot").headers["ETag"]
+    if change == "status":
+        _write_status(tmp_path / "api" / "status.jsonl", "Feed Healthy", "Feed Offline")
+    elif change == "sample":
+        monitoring.sampler.latest = {"timestamp": 1009, "cpu_percent": 50.0}
+        monitoring.sampler.seq += 1
+    else:
+        snapshot_env.config.write_text("[General]\nSLEEP_TIME = 600\n")
+        monkeypatch.setattr(snapshot_env.cfg, "SLEEP_TIME", 600)
+    resp = snapshot_env.client.get("/api/snapshot", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+    assert len(snapshot_env.config_calls) == (2 if change == "config" else 1)
+
+@pytest.mark.parametrize("header", ["If-None-Match", "If-Modified-Since"])
+def test_api_snapshot_sample_with_same_content_keeps_validators(snapshot_env, header):
+    first = snapshot_env.client.get("/api/snapshot")
+    validator = first.headers["ETag" if header == "If-None-Match" else "Last-Modified"]
+    # A new sample that changes nothing in the body
+    monitoring.sampler.latest = dict(monitoring.sampler.latest, timestamp=1009)
+    monitoring.sampler.seq += 1
+    resp = snapshot_env.client.get("/api/snapshot", headers={header: validator})
+    assert resp.status_code == 304
+
+def test_api_snapshot_etag_is_shared_by_workers(snapshot_env):
+    etag = snapshot_env.client.get("/api/snapshot").headers["ETag"]
+    # Another gunicorn worker: its own app and a sampler at another count
+    other = monitoring.create_app().test_client()
+    monitoring.sampler.seq += 7
+    assert other.get("/api/snapshot").headers["ETag"] == etag
+
+# --------------------------------------------------------------------------- #
+# /static and response compression
+# --------------------------------------------------------------------------- #
+@pytest.fixture
+def static_env(client, tmp_path, monkeypatch):
+    folder = tmp_path / "static"
+    folder.mkdir()
+    (folder / "main-min.js").write_text("console.log('dashboard');\n" * 100)
+    (folder / "UI_Sans.woff2").write_bytes(b"\x00font")
+    monkeypatch.setattr(monitoring, "static_dir", folder)
+    monkeypatch.setattr(monitoring, "_asset_versions", {})
+    return folder
+
+def test_static_urls_carry_content_hash(client, static_env):
+    app = client.application
+    with app.test_request_context():
+        url = monitoring.url_for("static", filename="main-min.js")
+        font = monitoring.url_for("static", filename="UI_Sans.woff2")
+    version = monitoring.asset_version(str(static_env / "main-min.js"))
+    assert url == f"/static/main-min.js?v={version}"
+    assert font == "/static/UI_Sans.woff2"
+
+    resp = client.get(url)
+    assert resp.status_code == 200
+    assert resp.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+    # An outdated or missing version must be revalidated
+    for stale in ("/static/main-min.js?v=0000000000", "/static/main-min.js"):
+        assert client.get(stale).headers["Cache-Control"] == "no-cache"
+
+    (static_env / "main-min.js").write_text("console.log('updated');\n")
+    assert monitoring.asset_version(str(static_env / "main-min.js")) != version
+
+def test_static_serves_fresh_precompressed_sibling(client, static_env):
+    assert assets.precompress_assets(static_env) == 1
+    assert not (static_env / "UI_Sans.woff2.gz").exists()
+    # Unchanged sources are not recompressed
+    assert assets.precompress_assets(static_env) == 0
+
+    plain = client.get("/static/main-min.js")
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+    resp = client.get("/static/main-min.js", headers={"Accept-Encoding": "gzip, br"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.mimetype == "text/javascript"
+    assert monitoring.gzip.decompress(resp.data) == plain.data
+
+    # A source newer than its .gz is served as-is until recompressed
+    src = static_env / "main-min.js"
+    src.write_text("console.log('updated');\n" * 100)
+    os.utime(src, ns=(0, src.stat().st_mtime_ns + 10**9))
+    stale = client.get("/static/main-min.js", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in stale.headers
+    assert assets.precompress_assets(static_env) == 1
+
+def test_static_rejects_paths_outside_folder(client, static_env):
+    assert client.get("/static/../api/status.txt").status_code == 404
+    assert client.get("/static/missing.js").status_code == 404
+
+def test_large_json_is_gzipped(client, tmp_path, monkeypatch):
+    log = tmp_path / "logs" / "viewport.log"
+    log.write_text("".join(f"[INFO] line {i}\n" for i in range(500)))
+    monkeypatch.setattr(monitoring, "log_file", log)
+
+    plain = client.get("/api/logs?limit=500")
+    resp = client.get("/api/logs?limit=500", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert json.loads(monitoring.gzip.decompress(resp.data)) == plain.get_json()
+
+    small = client.get("/api/status", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+
+def test_gzipped_snapshot_keeps_a_weak_etag(snapshot_env, monkeypatch):
+    monkeypatch.setattr(monitoring, "COMPRESS_MIN_SIZE", 1)
+    headers = {"Accept-Encoding": "gzip"}
+    first = snapshot_env.client.get("/api/snapshot", headers=headers)
+    assert first.headers["Content-Encoding"] == "gzip"
+    assert first.headers["ETag"].startswith('W/"')
+    resp = snapshot_env.client.get(
+        "/api/snapshot", headers={**headers, "If-None-Match": first.headers["ETag"]}
+    )
+    assert resp.status_code == 304
+
+# --------------------------------------------------------------------------- #
+# /metrics
+# --------------------------------------------------------------------------- #
+def test_metrics_renders_daemon_store_and_sample(client, tmp_path, monkeypatch):
+    import metrics
+    store = metrics.MetricsStore(tmp_path / "api" / "metrics.json")
+    store.inc("loading_refreshes", 3)
+    store.observe("health_check_seconds", 31.2)
+    store.flush(force=True)
+    ring = sampler.ResourceRing(tmp_path / "api" / "samples.bin", writable=True)
+    ring.append({"timestamp": 1005.0, "monitoring_rss": 4096})
+    ring.close()
+    monkeypatch.setattr(monitoring, "metrics_file", tmp_path / "api" / "metrics.json")
+    monkeypatch.setattr(monitoring, "sample_file", tmp_path / "api" / "samples.bin")
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.content_type == "text/plain; version=0.0.4; charset=utf-8"
+    lines = resp.get_data(as_text=True).splitlines()
+    assert "viewport_loading_refreshes_total 3" in lines
+    assert 'viewport_health_check_seconds_bucket{le="32"} 1' in lines
+    assert 'viewport_process_resident_memory_bytes{process="monitoring"} 4096' in lines
+
+def test_metrics_before_daemon_has_written(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(monitoring, "metrics_file", tmp_path / "api" / "missing.json")
+    monkeypatch.setattr(monitoring, "sample_file", tmp_path / "api" / "missing.bin")
+    text = client.get("/metrics").get_data(as_text=True)
+    assert "viewport_retries_total 0" in text
+    assert "process_cpu_percent" not in text
+
+# --------------------------------------------------------------------------- #
+# /api/history
+# --------------------------------------------------------------------------- #
+@pytest.fixture
+def history_env(client, tmp_path, monkeypatch):
+    import history
+    path = tmp_path / "api" / "history.db"
+    monkeypatch.setattr(monitoring, "history_file", path)
+    rec = history.HistoryRecorder()
+    rec.path = path
+    for ts, rss in ((400, 100.0), (1000, 300.0)):
+        rec.record("browser_rss", rss, ts=ts)
+    rec.event("status", "Tab Crashed", ts=990)
+    rec.flush(now=1010)
+    return path
+
+def test_api_history_defaults_to_last_hour_raw(client, history_env):
+    resp = client.get("/api/history?metrics=browser_rss")
+    assert resp.status_code == 200
+    data = resp.get_json()["data"]
+    assert (data["start"], data["end"]) == (1010 - 3600, 1010)
+    assert data["resolution"] == "raw" and data["step"] == 5
+    assert data["series"] == {"browser_rss": [[400, 100.0, 100.0], [1000, 300.0, 300.0]]}
+    assert data["events"] == [[990, "status", "Tab Crashed"]]
+
+def test_api_history_explicit_range(client, history_env):
+    data = client.get("/api/history?start=500&end=1010&metrics=browser_rss,cpu_percent").get_json()["data"]
+    assert data["series"] == {"browser_rss": [[1000, 300.0, 300.0]], "cpu_percent": []}
+
+def test_api_history_long_span_uses_rollups(client, history_env):
+    data = client.get("/api/history?span=86400&metrics=browser_rss").get_json()["data"]
+    assert data["resolution"] == "minute"
+    # The minute still in progress (960-1020) is not rolled up yet
+    assert data["series"]["browser_rss"] == [[360, 100.0, 100.0]]
+
+@pytest.mark.parametrize("query", ["span=abc", "start=10&end=5", "metrics=bogus"])
+def test_api_history_rejects_bad_queries(client, history_env, query):
+    resp = client.get(f"/api/history?{query}")
+    assert resp.status_code == 400
+    assert resp.get_json()["status"] == "error"
+
+def test_api_history_before_anything_was_recorded(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(monitoring, "history_file", tmp_path / "api" / "history.db")
+    data = client.get("/api/history?span=86400").get_json()["data"]
+    assert data["resolution"] == "minute" and data["step"] == 60
+    assert data["series"]["cpu_percent"] == [] and data["events"] == []
+
+# --------------------------------------------------------------------------- #
+# /api/logs/search
+# --------------------------------------------------------------------------- #
+@pytest.fixture
+def search_log(client, tmp_path, monkeypatch):
+    log = tmp_path / "logs" / "viewport.log"
+    (tmp_path / "logs" / "viewport.log.2025-06-04").write_text(
+        "[2025-06-04 23:59:00] [ERROR] Connection error occurred. Retrying...\n"
+    )
+    log.write_text(
+        "[2025-06-05 09:00:00] [INFO] Video feeds healthy.\n"
+        "[2025-06-05 09:05:00] [WARNING] Retrying... (Attempt 1 of 5)\n"
+        "[2025-06-05 09:06:00] [ERROR] Tab Crashed. Restarting chrome...\n"
+    )
+    monkeypatch.setattr(monitoring, "log_file", log)
+    return log
+
+def test_logs_search_filters(client, search_log):
+    resp = client.get("/api/logs/search?level=error,warning&start=2025-06-05T09:00&q=RETRYING")
+    assert resp.status_code == 200
+    assert resp.get_json()["data"] == {
+        "logs": ["[2025-06-05 09:05:00] [WARNING] Retrying... (Attempt 1 of 5)"],
+        "entries": [None],
+        "cursor": None,
+    }
+
+def test_logs_search_paginates_across_backups(client, search_log):
+    first = client.get("/api/logs/search?level=ERROR&limit=1").get_json()["data"]
+    assert first["logs"] == ["[2025-06-04 23:59:00] [ERROR] Connection error occurred. Retrying..."]
+    assert first["cursor"]
+    second = client.get(f"/api/logs/search?level=ERROR&limit=1&cursor={first['cursor']}").get_json()["data"]
+    assert second == {
+        "logs": ["[2025-06-05 09:06:00] [ERROR] Tab Crashed. Restarting chrome..."],
+        "entries": [None],
+        "cursor": None,
+    }
+
+@pytest.mark.parametrize("query", ["start=yesterday", "level=LOUD", "cursor=1:2"])
+def test_logs_search_rejects_bad_queries(client, search_log, query):
+    resp = client.get(f"/api/logs/search?{query}")
+    assert resp.status_code == 400
+    assert resp.get_json()["status"] == "error"
+
+# --------------------------------------------------------------------------- #
+# Micro-cache for expensive GET routes
+# --------------------------------------------------------------------------- #
+def _cache_lines(client):
+    return [l for l in client.get("/metrics").get_data(as_text=True).splitlines()
+            if l.startswith("viewport_api_cache_requests_total")]
+
+def test_cached_route_computes_once_per_ttl(client, monkeypatch):
+    calls = []
+    monkeypatch.setattr(monitoring, "browser_usage_handler",
+                        lambda: calls.append(1) or {"gpu": {"count": 1, "cpu": 4.0, "mem": 1}})
+    first = client.get("/api/browser_usage", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/api/browser_usage")
+    assert first.status_code == second.status_code == 200
+    assert second.get_json() == json.loads(first.data)
+    assert len(calls) == 1
+    # Query arguments the route does not read neither miss nor add entries
+    for i in range(3):
+        client.get(f"/api/browser_usage?x={i}")
+    assert len(calls) == 1
+    assert len(client.application._cache) == 1
+
+    clock = [time.monotonic() + 6]
+    monkeypatch.setattr(monitoring.time, "monotonic", lambda: clock[0])
+    client.get("/api/browser_usage")
+    assert len(calls) == 2
+    assert _cache_lines(client) == [
+        'viewport_api_cache_requests_total{endpoint="api_browser_usage",result="hit"} 4',
+        'viewport_api_cache_requests_total{endpoint="api_browser_usage",result="miss"} 2',
+        'viewport_api_cache_requests_total{endpoint="api_browser_usage",result="coalesced"} 0',
+    ]
+
+def test_cached_route_coalesces_concurrent_requests(client, monkeypatch):
+    import threading
+    release, started, calls = threading.Event(), threading.Event(), []
+    def slow_usage():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"gpu": {"count": 1, "cpu": 4.0, "mem": 1}}
+    monkeypatch.setattr(monitoring, "browser_usage_handler", slow_usage)
+    app = client.application
+    results = []
+    fetch = lambda: results.append(app.test_client().get("/api/browser_usage").get_json())
+    leader = threading.Thread(target=fetch)
+    leader.start()
+    assert started.wait(5)
+    # Count the followers parked on the leader's flight
+    (flight,) = app._cache_flights.values()
+    waiting, real_wait = [], flight.wait
+    flight.wait = lambda timeout=None: waiting.append(1) or real_wait(timeout)
+    followers = [threading.Thread(target=fetch) for _ in range(3)]
+    for t in followers: t.start()
+    deadline = time.monotonic() + 5
+    while len(waiting) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for t in [leader] + followers: t.join(5)
+    assert len(calls) == 1
+    assert len(results) == 4
+    assert all(r["data"]["processes"]["gpu"]["count"] == 1 for r in results)
+    assert app._cache_stats["api_browser_usage"] == {"hit": 0, "miss": 1, "coalesced": 3}
+
+def test_cached_route_does_not_keep_errors(client, monkeypatch):
+    outcomes = [RuntimeError("ps failed"), {"gpu": {"count": 1, "cpu": 4.0, "mem": 1}}]
+    def flaky():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    monkeypatch.setattr(monitoring, "browser_usage_handler", flaky)
+    assert client.get("/api/browser_usage").status_code == 500
+    assert client.get("/api/browser_usage").status_code == 200
+    assert outcomes == []
+
+def test_cached_route_keys_on_named_params():
+    app = monitoring.create_app()
+    calls = []
+    @app.route("/cached_echo")
+    @app.cached(ttl=5, params=("n",))
+    def cached_echo():
+        calls.append(request.args.get("n"))
+        return jsonify(n=request.args.get("n"))
+    client = app.test_client()
+    assert client.get("/cached_echo?n=1").get_json() == {"n": "1"}
+    assert client.get("/cached_echo?n=2").get_json() == {"n": "2"}
+    # Same value, other unread arguments: served from the cache
+    assert client.get("/cached_echo?n=1&x=9").get_json() == {"n": "1"}
+    assert calls == ["1", "2"]
+    assert sorted(app._cache) == [("cached_echo", ("1",)), ("cached_echo", ("2",))]
+
+def test_cached_route_drops_expired_entries(client, monkeypatch):
+    monkeypatch.setattr(monitoring, "browser_usage_handler", lambda: {})
+    app = client.application
+    app._cache[("gone", ())] = (time.monotonic() - 1, b"{}", 200, [])
+    client.get("/api/browser_usage")
+    assert list(app._cache) == [("api_browser_usage", ())]
@@ -1,4 +1,5 @@
 import sys
+import gzip
 import pytest
 import viewport
 import subprocess
@@ -53,28 +54,42 @@ def test_status_flag(mock_status_handler, mock_exit):
 # --------------------------------------------------------------------------- # 
 # Logs
 # --------------------------------------------------------------------------- # 
-@patch("viewport.sys.exit")
-@patch("viewport.open", new_callable=mock_open, read_data="[INFO] Something\n[WARNING] Be careful\n[ERROR] Uh oh\n")
-def test_logs_flag(mock_file, mock_exit):
-    mock_args = type("Args", (), {
-        "status": False, "logs": 3, "background": False, "pause": False,
+@pytest.fixture
+def log_path(tmp_path, monkeypatch):
+    path = tmp_path / "viewport.log"
+    monkeypatch.setattr(viewport, "log_file", path)
+    return path
+
+def _logs_args(n):
+    return type("Args", (), {
+        "status": False, "logs": n, "background": False, "pause": False,
         "quit": False, "diagnose": False, "api": False, "restart": False
     })()
+
+@patch("viewport.sys.exit")
+def test_logs_flag(mock_exit, log_path):
+    log_path.write_text("[INFO] Something\n[WARNING] Be careful\n[ERROR] Uh oh\n")
     with patch("viewport.print") as mock_print:
-        viewport.args_handler(mock_args)
+        viewport.args_handler(_logs_args(3))
         mock_exit.assert_called_once_with(0)
         assert mock_print.call_count == 3
 
 @patch("viewport.sys.exit")
-def test_logs_file_not_found(mock_exit):
-    # Simulate open() raising FileNotFoundError in the logs branch
-    mock_args = type("Args", (), {
-        "status": False, "logs": 5, "background": False, "pause": False,
-        "quit": False, "diagnose": False, "api": False, "restart": False
-    })()
-    with patch("viewport.open", side_effect=FileNotFoundError), \
-        patch("viewport.print") as mock_print:
-        viewport.args_handler(mock_args)
+def test_logs_reach_into_compressed_backups(mock_exit, log_path):
+    with gzip.open(log_path.with_name("viewport.log.2025-06-04.gz"), "wt") as f:
+        f.write("[2025-06-04 23:59:00] [INFO] yesterday\n")
+    log_path.write_text("[2025-06-05 00:00:01] [ERROR] today\n")
+    with patch("viewport.print") as mock_print:
+        viewport.args_handler(_logs_args(5))
+    assert mock_print.call_args_list == [
+        call(f"{viewport.GREEN}[2025-06-04 23:59:00] [INFO] yesterday{viewport.NC}"),
+        call(f"{viewport.RED}[2025-06-05 00:00:01] [ERROR] today{viewport.NC}"),
+    ]
+
+@patch("viewport.sys.exit")
+def test_logs_file_not_found(mock_exit, log_path):
+    with patch("viewport.print") as mock_print:
+        viewport.args_handler(_logs_args(5))
     mock_print.assert_called_once_with(
         f"{viewport.RED}Log file not found: {viewport.log_file}{viewport.NC}"
     )
@@ -82,14 +97,11 @@ def test_logs_file_not_found(mock_exit):
 
 @patch("viewport.sys.exit")
 @patch("viewport.log_error")
-def test_logs_generic_exception(mock_log_error, mock_exit):
-    # Simulate open() raising a generic Exception in the logs branch
-    mock_args = type("Args", (), {
-        "status": False, "logs": 2, "background": False, "pause": False,
-        "quit": False, "diagnose": False, "api": False, "restart": False
-    })()
-    with patch("viewport.open", side_effect=Exception("oops")):
-        viewport.args_handler(mock_args)
+def test_logs_generic_exception(mock_log_error, mock_exit, log_path):
+    # Simulate reading the log raising a generic Exception
+    log_path.write_text("")
+    with patch("viewport.read_log", side_effect=Exception("oops")):
+        viewport.args_handler(_logs_args(2))
     mock_log_error.assert_called_once()
     # first arg to log_error should include our message
     err_msg = mock_log_error.call_args[0][0]
@@ -97,31 +109,63 @@ def test_logs_generic_exception(mock_log_error, mock_exit):
     mock_exit.assert_called_once_with(0)
 
 @patch("viewport.sys.exit")
-@patch("viewport.open", new_callable=mock_open, read_data="[DEBUG] debug message\n")
-def test_logs_debug_flag(mock_file, mock_exit):
-    mock_args = type("Args", (), {
-        "status": False, "logs": 1, "background": False, "pause": False,
-        "quit": False, "diagnose": False, "api": False, "restart": False
-    })()
+def test_logs_debug_flag(mock_exit, log_path):
+    log_path.write_text("[DEBUG] debug message\n")
     with patch("viewport.print") as mock_print:
-        viewport.args_handler(mock_args)
+        viewport.args_handler(_logs_args(1))
     # should strip the "[DEBUG]" and color via CYAN
     mock_print.assert_called_once_with(f"{viewport.CYAN}[DEBUG] debug message{viewport.NC}")
     mock_exit.assert_called_once_with(0)
 
 @patch("viewport.sys.exit")
-@patch("viewport.open", new_callable=mock_open, read_data="plain line without tag\n")
-def test_logs_default_flag(mock_file, mock_exit):
-    mock_args = type("Args", (), {
-        "status": False, "logs": 1, "background": False, "pause": False,
-        "quit": False, "diagnose": False, "api": False, "restart": False
-    })()
+def test_logs_default_flag(mock_exit, log_path):
+    log_path.write_text("plain line without tag\n")
     with patch("viewport.print") as mock_print:
-        viewport.args_handler(mock_args)
+        viewport.args_handler(_logs_args(1))
     # no INFO/WARNING/DEBUG/ERROR ⇒ falls back to NC…NC
     mock_print.assert_called_once_with(f"{viewport.NC}plain line without tag{viewport.NC}")
     mock_exit.assert_called_once_with(0)
 
+@patch("viewport.sys.exit")
+def test_logs_json_line(mock_exit, log_path):
+    log_path.write_text(
+        '{"ts": "2025-06-05 10:00:01", "level": "ERROR", "event": "tab_crashed", "message": "Tab Crashed"}\n'
+    )
+    with patch("viewport.print") as mock_print:
+        viewport.args_handler(_logs_args(1))
+    # JSON lines print as text, colored by their level field
+    mock_print.assert_called_once_with(
+        f"{viewport.RED}[2025-06-05 10:00:01] [ERROR] Tab Crashed{viewport.NC}"
+    )
+    mock_exit.assert_called_once_with(0)
+
+def test_follow_flag_combines_with_logs(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["viewport.py", "-l", "20", "-f"])
+    args = viewport.args_helper()
+    assert (args.logs, args.follow) == (20, True)
+
+@patch("viewport.sys.exit")
+def test_logs_follow_prints_new_lines(mock_exit, log_path):
+    log_path.write_text("[INFO] old\n")
+    mock_args = _logs_args(1)
+    mock_args.follow = True
+
+    def follow(path, cursor):
+        assert (path, cursor) == (log_path, f"{log_path.stat().st_ino}:{log_path.stat().st_size}")
+        yield "[WARNING] new"
+        raise KeyboardInterrupt
+    with patch("viewport.follow_log", side_effect=follow), \
+         patch("viewport.signal.signal") as mock_signal, \
+         patch("viewport.print") as mock_print:
+        viewport.args_handler(mock_args)
+    # Ctrl+C must not reach the shutdown handler of the running instance
+    mock_signal.assert_any_call(viewport.signal.SIGINT, viewport.signal.default_int_handler)
+    assert mock_print.call_args_list == [
+        call(f"{viewport.GREEN}[INFO] old{viewport.NC}"),
+        call(f"{viewport.YELLOW}[WARNING] new{viewport.NC}", flush=True),
+    ]
+    mock_exit.assert_called_once_with(0)
+
 # --------------------------------------------------------------------------- # 
 # Background
 # --------------------------------------------------------------------------- # 
@@ -180,7 +224,7 @@ def test_diagnose_flag_success(mock_logging, mock_validate, mock_exit):
 
     mock_logging.info.assert_any_call("Checking validity of config.ini and .env variables...")
     mock_validate.assert_called_once_with(strict=False)
-    mock_logging.info.assert_any_call("No errors found.")
+    mock_logging.info.assert_any_call("No errors found.", extra={"event": "config_valid"})
     mock_exit.assert_called_once_with(0)
 
 # --------------------------------------------------------------------------- # 
@@ -463,7 +507,7 @@ def test_pause_flag_toggle(monkeypatch, caplog, initial, expected_msg, expected_
 
     # Check the right log and status
     assert expected_msg in caplog.text
-    assert viewport.status_file.read_text() == expected_status
+    assert viewport.read_status(viewport.status_file)[-1]["message"] == expected_status
 
     # And that the file was toggled
     assert viewport.pause_file.exists() == (not initial)
@@ -1,8 +1,8 @@
-import re
+import re, threading
 import pytest
 import logging
 from pathlib import Path
-from validate_config import validate_config
+from validate_config import validate_config, ConfigCache
 
 # Helpers to write test files
 BASE_INI = """
@@ -26,6 +26,10 @@ LOG_INTERVAL = 60
 
 [API]
 USE_API = true
+WORKERS = 1
+THREADS = 8
+KEEPALIVE = 5
+TIMEOUT = 30
 """
 
 BASE_ENV = """
@@ -244,6 +248,10 @@ def test_optional_env_fields_missing_and_empty(tmp_path, caplog, monkeypatch, fi
     ({"MAX_RETRIES": "2"}, {},       "MAX_RETRIES must be ≥ 3."),
     ({"LOG_DAYS": "0"}, {},          "LOG_DAYS must be ≥ 1."),
     ({"LOG_INTERVAL": "0"}, {},      "LOG_INTERVAL must be ≥ 1."),
+    ({"WORKERS": "0"}, {},           "WORKERS must be ≥ 1."),
+    ({"THREADS": "0"}, {},           "THREADS must be ≥ 1."),
+    ({"KEEPALIVE": "-1"}, {},        "KEEPALIVE must be ≥ 0."),
+    ({"TIMEOUT": "0"}, {},           "TIMEOUT must be ≥ 1."),
 ])
 def test_additional_validate_config_errors(tmp_path, caplog, monkeypatch,
                                         ini_overrides, env_overrides, expected_msg):
@@ -370,4 +378,56 @@ def test_print_and_strict_logs_and_exits(tmp_path, caplog):
         )
 
     assert exc.value.code == 1
-    assert any("SECRET is specified but empty." in r.message for r in caplog.records)
\ No newline at end of file
+    assert any("SECRET is specified but empty." in r.message for r in caplog.records)
+# --------------------------------------------------------------------------- #
+# ConfigCache
+# --------------------------------------------------------------------------- #
+def _cache(tmp_path, calls):
+    def loader():
+        calls.append(1)
+        return validate_config(
+            strict=False, print=False,
+            config_file=tmp_path / "config.ini",
+            env_file=tmp_path / ".env",
+            logs_dir=tmp_path / "logs",
+            api_dir=tmp_path / "api",
+        )
+    return ConfigCache(loader, files=(tmp_path / "config.ini", tmp_path / ".env"))
+
+def test_config_cache_reuses_snapshot_until_files_change(tmp_path):
+    write_base(tmp_path)
+    calls = []
+    cache = _cache(tmp_path, calls)
+    first = cache.get()
+    assert cache.get() is first
+    assert len(calls) == 1
+    assert first.SLEEP_TIME == 300
+
+    write_base(tmp_path, ini_overrides={"SLEEP_TIME": "600"})
+    second = cache.get()
+    assert second is not first
+    assert second.SLEEP_TIME == 600
+    # .env is watched too
+    write_base(tmp_path, ini_overrides={"SLEEP_TIME": "600"}, env_overrides={"URL": "http://example.org/view"})
+    assert cache.get() is not second
+    assert len(calls) == 3
+
+def test_config_cache_snapshot_is_read_only(tmp_path):
+    write_base(tmp_path)
+    snapshot = _cache(tmp_path, []).get()
+    with pytest.raises(AttributeError):
+        snapshot.SLEEP_TIME = 1
+    with pytest.raises(AttributeError):
+        del snapshot.SLEEP_TIME
+    assert isinstance(snapshot.RESTART_TIMES, tuple)
+
+def test_config_cache_loads_once_under_concurrency(tmp_path):
+    write_base(tmp_path)
+    calls = []
+    cache = _cache(tmp_path, calls)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get())) for _ in range(8)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
@@ -0,0 +1,101 @@
+import json, os, socket, stat, threading
+import pytest
+import control
+
+# --------------------------------------------------------------------------- #
+# Fixtures
+# --------------------------------------------------------------------------- #
+@pytest.fixture
+def server(tmp_path):
+    calls = []
+    def fail():
+        raise RuntimeError("no browser")
+    srv = control.ControlServer(tmp_path / "viewport.sock", {
+        "status": lambda: {"status": "Feed Healthy"},
+        "pause":  lambda **kw: calls.append(("pause", kw)) or {"paused": True},
+        "screenshot": fail,
+    }, token="s3cret").open()
+    srv.calls = calls
+    yield srv
+    srv.stop()
+    srv.join(5)
+
+# --------------------------------------------------------------------------- #
+# Server and client
+# --------------------------------------------------------------------------- #
+def test_request_round_trip(server):
+    assert control.request(server.path, "status", "s3cret") == {
+        "status": "ok", "data": {"status": "Feed Healthy"},
+    }
+    assert control.request(server.path, "pause", "s3cret", reason="maintenance")["data"] == {"paused": True}
+    assert server.calls == [("pause", {"reason": "maintenance"})]
+
+def test_socket_is_private(server):
+    assert stat.S_IMODE(os.stat(server.path).st_mode) == 0o600
+
+@pytest.mark.parametrize("command, token, message", [
+    ("status", "wrong", "Unauthorized"),
+    ("status", "",      "Unauthorized"),
+    ("reboot", "s3cret", 'Unknown command "reboot"'),
+    ("screenshot", "s3cret", "no browser"),
+])
+def test_request_errors(server, command, token, message):
+    reply = control.request(server.path, command, token)
+    assert reply == {"status": "error", "message": message}
+    assert server.calls == []
+
+def test_malformed_request(server):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(2)
+        sock.connect(str(server.path))
+        sock.sendall(b"not json\n")
+        reply = json.loads(sock.makefile("rb").readline())
+    assert reply == {"status": "error", "message": "Malformed request"}
+
+def test_request_timeout_is_an_error_reply(tmp_path):
+    release = threading.Event()
+    srv = control.ControlServer(tmp_path / "viewport.sock", {"slow": lambda: release.wait(5)}).open()
+    try:
+        reply = control.request(srv.path, "slow", timeout=0.1)
+        assert reply == {"status": "error", "message": "Timed out waiting for a reply to slow"}
+    finally:
+        release.set()
+        srv.stop()
+        srv.join(5)
+
+def test_screenshot_waits_longer_than_the_daemon(monkeypatch):
+    timeouts = []
+    class FakeSocket:
+        def __init__(self, *a):
+            pass
+        def settimeout(self, t):
+            timeouts.append(t)
+        def connect(self, path):
+            raise FileNotFoundError(path)
+        def close(self):
+            pass
+    monkeypatch.setattr(control.socket, "socket", FakeSocket)
+    control.request("viewport.sock", "screenshot")
+    control.request("viewport.sock", "status")
+    assert timeouts[0] > control.SCREENSHOT_TIMEOUT
+    assert timeouts[1] == control.TIMEOUT
+
+def test_request_without_daemon(tmp_path):
+    assert control.request(tmp_path / "viewport.sock", "status") is None
+    # A socket file left behind by a crashed daemon
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(tmp_path / "stale.sock"))
+    stale.close()
+    assert control.request(tmp_path / "stale.sock", "status") is None
+
+def test_open_replaces_stale_socket_and_stop_removes_it(tmp_path):
+    path = tmp_path / "viewport.sock"
+    path.write_text("left over")
+    srv = control.ControlServer(path, {"status": lambda: "up"}).open()
+    try:
+        assert control.request(path, "status") == {"status": "ok", "data": "up"}
+    finally:
+        srv.stop()
+        srv.join(5)
+    assert not srv.is_alive()
+    assert not path.exists()
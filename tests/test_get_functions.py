@@ -79,6 +79,29 @@ def test_get_mem_color(pct, expected_color):
     assert viewport.get_mem_color(pct) == expected_color
 
 # --------------------------------------------------------------------------- #
+# Test get_process_type
+# --------------------------------------------------------------------------- #
+@pytest.mark.parametrize(
+    "cmdline, expected",
+    [
+        (["/opt/google/chrome/chrome", "--remote-debugging-port=9222"], "browser"),
+        (["chrome", "--type=renderer", "--lang=en-US"],                 "renderer"),
+        (["chrome", "--type=renderer", "--extension-process"],          "extension"),
+        (["chrome", "--type=gpu-process"],                              "gpu"),
+        (["chrome", "--type=utility",
+          "--utility-sub-type=network.mojom.NetworkService"],           "network"),
+        (["chrome", "--type=utility",
+          "--utility-sub-type=audio.mojom.AudioService"],               "utility"),
+        (["chrome", "--type=zygote"],                                   "other"),
+        (["firefox", "-contentproc", "-childID", "1", "123", "tab"],    "renderer"),
+        (["firefox", "-contentproc", "456", "socket"],                  "network"),
+        (["firefox", "-contentproc", "789", "forkserver"],              "other"),
+        ([],                                                            "browser"),
+    ],
+)
+def test_get_process_type(cmdline, expected):
+    assert viewport.get_process_type(cmdline) == expected
+# --------------------------------------------------------------------------- #
 # Test get_browser_version
 # --------------------------------------------------------------------------- #
 def test_get_browser_version(monkeypatch):
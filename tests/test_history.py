@@ -0,0 +1,118 @@
+import pytest
+import sqlite3
+import history, sampler
+
+HOUR = 3600
+NOW = 480_000 * HOUR + 30   # 30 s into an hour, 2024
+
+def _rows(path, res, metric):
+    db = sqlite3.connect(path)
+    try:
+        return db.execute(
+            "SELECT ts, avg, max, n FROM points WHERE res = ? AND metric = ? ORDER BY ts",
+            (res, metric),
+        ).fetchall()
+    finally:
+        db.close()
+
+# --------------------------------------------------------------------------- #
+# HistoryRecorder
+# --------------------------------------------------------------------------- #
+def test_recorder_copies_new_ring_samples_once(tmp_path):
+    ring = sampler.ResourceRing(tmp_path / "samples.bin", capacity=8, writable=True)
+    for ts in (NOW - 20, NOW - 15):
+        ring.append({"timestamp": ts, "cpu_percent": 10.0, "browser_rss": 2048})
+    rec = history.HistoryRecorder()
+    rec.path, rec.ring = tmp_path / "history.db", ring
+    rec.flush(now=NOW)
+    ring.append({"timestamp": NOW - 10, "cpu_percent": 40.0})
+    rec.flush(now=NOW)
+    # A restarted daemon reads the whole ring again without duplicating it
+    again = history.HistoryRecorder()
+    again.path, again.ring = rec.path, ring
+    again.flush(now=NOW)
+    ring.close()
+    rows = _rows(rec.path, 0, "cpu_percent")
+    assert [r[:2] for r in rows] == [(NOW - 20, 10.0), (NOW - 15, 10.0), (NOW - 10, 40.0)]
+    assert _rows(rec.path, 0, "browser_rss")[0][1] == 2048
+
+def test_recorder_dedupes_events_and_queues_before_open(tmp_path):
+    rec = history.HistoryRecorder()
+    rec.record("health_check_seconds", 31.5, ts=NOW - 5)
+    for msg in ("Feed Healthy", "Feed Healthy", "Tab Crashed", "Feed Healthy"):
+        rec.event("status", msg, ts=NOW)
+    rec.flush(now=NOW)   # no path yet: nothing written, nothing lost
+    rec.path = tmp_path / "history.db"
+    rec.flush(now=NOW)
+    data = history.query(rec.path, NOW - 60, NOW, now=NOW)
+    assert data["series"]["health_check_seconds"] == [[NOW - 5, 31.5, 31.5]]
+    assert [e[2] for e in data["events"]] == ["Feed Healthy", "Tab Crashed", "Feed Healthy"]
+
+def test_recorder_logs_write_errors(tmp_path, caplog):
+    rec = history.HistoryRecorder()
+    rec.path = tmp_path / "missing" / "history.db"
+    rec.record("health_check_seconds", 1)
+    rec.flush()
+    assert "Could not write history" in caplog.text
+
+# --------------------------------------------------------------------------- #
+# Rollups and retention
+# --------------------------------------------------------------------------- #
+def test_rollup_weights_minutes_into_hours(tmp_path):
+    path = tmp_path / "history.db"
+    db = history.connect(path)
+    start = NOW - 30 - HOUR   # previous hour
+    with db:
+        # 12 samples of 10 % in the first minute, 1 sample of 70 % in the second
+        db.executemany(
+            "INSERT INTO points VALUES (0, 'cpu_percent', ?, ?, ?, 1)",
+            [(start + i * 5, 10.0, 10.0) for i in range(12)] + [(start + 60, 70.0, 70.0)],
+        )
+        # Still in progress: not rolled up yet
+        db.execute("INSERT INTO points VALUES (0, 'cpu_percent', ?, 99, 99, 1)", (NOW - 1,))
+        history.rollup(db, now=NOW)
+    db.close()
+    assert _rows(path, 60, "cpu_percent") == [
+        (start, 10.0, 10.0, 12),
+        (start + 60, 70.0, 70.0, 1),
+    ]
+    ((ts, avg, peak, n),) = _rows(path, 3600, "cpu_percent")
+    assert (ts, peak, n) == (start, 70.0, 13)
+    assert avg == pytest.approx((12 * 10 + 70) / 13)
+
+def test_rollup_prunes_expired_rows(tmp_path):
+    path = tmp_path / "history.db"
+    db = history.connect(path)
+    old = NOW - history.RESOLUTIONS["raw"][1] - 60
+    with db:
+        db.execute("INSERT INTO points VALUES (0, 'mem_used', ?, 1, 1, 1)", (old,))
+        db.execute("INSERT INTO events VALUES (?, 'status', 'ancient')",
+                   (NOW - history.RESOLUTIONS["hour"][1] - 1,))
+        history.rollup(db, now=NOW)
+    db.close()
+    assert _rows(path, 0, "mem_used") == []
+    # The minute it belonged to outlives it
+    assert len(_rows(path, 60, "mem_used")) == 1
+    assert history.query(path, 0, NOW, now=NOW)["events"] == []
+
+# --------------------------------------------------------------------------- #
+# Range queries
+# --------------------------------------------------------------------------- #
+@pytest.mark.parametrize("span, expected", [
+    (HOUR,           "raw"),
+    (6 * HOUR,       "raw"),
+    (12 * HOUR,      "minute"),
+    (3 * 24 * HOUR,  "minute"),
+    (7 * 24 * HOUR,  "hour"),
+    (90 * 24 * HOUR, "hour"),
+])
+def test_pick_resolution(span, expected):
+    assert history.pick_resolution(NOW - span, NOW, now=NOW) == expected
+
+def test_pick_resolution_respects_retention():
+    # A short range from two days ago has no raw rows left
+    start = NOW - 48 * HOUR
+    assert history.pick_resolution(start, start + HOUR, now=NOW) == "minute"
+
+def test_query_missing_database(tmp_path):
+    assert history.query(tmp_path / "history.db", 0, NOW) is None
@@ -1,8 +1,13 @@
 import pytest
-import logging, datetime, os, sys, re
+import gzip, logging, datetime, json, os, sys, re, threading, time
 from pathlib import Path
 from logging.handlers import TimedRotatingFileHandler
-from logging_config import configure_logging, ColoredFormatter
+import logging_config
+from logging_config import configure_logging, ColoredFormatter, tail_lines, read_log, parse_log_cursor, LogIndex
+from logging_config import DroppingQueueHandler, flush_logging, dropped_records, PlainFormatter
+from logging_config import JsonFormatter, event_code, parse_log_line, render_log_lines
+from logging_config import CompressingFileHandler, compress_backups, rotated_logs
+from logging_config import DirectoryWatcher, follow_log
 # --------------------------------------------------------------------------- # 
 # Override conftest's autouse isolate_logging
 # --------------------------------------------------------------------------- # 
@@ -122,6 +127,93 @@ def test_colored_formatter_all_branches(level, expected_color):
     assert out.startswith(expected_color)
     assert out.endswith(ColoredFormatter.NC)
     assert "Payload" in out
+    # The record is left as logged for the other handlers
+    assert rec.msg == "Payload"
+
+def test_formatters_do_not_leak_between_handlers():
+    colored = ColoredFormatter("[%(levelname)s] %(message)s")
+    plain = PlainFormatter("[%(levelname)s] %(message)s", clean_access=True)
+    rec = logging.LogRecord("werkzeug", logging.INFO, __file__, 1,
+                            "\x1b[32m10.0.0.5 - - [01/Jan/2025 00:00:00] \"GET /api/status HTTP/1.1\" 200 -\x1b[0m",
+                            (), None)
+    assert plain.format(rec) == '[INFO] "GET /api/status HTTP/1.1" 200 -'
+    assert colored.format(rec).startswith(f"[INFO] {ColoredFormatter.GREEN}\x1b[32m10.0.0.5")
+    assert plain.format(rec) == '[INFO] "GET /api/status HTTP/1.1" 200 -'
+    assert rec.msg.startswith("\x1b[32m10.0.0.5")
+
+@pytest.mark.parametrize("name, clean_access, expected", [
+    ("root",     True,  "[INFO] 10.0.0.5 - - [x] hi"),   # only access loggers are trimmed
+    ("werkzeug", False, "[INFO] 10.0.0.5 - - [x] hi"),
+    ("werkzeug", True,  "[INFO] hi"),
+])
+def test_plain_formatter_access_preamble(name, clean_access, expected):
+    fmt = PlainFormatter("[%(levelname)s] %(message)s", clean_access=clean_access)
+    rec = logging.LogRecord(name, logging.INFO, __file__, 1, "10.0.0.5 - - [x] %s", ("hi",), None)
+    assert fmt.format(rec) == expected
+
+# --------------------------------------------------------------------------- #
+# Structured (JSON) log lines
+# --------------------------------------------------------------------------- #
+@pytest.mark.parametrize("message, expected", [
+    ("Video feeds healthy.",                  "video_feeds_healthy"),
+    ("Retrying... (Attempt 2 of 5)",          "retrying_attempt"),
+    ("Saved screenshot to '/tmp/x.png'",      "saved_screenshot_to"),
+    ("404",                                   "log"),
+])
+def test_event_code(message, expected):
+    assert event_code(message) == expected
+
+def test_json_formatter_fields():
+    fmt = JsonFormatter()
+    rec = logging.LogRecord("root", logging.WARNING, __file__, 1, "Retrying... (Attempt %d of %d)",
+                            (2, 5), None)
+    rec.created = datetime.datetime(2025, 6, 5, 10, 0, 1).timestamp()
+    rec.event, rec.attempt = "retry", 2
+    line = fmt.format(rec)
+    assert "\n" not in line
+    assert list(json.loads(line).items()) == [
+        ("ts", "2025-06-05 10:00:01"), ("level", "WARNING"), ("event", "retry"),
+        ("logger", "root"), ("message", "Retrying... (Attempt 2 of 5)"), ("attempt", 2),
+    ]
+    # Without an event the code is derived; tracebacks stay on the one line
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        rec = logging.LogRecord("werkzeug", logging.ERROR, __file__, 1,
+                                "\x1b[31mTab Crashed\x1b[0m", (), sys.exc_info())
+    entry = json.loads(fmt.format(rec))
+    assert entry["event"] == "tab_crashed"
+    assert entry["message"] == "Tab Crashed"
+    assert entry["exc"].endswith("ValueError: boom")
+
+def test_configure_logging_json_file(tmp_path):
+    log_file = tmp_path / "viewport.log"
+    logger = configure_logging(str(log_file), log_file=True, log_console=False, log_json=True)
+    logger.info("Video feeds healthy.", extra={"event": "feed_healthy", "duration": 1.5})
+    for h in logger.handlers:
+        h.flush()
+    entry = json.loads(log_file.read_text())
+    assert (entry["level"], entry["event"], entry["duration"]) == ("INFO", "feed_healthy", 1.5)
+
+@pytest.mark.parametrize("line, expected", [
+    ("[2025-06-05 10:00:01] [ERROR] Tab Crashed\n",
+     {"ts": "2025-06-05 10:00:01", "level": "ERROR", "event": "tab_crashed", "message": "Tab Crashed"}),
+    ('{"ts": "2025-06-05 10:00:01", "level": "INFO", "event": "resumed", "message": "Resuming"}\n',
+     {"ts": "2025-06-05 10:00:01", "level": "INFO", "event": "resumed", "message": "Resuming"}),
+    ("Traceback (most recent call last):\n", None),
+    ('{"not": "a record"}', None),
+    ("{broken", None),
+])
+def test_parse_log_line(line, expected):
+    assert parse_log_line(line) == expected
+
+def test_render_log_lines():
+    texts, entries = render_log_lines([
+        "[2025-06-05 10:00:00] [INFO] text",
+        '{"ts": "2025-06-05 10:00:01", "level": "WARNING", "event": "paused", "message": "Pausing"}',
+    ])
+    assert texts == ["[2025-06-05 10:00:00] [INFO] text", "[2025-06-05 10:00:01] [WARNING] Pausing"]
+    assert entries[0] is None and entries[1]["event"] == "paused"
 
 # --------------------------------------------------------------------------- # 
 # Test log rotation
@@ -161,6 +253,187 @@ def test_date_only_rotation_culls_old_backups(tmp_path):
         "test.log.2025-05-05",
     ]
 
+def _compressing_handler(path, backups=2):
+    return CompressingFileHandler(
+        filename=str(path), when="midnight", backupCount=backups, encoding="utf-8",
+        atTime=datetime.time(0, 0),
+    )
+
+@pytest.fixture
+def compress_threads(monkeypatch):
+    # Collect the background compression threads so tests can join them
+    threads = []
+    real_thread = threading.Thread
+    monkeypatch.setattr(logging_config.threading, "Thread",
+                        lambda *a, **kw: threads.append(real_thread(*a, **kw)) or threads[-1])
+    def join():
+        for t in threads:
+            t.join()
+    return join
+
+def _rollover(handler, join, msg, day):
+    # Write *msg*, then rotate it into a backup dated *day*
+    handler.emit(logging.LogRecord("root", logging.INFO, __file__, 1, msg, (), None))
+    handler.rotation_filename = lambda name: f"{handler.baseFilename}.{day}.gz"
+    handler.doRollover()
+    join()
+
+def test_compressing_handler_gzips_older_backups_in_background(tmp_path, compress_threads):
+    log = tmp_path / "test.log"
+    handler = _compressing_handler(log, backups=5)
+    _rollover(handler, compress_threads, "day one", "2025-05-01")
+    # The newest backup stays plain until the next rollover
+    assert [p.name for p in rotated_logs(log)] == ["test.log.2025-05-01"]
+    _rollover(handler, compress_threads, "day two", "2025-05-02")
+    handler.emit(logging.LogRecord("root", logging.INFO, __file__, 1, "today", (), None))
+    handler.close()
+
+    backups = rotated_logs(log)
+    assert [p.name for p in backups] == ["test.log.2025-05-02", "test.log.2025-05-01.gz"]
+    assert gzip.decompress(backups[1].read_bytes()) == b"day one\n"
+    assert log.read_text() == "today\n"
+    assert not list(tmp_path.glob(".*.part"))
+
+def test_read_log_cursor_survives_compressing_rotation(tmp_path, compress_threads):
+    log = tmp_path / "test.log"
+    handler = _compressing_handler(log, backups=5)
+    _rollover(handler, compress_threads, "day one", "2025-05-01")
+    handler.emit(logging.LogRecord("root", logging.INFO, __file__, 1, "seen", (), None))
+    _, cursor, _ = read_log(log, 100)
+    _rollover(handler, compress_threads, "before midnight", "2025-05-02")
+    handler.emit(logging.LogRecord("root", logging.INFO, __file__, 1, "after midnight", (), None))
+    handler.flush()
+    assert (tmp_path / "test.log.2025-05-01.gz").exists()
+    lines, _, reset = read_log(log, 100, cursor)
+    handler.close()
+    assert reset is False
+    assert lines == ["before midnight", "after midnight"]
+
+def test_compressing_handler_counts_each_day_once(tmp_path):
+    handler = _compressing_handler(tmp_path / "test.log")
+    for d in ["2025-05-01", "2025-05-02", "2025-05-03"]:
+        (tmp_path / f"test.log.{d}.gz").write_bytes(b"")
+    # 05-04 is being compressed: it exists both ways
+    (tmp_path / "test.log.2025-05-04").write_text("")
+    (tmp_path / "test.log.2025-05-04.gz").write_bytes(b"")
+    assert [p.name for p in rotated_logs(tmp_path / "test.log")] == [
+        "test.log.2025-05-04", "test.log.2025-05-03.gz", "test.log.2025-05-02.gz", "test.log.2025-05-01.gz",
+    ]
+    assert sorted(Path(p).name for p in handler.getFilesToDelete()) == [
+        "test.log.2025-05-01.gz", "test.log.2025-05-02.gz",
+    ]
+    handler.close()
+
+def test_compress_backups_sweeps_plain_and_stale_parts(tmp_path):
+    log = tmp_path / "viewport.log"
+    log.write_text("live\n")
+    (tmp_path / "viewport.log.2025-05-01").write_text("old\n")
+    (tmp_path / "viewport.log.2025-05-02").write_text("yesterday\n")
+    stale = tmp_path / ".viewport.log.2025-05-02.123.part"
+    stale.write_bytes(b"partial")
+    os.utime(stale, (0, 0))
+    compress_backups(log)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "viewport.log", "viewport.log.2025-05-01.gz", "viewport.log.2025-05-02",
+    ]
+    assert gzip.decompress((tmp_path / "viewport.log.2025-05-01.gz").read_bytes()) == b"old\n"
+
+# --------------------------------------------------------------------------- #
+# Asynchronous logging
+# --------------------------------------------------------------------------- #
+def test_async_logging_writes_on_listener_thread(tmp_path):
+    log_path = tmp_path / "viewport.log"
+    logger = configure_logging(str(log_path), log_file=True, log_console=False, log_async=True)
+    queue_handlers = [h for h in logger.handlers if isinstance(h, DroppingQueueHandler)]
+    assert len(queue_handlers) == 1
+    assert not any(isinstance(h, TimedRotatingFileHandler) for h in logger.handlers)
+    writers = []
+    file_handler = queue_handlers[0].listener.handlers[0]
+    file_handler.addFilter(lambda rec: writers.append(threading.current_thread()) or True)
+    try:
+        logging.info("queued %s", "record")
+        logging.error("with trace", exc_info=ZeroDivisionError("boom"))
+    finally:
+        assert flush_logging() is True
+    text = log_path.read_text()
+    assert "[INFO] queued record" in text
+    assert "ZeroDivisionError: boom" in text
+    assert writers and threading.current_thread() not in writers
+    # flushed: the file handler is back on the root logger, writing inline
+    assert file_handler in logger.handlers
+    logging.info("after flush")
+    assert "after flush" in log_path.read_text()
+    for h in list(logger.handlers):
+        logger.removeHandler(h)
+        h.close()
+
+def test_async_json_logging_keeps_traceback_separate(tmp_path):
+    log_path = tmp_path / "viewport.log"
+    configure_logging(str(log_path), log_file=True, log_console=False, log_async=True, log_json=True)
+    try:
+        try:
+            raise ValueError("bad")
+        except ValueError:
+            logging.exception("boom %s", 1)
+    finally:
+        assert flush_logging() is True
+    entry = json.loads(log_path.read_text())
+    assert (entry["message"], entry["event"]) == ("boom 1", "boom")
+    assert entry["exc"].startswith("Traceback (most recent call last):")
+    assert entry["exc"].endswith("ValueError: bad")
+
+def test_async_logging_reuses_existing_handler(tmp_path):
+    log_path = tmp_path / "viewport.log"
+    logger = configure_logging(str(log_path), log_file=True, log_console=False, log_async=True)
+    configure_logging(str(log_path), log_file=True, log_console=False, log_async=True)
+    assert len([h for h in logger.handlers if isinstance(h, DroppingQueueHandler)]) == 1
+    flush_logging()
+    for h in list(logger.handlers):
+        logger.removeHandler(h)
+        h.close()
+
+def test_async_logging_drops_and_counts_when_full(tmp_path, monkeypatch):
+    monkeypatch.setattr(logging_config, "LOG_QUEUE_SIZE", 3)
+    log_path = tmp_path / "viewport.log"
+    logger = configure_logging(str(log_path), log_file=True, log_console=False, log_async=True)
+    handler = next(h for h in logger.handlers if isinstance(h, DroppingQueueHandler))
+    # Stall the writer, as a slow disk would
+    gate = threading.Event()
+    handler.listener.handlers[0].addFilter(lambda rec: gate.wait(5) or True)
+    for i in range(10):
+        logging.info(f"record {i}")
+    logging.warning("late warning")
+    dropped = dropped_records()
+    assert dropped["INFO"] >= 5
+    assert dropped.get("WARNING", 0) <= 1
+    gate.set()
+    # Let the writer catch up before logging again
+    handler.listener.stop()
+    handler.listener.start()
+    logging.info("after the stall")
+    assert flush_logging() is True
+    text = log_path.read_text()
+    assert "record 0" in text
+    assert "[WARNING] Log queue full; dropped" in text
+    assert text.index("Log queue full") < text.index("after the stall")
+    for h in list(logger.handlers):
+        logger.removeHandler(h)
+        h.close()
+
+def test_flush_logging_gives_up_on_a_stuck_writer(tmp_path, monkeypatch):
+    monkeypatch.setattr(logging_config, "LOG_QUEUE_SIZE", 1)
+    logger = configure_logging(str(tmp_path / "viewport.log"), log_file=True, log_console=False, log_async=True)
+    handler = next(h for h in logger.handlers if isinstance(h, DroppingQueueHandler))
+    gate = threading.Event()
+    handler.listener.handlers[0].addFilter(lambda rec: gate.wait(5) or True)
+    logging.info("stuck")
+    logging.info("queued")
+    assert flush_logging(timeout=0.1) is False
+    gate.set()
+    for h in list(logger.handlers):
+        logger.removeHandler(h)
+        h.close()
+
 # --------------------------------------------------------------------------- #
 # Re-use-existing-handler branch coverage
 # --------------------------------------------------------------------------- #
@@ -252,3 +525,325 @@ def test_viewport_and_monitoring_logs_routed_and_filtered(tmp_path):
     assert not "127.0.0.1 - - [01/Jan/2025 00:00:00]" in mon_text
     # no IP + timestamp clutter
     assert not re.search(r"\d+\.\d+\.\d+\.\d+ - - \[", mon_text)
+
+# --------------------------------------------------------------------------- #
+# Reading logs back: reverse tail and cursors
+# --------------------------------------------------------------------------- #
+@pytest.mark.parametrize("limit, start, chunk, expected", [
+    (3,  0, 8192, ["l7", "l8", "l9"]),
+    (3,  0, 4,    ["l7", "l8", "l9"]),   # many small backwards steps
+    (50, 0, 4,    [f"l{i}" for i in range(10)]),
+    (50, 9, 4,    [f"l{i}" for i in range(3, 10)]),
+    (0,  0, 8192, []),
+])
+def test_tail_lines(tmp_path, limit, start, chunk, expected):
+    path = tmp_path / "app.log"
+    path.write_text("".join(f"l{i}\n" for i in range(10)))
+    with open(path, "rb") as f:
+        lines, end = tail_lines(f, limit, start=start, chunk_size=chunk)
+    assert lines == expected
+    assert end == path.stat().st_size
+
+def test_tail_lines_reads_only_the_end(tmp_path):
+    path = tmp_path / "big.log"
+    path.write_text("x" * 1_000_000 + "\nlast\n")
+    with open(path, "rb") as f:
+        reads = []
+        real_read = f.read
+        f.read = lambda n: reads.append(n) or real_read(n)
+        assert tail_lines(f, 1, chunk_size=4096)[0] == ["last"]
+    assert sum(reads) < 10_000
+
+@pytest.mark.parametrize("raw, expected", [
+    ("12:34", (12, 34)),
+    ("12:-1", None),
+    ("junk", None),
+    ("1:2:3", None),
+    (None, None),
+])
+def test_parse_log_cursor(raw, expected):
+    assert parse_log_cursor(raw) == expected
+
+def test_read_log_cursor_returns_only_new_lines(tmp_path):
+    log = tmp_path / "viewport.log"
+    log.write_text("a\nb\n")
+    lines, cursor, reset = read_log(log, 100)
+    assert lines == ["a", "b"] and reset is False
+    assert cursor == f"{log.stat().st_ino}:{log.stat().st_size}"
+    # nothing new
+    assert read_log(log, 100, cursor) == ([], cursor, False)
+    with log.open("a") as f:
+        f.write("c\nd\n")
+    lines, cursor, reset = read_log(log, 100, cursor)
+    assert lines == ["c", "d"] and reset is False
+    # more new lines than the limit → the oldest come first, none are skipped
+    with log.open("a") as f:
+        f.write("e\nf\ng\n")
+    lines, cursor, reset = read_log(log, 2, cursor)
+    assert lines == ["e", "f"] and reset is False
+    assert read_log(log, 2, cursor)[0] == ["g"]
+
+def test_read_log_cursor_holds_back_partial_line(tmp_path):
+    log = tmp_path / "viewport.log"
+    log.write_text("a\n")
+    _, cursor, _ = read_log(log, 100)
+    with log.open("a") as f:
+        f.write("b\npart")
+    lines, cursor, _ = read_log(log, 100, cursor)
+    assert lines == ["b"]
+    with log.open("a") as f:
+        f.write("ial\n")
+    assert read_log(log, 100, cursor)[0] == ["partial"]
+
+def test_read_log_cursor_continues_across_rotation_in_steps(tmp_path):
+    log = tmp_path / "viewport.log"
+    log.write_text("a\n")
+    _, cursor, _ = read_log(log, 100)
+    with log.open("a") as f:
+        f.write("b\nc\n")
+    log.rename(tmp_path / "viewport.log.2025-06-05")
+    log.write_text("d\ne\n")
+    seen = []
+    for _ in range(3):
+        lines, cursor, reset = read_log(log, 2, cursor)
+        assert reset is False
+        seen += lines
+    assert seen == ["b", "c", "d", "e"]
+    assert cursor == f"{log.stat().st_ino}:{log.stat().st_size}"
+
+def test_read_log_cursor_survives_rotation(tmp_path):
+    log = tmp_path / "viewport.log"
+    log.write_text("old1\n")
+    _, cursor, _ = read_log(log, 100)
+    with log.open("a") as f:
+        f.write("old2\n")
+    # midnight: TimedRotatingFileHandler renames, then starts a new file
+    log.rename(tmp_path / "viewport.log.2025-06-05")
+    (tmp_path / "viewport.log.2025-06-04").write_text("ancient\n")
+    log.write_text("new1\n")
+    lines, new_cursor, reset = read_log(log, 100, cursor)
+    assert lines == ["old2", "new1"]
+    assert reset is False
+    assert new_cursor == f"{log.stat().st_ino}:{log.stat().st_size}"
+
+@pytest.mark.parametrize("make_cursor", [
+    lambda log: "999999999:0",                                   # unknown file
+    lambda log: f"{log.stat().st_ino}:{log.stat().st_size + 50}", # truncated
+    lambda log: "garbage",
+])
+def test_read_log_bad_cursor_resets(tmp_path, make_cursor):
+    log = tmp_path / "viewport.log"
+    log.write_text("a\nb\n")
+    (tmp_path / "viewport.log.2025-06-05").write_text("y\n")
+    lines, cursor, reset = read_log(log, 3, make_cursor(log))
+    assert reset is True
+    assert lines == ["y", "a", "b"]
+
+def test_read_log_missing_file(tmp_path):
+    assert read_log(tmp_path / "viewport.log", 10) == ([], None, False)
+
+# --------------------------------------------------------------------------- #
+# Following logs
+# --------------------------------------------------------------------------- #
+def _follow(log, cursor=None, poll=0.2):
+    # Run follow_log on a thread, collecting lines until stopped
+    stop, lines = threading.Event(), []
+    def run():
+        for line in follow_log(log, cursor, poll=poll, stop=stop):
+            lines.append(line)
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return stop, lines, thread
+
+def _wait_for(lines, count, timeout=3):
+    deadline = time.monotonic() + timeout
+    while len(lines) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return lines
+
+def test_directory_watcher_wakes_for_its_file(tmp_path):
+    try:
+        watcher = DirectoryWatcher(tmp_path / "viewport.log")
+    except OSError:
+        pytest.skip("inotify not available")
+    (tmp_path / "monitoring.log").write_text("x\n")
+    assert watcher.wait(0.05) is False
+    (tmp_path / "viewport.log").write_text("x\n")
+    assert watcher.wait(1) is True
+    watcher.close()
+
+def test_follow_log_streams_appends_and_rotation(tmp_path):
+    log = tmp_path / "viewport.log"
+    log.write_text("old\n")
+    _, cursor, _ = read_log(log, 1)
+    stop, lines, thread = _follow(log, cursor)
+    with open(log, "a") as f:
+        f.write("one\npart")
+        f.flush()
+        assert _wait_for(lines, 1) == ["one"]
+        f.write("ial\n")
+    assert _wait_for(lines, 2) == ["one", "partial"]
+    # Midnight rotation: the rest of the old file, then the new one
+    with open(log, "a") as f:
+        f.write("last of the day\n")
+    log.rename(tmp_path / "viewport.log.2025-06-04")
+    log.write_text("after midnight\n")
+    assert _wait_for(lines, 4) == ["one", "partial", "last of the day", "after midnight"]
+    stop.set()
+    thread.join(1)
+
+def test_follow_log_polls_without_inotify(tmp_path, monkeypatch):
+    def unavailable(path):
+        raise OSError("inotify is not available")
+    monkeypatch.setattr(logging_config, "DirectoryWatcher", unavailable)
+    log = tmp_path / "viewport.log"
+    log.write_text("old\n")
+    _, cursor, _ = read_log(log, 1)
+    stop, lines, thread = _follow(log, cursor, poll=0.01)
+    with open(log, "a") as f:
+        f.write("first\n")
+    assert _wait_for(lines, 1) == ["first"]
+    stop.set()
+    thread.join(1)
+    assert not thread.is_alive()
+
+# --------------------------------------------------------------------------- #
+# Searching logs: LogIndex
+# --------------------------------------------------------------------------- #
+def _log(path, *records):
+    with open(path, "a") as f:
+        for stamp, level, msg in records:
+            f.write(f"[2025-06-05 {stamp}] [{level}] {msg}\n")
+
+@pytest.fixture
+def indexed_logs(tmp_path):
+    log = tmp_path / "viewport.log"
+    _log(tmp_path / "viewport.log.2025-06-04",
+         ("10:00:01", "INFO", "yesterday"))
+    _log(log,
+         ("10:00:05", "INFO", "Video feeds healthy."),
+         ("10:00:30", "ERROR", "Tab Crashed. Restarting chrome..."))
+    with open(log, "a") as f:
+        f.write("Traceback (most recent call last):\n  boom\n")
+    _log(log,
+         ("10:01:10", "WARNING", "Retrying... (Attempt 1 of 5)"),
+         ("10:02:00", "INFO", "Page successfully reloaded."),
+         ("10:02:30", "ERROR", "Error during login"))
+    return log
+
+def test_log_index_filters_by_time_level_and_text(indexed_logs):
+    index = LogIndex(indexed_logs)
+    lines, cursor = index.search(levels={"ERROR"})
+    assert cursor is None
+    # The traceback stays with its record
+    assert lines == [
+        "[2025-06-05 10:00:30] [ERROR] Tab Crashed. Restarting chrome...\n"
+        "Traceback (most recent call last):\n  boom",
+        "[2025-06-05 10:02:30] [ERROR] Error during login",
+    ]
+    lines, _ = index.search(start="2025-06-05 10:00:10", end="2025-06-05 10:01:59")
+    assert [line.splitlines()[0][22:] for line in lines] == [
+        "[ERROR] Tab Crashed. Restarting chrome...",
+        "[WARNING] Retrying... (Attempt 1 of 5)",
+    ]
+
+    lines, _ = index.search(text="HEALTHY")
+    assert lines == ["[2025-06-05 10:00:05] [INFO] Video feeds healthy."]
+    # Oldest first, across rotated backups
+    assert index.search(limit=1)[0] == ["[2025-06-05 10:00:01] [INFO] yesterday"]
+
+def test_log_index_pages_with_cursor(indexed_logs):
+    index = LogIndex(indexed_logs)
+    seen, cursor = [], None
+    while True:
+        page, cursor = index.search(levels={"INFO", "ERROR"}, limit=2, cursor=cursor)
+        seen += [line.splitlines()[0] for line in page]
+        if cursor is None:
+            break
+    assert [line[22:] for line in seen] == [
+        "[INFO] yesterday",
+        "[INFO] Video feeds healthy.",
+        "[ERROR] Tab Crashed. Restarting chrome...",
+        "[INFO] Page successfully reloaded.",
+        "[ERROR] Error during login",
+    ]
+    with pytest.raises(ValueError):
+        index.search(cursor="999999999:0")
+
+def test_log_index_reads_only_new_bytes_and_wanted_blocks(indexed_logs, monkeypatch):
+    index = LogIndex(indexed_logs)
+    index.search()
+    scanned = []
+    real_scan = LogIndex._scan
+    monkeypatch.setattr(LogIndex, "_scan", lambda self, path, entry, size: (
+        scanned.append((path.name, entry["size"], size)), real_scan(self, path, entry, size)))
+    # Nothing changed: no file is scanned again
+    assert index.search(levels={"WARNING"})[0][0].endswith("(Attempt 1 of 5)")
+    assert scanned == []
+
+    size = indexed_logs.stat().st_size
+    _log(indexed_logs, ("10:03:00", "ERROR", "Driver unresponsive."))
+    # A partly written line waits for its newline
+    with open(indexed_logs, "a") as f:
+        f.write("[2025-06-05 10:03:01] [INF")
+    lines, _ = index.search(start="2025-06-05 10:03:00")
+    assert lines == ["[2025-06-05 10:03:00] [ERROR] Driver unresponsive."]
+    assert scanned == [("viewport.log", size, indexed_logs.stat().st_size)]
+
+    # Blocks without the level are never read
+    reads = []
+    real_records = LogIndex._records
+    monkeypatch.setattr(LogIndex, "_records", staticmethod(
+        lambda path, ranges: reads.append(ranges) or real_records(path, ranges)))
+    index.search(levels={"WARNING"})
+    assert len(reads) == 1 and len(reads[0]) == 1
+
+def test_log_index_follows_rotation(indexed_logs, tmp_path):
+    index = LogIndex(indexed_logs)
+    before = index.search()[0]
+    indexed_logs.rename(tmp_path / "viewport.log.2025-06-05")
+    (tmp_path / "viewport.log.2025-06-04").unlink()
+    _log(indexed_logs, ("00:00:01", "INFO", "after midnight"))
+    after = index.search()[0]
+    assert after == before[1:] + ["[2025-06-05 00:00:01] [INFO] after midnight"]
+    assert len(index._files) == 2
+
+def test_log_index_reads_json_logs(tmp_path):
+    log = tmp_path / "viewport.log"
+    fmt = JsonFormatter()
+    with open(log, "w") as f:
+        for stamp, level, msg in (("10:00:05", "INFO", "Video feeds healthy."),
+                                  ("10:00:30", "ERROR", "Tab Crashed."),
+                                  ("10:01:10", "WARNING", "Retrying... (Attempt 1 of 5)")):
+            rec = logging.LogRecord("root", getattr(logging, level), __file__, 1, msg, (), None)
+            rec.created = datetime.datetime.fromisoformat(f"2025-06-05 {stamp}").timestamp()
+            f.write(fmt.format(rec) + "\n")
+    index = LogIndex(log)
+    lines, _ = index.search(levels={"ERROR"})
+    assert [json.loads(line)["message"] for line in lines] == ["Tab Crashed."]
+    lines, _ = index.search(start="2025-06-05 10:01:00")
+    assert [json.loads(line)["level"] for line in lines] == ["WARNING"]
+    # Text search looks at the message, not the JSON keys
+    assert index.search(text="level")[0] == []
+    assert len(index.search(text="crashed")[0]) == 1
+
+def test_read_log_can_skip_gzipped_backups(indexed_logs, tmp_path, monkeypatch):
+    compress_backups(indexed_logs, keep=0)
+    opened = []
+    monkeypatch.setattr(logging_config, "tail_compressed", lambda path, limit: opened.append(path) or [])
+    lines, _, _ = read_log(indexed_logs, 100, compressed=False)
+    assert lines == indexed_logs.read_text().splitlines()
+    assert opened == []
+
+def test_read_log_and_index_read_gzipped_backups(indexed_logs, tmp_path):
+    compress_backups(indexed_logs, keep=0)
+    assert (tmp_path / "viewport.log.2025-06-04.gz").exists()
+    lines, cursor, _ = read_log(indexed_logs, 100)
+    assert lines[0] == "[2025-06-05 10:00:01] [INFO] yesterday"
+    assert cursor.startswith(f"{indexed_logs.stat().st_ino}:")
+    index = LogIndex(indexed_logs)
+    assert index.search(text="yesterday")[0] == ["[2025-06-05 10:00:01] [INFO] yesterday"]
+    # Indexed once; later searches do not scan the archive again
+    size = index._files[(tmp_path / "viewport.log.2025-06-04.gz").stat().st_ino]["size"]
+    assert size == (tmp_path / "viewport.log.2025-06-04.gz").stat().st_size
+    assert len(index.search(levels={"ERROR"})[0]) == 2
@@ -1,4 +1,5 @@
 import re
+import json
 import signal
 import logging
 import logging.handlers
@@ -11,6 +12,7 @@ from unittest.mock import MagicMock, patch, mock_open
 
 import pytest
 import viewport
+import core
 # Ensure no scheduled restarts by default
 viewport.RESTART_TIMES = []
 @pytest.fixture(autouse=True)
@@ -19,6 +21,14 @@ def disable_external_side_effects(monkeypatch):
     monkeypatch.setattr(viewport.time, "sleep", lambda *args, **kwargs: None)
     # never actually fork a process
     monkeypatch.setattr(viewport.subprocess, "Popen", lambda *args, **kwargs: None)
+    # never start the background resource sampler
+    monkeypatch.setattr(viewport, "sampler_handler", lambda: None)
+    # nor the history writer thread
+    monkeypatch.setattr(viewport.history, "open", lambda *args, **kwargs: None)
+    # nor map the shared state block
+    monkeypatch.setattr(viewport.state, "open", lambda *args, **kwargs: None)
+    # nor the control socket
+    monkeypatch.setattr(viewport, "control_handler", lambda: None)
 # --------------------------------------------------------------------------- # 
 # Test conftest file handler isolation
 # --------------------------------------------------------------------------- # 
@@ -72,6 +82,7 @@ def test_guard_blocks_deletes_outside_safe():
 )
 @patch("viewport.args_handler", return_value="continue")
 @patch("viewport.process_handler")
+@patch("viewport.pid_handler")
 @patch("viewport.api_handler")
 @patch("viewport.api_status")
 @patch("viewport.browser_handler")
@@ -83,6 +94,7 @@ def test_main_various(
     mock_chrome,
     mock_api_status,
     mock_api_handler,
+    mock_pid,
     mock_process,
     mock_args,
     tmp_path,
@@ -150,6 +162,9 @@ def test_main_various(
     else:
         mock_open_file.assert_not_called()
 
+    # the new instance registers its PID file
+    mock_pid.assert_called_once_with("viewport.py", action="write")
+
     # browser + thread
     mock_chrome.assert_called_once_with(viewport.url)
     mock_thread.assert_any_call(
@@ -292,10 +307,38 @@ def test_clear_sst_exception(monkeypatch):
 # Test api_status function
 # --------------------------------------------------------------------------- # 
 def test_api_status_writes(tmp_path, monkeypatch):
-    status_file = tmp_path / "status.txt"
-    monkeypatch.setattr(viewport, "status_file", status_file)
+    status_file = tmp_path / "status.jsonl"
+    monkeypatch.setattr(core, "status_file", status_file)
     viewport.api_status("OKAY")
-    assert status_file.read_text() == "OKAY"
+    viewport.api_status("Browser Restarted", attempt=2)
+    entries = core.read_status(status_file, tail=5)
+    assert [e["message"] for e in entries] == ["OKAY", "Browser Restarted"]
+    assert entries[-1]["code"] == "browser_restarted"
+    assert entries[-1]["details"] == {"attempt": 2}
+
+def test_api_status_skips_repeats(tmp_path, monkeypatch):
+    status_file = tmp_path / "status.jsonl"
+    monkeypatch.setattr(core, "status_file", status_file)
+    for _ in range(3):
+        viewport.api_status("Feed Healthy")
+    viewport.api_status("Tab Crashed")
+    viewport.api_status("Feed Healthy")
+    assert len(status_file.read_text().splitlines()) == 3
+
+def test_api_status_compacts(tmp_path, monkeypatch):
+    status_file = tmp_path / "status.jsonl"
+    monkeypatch.setattr(core, "status_file", status_file)
+    monkeypatch.setattr(core, "STATUS_MAX_BYTES", 2048)
+    monkeypatch.setattr(core, "STATUS_KEEP", 5)
+    for i in range(100):
+        viewport.api_status(f"Retry {i}")
+    assert status_file.stat().st_size <= 2048
+    assert core.read_status(status_file, tail=1)[0]["message"] == "Retry 99"
+
+def test_read_status_skips_partial_line(tmp_path):
+    status_file = tmp_path / "status.jsonl"
+    status_file.write_text(json.dumps(core.status_entry("Feed Healthy")) + '\n{"ts": 1, "mess')
+    assert [e["message"] for e in core.read_status(status_file, tail=5)] == ["Feed Healthy"]
 
 # --------------------------------------------------------------------------- # 
 # Test Script Start Time File
@@ -0,0 +1,106 @@
+import pytest
+import json, time
+import metrics
+from unittest.mock import MagicMock, patch
+
+# --------------------------------------------------------------------------- #
+# MetricsStore
+# --------------------------------------------------------------------------- #
+def test_store_counts_and_buckets():
+    store = metrics.MetricsStore()
+    store.inc("retries")
+    store.inc("retries", 2)
+    store.observe("webdriver_rtt_seconds", 0.02)
+    store.observe("webdriver_rtt_seconds", 0.02)
+    store.observe("webdriver_rtt_seconds", 99)   # above every bucket
+    data = store.snapshot()
+    assert data["counters"]["retries"] == 3
+    assert data["counters"]["logins"] == 0
+    hist = data["histograms"]["webdriver_rtt_seconds"]
+    assert hist["buckets"][2] == 2               # le=0.025
+    assert sum(hist["buckets"]) == 2
+    assert hist["count"] == 3
+    assert hist["sum"] == pytest.approx(99.04)
+
+def test_store_timer_skips_failed_blocks():
+    store = metrics.MetricsStore()
+    with store.timer("health_check_seconds"):
+        pass
+    with pytest.raises(RuntimeError):
+        with store.timer("health_check_seconds"):
+            raise RuntimeError("driver gone")
+    assert store.snapshot()["histograms"]["health_check_seconds"]["count"] == 1
+
+def test_store_without_path_never_writes(tmp_path):
+    store = metrics.MetricsStore()
+    with patch("metrics.write_metrics") as write:
+        store.inc("retries")
+        store.flush(force=True)
+    write.assert_not_called()
+
+def test_store_writes_are_throttled(tmp_path, monkeypatch):
+    path = tmp_path / "metrics.json"
+    timers = []
+    monkeypatch.setattr(metrics.threading, "Timer", lambda wait, fn: timers.append(fn) or MagicMock())
+    store = metrics.MetricsStore(path, interval=60)
+    store.inc("retries")                 # first change is written at once
+    assert metrics.read_metrics(path)["counters"]["retries"] == 1
+    store.inc("retries")
+    store.inc("modals_closed")           # both wait for one deferred write
+    assert metrics.read_metrics(path)["counters"]["retries"] == 1
+    assert len(timers) == 1
+    timers[0]()
+    data = metrics.read_metrics(path)
+    assert data["counters"]["retries"] == 2
+    assert data["counters"]["modals_closed"] == 1
+    assert list(tmp_path.iterdir()) == [path]
+
+def test_store_continues_from_file(tmp_path):
+    path = tmp_path / "metrics.json"
+    first = metrics.MetricsStore(path)
+    first.inc("script_restarts")
+    first.observe("recovery_seconds", 12)
+    first.flush(force=True)
+    second = metrics.MetricsStore().open(path)
+    second.inc("script_restarts")
+    data = second.snapshot()
+    assert data["counters"]["script_restarts"] == 2
+    assert data["histograms"]["recovery_seconds"]["count"] == 1
+
+@pytest.mark.parametrize("content", ["", "not json", "[]", json.dumps({"version": 99})])
+def test_read_metrics_rejects_bad_files(tmp_path, content):
+    path = tmp_path / "metrics.json"
+    path.write_text(content)
+    assert metrics.read_metrics(path) is None
+    assert metrics.read_metrics(tmp_path / "missing.json") is None
+
+# --------------------------------------------------------------------------- #
+# Prometheus rendering
+# --------------------------------------------------------------------------- #
+def test_render_exposition_format():
+    store = metrics.MetricsStore()
+    store.inc("browser_restarts")
+    store.observe("recovery_seconds", 7)
+    store.observe("recovery_seconds", 45)
+    text = metrics.render(store.snapshot(), {"viewport_cpu": 1.5, "browser_rss": 2048})
+    lines = text.splitlines()
+    assert text.endswith("\n")
+    assert "# TYPE viewport_browser_restarts_total counter" in lines
+    assert "viewport_browser_restarts_total 1" in lines
+    assert "viewport_retries_total 0" in lines
+    # Buckets are cumulative and end with +Inf
+    assert 'viewport_recovery_seconds_bucket{le="5"} 0' in lines
+    assert 'viewport_recovery_seconds_bucket{le="10"} 1' in lines
+    assert 'viewport_recovery_seconds_bucket{le="60"} 2' in lines
+    assert 'viewport_recovery_seconds_bucket{le="+Inf"} 2' in lines
+    assert "viewport_recovery_seconds_sum 52.0" in lines
+    assert "viewport_recovery_seconds_count 2" in lines
+    assert 'viewport_process_cpu_percent{process="viewport"} 1.5' in lines
+    assert 'viewport_process_resident_memory_bytes{process="browser"} 2048' in lines
+    assert 'viewport_process_resident_memory_bytes{process="monitoring"} 0' in lines
+
+def test_render_without_data_reports_zeros():
+    text = metrics.render(None, None)
+    assert "viewport_logins_total 0" in text
+    assert "viewport_health_check_seconds_count 0" in text
+    assert "process_cpu_percent" not in text
@@ -0,0 +1,147 @@
+import pytest
+import psutil, struct, time
+import sampler
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# --------------------------------------------------------------------------- #
+# ResourceRing
+# --------------------------------------------------------------------------- #
+def test_ring_append_and_read(tmp_path):
+    path = tmp_path / "samples.bin"
+    ring = sampler.ResourceRing(path, capacity=4, interval=2, writable=True)
+    assert ring.latest() is None
+    ring.append({"timestamp": 1.0, "cpu_percent": 50.0, "browser_rss": 123})
+    reader = sampler.ResourceRing.open(path)
+    latest = reader.latest()
+    assert latest["seq"] == 1
+    assert latest["timestamp"] == 1.0
+    assert latest["cpu_percent"] == pytest.approx(50.0)
+    assert latest["browser_rss"] == 123
+    assert latest["viewport_rss"] == 0
+    assert reader.interval == 2 and reader.capacity == 4
+    reader.close()
+    ring.close()
+
+def test_ring_wraps_and_keeps_newest(tmp_path):
+    ring = sampler.ResourceRing(tmp_path / "samples.bin", capacity=4, writable=True)
+    for i in range(10):
+        ring.append({"timestamp": float(i)})
+    # one slot is reserved for the record being written
+    assert [s["timestamp"] for s in ring.history()] == [7.0, 8.0, 9.0]
+    assert [s["timestamp"] for s in ring.history(2)] == [8.0, 9.0]
+    assert ring.history(0) == []
+    ring.close()
+
+def test_ring_survives_reopen(tmp_path):
+    path = tmp_path / "samples.bin"
+    ring = sampler.ResourceRing(path, capacity=4, writable=True)
+    ring.append({"timestamp": 5.0})
+    ring.close()
+    ring = sampler.ResourceRing(path, capacity=4, writable=True)
+    assert ring.seq == 1
+    ring.close()
+    # A different layout resets the file instead of misreading it
+    ring = sampler.ResourceRing(path, capacity=8, writable=True)
+    assert ring.seq == 0 and ring.capacity == 8
+    ring.close()
+
+def test_ring_open_rejects_missing_and_foreign(tmp_path):
+    assert sampler.ResourceRing.open(tmp_path / "missing.bin") is None
+    bogus = tmp_path / "bogus.bin"
+    bogus.write_bytes(b"x" * 64)
+    assert sampler.ResourceRing.open(bogus) is None
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    assert sampler.ResourceRing.open(empty) is None
+
+@pytest.mark.parametrize("age, max_age, expected", [
+    (1,   None, True),
+    (100, None, False),
+    (100, 200,  True),
+])
+def test_latest_sample_freshness(tmp_path, age, max_age, expected):
+    path = tmp_path / "samples.bin"
+    ring = sampler.ResourceRing(path, capacity=4, interval=5, writable=True)
+    ring.append({"timestamp": time.time() - age})
+    ring.close()
+    assert (sampler.latest_sample(path, max_age) is not None) is expected
+
+def test_latest_sample_missing(tmp_path):
+    assert sampler.latest_sample(tmp_path / "nope.bin") is None
+
+# --------------------------------------------------------------------------- #
+# ResourceSampler
+# --------------------------------------------------------------------------- #
+def _nic(recv, sent):
+    return SimpleNamespace(bytes_recv=recv, bytes_sent=sent)
+
+def _proc(pid, name, cpu, rss):
+    p = MagicMock()
+    p.info = {"pid": pid, "name": name, "cmdline": [name]}
+    p.cpu_percent.return_value = cpu
+    p.memory_info.return_value = SimpleNamespace(rss=rss)
+    return p
+
+@patch("sampler.psutil.cpu_count", return_value=2)
+@patch("sampler.psutil.cpu_percent", return_value=25.0)
+@patch("sampler.psutil.virtual_memory", return_value=SimpleNamespace(percent=40.0, used=4096))
+@patch("sampler.psutil.disk_io_counters")
+@patch("sampler.psutil.net_io_counters")
+@patch("sampler.psutil.process_iter")
+@patch("sampler.time.time")
+def test_sampler_rates_and_groups(
+    mock_time, mock_iter, mock_net, mock_disk, mock_vm, mock_cpu, mock_count, tmp_path
+):
+    denied = _proc(3, "chrome", 0, 0)
+    denied.cpu_percent.side_effect = psutil.AccessDenied(3)
+    mock_iter.return_value = [
+        _proc(1, "chrome", 40.0, 100), _proc(2, "chrome", 20.0, 50),
+        _proc(4, "viewport.py", 2.0, 10), denied, _proc(5, "bash", 99.0, 999),
+    ]
+    mock_time.side_effect = [100.0, 102.0]
+    mock_net.side_effect = [{"eth0": _nic(1000, 500)}, {"eth0": _nic(3000, 1500)}]
+    mock_disk.side_effect = [SimpleNamespace(read_bytes=0, write_bytes=0),
+                             SimpleNamespace(read_bytes=400, write_bytes=800)]
+    ring = sampler.ResourceRing(tmp_path / "samples.bin", capacity=4, writable=True)
+    s = sampler.ResourceSampler(ring, groups={
+        "browser":  lambda p: p.info["name"] == "chrome",
+        "viewport": lambda p: p.info["name"] == "viewport.py",
+    })
+    first = s.sample()
+    assert first["net_recv_rate"] == 0.0
+    second = s.sample()
+    assert second["net_recv_rate"] == pytest.approx(1000.0)
+    assert second["net_sent_rate"] == pytest.approx(500.0)
+    assert second["disk_read_rate"] == pytest.approx(200.0)
+    assert second["disk_write_rate"] == pytest.approx(400.0)
+    # CPU normalised across 2 cores, denied process skipped
+    assert second["browser_cpu"] == pytest.approx(30.0)
+    assert second["browser_rss"] == 150
+    assert second["viewport_cpu"] == pytest.approx(1.0)
+    assert second["monitoring_rss"] == 0
+    assert s.net_interfaces["eth0"]["download"] == pytest.approx(1000.0)
+    assert s.latest is second
+    assert s.seq == ring.seq == 2
+    ring.close()
+
+@patch("sampler.psutil.disk_io_counters", return_value=None)
+@patch("sampler.psutil.net_io_counters", return_value={})
+def test_sampler_without_ring_or_disks(*_):
+    s = sampler.ResourceSampler()
+    sample = s.sample()
+    assert sample["disk_read_rate"] == 0.0
+    assert set(sampler.FIELDS) <= set(sample)
+
+def test_sampler_thread_runs_and_stops():
+    s = sampler.ResourceSampler(interval=60)
+    calls = []
+    def fake_sample():
+        calls.append(1)
+        s.stop()
+        raise RuntimeError("keeps running")
+    s.sample = fake_sample
+    s.start()
+    s.join(timeout=2)
+    assert not s.is_alive()
+    assert calls == [1]
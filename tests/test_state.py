@@ -0,0 +1,104 @@
+import pytest
+import threading
+import state
+
+# --------------------------------------------------------------------------- #
+# StateBlock / StateReader
+# --------------------------------------------------------------------------- #
+def test_state_round_trip(tmp_path):
+    path = tmp_path / "state.bin"
+    block = state.StateBlock(path)
+    block.update(pid=42, phase="retrying", attempt=2, max_attempts=5,
+                 started=100.5, status="Retrying: 2 of 5", severity="warning")
+    live = state.read_state(path)
+    assert live["pid"] == 42
+    assert live["phase"] == "retrying"
+    assert (live["attempt"], live["max_attempts"]) == (2, 5)
+    assert live["started"] == 100.5
+    assert live["status"] == "Retrying: 2 of 5"
+    assert live["severity"] == "warning"
+    assert live["last_check"] is None
+    assert live["seq"] % 2 == 0
+    assert path.stat().st_size == state.SIZE
+    block.close()
+
+def test_state_kept_in_memory_until_open(tmp_path):
+    block = state.StateBlock()
+    block.update(status="Starting...", phase="starting")
+    path = tmp_path / "state.bin"
+    assert state.read_state(path) is None
+    block.open(path)
+    assert state.read_state(path)["status"] == "Starting..."
+    block.close()
+
+def test_state_check_passed_resets_attempt(tmp_path):
+    block = state.StateBlock(tmp_path / "state.bin")
+    block.update(phase="retrying", attempt=3)
+    block.check_passed()
+    block.check_passed()
+    live = state.read_state(block.path)
+    assert (live["phase"], live["attempt"], live["checks"]) == ("running", 0, 2)
+    assert live["last_check"] is not None
+    block.close()
+
+def test_state_rejects_unknown_fields():
+    with pytest.raises(KeyError):
+        state.StateBlock().update(uptime=5)
+
+def test_state_truncates_long_status(tmp_path):
+    block = state.StateBlock(tmp_path / "state.bin")
+    block.update(status="é" * state.STATUS_BYTES)
+    live = state.read_state(block.path)
+    assert live["status"] == "é" * (state.STATUS_BYTES // 2)
+    block.close()
+
+def test_state_reopen_keeps_sequence(tmp_path):
+    path = tmp_path / "state.bin"
+    block = state.StateBlock(path)
+    block.update(pid=1)
+    seq = state.read_state(path)["seq"]
+    block.close()
+    reopened = state.StateBlock(path)
+    assert state.read_state(path)["seq"] > seq
+    reopened.close()
+
+def test_reader_stays_mapped_across_writes(tmp_path):
+    block = state.StateBlock(tmp_path / "state.bin")
+    reader = state.StateReader(block.path)
+    block.update(status="Feed Healthy")
+    assert reader.read()["status"] == "Feed Healthy"
+    block.update(status="Tab Crashed", severity="error")
+    assert reader.read()["severity"] == "error"
+    reader.close()
+    block.close()
+
+def test_reader_ignores_missing_or_foreign_file(tmp_path):
+    path = tmp_path / "state.bin"
+    reader = state.StateReader(path)
+    assert reader.read() is None
+    path.write_bytes(b"\0" * state.SIZE)
+    assert reader.read() is None
+
+def test_reader_never_sees_torn_write(tmp_path):
+    block = state.StateBlock(tmp_path / "state.bin")
+    reader = state.StateReader(block.path)
+    stop = threading.Event()
+    def writer():
+        i = 0
+        while not stop.is_set():
+            i += 1
+            block.update(attempt=i % 1000, max_attempts=i % 1000, status=f"{i % 1000}")
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(2000):
+            live = reader.read()
+            if live is None:
+                continue
+            assert live["attempt"] == live["max_attempts"]
+            assert live["status"] in (None, str(live["attempt"]))
+    finally:
+        stop.set()
+        thread.join()
+    reader.close()
+    block.close()
@@ -11,6 +11,13 @@ import validate_config
 # --------------------------------------------------------------------------- # 
 # Fixtures
 # --------------------------------------------------------------------------- # 
+@pytest.fixture(autouse=True)
+def release_file(tmp_path, monkeypatch):
+    # Keep the persisted release cache out of the real api/ directory
+    monkeypatch.setattr(uu, "RELEASE", tmp_path / "release.json")
+    monkeypatch.setattr(uu, "release_etag", None)
+    return tmp_path / "release.json"
+
 @pytest.fixture
 def dummy_repo(tmp_path, monkeypatch):
     # Create an isolated fake repo tree:  api/VERSION  +  .git dir
@@ -22,6 +29,7 @@ def dummy_repo(tmp_path, monkeypatch):
 
     monkeypatch.setattr(uu, "ROOT", tmp_path)
     monkeypatch.setattr(uu, "VERS", tmp_path / "api" / "VERSION")
+    monkeypatch.setattr(uu, "RELEASE", tmp_path / "api" / "release.json")
     monkeypatch.setattr(uu, "GIT",  ["git", "-C", str(tmp_path)])
     yield tmp_path
     importlib.reload(uu)              # restore globals for other tests
@@ -116,6 +124,7 @@ def test_current_version_reads_file(dummy_repo):
 
 def test_latest_version_success(monkeypatch):
     class _JSON(io.StringIO):
+        headers = {}
         def __enter__(self): return self
         def __exit__(self, *exc): pass
 
@@ -175,6 +184,7 @@ def test_latest_version_cache_expired(monkeypatch):
 
     # Provide new version
     class _JSON(io.StringIO):
+        headers = {}
         def __enter__(self): return self
         def __exit__(self, *exc): pass
 
@@ -194,6 +204,7 @@ def test__get_release_data_cache_expired(monkeypatch):
     uu.last_release_fetched = datetime.now() - timedelta(hours=2)
 
     class _JSON(io.StringIO):
+        headers = {}
         def __enter__(self): return self
         def __exit__(self, *exc): pass
 
@@ -282,6 +293,97 @@ def test__get_release_data_returns_cached(monkeypatch):
     result = uu._get_release_data()
     assert result == {"tag_name": "vX.Y.Z", "body": "ignored"}
     
+# --------------------------------------------------------------------------- # 
+# Persisted release cache / background refresher
+# --------------------------------------------------------------------------- # 
+class _Release(io.StringIO):
+    def __init__(self, body, etag):
+        super().__init__(body)
+        self.headers = {"ETag": etag}
+    def __enter__(self): return self
+    def __exit__(self, *exc): pass
+
+def test__get_release_data_persists_and_revalidates(monkeypatch, release_file):
+    uu.cached_release_data = None
+    uu.last_release_fetched = None
+    sent = []
+    def github(url, **kw):
+        sent.append(kw.get("etag"))
+        if kw.get("etag") == '"abc"':
+            raise HTTPError(url, 304, "Not Modified", hdrs=None, fp=None)
+        return _Release('{"tag_name":"v3.0.0","body":"notes"}', '"abc"')
+    monkeypatch.setattr(uu, "_github", github)
+
+    assert uu._get_release_data()["tag_name"] == "v3.0.0"
+    saved = json.loads(release_file.read_text())
+    assert saved["etag"] == '"abc"' and saved["data"]["tag_name"] == "v3.0.0"
+
+    # A fresh copy is served as is; a forced check revalidates it and a
+    # 304 keeps the data but renews its age
+    assert uu._get_release_data()["tag_name"] == "v3.0.0"
+    assert sent == [None]
+    assert uu._get_release_data(force=True)["tag_name"] == "v3.0.0"
+    assert sent == [None, '"abc"']
+    assert datetime.now() - uu.last_release_fetched < timedelta(minutes=1)
+    assert json.loads(release_file.read_text())["fetched"] >= saved["fetched"]
+
+def test__github_does_not_log_not_modified(monkeypatch, caplog):
+    err = HTTPError(url="http://example.com", code=304, msg="Not Modified", hdrs=None, fp=None)
+    seen = {}
+    def request(url, headers):
+        seen.update(headers)
+        return "REQ"
+    monkeypatch.setattr(uu, "Request", request)
+    monkeypatch.setattr(uu, "urlopen", lambda req, timeout: (_ for _ in ()).throw(err))
+    caplog.set_level("ERROR")
+    with pytest.raises(HTTPError):
+        uu._github("http://example.com", etag='"abc"')
+    assert seen["If-None-Match"] == '"abc"'
+    assert caplog.text == ""
+
+def test_release_info_loads_persisted_release(monkeypatch, release_file):
+    # Written by another worker or before a restart
+    uu.cached_release_data = None
+    uu.last_release_fetched = None
+    fetched = datetime.now() - timedelta(minutes=10)
+    release_file.write_text(json.dumps({
+        "etag": '"abc"', "fetched": fetched.timestamp(),
+        "data": {"tag_name": "v4.1.0", "body": "New things\n---\n-- tar info"},
+    }))
+    info = uu.release_info()
+    assert info["latest"] == "4.1.0"
+    assert info["changelog"] == "New things"
+    assert info["checked"] == fetched.isoformat(timespec="seconds")
+    assert 599 <= info["age"] <= 601
+    assert uu.release_etag == '"abc"'
+
+def test_release_info_without_release(release_file):
+    uu.cached_release_data = None
+    uu.last_release_fetched = None
+    release_file.write_text("not json")
+    assert uu.release_info() == {
+        "latest": "failed-to-fetch", "changelog": "", "checked": None, "age": None,
+    }
+
+def test_release_refresher_schedule(monkeypatch):
+    calls = []
+    monkeypatch.setattr(uu, "_get_release_data", lambda force=False: calls.append(force))
+    refresher = uu.ReleaseRefresher()
+    # Fresh cache: nothing to do until it goes stale
+    uu.cached_release_data = {"tag_name": "v1.0.0"}
+    uu.last_release_fetched = datetime.now() - timedelta(minutes=20)
+    assert 2390 < refresher.refresh() <= 2400
+    assert calls == []
+    # Stale cache: revalidated, then checked again in an hour
+    uu.last_release_fetched = datetime.now() - timedelta(hours=2)
+    assert refresher.refresh() == uu.CACHE_DURATION.total_seconds()
+    assert calls == [True]
+    # Offline: retried sooner, the old release is kept
+    def offline(force=False): raise OSError("network unreachable")
+    monkeypatch.setattr(uu, "_get_release_data", offline)
+    assert refresher.refresh() == uu.RETRY_INTERVAL.total_seconds()
+    assert uu.release_info()["latest"] == "1.0.0"
+
 # --------------------------------------------------------------------------- # 
 # helpers: _clean_worktree / _current_branch / _default_branch
 # --------------------------------------------------------------------------- # 
@@ -620,6 +722,17 @@ def test_perform_update_paths(dummy_repo, monkeypatch, git_ok, tar_ok, expect):
     updated = (dummy_repo / "api" / "VERSION").read_text().strip()
     assert updated == ("0.2.0" if result != "update-failed" else "0.1.0")
 
+@pytest.mark.parametrize("strategy", ["update_via_git", "update_via_tar"])
+def test_perform_update_precompresses_assets(dummy_repo, monkeypatch, strategy):
+    monkeypatch.setattr(uu, "latest_version", lambda: "0.2.0")
+    monkeypatch.setattr(uu, "_clean_worktree", lambda: True)
+    monkeypatch.setattr(uu, "update_via_git", lambda t: strategy == "update_via_git")
+    monkeypatch.setattr(uu, "update_via_tar", lambda t: True)
+    (dummy_repo / "static").mkdir()
+    (dummy_repo / "static" / "main-min.js").write_text("console.log('dashboard');\n" * 100)
+    assert uu.perform_update().startswith("updated-to-0.2.0")
+    assert (dummy_repo / "static" / "main-min.js.gz").exists()
+
 def test_perform_update_already_current(dummy_repo, monkeypatch):
     monkeypatch.setattr(uu, "latest_version", lambda: "0.1.0")   # same
     assert uu.perform_update() == "already-current"
@@ -705,15 +818,29 @@ def test__github_other_http_error_logging(monkeypatch, caplog):
 # --------------------------------------------------------------------------- # 
 # Monitoring API endpoints
 # --------------------------------------------------------------------------- # 
-@patch.object(monitoring.update, "latest_version", lambda: "0.2.0")
+RELEASE_INFO = {"latest": "0.2.0", "changelog": "Example notes",
+                "checked": "2025-06-05T09:00:00", "age": 312}
+
+@patch.object(monitoring.update, "release_info", lambda: RELEASE_INFO)
 def test_update_info_endpoint(app_client):
     r = app_client.get("/api/update")
     assert r.status_code == 200
-    assert r.get_json()["data"] == {"current": "0.1.0", "latest": "0.2.0"}
+    assert r.get_json()["data"] == {
+        "current": "0.1.0", "latest": "0.2.0",
+        "checked": "2025-06-05T09:00:00", "age": 312,
+    }
+
+def test_update_endpoints_never_fetch(app_client, monkeypatch):
+    # Offline: only the background refresher may contact GitHub
+    monkeypatch.setattr(uu, "_github", lambda *a, **k: pytest.fail("fetched in a request"))
+    uu.cached_release_data = None
+    uu.last_release_fetched = None
+    assert app_client.get("/api/update").get_json()["data"]["latest"] == "failed-to-fetch"
+    assert app_client.get("/api/update/changelog").get_json()["data"]["changelog"] == ""
 
 def test_update_info_endpoint_error(app_client, monkeypatch, caplog):
     def boom(): raise RuntimeError("net down")
-    monkeypatch.setattr(uu, "latest_version", boom)
+    monkeypatch.setattr(uu, "release_info", boom)
     caplog.set_level("ERROR")
     resp = app_client.get("/api/update")
     assert resp.status_code == 500
@@ -727,24 +854,25 @@ def test_update_apply_endpoint(app_client, monkeypatch):
     assert r.get_json()["data"]["outcome"] == "ok"
 
 def test_update_changelog_endpoint_success(app_client, monkeypatch):
-    # Simulate a normal response from latest_changelog
-    monkeypatch.setattr(monitoring.update, "latest_changelog", lambda: "Example notes")
+    # Simulate a normal response from the release cache
+    monkeypatch.setattr(monitoring.update, "release_info", lambda: RELEASE_INFO)
     response = app_client.get("/api/update/changelog")
     assert response.status_code == 200
 
     data = response.get_json()
     assert data["status"] == "ok"
     assert data["data"]["changelog"] == "Example notes"
+    assert data["data"]["age"] == 312
     # The release_url should point to the GitHub releases/latest for the configured REPO
     assert monitoring.update.REPO in data["data"]["release_url"]
     assert data["data"]["release_url"].startswith("https://github.com/")
 
 def test_update_changelog_endpoint_error(app_client, monkeypatch, caplog):
-    # Simulate an exception in latest_changelog to hit the error branch
+    # Simulate an exception in release_info to hit the error branch
     caplog.set_level("ERROR")
     monkeypatch.setattr(
         monitoring.update,
-        "latest_changelog",
+        "release_info",
         lambda: (_ for _ in ()).throw(RuntimeError("fetch failed"))
     )
 
@@ -1,27 +1,31 @@
 #!/usr/bin/venv python3
-import subprocess, io, tarfile, logging, sys, json, os, base64
+import subprocess, io, tarfile, logging, sys, json, os, base64, threading, time
 from logging_config import configure_logging
-from validate_config import validate_config
+from validate_config import validate_config, config_cache
 from pathlib import Path
 from urllib.request import urlopen
 from urllib.request import Request, urlopen
 from urllib.error import HTTPError
 from datetime import datetime, timedelta
-from viewport import log_error
+from core import log_error
+from assets import precompress_assets
 
 CACHE_DURATION = timedelta(hours=1)
+RETRY_INTERVAL = timedelta(minutes=5)   # wait after a failed background refresh
 REPO  = "Samuel1698/fakeViewport"
 ROOT  = Path(__file__).resolve().parent
 GIT   = ["git", "-C", str(ROOT)]
 VERS  = ROOT / "api" / "VERSION"
+RELEASE = ROOT / "api" / "release.json"
 _mon = sys.modules[__name__]
 last_release_fetched: datetime | None = None
 cached_release_data: dict | None = None
+release_etag: str | None = None
 
 # --------------------------------------------------------------------------- # 
 # Config set up
 # --------------------------------------------------------------------------- # 
-cfg = validate_config(strict=False, print=False)
+cfg = config_cache.get()
 # pull everything out into locals/globals
 for name, val in vars(cfg).items():
     setattr(_mon, name, val)
@@ -33,37 +37,46 @@ if not root_logger.handlers:
         log_file=LOG_FILE_FLAG,
         log_console=LOG_CONSOLE,
         log_days=LOG_DAYS,
-        Debug_logging=DEBUG_LOGGING
+        Debug_logging=DEBUG_LOGGING,
+        log_json=LOG_JSON,
+        log_compress=LOG_COMPRESS
     )
 else: pass
 logger = logging.getLogger(__name__) 
 # --------------------------------------------------------------------------- # 
 # Helper functions
 # --------------------------------------------------------------------------- # 
-def _github(url: str, *, accept="application/vnd.github+json"):
+def _github(url: str, *, accept="application/vnd.github+json", etag=None):
     """
     Open a GitHub API endpoint with automatic token and rate-limit handling.
 
     Args:
         url: Full HTTPS URL of the GitHub REST endpoint.
         accept: Value for the ``Accept`` request header.
+        etag: ``ETag`` of a copy already held; sent as ``If-None-Match``
+            so an unchanged resource answers ``304 Not Modified``.
 
     Returns:
         http.client.HTTPResponse: An open response object ready for
         ``.read()`` / JSON decoding.
 
     Raises:
-        urllib.error.HTTPError: Propagates 4xx/5xx errors after logging.
+        urllib.error.HTTPError: Propagates 4xx/5xx errors after logging,
+            and ``304`` without logging.
         Exception: Any other network-related exception.
     """
     hdr = {"Accept": accept}
     # Always use token if available
     if (tok := os.getenv("GITHUB_TOKEN")):
         hdr["Authorization"] = f"Bearer {tok}"
+    if etag:
+        hdr["If-None-Match"] = etag
     req = Request(url, headers=hdr)
     try:
         return urlopen(req, timeout=30)
     except HTTPError as e:
+        if e.code == 304:
+            raise
         logging.error("HTTP Error %s", e.code)
         if e.code == 403 and 'rate limit' in str(e):
             remaining = e.headers.get('X-RateLimit-Remaining', '?')
@@ -225,10 +238,55 @@ def current_version() -> str:
     """
     return VERS.read_text().strip()
 
-def _get_release_data() -> dict:
+def _save_release() -> None:
+    """
+    Persist the cached release, its ``ETag`` and fetch time to
+    ``api/release.json`` so it survives restarts and is shared between
+    API workers. The file is replaced atomically.
+    """
+    tmp = RELEASE.with_name(f".{RELEASE.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps({
+            "etag":    release_etag,
+            "fetched": last_release_fetched.timestamp(),
+            "data":    cached_release_data,
+        }))
+        os.replace(tmp, RELEASE)
+    except OSError as e:
+        logging.debug(f"Could not write {RELEASE}: {e}")
+
+def _load_release() -> None:
+    """
+    Adopt the release persisted in ``api/release.json`` when it is newer
+    than the copy in memory, e.g. after a restart or when another worker
+    refreshed it. A missing or unreadable file is ignored.
+    """
+    global last_release_fetched, cached_release_data, release_etag
+    try:
+        saved = json.loads(RELEASE.read_text())
+        fetched = datetime.fromtimestamp(saved["fetched"])
+        data = saved["data"]
+    except (OSError, ValueError, TypeError, KeyError):
+        return
+    if not isinstance(data, dict):
+        return
+    if last_release_fetched is None or fetched > last_release_fetched:
+        cached_release_data = data
+        last_release_fetched = fetched
+        release_etag = saved.get("etag")
+
+def _get_release_data(force: bool = False) -> dict:
     """
     Retrieve (and cache) the GitHub JSON for the latest release.
 
+    A cached copy younger than ``CACHE_DURATION`` is returned without a
+    request unless *force* is set. Otherwise the request carries the
+    cached ``ETag``, so an unchanged release costs a ``304`` that does
+    not count against the rate limit and only renews the fetch time.
+
+    Args:
+        force: Revalidate even if the cached copy is still fresh.
+
     Returns:
         dict: Raw JSON representing the latest release.
 
@@ -236,24 +294,33 @@ def _get_release_data() -> dict:
         urllib.error.HTTPError: Propagates 4xx/5xx errors.
         Exception: Any other network or parsing exception.
     """
-    global last_release_fetched, cached_release_data
+    global last_release_fetched, cached_release_data, release_etag
 
+    _load_release()
     now = datetime.now()
     if (
-        cached_release_data is not None
+        not force
+        and cached_release_data is not None
         and last_release_fetched is not None
         and (now - last_release_fetched) < CACHE_DURATION
     ):  
         return cached_release_data
     url = f"https://api.github.com/repos/{REPO}/releases/latest"
+    etag = release_etag if cached_release_data is not None else None
     try:
-        with _github(url) as resp:
+        with _github(url, etag=etag) as resp:
             data = json.load(resp)
             cached_release_data = data
             last_release_fetched = now
+            release_etag = resp.headers.get("ETag")
+            _save_release()
             return data
 
     except HTTPError as e:
+        if e.code == 304:
+            last_release_fetched = now
+            _save_release()
+            return cached_release_data
         # Log rate-limit (403 with “rate limit” in message) differently from other HTTP errors
         if e.code == 403 and "rate limit" in str(e).lower():
             remaining = e.headers.get("X-RateLimit-Remaining", "?")
@@ -318,12 +385,82 @@ def latest_changelog() -> str:
     except Exception:
         return ""
     
+def release_info() -> dict:
+    """
+    Describe the cached latest release without touching the network.
+
+    Requests are answered from here so a slow or unreachable GitHub
+    never delays the dashboard; :class:`ReleaseRefresher` keeps the
+    cache current in the background.
+
+    Returns:
+        dict: ``latest`` (tag, or ``"failed-to-fetch"`` if nothing has
+        been fetched yet), ``changelog`` (truncated like
+        :pyfunc:`latest_changelog`), ``checked`` (ISO time of the last
+        successful check, or ``None``) and ``age`` (seconds since then,
+        or ``None``).
+    """
+    _load_release()
+    data, fetched = cached_release_data, last_release_fetched
+    if data is None or fetched is None:
+        return {"latest": "failed-to-fetch", "changelog": "", "checked": None, "age": None}
+    body = data.get("body", "") or ""
+    return {
+        "latest":    (data.get("tag_name") or "failed-to-fetch").lstrip("v"),
+        "changelog": body.split("\n---", 1)[0].rstrip("\n"),
+        "checked":   fetched.isoformat(timespec="seconds"),
+        "age":       max(0, int((datetime.now() - fetched).total_seconds())),
+    }
+
+class ReleaseRefresher(threading.Thread):
+    """
+    Daemon thread that revalidates the cached release in the background.
+
+    It checks GitHub whenever the cache is older than ``CACHE_DURATION``
+    and retries after ``RETRY_INTERVAL`` when a check fails, so an
+    offline site keeps serving the last known release. A check made by
+    another process is picked up from ``api/release.json`` instead of
+    being repeated.
+    """
+    def __init__(self):
+        super().__init__(name="release-refresher", daemon=True)
+        self._stopped = threading.Event()
+
+    def refresh(self) -> float:
+        """
+        Revalidate the release if it is due.
+
+        Returns:
+            float: Seconds until the next check is due.
+        """
+        _load_release()
+        if last_release_fetched is not None:
+            due = last_release_fetched + CACHE_DURATION - datetime.now()
+            if due.total_seconds() > 0:
+                return due.total_seconds()
+        try:
+            _get_release_data(force=True)
+        except Exception as e:
+            logging.debug(f"Release check failed: {e}")
+            return RETRY_INTERVAL.total_seconds()
+        return CACHE_DURATION.total_seconds()
+
+    def run(self):
+        while True:
+            wait = self.refresh()
+            if self._stopped.wait(wait):
+                return
+
+    def stop(self):
+        self._stopped.set()
+
 def perform_update() -> str:
     """
     Update the installation to the newest release using Git or tarball.
 
     The function tries Git first (when possible) and falls back to the
-    tarball strategy, logging the outcome.
+    tarball strategy, logging the outcome. After either, the dashboard
+    assets changed by the update get fresh gzipped siblings.
 
     Returns:
         string: Outcome label, e.g. ``"already-current"``,
@@ -342,14 +479,16 @@ def perform_update() -> str:
     if (ROOT / ".git").exists() and _clean_worktree():
         tried_git = True
         if update_via_git(new):
+            precompress_assets(ROOT / "static")
             outcome = f"updated-to-{new}-via-git"
-            logging.info(f"Successfully updated to v{new} via git")
+            logging.info(f"Successfully updated to v{new} via git", extra={"event": "updated"})
             return outcome
     else: logging.warning("Local changes detected  or not a git repository - skipping git strategy")
     # tarball path 
     if update_via_tar(new):
+        precompress_assets(ROOT / "static")
         outcome = f"updated-to-{new}-via-tar" + (" (git failed)" if tried_git else "")
-        logging.info(f"Successfully updated to v{new} via tarbal")
+        logging.info(f"Successfully updated to v{new} via tarbal", extra={"event": "updated"})
         return outcome
 
     # failure
@@ -3,8 +3,11 @@ import os
 import ipaddress
 import configparser
 import logging
+import threading
 from pathlib import Path
 from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Callable, Iterable
 from datetime import datetime, time
 from urllib.parse import urlparse
 from dotenv import load_dotenv, dotenv_values
@@ -28,11 +31,18 @@ class AppConfig:
     DEBUG_LOGGING: bool
     ERROR_LOGGING: bool
     ERROR_PRTSCR: bool
+    LOG_ASYNC: bool
+    LOG_JSON: bool
+    LOG_COMPRESS: bool
     LOG_DAYS: int
     LOG_INTERVAL: int
     # API
     API: bool
     CONTROL_TOKEN: str
+    API_WORKERS: int
+    API_THREADS: int
+    API_KEEPALIVE: int
+    API_TIMEOUT: int
     # Env credentials
     username: str
     password: str
@@ -46,6 +56,13 @@ class AppConfig:
     status_file: Path
     restart_file: Path
     pause_file: Path
+    vp_pid_file: Path
+    mon_pid_file: Path
+    sample_file: Path
+    metrics_file: Path
+    history_file: Path
+    control_file: Path
+    state_file: Path
 
 def check_files(config_file: Path, env_file: Path, errors: list[str]):
     if not config_file.exists():
@@ -221,9 +238,16 @@ def validate_config(
     mon_file = logs_dir / 'monitoring.log'
     log_file = logs_dir / 'viewport.log'
     sst_file = api_dir / 'sst.txt'
-    status_file = api_dir / 'status.txt'
+    status_file = api_dir / 'status.jsonl'
     restart_file = api_dir / '.restart'
     pause_file  = api_dir / '.pause'
+    vp_pid_file = api_dir / 'viewport.pid'
+    mon_pid_file = api_dir / 'monitoring.pid'
+    sample_file = api_dir / 'samples.bin'
+    metrics_file = api_dir / 'metrics.json'
+    history_file = api_dir / 'history.db'
+    control_file = api_dir / 'viewport.sock'
+    state_file  = api_dir / 'state.bin'
     
     # Parse INI
     config = load_ini(config_file)
@@ -255,11 +279,18 @@ def validate_config(
     debug_logging = safe_bool(config, 'Logging', 'DEBUG_LOGGING', False, errors)
     error_logging = safe_bool(config, 'Logging', 'ERROR_LOGGING', False, errors)
     error_prtscr = safe_bool(config, 'Logging', 'ERROR_PRTSCR', False, errors)
+    log_async = safe_bool(config, 'Logging', 'LOG_ASYNC', False, errors)
+    log_json = safe_bool(config, 'Logging', 'LOG_JSON', False, errors)
+    log_compress = safe_bool(config, 'Logging', 'LOG_COMPRESS', True, errors)
     log_days = safe_getint(config, 'Logging', 'LOG_DAYS', 7, errors)
     log_interval = safe_getint(config, 'Logging', 'LOG_INTERVAL', 60, errors)
 
     # API section
     api_flag = safe_bool(config, 'API', 'USE_API', False, errors)
+    api_workers = safe_getint(config, 'API', 'WORKERS', 1, errors)
+    api_threads = safe_getint(config, 'API', 'THREADS', 8, errors)
+    api_keepalive = safe_getint(config, 'API', 'KEEPALIVE', 5, errors)
+    api_timeout = safe_getint(config, 'API', 'TIMEOUT', 30, errors)
 
     # Validate .env
     username, password, url_val, host, port, secret = validate_env(env_file, api_flag, errors)
@@ -277,6 +308,14 @@ def validate_config(
         errors.append("LOG_DAYS must be ≥ 1.")
     if log_interval < 1:
         errors.append("LOG_INTERVAL must be ≥ 1.")
+    if api_workers < 1:
+        errors.append("WORKERS must be ≥ 1.")
+    if api_threads < 1:
+        errors.append("THREADS must be ≥ 1.")
+    if api_keepalive < 0:
+        errors.append("KEEPALIVE must be ≥ 0.")
+    if api_timeout < 1:
+        errors.append("TIMEOUT must be ≥ 1.")
 
     # Report or return
     if (print or strict) and errors:
@@ -300,10 +339,17 @@ def validate_config(
         DEBUG_LOGGING=debug_logging,
         ERROR_LOGGING=error_logging,
         ERROR_PRTSCR=error_prtscr,
+        LOG_ASYNC=log_async,
+        LOG_JSON=log_json,
+        LOG_COMPRESS=log_compress,
         LOG_DAYS=log_days,
         LOG_INTERVAL=log_interval,
         API=api_flag,
         CONTROL_TOKEN=control_token,
+        API_WORKERS=api_workers,
+        API_THREADS=api_threads,
+        API_KEEPALIVE=api_keepalive,
+        API_TIMEOUT=api_timeout,
         username=username,
         password=password,
         url=url_val,
@@ -314,5 +360,79 @@ def validate_config(
         sst_file=sst_file,
         status_file=status_file,
         restart_file=restart_file,
-        pause_file=pause_file
+        pause_file=pause_file,
+        vp_pid_file=vp_pid_file,
+        mon_pid_file=mon_pid_file,
+        sample_file=sample_file,
+        metrics_file=metrics_file,
+        history_file=history_file,
+        control_file=control_file,
+        state_file=state_file
     )
+
+class ConfigSnapshot(SimpleNamespace):
+    """
+    Read-only copy of an :class:`AppConfig`; lists become tuples.
+    """
+    def __init__(self, cfg):
+        super().__init__(**{
+            name: tuple(val) if isinstance(val, list) else val
+            for name, val in vars(cfg).items()
+        })
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Config snapshots are read-only ({name})")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Config snapshots are read-only ({name})")
+
+class ConfigCache:
+    """
+    Thread-safe cache of the validated configuration.
+
+    :pyfunc:`validate_config` re-parses ``config.ini``, reloads ``.env``
+    into ``os.environ`` and creates the log and API directories on every
+    call. The cache runs it once and hands every caller the same
+    :class:`ConfigSnapshot` until the mtime or size of a watched file
+    changes.
+
+    Args:
+        loader: Returns an :class:`AppConfig`; defaults to
+            ``validate_config(strict=False, print=False)``.
+        files: Files whose changes invalidate the cache; defaults to
+            ``config.ini`` and ``.env`` next to this module.
+    """
+    def __init__(
+        self,
+        loader: Callable[[], AppConfig] | None = None,
+        files: Iterable[Path] | None = None,
+    ):
+        base = Path(__file__).parent
+        self._loader = loader or (lambda: validate_config(strict=False, print=False))
+        self._files = tuple(files or (base / 'config.ini', base / '.env'))
+        self._lock = threading.Lock()
+        self._key = None
+        self._snapshot = None
+
+    def _state(self) -> tuple:
+        state = []
+        for path in self._files:
+            try:
+                st = os.stat(path)
+                state.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                state.append(None)
+        return tuple(state)
+
+    def get(self) -> ConfigSnapshot:
+        # Stat before loading: an edit landing mid-load changes the key
+        # again and is picked up by the next call
+        key = self._state()
+        with self._lock:
+            if self._snapshot is None or key != self._key:
+                self._snapshot = ConfigSnapshot(self._loader())
+                self._key = key
+            return self._snapshot
+
+# Shared by the modules that read the configuration at import time
+config_cache = ConfigCache()
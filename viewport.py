@@ -1,8 +1,29 @@
 #!/usr/bin/venv python3
 import os, psutil, sys, time, argparse, signal, subprocess
-import math, threading, logging, concurrent.futures, shutil, re
-from logging_config                      import configure_logging
-from validate_config                     import validate_config
+import math, threading, logging, concurrent.futures, shutil, re, queue
+from logging_config                      import configure_logging, flush_logging, dropped_records
+from logging_config                      import parse_log_line, render_log_entry, read_log, follow_log
+from validate_config                     import validate_config, config_cache
+from sampler                             import ResourceRing, ResourceSampler, latest_sample
+from metrics                             import MetricsStore
+from control                             import ControlServer, SCREENSHOT_TIMEOUT, request as control_request
+from state                               import read_state
+from core import (
+    api_status,
+    read_status,
+    history,
+    state,
+    get_process_type,
+    process_snapshot,
+    usage_match,
+    cpu_sampler,
+    usage_handler,
+    browser_tree,
+    browser_usage_handler,
+    pid_handler,
+    process_handler,
+    live_state,
+)
 from pathlib                             import Path
 from typing                              import Tuple, Optional
 from datetime                            import datetime, timedelta
@@ -38,6 +59,10 @@ from css_selectors import (
 _mod = sys.modules[__name__]
 _version_re = re.compile(r'\d+')
 driver = None # Declare it globally so that it can be accessed in the signal handler function
+control_server = None # Control socket, started by main()
+restart_requested = threading.Event() # Set over the control socket; handled by handle_view
+control_wake = threading.Event()      # Set with every request for handle_view; cuts its sleep short
+screenshot_requests = queue.Queue()   # Screenshots for handle_view to take; see control_handler
 os.environ['DISPLAY'] = ':0' # Sets Display 0 as the display environment. Very important for selenium to launch the browser.
 # Directory and file paths
 _base = Path(__file__).parent
@@ -48,8 +73,10 @@ api_dir     = _base / 'api'
 ver_file    = api_dir / 'VERSION'
 __version__ = ver_file.read_text().strip()
 driver_path = None
+sampler = None # Background resource sampler, started by main()
+metrics = MetricsStore() # Kept in memory until main() opens metrics_file
 # Initial non strict config parsing
-cfg = validate_config(strict=False, print=False)
+cfg = config_cache.get()
 for name, val in vars(cfg).items():
     setattr(_mod, name, val)
 class DriverDownloadStuckError(Exception): pass
@@ -59,6 +86,8 @@ GREEN="\033[0;32m"
 YELLOW="\033[1;33m"
 CYAN = "\033[36m"
 NC="\033[0m"
+# "[LEVEL]" tag of a text log line
+LOG_LEVEL_TAG = re.compile(r"\[(DEBUG|INFO|WARNING|ERROR|CRITICAL)\]")
 # --------------------------------------------------------------------------- # 
 # Argument Handlers
 # --------------------------------------------------------------------------- # 
@@ -110,7 +139,8 @@ def args_helper():
         const=5,
         metavar="n",
         dest="logs",
-        help="Display the last n lines from the log file (default: 5)."
+        help="Display the last n lines from the log file (default: 5). "
+             "Reaching back into gzipped backups decompresses them, which is slower."
     )
     group.add_argument(
         "-d", "--diagnose",
@@ -124,6 +154,12 @@ def args_helper():
         dest="api",
         help="Toggles the API on or off. Requires USA_API=True in config.ini"
     )
+    parser.add_argument(
+        "-f", "--follow",
+        action="store_true",
+        dest="follow",
+        help="With --logs, keep printing new log lines as they are written."
+    )
     args, _ = parser.parse_known_args()
     return args
 def args_handler(args):
@@ -145,22 +181,22 @@ def args_handler(args):
         sys.exit(1)
     if args.logs is not None:
         try:
-            with open(log_file, "r") as f:
-                # Read the last X lines from the log file
-                lines = f.readlines()[-args.logs:]
-                for line in lines:
-                    # Conditionally color the log line based on its content
-                    if "[INFO]" in line:
-                        colored_line = f"{GREEN}{line.strip()}{NC}"
-                    elif "[WARNING]" in line:
-                        colored_line = f"{YELLOW}{line.strip()}{NC}"
-                    elif "[DEBUG]" in line:
-                        colored_line = f"{CYAN}{line.strip()}{NC}"
-                    elif "[ERROR]" in line:
-                        colored_line = f"{RED}{line.strip()}{NC}"
-                    else:
-                        colored_line = f"{NC}{line.strip()}{NC}"
-                    print(colored_line)  # Print the colored line to the console
+            if not log_file.exists():
+                raise FileNotFoundError(log_file)
+            # The last X lines, reaching back into (gzipped) backups if needed
+            lines, cursor, _ = read_log(log_file, args.logs)
+            for line in lines:
+                # Color the log line by its level
+                print(get_log_line(line))
+            if getattr(args, "follow", False):
+                # Ctrl+C ends this reader, not the running instance
+                signal.signal(signal.SIGINT, signal.default_int_handler)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                try:
+                    for line in follow_log(log_file, cursor):
+                        print(get_log_line(line), flush=True)
+                except KeyboardInterrupt:
+                    pass
         except FileNotFoundError:
             print(f"{RED}Log file not found: {log_file}{NC}")
         except Exception as e:
@@ -168,14 +204,19 @@ def args_handler(args):
         sys.exit(0)
     if args.pause:
         try:
-            if process_handler("viewport.py", action="check"):    
+            command = "resume" if pause_file.exists() else "pause"
+            reply = control_request(control_file, command, CONTROL_TOKEN)
+            if reply is not None:
+                if reply["status"] != "ok":
+                    log_error(f"Could not {command}: {reply['message']}")
+            elif process_handler("viewport.py", action="check"):    
                 if pause_file.exists():
                     pause_file.unlink()
-                    logging.info("Resuming health checks.")
+                    logging.info("Resuming health checks.", extra={"event": "resumed"})
                     api_status("Resumed")
                 else:
                     pause_file.touch()
-                    logging.warning("Pausing health checks.")
+                    logging.warning("Pausing health checks.", extra={"event": "paused"})
                     api_status("Paused")
             else:
                 logging.warning("Fake Viewport is not running.")
@@ -200,14 +241,17 @@ def args_handler(args):
         sys.exit(0)
     if args.quit:
         logging.warning("Stopping the Fake Viewport script...")
-        process_handler("viewport.py", action="kill")
-        process_handler(BROWSER, action="kill")
-        clear_sst()
+        # A reachable daemon closes the browser and clears the SST itself
+        reply = control_request(control_file, "quit", CONTROL_TOKEN)
+        if reply is None or reply["status"] != "ok":
+            process_handler("viewport.py", action="kill")
+            process_handler(BROWSER, action="kill")
+            clear_sst()
         sys.exit(0)
     if args.diagnose:
         logging.info("Checking validity of config.ini and .env variables...")
         diag_cfg = validate_config(strict=False)
-        if diag_cfg: logging.info("No errors found.")       
+        if diag_cfg: logging.info("No errors found.", extra={"event": "config_valid"})       
         sys.exit(0)
     if args.api:
         if process_handler("monitoring.py", action="check"):
@@ -221,9 +265,13 @@ def args_handler(args):
             log_error("API is not enabled in config.ini. Please set USE_API=True and restart script to use this feature.")
         sys.exit(0)
     if args.restart:
-        # --restart from the CLI should kill the existing daemon
-        # and spawn a fresh background instance, then exit immediately.
-        if process_handler("viewport.py", action="check"):
+        # --restart from the CLI asks a reachable daemon to restart itself;
+        # otherwise it kills the existing daemon and spawns a fresh
+        # background instance, then exits immediately.
+        reply = control_request(control_file, "soft-restart", CONTROL_TOKEN)
+        if reply is not None and reply["status"] == "ok":
+            logging.warning("Restarting script...")
+        elif process_handler("viewport.py", action="check"):
             logging.warning("Restarting script...")  
             child_argv = args_child_handler(
                 args,
@@ -239,7 +287,7 @@ def args_handler(args):
                 close_fds=True,
                 start_new_session=True,
             )
-            logging.info("Viewport started in the background")
+            logging.info("Viewport started in the background", extra={"event": "started"})
         else:
             logging.warning("Fake Viewport is not running.")
         sys.exit(0)
@@ -279,6 +327,7 @@ def args_child_handler(args, *, drop_flags=(), add_flags=None):
         "diagnose":   ["--diagnose"],
         "api":        ["--api"],
         "logs":       (["--logs", str(args.logs)] if args.logs is not None else []),
+        "follow":     ["--follow"],
     }
     child = []
     # Re-emit any flags the user originally set,
@@ -308,7 +357,10 @@ configure_logging(
     log_file=LOG_FILE_FLAG,
     log_console=LOG_CONSOLE,
     log_days=LOG_DAYS,
-    Debug_logging=DEBUG_LOGGING
+    Debug_logging=DEBUG_LOGGING,
+    log_async=LOG_ASYNC,
+    log_json=LOG_JSON,
+    log_compress=LOG_COMPRESS
 )
 def log_error(message, exception=None, driver=None):
     """
@@ -332,7 +384,7 @@ def log_error(message, exception=None, driver=None):
             timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
             screenshot_path = logs_dir / f"screenshot_{timestamp}.png"
             driver.save_screenshot(str(screenshot_path))
-            logging.warning(f"Saved screenshot to {screenshot_path}")
+            logging.warning(f"Saved screenshot to {screenshot_path}", extra={"event": "screenshot_saved"})
             api_status("Saved error screenshot.")
         except (InvalidSessionIdException, WebDriverException) as e:
             logging.warning(f"Could not take screenshot: WebDriver not alive ({e})")
@@ -352,17 +404,9 @@ def clear_sst():
         # Opening with 'w' and immediately closing truncates the file to zero length
         if sst_file.exists(): open(sst_file, 'w').close()
         if pause_file.exists(): pause_file.unlink()
+        state.update(phase="stopped", pid=0, started=None, paused=False, attempt=0)
     except Exception as e:
         log_error("Error clearing SST file:", e)
-def api_status(msg):
-    """
-    Write a one-line status update for external tools.
-
-    Args:
-        msg: Message to store in *status_file*.
-    """
-    with open(status_file, 'w') as f:
-        f.write(msg)
 def api_handler(*, standalone: bool = False):
     """
     Ensure the Flask monitoring API is running.
@@ -374,7 +418,7 @@ def api_handler(*, standalone: bool = False):
     1. Launches **monitoring.py** in a background subprocess.
     2. Starts two daemon threads that stream the child process's
        *stdout* and *stderr* to the logger, filtering out common
-        Werkzeug development-server chatter.
+        gunicorn and Werkzeug start-up chatter.
     3. Waits briefly to confirm the child did not exit immediately.
 
     Returns:
@@ -382,7 +426,7 @@ def api_handler(*, standalone: bool = False):
         `False` if startup fails for any reason.
     """  
     if process_handler("monitoring.py", action="check"):
-        logging.info("API is already running")
+        logging.info("API is already running", extra={"event": "api_started"})
         return True
     logging.info("Starting API...")
     api_status("Starting API...")
@@ -403,13 +447,20 @@ def api_handler(*, standalone: bool = False):
         # Only spin filter threads in stand-alone mode
         if standalone:
             def filter_output(stream):
-                WERKZEUG_MESSAGES = {
+                SERVER_MESSAGES = {
                     "WARNING: This is a development server",
                     "Press CTRL+C to quit",
                     "Serving Flask app",
                     "Debug mode:",
                     "Running on",
-                    "Starting server with"
+                    "Starting server with",
+                    "Starting gunicorn",
+                    "Listening at:",
+                    "Using worker:",
+                    "Booting worker with pid",
+                    "Handling signal:",
+                    "Worker exiting",
+                    "Shutting down: Master"
                 }
                 # Regular expression to match ANSI color codes
                 ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
@@ -421,7 +472,7 @@ def api_handler(*, standalone: bool = False):
                     line = ansi_escape.sub('', line)
                     # Remove timestamp prefix if present
                     line = timestamp_prefix.sub('', line).strip()
-                    if not line or any(msg in line for msg in WERKZEUG_MESSAGES): continue
+                    if not line or any(msg in line for msg in SERVER_MESSAGES): continue
                     else: pass
                     logging.info(line)
             # Start output‐filtering threads
@@ -432,7 +483,7 @@ def api_handler(*, standalone: bool = False):
         time.sleep(1)
         if process.poll() is not None:
             raise RuntimeError(f"API failed to start (code {process.returncode})")
-        logging.info("API started successfully")
+        logging.info("API started successfully", extra={"event": "api_started"})
         return True
     except Exception as e:
         log_error("Error starting API: ", e)
@@ -456,14 +507,17 @@ def signal_handler(signum, frame, driver=None):
             WebDriver instance to close before shutdown.
     """  
     if driver is not None:
-        logging.info(f'Gracefully shutting down {BROWSER}.')
+        logging.info(f'Gracefully shutting down {BROWSER}.', extra={"event": "shutdown"})
         try:
             driver.quit()
         except:
             pass
     api_status("Stopped")
-    logging.info("Gracefully shutting down script instance.")
+    logging.info("Gracefully shutting down script instance.", extra={"event": "shutdown"})
     clear_sst()
+    pid_handler("viewport.py", action="clear")
+    # os._exit skips atexit, so write out anything still queued
+    flush_logging()
     os._exit(0)
 signal.signal(signal.SIGINT, lambda s, f: signal_handler(s, f, driver))
 signal.signal(signal.SIGTERM, lambda s, f: signal_handler(s, f, driver))
@@ -518,6 +572,31 @@ def get_mem_color(pct):
     if pct <= 60:
         return YELLOW
     return RED
+def get_log_line(line):
+    """
+    Render one log-file line for the console, colored by its level.
+
+    Works for both log formats: JSON lines (``LOG_JSON``) are shown as
+    ``[ts] [LEVEL] message`` text; text lines are colored by their
+    ``[LEVEL]`` tag, and lines without one (a traceback) are not.
+
+    Args:
+        line: Raw line from a log file.
+
+    Returns:
+        string: The line wrapped in a color code and ``NC``.
+    """
+    entry = parse_log_line(line)
+    if entry is not None and line.lstrip().startswith("{"):
+        text, level = render_log_entry(entry), entry.get("level")
+    else:
+        text = line.strip()
+        tag = LOG_LEVEL_TAG.search(text)
+        level = tag[1] if tag else None
+    color = {
+        "INFO": GREEN, "WARNING": YELLOW, "DEBUG": CYAN, "ERROR": RED, "CRITICAL": RED,
+    }.get(level, NC)
+    return f"{color}{text}{NC}"
 def get_browser_version(binary_path):
     """
     Retrieve the browser's full version string.
@@ -765,36 +844,6 @@ def screenshot_handler(logs_dir, max_age_days):
                 api_status("Deleted old screenshot.")
         except Exception as e:
             log_error(f"Failed to delete screenshot {file.name}: ", e)
-def usage_handler(match_str):
-    """
-    Aggregate CPU and memory use for matching processes.
-
-    Args:
-        match_str: Substring to look for in a process's name or
-            command-line.
-
-    Returns:
-        tuple[float, int]: ``(total_cpu_percent, total_rss_bytes)`` where
-        *total_cpu_percent* is summed across logical cores and
-        *total_rss_bytes* is the combined resident-set size.
-    """
-    names_to_match = [match_str]
-    total_cpu = 0.0
-    total_mem = 0
-    for p in psutil.process_iter(['pid', 'name', 'cmdline']):
-        try:
-            # normalize cmdline → string
-            raw = p.info.get('cmdline') or []
-            cmd = " ".join(raw) if isinstance(raw, (list, tuple)) else str(raw)
-            # if any of our target names appear in name or cmdline
-            if any(ns in (p.info.get('name') or "") or ns in cmd for ns in names_to_match):
-                # block for 100 ms so psutil can sample real CPU usage
-                total_cpu += p.cpu_percent(interval=0.1)
-                total_mem += p.memory_info().rss
-        except Exception:
-            # skip processes we can’t inspect
-            continue
-    return total_cpu, total_mem
 def status_handler():
     """
     Print a human-readable status dashboard to the console.
@@ -804,26 +853,31 @@ def status_handler():
     log lines.
     """
     try:
-        try:
-            with open(sst_file, 'r') as f:
-                content = f.read().strip()
-        except FileNotFoundError:
-            content = ''
-        if content:
+        # The daemon's live state block, when there is one, saves parsing files;
+        # one left behind by a daemon that died is ignored
+        live = live_state(read_state(state_file))
+        if live and live["started"]:
+            script_start_time = datetime.fromtimestamp(live["started"])
+        else:
+            try:
+                with open(sst_file, 'r') as f:
+                    content = f.read().strip()
+            except FileNotFoundError:
+                content = ''
             try:
-                script_start_time = datetime.strptime(content, '%Y-%m-%d %H:%M:%S.%f')
+                # empty file ⇒ generic timestamp
+                script_start_time = datetime.strptime(content, '%Y-%m-%d %H:%M:%S.%f') if content else datetime.now()
             except ValueError:
                 # malformed timestamp ⇒ treat like new
                 script_start_time = datetime.now()
-        else:
-            # empty file ⇒ generic timestamp
-            script_start_time = datetime.now()
         script_uptime = datetime.now() - script_start_time
         uptime_seconds = script_uptime.total_seconds()
 
+        # One process-table snapshot serves every check and usage query
+        procs = process_snapshot()
         # Check if viewport and api are running
-        uptime = process_handler("viewport.py", action="check")
-        monitoring = process_handler("monitoring.py", action="check")
+        uptime = process_handler("viewport.py", action="check", procs=procs)
+        monitoring = process_handler("monitoring.py", action="check", procs=procs)
         # Convert uptime_seconds to months, days, hours, minutes, and seconds
         uptime_months = int(uptime_seconds // 2592000)
         uptime_days = int(uptime_seconds // 86400)
@@ -849,16 +903,32 @@ def status_handler():
         if sleep_seconds > 0: sleep_parts.append(f"{sleep_seconds} sec")
         sleep_str = f"{GREEN}{' '.join(sleep_parts)}{NC}"
         # CPU & Memory usage
-        # gather raw sums (each sum can exceed 100%)
-        cpu_vp, mem_vp = usage_handler("viewport.py")
-        cpu_mon, mem_mon = usage_handler("monitoring.py")
-        cpu_ch,  mem_ch  = usage_handler(BROWSER)
-
-        # normalize across all logical cores (so 0–100%)
         ncpus = psutil.cpu_count(logical=True) or 1
-        cpu_vp  /= ncpus
-        cpu_mon /= ncpus
-        cpu_ch  /= ncpus
+        tree = browser_tree(procs)
+        # Prefer the daemon's background sample; it is already normalized
+        latest = latest_sample(sample_file) if uptime else None
+        if latest:
+            samples = cpu_sampler(tree)
+            cpu_vp, mem_vp = latest["viewport_cpu"], latest["viewport_rss"]
+            cpu_mon, mem_mon = latest["monitoring_cpu"], latest["monitoring_rss"]
+            cpu_ch, mem_ch = latest["browser_cpu"], latest["browser_rss"]
+        else:
+            # sample every matching process in a single window
+            targets = ("viewport.py", "monitoring.py", BROWSER)
+            tree_ids = {id(p) for p in tree}
+            samples = cpu_sampler([
+                p for p in procs
+                if id(p) in tree_ids or any(usage_match(p, t) for t in targets)
+            ])
+            # gather raw sums (each sum can exceed 100%)
+            cpu_vp, mem_vp = usage_handler("viewport.py", procs, samples)
+            cpu_mon, mem_mon = usage_handler("monitoring.py", procs, samples)
+            cpu_ch,  mem_ch  = usage_handler(BROWSER, procs, samples)
+
+            # normalize across all logical cores (so 0–100%)
+            cpu_vp  /= ncpus
+            cpu_mon /= ncpus
+            cpu_ch  /= ncpus
 
         total_ram = psutil.virtual_memory().total
         # Individual memory colors based on their percentage
@@ -916,6 +986,17 @@ def status_handler():
                 f" {CYAN}CPU:{NC} {cpu_color}{cpu:04.1f}%{NC}"
                 f"   {CYAN}Mem:{NC} {mem_color}{fmt_mem(mem)}{NC}"
             )
+        # Per-process-type breakdown of the browser tree
+        breakdown = browser_usage_handler(procs, samples)
+        for ptype, entry in sorted(breakdown.items(), key=lambda kv: -kv[1]["mem"]):
+            cpu = entry["cpu"] / ncpus
+            cpu_color = get_cpu_color(BROWSER, cpu)
+            label = f"{ptype} x{entry['count']}"
+            print(
+                f"    {label:<14}"
+                f" {CYAN}CPU:{NC} {cpu_color}{cpu:04.1f}%{NC}"
+                f"   {CYAN}Mem:{NC} {GREEN}{entry['mem']/(1024**2):.0f}MB{NC}"
+            )
         print(f"{CYAN}Check Health Every:{NC} {sleep_str}")
         print(f"{CYAN}Print to Log Every:{NC}{GREEN} {LOG_INTERVAL} min{NC}")
         if RESTART_TIMES:
@@ -923,39 +1004,30 @@ def status_handler():
             next_run = get_next_restart(now)
             print(f"{CYAN}Scheduled Restart:{NC}  {GREEN}{next_run}{NC}")
         try:
-            with open(status_file, "r") as f:
-                # Read the status file
-                status_line = f.readlines()[-1].strip()
-                # Conditionally color the status line based on its content
-                if any(keyword in status_line for keyword in ["Error", "Crashed", "Timed Out", "Crash"]):
-                    colored_status_line = f"{RED}{status_line}{NC}"
-                elif any(keyword in status_line for keyword in ["Restarting", "Starting", "Stopped", "Offline"]):
-                    colored_status_line = f"{YELLOW}{status_line}{NC}"
-                else:
-                    colored_status_line = f"{GREEN}{status_line}{NC}"  # Default to green if no other color is matched
-                print(f"{CYAN}Last Status Update:{NC} {colored_status_line}")
+            # Newest status, from the state block or else the status journal
+            if live and live["status"]:
+                latest = {"message": live["status"], "severity": live["severity"]}
+            else:
+                latest = (read_status(status_file) or [{}])[-1]
+            status_line = latest.get("message", "")
+            # Color the status line based on its severity
+            color = {"error": RED, "warning": YELLOW}.get(latest.get("severity"), GREEN)
+            print(f"{CYAN}Last Status Update:{NC} {color}{status_line}{NC}")
         except FileNotFoundError:
             print(f"{RED}Status file not found.{NC}")
             log_error("Status File not found")
         try:
-            with open(log_file, "r") as f:
-                lines = f.readlines()
+            if not log_file.exists():
+                raise FileNotFoundError(log_file)
+            # Only the end of the log is read, however large it is; gzipped
+            # backups are skipped rather than decompressed for one line
+            lines, _, _ = read_log(log_file, 1, compressed=False)
             if not lines:
                 # No entries yet in the log
                 colored_log_line = (f"{RED}No log entries yet.{NC}")
             else:
-                log_line = lines[-1].strip()
-                # Conditionally color the log line based on its content
-                if "[ERROR]" in log_line:
-                    colored_log_line = f"{RED}{log_line}{NC}"
-                elif "[DEBUG]" in log_line:
-                    colored_log_line = f"{CYAN}{log_line}{NC}"
-                elif "[WARNING]" in log_line:
-                    colored_log_line = f"{YELLOW}{log_line}{NC}"
-                elif "[INFO]" in log_line:
-                    colored_log_line = f"{GREEN}{log_line}{NC}"
-                else:
-                    colored_log_line = f"{NC}{log_line}{NC}"
+                # Color the log line by its level
+                colored_log_line = get_log_line(lines[-1])
             print(f"{CYAN}Last Log Entry:{NC} {colored_log_line}")
         except FileNotFoundError:
             # Log file does not exist
@@ -966,75 +1038,142 @@ def status_handler():
         log_error("Uptime File not found")
     except Exception as e:
         log_error("Error while checking status: ", e)
-def process_handler(name, action="check"):
+def sampler_handler():
     """
-    Check for—or terminate—running processes that match *name*.
+    Start the background resource sampler that feeds *sample_file*.
 
-    For ``viewport.py`` and ``monitoring.py`` the match is exact on a
-    standalone script argument; for browsers it searches the executable
-    path and full command-line.
-
-    Args:
-        name: Script filename (e.g., ``"viewport.py"``) or browser name.
-        action: ``"check"`` to test for running instances,
-            ``"kill"`` to force-terminate them.
+    The sampler runs as a daemon thread for the life of the script and
+    appends system and per-process usage to a shared ring buffer, so
+    ``--status`` and the monitoring API can read recent figures without
+    sampling on their own.
 
     Returns:
-        bool: ``True`` if any matching processes are (or were) running;
-        otherwise ``False``.
+        ResourceSampler | None: The running sampler, or ``None`` if the
+        ring could not be created.
     """
+    global sampler
+    if sampler is not None and sampler.is_alive():
+        return sampler
     try:
-        me = os.geteuid()
-        current_pid = os.getpid()
-        matches = []
-        lower_name = name.lower()
-        script_token = lower_name[:-3] if lower_name.endswith(".py") else lower_name
-        # Determine if we're matching a script or a browser
-        is_script = lower_name in ("viewport.py", "monitoring.py")
-        for proc in psutil.process_iter(['pid', 'name', 'uids', 'cmdline', 'exe']):
-            try:
-                info = proc.info
-                proc_name = (info.get('name') or '').lower()
-                raw_cmd = info.get('cmdline') or []
-                exe_path = (info.get('exe') or '').lower()
-                if is_script:
-                    # Strict: match only if script name is a standalone argument
-                    cmd_args = [os.path.basename(str(arg)).lower() for arg in raw_cmd]
-                    if lower_name not in cmd_args and script_token not in cmd_args:
-                        continue
-                else:
-                    # Browser: match if name appears anywhere in cmdline or exe path
-                    cmd = " ".join(raw_cmd).lower()
-                    if lower_name not in proc_name and lower_name not in cmd and lower_name not in exe_path:
-                        continue
-                # Only kill/check processes you own
-                uids = info.get('uids')
-                if uids is not None and uids.real != me:
-                    continue
-                pid = info.get('pid')
-                if pid == current_pid:
-                    continue
-                matches.append(pid)
-                if action == "check":
-                    return True
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-        if action == "kill" and matches:
-            for pid in matches:
-                try:
-                    os.kill(pid, signal.SIGKILL)
-                except ProcessLookupError:
-                    logging.warning(f"Process {pid} already gone")
-            pids = ', '.join(str(x) for x in matches)
-            time.sleep(0.5)
-            logging.info(f"Killed process '{name}' with PIDs: {pids}")
-            api_status(f"Killed process '{name}'")
-            return False
-        return bool(matches)
+        ring = ResourceRing(sample_file, writable=True)
     except Exception as e:
-        log_error(f"Error while checking process '{name}'", e)
-        api_status(f"Error Checking Process '{name}'")
-        return False
+        log_error("Error starting resource sampler: ", e)
+        return None
+    sampler = ResourceSampler(ring, groups={
+        "viewport":   lambda p: usage_match(p, "viewport.py"),
+        "monitoring": lambda p: usage_match(p, "monitoring.py"),
+        "browser":    lambda p: usage_match(p, BROWSER),
+    })
+    sampler.start()
+    return sampler
+def control_handler():
+    """
+    Start the control socket that the CLI flags and the monitoring API
+    use to reach this daemon without starting another interpreter.
+
+    Commands: ``status``, ``pause``, ``resume``, ``soft-restart``,
+    ``quit``, ``metrics`` and ``screenshot``. ``soft-restart`` and
+    ``screenshot`` are queued for :pyfunc:`handle_view`, which is woken
+    from its sleep to carry them out, and ``quit`` is left to the
+    SIGTERM handler, so the browser is only driven from one thread.
+
+    Returns:
+        ControlServer | None: The running server, or ``None`` if the
+        socket could not be created.
+    """
+    global control_server
+    if control_server is not None and control_server.is_alive():
+        return control_server
+    def status():
+        return {
+            "pid": os.getpid(),
+            "version": __version__,
+            "status": (read_status(status_file) or [None])[-1] if status_file.exists() else None,
+            "paused": pause_file.exists(),
+            "started": (sst_file.read_text().strip() or None) if sst_file.exists() else None,
+            "log_dropped": dropped_records(),
+        }
+    def pause():
+        pause_file.touch()
+        state.update(phase="paused", paused=True)
+        logging.warning("Pausing health checks.", extra={"event": "paused"})
+        api_status("Paused")
+        return {"paused": True}
+    def resume():
+        pause_file.unlink(missing_ok=True)
+        state.update(phase="running", paused=False)
+        logging.info("Resuming health checks.", extra={"event": "resumed"})
+        api_status("Resumed")
+        return {"paused": False}
+    def soft_restart():
+        restart_requested.set()
+        control_wake.set()
+        return {"restarting": True}
+    def stop():
+        # Reply first; signal_handler closes the browser and exits
+        threading.Timer(0.2, os.kill, (os.getpid(), signal.SIGTERM)).start()
+        return {"stopping": True}
+    def screenshot():
+        if driver is None:
+            raise RuntimeError("No browser session")
+        request = {"done": threading.Event()}
+        screenshot_requests.put(request)
+        control_wake.set()
+        if not request["done"].wait(SCREENSHOT_TIMEOUT):
+            request["cancelled"] = True
+            raise RuntimeError("Timed out waiting for the health check loop")
+        if "error" in request:
+            raise RuntimeError(request["error"])
+        return {"path": request["path"]}
+    try:
+        control_server = ControlServer(control_file, {
+            "status":       status,
+            "pause":        pause,
+            "resume":       resume,
+            "soft-restart": soft_restart,
+            "quit":         stop,
+            "metrics":      metrics.snapshot,
+            "screenshot":   screenshot,
+        }, token=CONTROL_TOKEN).open()
+    except OSError as e:
+        log_error("Error starting control socket: ", e)
+        return None
+    return control_server
+def control_wait(seconds):
+    """
+    Sleep for up to *seconds*, returning early on a control request.
+
+    Returns:
+        bool: True if a request (see :pyfunc:`control_handler`) cut the
+        sleep short.
+    """
+    woken = control_wake.wait(seconds)
+    control_wake.clear()
+    return woken
+def serve_screenshots(driver):
+    """
+    Take the screenshots queued over the control socket.
+
+    Called from :pyfunc:`handle_view`, the only thread that drives the
+    browser; each waiting request gets its path or error back.
+    """
+    while True:
+        try:
+            request = screenshot_requests.get_nowait()
+        except queue.Empty:
+            return
+        if request.get("cancelled"):
+            continue
+        try:
+            screenshot_handler(logs_dir, LOG_DAYS)
+            path = logs_dir / f"screenshot_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.png"
+            if not driver.save_screenshot(str(path)):
+                raise RuntimeError("Screenshot failed")
+            logging.info(f"Saved screenshot to {path}", extra={"event": "screenshot_saved"})
+            request["path"] = str(path)
+        except Exception as e:
+            request["error"] = str(e) or type(e).__name__
+        request["done"].set()
 def browser_handler(url):
     """
     Launch a fresh browser instance and navigate to *url*.
@@ -1057,7 +1196,10 @@ def browser_handler(url):
     for attempt in range(1, max_attempts + 1):  # 1-indexed counting
         # Log retry messages only for attempts after the first one
         if attempt > 1:
-            logging.info(f"Retrying... (Attempt {attempt - 1} of {MAX_RETRIES})")
+            logging.info(
+                f"Retrying... (Attempt {attempt - 1} of {MAX_RETRIES})",
+                extra={"event": "browser_retry", "attempt": attempt - 1},
+            )
         # Kill before the last retry to give it a clean slate
         if attempt == max_attempts:
             logging.warning(f"Killing existing {BROWSER} processes before final attempt...")
@@ -1165,13 +1307,14 @@ def browser_restart_handler(url):
     Raises:
         Exception: Propagates any error encountered during restart.
     """
+    metrics.inc("browser_restarts")
     try:
         logging.info(f"Restarting {BROWSER}...")
         api_status(f"Restarting {BROWSER}")
         driver = browser_handler(url)
         check_for_title(driver)
         if handle_page(driver):
-            logging.info("Page successfully reloaded.")
+            logging.info("Page successfully reloaded.", extra={"event": "page_reloaded"})
             api_status("Feed Healthy")
             time.sleep(WAIT_TIME)
         return driver
@@ -1194,6 +1337,11 @@ def restart_handler(driver):
     try:
         # notify API & shut down driver if present
         api_status("Restarting script...")
+        state.update(phase="restarting")
+        # Count it now: this process is about to be replaced
+        metrics.inc("script_restarts")
+        metrics.flush(force=True)
+        history.flush()
         # Mark a restart intent
         with open(restart_file, "w") as f:
             f.write("1")
@@ -1207,6 +1355,7 @@ def restart_handler(driver):
         script_path = os.path.realpath(sys.argv[0])
         # If we're in a real terminal, replace ourselves (and keep stdout/stderr)
         if sys.stdout.isatty():
+            flush_logging()  # execv discards the queue
             os.execv(sys.executable, [sys.executable, script_path] + child_argv)
             # (os.execv never returns on success)
         else:
@@ -1257,7 +1406,8 @@ def check_driver(driver):
         Exception: Propagates any other Selenium-related error.
     """
     try:
-        driver.title  # Accessing the title will raise an exception if the driver is not alive
+        with metrics.timer("webdriver_rtt_seconds"):
+            driver.title  # Accessing the title will raise an exception if the driver is not alive
         return True
     except (WebDriverException, InvalidSessionIdException, Exception):
         raise
@@ -1566,6 +1716,7 @@ def handle_loading_issue(driver):
                 log_error("Video feed trouble persisting for 15 seconds, refreshing the page.", None, driver=driver)
                 api_status("Loading Issue Detected")
                 driver.refresh()
+                metrics.inc("loading_refreshes")
                 time.sleep(5)  # let it load
 
                 # Validate after refresh
@@ -1629,7 +1780,7 @@ def handle_fullscreen_button(driver):
             actions.move_to_element(button)
             actions.click(button)
             actions.perform()
-            logging.info("Fullscreen activated")
+            logging.info("Fullscreen activated", extra={"event": "fullscreen_activated"})
             api_status("Fullscreen restored")
             return True
         except Exception as e:
@@ -1677,6 +1828,7 @@ def handle_login(driver):
         submit_button.click()
         # Verify successful login
         if check_for_title(driver, "Dashboard"):
+            metrics.inc("logins")
             return True
         # If not logged in yet, look for a "Trust This Device" prompt
         try:
@@ -1697,10 +1849,13 @@ def handle_login(driver):
             # no trust-device prompt appeared
             pass
         # One more shot at Dashboard
-        return check_for_title(driver, "Dashboard")
+        logged_in = check_for_title(driver, "Dashboard")
+        metrics.inc("logins" if logged_in else "login_failures")
+        return logged_in
     except Exception as e: 
         log_error("Error during login: ", e, driver)
         api_status("Error Logging In")
+        metrics.inc("login_failures")
         return False
 def handle_page(driver):
     """
@@ -1769,6 +1924,7 @@ def handle_modal(driver):
             )
             logging.info("Modal successfully closed")
             api_status("Modal closed")
+            metrics.inc("modals_closed")
             return True
         return False
     except TimeoutException:
@@ -1790,8 +1946,13 @@ def handle_retry(driver, url, attempt, max_retries):
     Returns:
         selenium.webdriver.Remote: The (potentially new) driver instance.
     """
-    logging.warning(f"Retrying... (Attempt {attempt} of {max_retries})")
+    logging.warning(
+        f"Retrying... (Attempt {attempt} of {max_retries})",
+        extra={"event": "retry", "attempt": attempt},
+    )
     api_status(f"Retrying: {attempt} of {max_retries}")
+    state.update(phase="retrying", attempt=attempt, max_attempts=max_retries)
+    metrics.inc("retries")
     if attempt < max_retries - 1:
         try:
             if not check_driver(driver):
@@ -1810,7 +1971,7 @@ def handle_retry(driver, url, attempt, max_retries):
                 page_ok = handle_page(driver)
         
                 # log success or failure with one ternary; no need for an else just to log
-                logging.info("Page successfully reloaded.") if page_ok else logging.warning("Couldn't reload page.")
+                logging.info("Page successfully reloaded.", extra={"event": "page_reloaded"}) if page_ok else logging.warning("Couldn't reload page.")
         
                 # only if it succeeded do we do the fullscreen + healthy-feed status
                 if page_ok:
@@ -1854,6 +2015,7 @@ def handle_view(driver, url):
     retry_count = 0
     max_retries = MAX_RETRIES
     paused_logged = False
+    failing_since = None # monotonic time of the first failed check, until healthy again
     # how many loops between regular logs
     log_interval_iterations = round(max(LOG_INTERVAL * 60, SLEEP_TIME) / SLEEP_TIME)
     # Align the first log to the next "even" boundary:
@@ -1880,28 +2042,37 @@ def handle_view(driver, url):
         api_status("Error Loading Live View. Restarting...")
         restart_handler(driver)
     while True:
+        check_start = time.monotonic()
+        _mod.driver = driver # for the signal handler and the control socket
         try:
-            state = driver.execute_script(
+            if restart_requested.is_set():
+                restart_requested.clear()
+                logging.info("Restart requested over the control socket.")
+                restart_handler(driver)
+            serve_screenshots(driver)
+            banner = driver.execute_script(
                 "const e = document.getElementById('pause-banner');"
                 "return e ? e.getAttribute('data-paused') : null;"
             )
-            paused_ui   = (state == "true")
+            paused_ui   = (banner == "true")
             paused_file = pause_file.exists()
             if paused_ui or paused_file:
                 if not paused_logged:
                     logging.warning("Script paused; skipping health checks.")
                     api_status("Paused")
+                    state.update(phase="paused", paused=True)
                     paused_logged = True
-                time.sleep(5)
+                control_wait(5)
                 continue
             if paused_logged:
                 if pause_file.exists(): pause_file.unlink()
                 logging.info("Script resumed; starting health checks again.")
                 api_status("Resumed")
+                state.update(phase="running", paused=False)
                 paused_logged = False
             now = datetime.now()
             if RESTART_TIMES and next_run and now >= next_run:
-                logging.info("Performing scheduled restart")
+                logging.info("Performing scheduled restart", extra={"event": "scheduled_restart"})
                 api_status("Performing scheduled restart")
                 restart_handler(driver)
             elif check_driver(driver):
@@ -1909,6 +2080,7 @@ def handle_view(driver, url):
                 if check_crash(driver):
                     log_error(f"Tab Crashed. Restarting {BROWSER}...", None, driver=driver)
                     api_status("Tab Crashed")
+                    failing_since = failing_since or check_start
                     driver = browser_restart_handler(url)
                     continue
                 # Check for "Console Offline" or "Protect Offline"
@@ -1951,18 +2123,29 @@ def handle_view(driver, url):
                 handle_elements(driver)     # Hides cursor and camera controls until mouse moves
                 handle_pause_banner(driver) # Injects a pause banner on mouse move
                 api_status("Feed Healthy")
+                state.check_passed()
+                check_seconds = time.monotonic() - check_start
+                metrics.observe("health_check_seconds", check_seconds)
+                history.record("health_check_seconds", check_seconds)
+                if failing_since is not None:
+                    metrics.observe("recovery_seconds", time.monotonic() - failing_since)
+                    failing_since = None
                 # Check decoding errors
                 if check_unable_to_stream(driver):
                     logging.warning("Live view contains cameras that the browser cannot decode.")
                     api_status("Decoding Error in some cameras")
                 # Prints healthy message logfile every LOG_INTERVAL. Prevents spamming the logfile.
                 if iteration_counter >= log_interval_iterations:
-                    logging.info("Video feeds healthy.")
+                    logging.info(
+                        "Video feeds healthy.",
+                        extra={"event": "feed_healthy", "duration": round(check_seconds, 3)},
+                    )
                     iteration_counter = 0  # Reset the counter
                 # Calculate the time to sleep until the next health check
                 # Based on the difference between the current time and the next health check time
+                # A control request ends the sleep early and is handled at the top
                 sleep_duration = max(0, get_next_interval(SLEEP_TIME) - time.time())
-                time.sleep(sleep_duration)
+                control_wait(sleep_duration)
                 iteration_counter += 1
             else:
                 log_error("Driver unresponsive.")
@@ -1974,6 +2157,7 @@ def handle_view(driver, url):
         except (TimeoutException, NoSuchElementException) as e:
             log_error("Video feeds not found or page timed out.", e, driver)
             api_status("Video Feeds Not Found")
+            failing_since = failing_since or check_start
             time.sleep(WAIT_TIME)
             retry_count += 1
             handle_retry(driver, url, retry_count, max_retries)
@@ -1981,6 +2165,7 @@ def handle_view(driver, url):
         except (NewConnectionError, NameResolutionError, MaxRetryError) as e:
             log_error("Connection error occurred. Retrying...", e, driver)
             api_status("Connection Error")
+            failing_since = failing_since or check_start
             time.sleep(SLEEP_TIME/2)
             retry_count += 1
             handle_retry(driver, url, retry_count, max_retries)
@@ -1988,10 +2173,12 @@ def handle_view(driver, url):
         except WebDriverException as e:
             log_error(f"Tab Crashed. Restarting {BROWSER}...", e)
             api_status("Tab Crashed")
+            failing_since = failing_since or check_start
             driver = browser_restart_handler(url)
         except Exception as e:
             log_error("Unexpected error occurred: ", e, driver)
             api_status("Unexpected Error")
+            failing_since = failing_since or check_start
             time.sleep(WAIT_TIME)
             retry_count += 1
             handle_retry(driver, url, retry_count, max_retries)
@@ -2039,6 +2226,21 @@ def main():
             f.write(str(datetime.now()))
     # Check and kill any existing instance of viewport.py and reset the restart_file flag
     if other_running: process_handler("viewport.py", action="kill")
+    pid_handler("viewport.py", action="write")
+    # Only this process writes the state block from here on
+    try:
+        started = datetime.fromisoformat(sst_file.read_text().strip()).timestamp()
+    except (OSError, ValueError):
+        started = time.time()
+    state.open(state_file)
+    state.update(
+        pid=os.getpid(), phase="starting", started=started, attempt=0,
+        max_attempts=MAX_RETRIES, paused=pause_file.exists(),
+    )
+    control_handler()
+    sampler_handler()
+    metrics.open(metrics_file)
+    history.open(history_file, sampler.ring if sampler else None)
     driver = browser_handler(url)
     # Start the handle_view function in a separate thread
     threading.Thread(target=handle_view, args=(driver, url)).start()